@@ -10,7 +10,8 @@ import copy
 import datetime
 import time
 from abc import abstractmethod
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import arrow
@@ -35,6 +36,7 @@ from ..exceptions import (
 from ..resources.cache_utils import StatsAggregationRegistry
 from ..services.community_dashboards import CommunityDashboardsService
 from .bookmarks import CommunityBookmarkAPI
+from .checkpoints import SnapshotCheckpointAPI
 from .types import (
     RecordDeltaDocument,
     RecordSnapshotDocument,
@@ -95,6 +97,10 @@ class CommunityAggregatorBase(StatAggregator):
         self.query_timeout_seconds = current_app.config.get(
             "COMMUNITY_STATS_BULK_INDEX_TIMEOUT", 300
         )
+        # Number of communities aggregated concurrently by run()
+        self.max_workers = max(
+            1, current_app.config.get("COMMUNITY_STATS_AGGREGATION_WORKERS", 1)
+        )
         # Field name for searching community event indices - overridden by subclasses
         self.event_date_field = "created"
         self.first_event_date_field = "created"
@@ -280,6 +286,8 @@ class CommunityAggregatorBase(StatAggregator):
         update_bookmark: bool = True,
         ignore_bookmark: bool = False,
         return_results: bool = False,
+        community_order: Iterable[str] | None = None,
+        on_community_done: Callable[[str], None] | None = None,
     ) -> list[tuple[int, int | list[dict], list[dict]]]:
         """Perform an aggregation for community and global stats.
 
@@ -305,6 +313,12 @@ class CommunityAggregatorBase(StatAggregator):
             ignore_bookmark: Whether to ignore the bookmark.
             return_results: Whether to return the error results from the bulk
                 aggregation or only the error count. This is primarily used in testing.
+            community_order: Optional iterable that decides when each community is
+                aggregated. It may block until a community is ready (e.g. until an
+                upstream aggregator has finished it). Communities it doesn't yield
+                are aggregated after it is exhausted.
+            on_community_done: Optional callback called with each community ID once
+                that community has been aggregated and its bookmark updated.
 
         Returns:
             A list of tuples representing results from the bulk aggregation. If
@@ -357,131 +371,252 @@ class CommunityAggregatorBase(StatAggregator):
                 registry, communities_to_aggregate
             )
 
-            results = []
-            for community_id in communities_to_aggregate:
-                try:
-                    first_event_date, last_event_date = self._find_first_event_date(
-                        community_id
-                    )
-                except ValueError:
-                    continue
-
-                previous_bookmark = self.bookmark_api.get_bookmark(community_id)
-
-                if not ignore_bookmark:
-                    if previous_bookmark:
-                        lower_limit = arrow.get(previous_bookmark)
-                    elif start_date:
-                        lower_limit = start_date
-                    else:
-                        lower_limit = min(
-                            first_event_date or arrow.utcnow(), arrow.utcnow()
-                        )
-                else:
-                    # When ignoring bookmark, start from the earliest available data
-                    # if no start_date is provided, otherwise use the provided
-                    # start_date
-                    if start_date:
-                        lower_limit = start_date
-                    else:
-                        lower_limit = first_event_date or arrow.utcnow()
-
-                # Ensure we don't aggregate more than self.catchup_interval days
-                upper_limit = self._get_end_date(lower_limit, end_date)
-
-                first_event_date_safe = first_event_date or arrow.utcnow()
-                last_event_date_safe = last_event_date or arrow.utcnow()
-
-                agg_iter_generator = self.agg_iter(
-                    community_id,
-                    lower_limit,
-                    upper_limit,
-                    first_event_date_safe,
-                    last_event_date_safe,
+            community_kwargs = {
+                "start_date": start_date,
+                "end_date": end_date,
+                "update_bookmark": update_bookmark,
+                "ignore_bookmark": ignore_bookmark,
+                "return_results": return_results,
+            }
+            ordered_communities = self._iter_communities(
+                communities_to_aggregate, community_order
+            )
+            if self.max_workers > 1 and len(communities_to_aggregate) > 1:
+                results = self._run_communities_in_parallel(
+                    ordered_communities, on_community_done, **community_kwargs
                 )
+            else:
+                results = []
+                for community_id in ordered_communities:
+                    community_result = self._aggregate_community(
+                        community_id, **community_kwargs
+                    )
+                    if on_community_done:
+                        on_community_done(community_id)
+                    if community_result is not None:
+                        results.append(community_result)
 
-                community_docs_info: list[dict] = []
-
-                # Wrapper generator that collects metadata while yielding documents
-                # so that we can return the detailed information in the result
-                def document_generator_with_metadata(docs_info_list):
-                    doc_count = 0
-                    for doc, doc_generation_time in agg_iter_generator:  # noqa: B023
-                        doc_count += 1
-                        doc_info = {
-                            "document_id": doc["_id"],
-                            "index_name": doc["_index"],
-                            "community_id": doc["_source"].get("community_id"),
-                            "date_info": {},
-                            "generation_time": doc_generation_time,
-                        }
+            self.client.indices.refresh(index=f"{self.aggregation_index}-*")
+            return results
+        finally:
+            # Clean up registry keys
+            if active_registry_keys:
+                for key in active_registry_keys:
+                    registry.delete(key)
 
-                        if (
-                            "period_start" in doc["_source"]
-                            and "period_end" in doc["_source"]
-                        ):
-                            doc_info["date_info"] = {
-                                "period_start": doc["_source"]["period_start"],
-                                "period_end": doc["_source"]["period_end"],
-                                "date_type": "delta",
-                            }
-                        elif "snapshot_date" in doc["_source"]:
-                            doc_info["date_info"] = {
-                                "snapshot_date": doc["_source"]["snapshot_date"],
-                                "date_type": "snapshot",
-                            }
+    @staticmethod
+    def _iter_communities(
+        communities_to_aggregate: list[str],
+        community_order: Iterable[str] | None = None,
+    ) -> Generator[str, None, None]:
+        """Yield the communities to aggregate, following an optional order.
 
-                        docs_info_list.append(doc_info)
+        Args:
+            communities_to_aggregate: List of community IDs to aggregate.
+            community_order: Optional iterable of community IDs giving the order.
+                IDs that are not in communities_to_aggregate are ignored.
 
-                        yield doc
+        Yields:
+            str: Each community ID in communities_to_aggregate exactly once.
+        """
+        if community_order is None:
+            yield from communities_to_aggregate
+            return
+        remaining = dict.fromkeys(communities_to_aggregate)
+        for community_id in community_order:
+            if community_id in remaining:
+                del remaining[community_id]
+                yield community_id
+        yield from remaining
+
+    def _aggregate_community(
+        self,
+        community_id: str,
+        start_date: arrow.Arrow | None,
+        end_date: arrow.Arrow | None,
+        update_bookmark: bool,
+        ignore_bookmark: bool,
+        return_results: bool,
+    ) -> tuple[int, int | list[dict], list[dict]] | None:
+        """Aggregate and index the documents for a single community.
 
-                docs_indexed, errors = self._adaptive_bulk_index(
-                    document_generator_with_metadata(community_docs_info),
-                    stats_only=False if return_results else True,
+        Args:
+            community_id: The community ID (or "global").
+            start_date: The start date for the aggregation.
+            end_date: The end date for the aggregation.
+            update_bookmark: Whether to update the bookmark.
+            ignore_bookmark: Whether to ignore the bookmark.
+            return_results: Whether to return the error results from the bulk
+                aggregation or only the error count.
+
+        Returns:
+            The number of documents indexed, the errors, and the information about
+            each indexed document, or None if the community has no events.
+        """
+        try:
+            first_event_date, last_event_date = self._find_first_event_date(
+                community_id
+            )
+        except ValueError:
+            return None
+
+        previous_bookmark = self.bookmark_api.get_bookmark(community_id)
+
+        if not ignore_bookmark:
+            if previous_bookmark:
+                lower_limit = arrow.get(previous_bookmark)
+            elif start_date:
+                lower_limit = start_date
+            else:
+                lower_limit = min(first_event_date or arrow.utcnow(), arrow.utcnow())
+        else:
+            # When ignoring bookmark, start from the earliest available data
+            # if no start_date is provided, otherwise use the provided
+            # start_date
+            if start_date:
+                lower_limit = start_date
+            else:
+                lower_limit = first_event_date or arrow.utcnow()
+
+        # Ensure we don't aggregate more than self.catchup_interval days
+        upper_limit = self._get_end_date(lower_limit, end_date)
+
+        first_event_date_safe = first_event_date or arrow.utcnow()
+        last_event_date_safe = last_event_date or arrow.utcnow()
+
+        agg_iter_generator = self.agg_iter(
+            community_id,
+            lower_limit,
+            upper_limit,
+            first_event_date_safe,
+            last_event_date_safe,
+        )
+
+        community_docs_info: list[dict] = []
+
+        # Wrapper generator that collects metadata while yielding documents
+        # so that we can return the detailed information in the result
+        def document_generator_with_metadata(docs_info_list):
+            doc_count = 0
+            for doc, doc_generation_time in agg_iter_generator:
+                doc_count += 1
+                doc_info = {
+                    "document_id": doc["_id"],
+                    "index_name": doc["_index"],
+                    "community_id": doc["_source"].get("community_id"),
+                    "date_info": {},
+                    "generation_time": doc_generation_time,
+                }
+
+                if "period_start" in doc["_source"] and "period_end" in doc["_source"]:
+                    doc_info["date_info"] = {
+                        "period_start": doc["_source"]["period_start"],
+                        "period_end": doc["_source"]["period_end"],
+                        "date_type": "delta",
+                    }
+                elif "snapshot_date" in doc["_source"]:
+                    doc_info["date_info"] = {
+                        "snapshot_date": doc["_source"]["snapshot_date"],
+                        "date_type": "snapshot",
+                    }
+
+                docs_info_list.append(doc_info)
+
+                yield doc
+
+        docs_indexed, errors = self._adaptive_bulk_index(
+            document_generator_with_metadata(community_docs_info),
+            stats_only=False if return_results else True,
+        )
+        community_result = (docs_indexed, errors, community_docs_info)
+
+        if update_bookmark:
+            if errors:
+                error_count = len(errors) if isinstance(errors, list) else errors
+                current_app.logger.error(
+                    f"Bulk indexing errors for {community_id}: "
+                    f"{error_count} errors. Skipping bookmark update."
                 )
-                results.append((docs_indexed, errors, community_docs_info))
+                return community_result
 
-                if update_bookmark:
-                    if errors:
-                        error_count = (
-                            len(errors) if isinstance(errors, list) else errors
-                        )
-                        current_app.logger.error(
-                            f"Bulk indexing errors for {community_id}: "
-                            f"{error_count} errors. Skipping bookmark update."
-                        )
-                        continue
+            expected_days = (upper_limit - lower_limit).days + 1
 
-                    expected_days = (upper_limit - lower_limit).days + 1
+            # For snapshot aggregators, we expect at least the expected number
+            # of days (they may index more due to catch-up processing)
+            if docs_indexed < expected_days:
+                current_app.logger.error(
+                    f"Insufficient documents for {community_id}: "
+                    f"expected at least {expected_days} days, indexed "
+                    f"{docs_indexed} documents. Skipping bookmark update."
+                )
+                return community_result
 
-                    # For snapshot aggregators, we expect at least the expected number
-                    # of days (they may index more due to catch-up processing)
-                    if docs_indexed < expected_days:
-                        current_app.logger.error(
-                            f"Insufficient documents for {community_id}: "
-                            f"expected at least {expected_days} days, indexed "
-                            f"{docs_indexed} documents. Skipping bookmark update."
-                        )
-                        continue
-
-                    if len(community_docs_info) != docs_indexed:
-                        current_app.logger.error(
-                            f"Document info count mismatch for {community_id}: "
-                            f"indexed {docs_indexed} documents, got "
-                            f"{len(community_docs_info)} document info entries. "
-                            f"Skipping bookmark update."
-                        )
-                        continue
+            if len(community_docs_info) != docs_indexed:
+                current_app.logger.error(
+                    f"Document info count mismatch for {community_id}: "
+                    f"indexed {docs_indexed} documents, got "
+                    f"{len(community_docs_info)} document info entries. "
+                    f"Skipping bookmark update."
+                )
+                return community_result
 
-                    self._update_bookmark(community_id, community_docs_info)
+            self._update_bookmark(community_id, community_docs_info)
 
-            self.client.indices.refresh(index=f"{self.aggregation_index}-*")
-            return results
-        finally:
-            # Clean up registry keys
-            if active_registry_keys:
-                for key in active_registry_keys:
-                    registry.delete(key)
+        return community_result
+
+    def _run_communities_in_parallel(
+        self,
+        communities_to_aggregate: Iterable[str],
+        on_community_done: Callable[[str], None] | None = None,
+        **kwargs,
+    ) -> list[tuple[int, int | list[dict], list[dict]]]:
+        """Aggregate several communities concurrently in a thread pool.
+
+        Aggregation is dominated by search latency, so communities are spread
+        across up to self.max_workers threads. Each community is handled by its own
+        shallow copy of the aggregator, so that per-run working state (like the
+        adaptive chunk size) is not shared between threads. The results are
+        returned in the same order as the communities.
+
+        Args:
+            communities_to_aggregate: The community IDs to aggregate.
+            on_community_done: Optional callback called with each community ID
+                once that community has been aggregated.
+            **kwargs: Keyword arguments for _aggregate_community.
+
+        Returns:
+            The per-community results, skipping communities without events.
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def aggregate_in_app_context(community_id: str):
+            with app.app_context():
+                community_result = copy.copy(self)._aggregate_community(
+                    community_id, **kwargs
+                )
+                if on_community_done:
+                    on_community_done(community_id)
+                return community_result
+
+        max_workers = self.max_workers
+        results = []
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{self.name}-worker"
+        ) as executor:
+            futures = [
+                executor.submit(aggregate_in_app_context, community_id)
+                for community_id in communities_to_aggregate
+            ]
+            try:
+                for future in futures:
+                    community_result = future.result()
+                    if community_result is not None:
+                        results.append(community_result)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
 
     def _setup_registry_keys(
         self,
@@ -862,6 +997,12 @@ class CommunitySnapshotAggregatorBase(CommunityAggregatorBase):
             "term", community_id=community_id
         )
         self.delta_index: str | None = None
+        # The key of the subcount configuration section used by this aggregator
+        self.subcount_config_section = "records"
+        self.use_checkpoints = current_app.config.get(
+            "COMMUNITY_STATS_SNAPSHOT_CHECKPOINTS", True
+        )
+        self.checkpoint_api = SnapshotCheckpointAPI(self.client, self.name)
 
     @abstractmethod
     def _get_latest_delta_date(self, community_id: str) -> arrow.Arrow | None:
@@ -1144,6 +1285,97 @@ class CommunitySnapshotAggregatorBase(CommunityAggregatorBase):
         # Return delta documents directly
         return [doc["_source"] for doc in all_delta_documents]
 
+    def _get_top_subcount_keys(self) -> list[str]:
+        """Get the keys of the "top" subcounts held in the exhaustive cache.
+
+        Returns:
+            list[str]: The subcount keys.
+        """
+        return [
+            subcount_key
+            for subcount_key, config in self.subcount_configs.items()
+            if (config.get(self.subcount_config_section) or {}).get("snapshot_type")
+            == "top"
+        ]
+
+    def _get_checkpoint_config_hash(self) -> str:
+        """Get the hash of the subcount configuration held in checkpoints.
+
+        Returns:
+            str: The configuration hash.
+        """
+        return SnapshotCheckpointAPI.make_config_hash({
+            subcount_key: self.subcount_configs[subcount_key][
+                self.subcount_config_section
+            ]
+            for subcount_key in self._get_top_subcount_keys()
+        })
+
+    def _load_checkpoint(
+        self, community_id: str, current_date: arrow.Arrow
+    ) -> tuple[arrow.Arrow, dict] | None:
+        """Load the exhaustive cache checkpoint to resume from.
+
+        A checkpoint can only be used if it was taken before the first date to be
+        aggregated, since delta documents can be folded into the cache but not
+        removed from it.
+
+        Args:
+            community_id: The community ID
+            current_date: The first date to be aggregated in this run
+
+        Returns:
+            The checkpoint date and exhaustive cache, or None if there is no
+            usable checkpoint and the cache must be built from all delta documents.
+        """
+        if not self.use_checkpoints:
+            return None
+        try:
+            checkpoint = self.checkpoint_api.get_checkpoint(
+                community_id, self._get_checkpoint_config_hash()
+            )
+        except Exception as e:
+            current_app.logger.warning(
+                f"Could not load snapshot checkpoint for {community_id}: {e}"
+            )
+            return None
+        if checkpoint is None:
+            return None
+
+        checkpoint_date, exhaustive_cache = checkpoint
+        if checkpoint_date.date() >= current_date.date():
+            return None
+        if set(exhaustive_cache) != set(self._get_top_subcount_keys()):
+            return None
+        return checkpoint_date, exhaustive_cache
+
+    def _save_checkpoint(
+        self, community_id: str, date: arrow.Arrow, exhaustive_cache: dict
+    ) -> None:
+        """Save the exhaustive cache as it stands after the snapshot for a date.
+
+        Failures are logged and ignored, since the next run can always fall back
+        to building the cache from all delta documents.
+
+        Args:
+            community_id: The community ID
+            date: The date of the last snapshot included in the cache
+            exhaustive_cache: The exhaustive counts cache
+        """
+        if not self.use_checkpoints:
+            return
+        try:
+            self.checkpoint_api.set_checkpoint(
+                community_id,
+                date,
+                self._get_checkpoint_config_hash(),
+                exhaustive_cache,
+            )
+        except Exception as e:
+            current_app.logger.warning(
+                f"Could not save snapshot checkpoint for {community_id}: {e}"
+            )
+
     def _build_exhaustive_cache(self, deltas: list, category_name: str) -> dict:
         """Build exhaustive cache for a category from all delta documents.
 
@@ -1349,9 +1581,18 @@ class CommunitySnapshotAggregatorBase(CommunityAggregatorBase):
             # No events exist, return empty generator
             return
 
+        # Resume the exhaustive cache from a checkpoint if possible, so that
+        # only the deltas after the checkpoint need to be fetched
+        exhaustive_counts_cache: dict[str, Any] = {}
+        fetch_start_date = first_event_date
+        checkpoint = self._load_checkpoint(community_id, current_iteration_date)
+        if checkpoint:
+            checkpoint_date, exhaustive_counts_cache = checkpoint
+            fetch_start_date = checkpoint_date.shift(days=1).floor("day")
+
         try:
             all_delta_documents = self._fetch_all_delta_documents(
-                community_id, first_event_date, end_date
+                community_id, fetch_start_date, end_date
             )
         except Exception as e:
             current_app.logger.error(
@@ -1363,7 +1604,18 @@ class CommunitySnapshotAggregatorBase(CommunityAggregatorBase):
             # No delta documents exist, return empty generator
             return
 
-        exhaustive_counts_cache: dict[str, Any] = {}
+        if checkpoint:
+            # Fold in any deltas between the checkpoint and the first new snapshot
+            for delta_doc in all_delta_documents:
+                if (
+                    arrow.get(delta_doc["period_start"]).date()
+                    >= current_iteration_date.date()
+                ):
+                    break
+                for subcount_key in exhaustive_counts_cache:
+                    self._update_exhaustive_cache(
+                        subcount_key, delta_doc, exhaustive_counts_cache
+                    )
 
         # Don't try to aggregate beyond the last delta date
         last_delta_date = arrow.get(all_delta_documents[-1]["period_start"])
@@ -1374,6 +1626,7 @@ class CommunitySnapshotAggregatorBase(CommunityAggregatorBase):
         )
 
         iteration_count = 0
+        last_completed_date = None
         while current_iteration_date <= end_date:
             iteration_start_time = time.time()
             iteration_count += 1
@@ -1421,9 +1674,23 @@ class CommunitySnapshotAggregatorBase(CommunityAggregatorBase):
 
             previous_snapshot = source_content
             previous_snapshot_date = current_iteration_date
+            last_completed_date = current_iteration_date
             current_iteration_date = current_iteration_date.shift(days=1)
             current_delta_index += 1
 
+        if last_completed_date is not None:
+            # The cache is built lazily, so complete it before checkpointing
+            for subcount_key in self._get_top_subcount_keys():
+                if subcount_key not in exhaustive_counts_cache:
+                    exhaustive_counts_cache[subcount_key] = (
+                        self._build_exhaustive_cache(
+                            all_delta_documents[:current_delta_index], subcount_key
+                        )
+                    )
+            self._save_checkpoint(
+                community_id, last_completed_date, exhaustive_counts_cache
+            )
+
 
 class CommunityEventsIndexAggregator(CommunityAggregatorBase):
     """Dummy aggregator for registering the community events index template.
@@ -12,6 +12,7 @@ import arrow
 from flask import current_app
 from invenio_search.utils import prefix_index
 from invenio_stats.bookmark import BookmarkAPI
+from opensearchpy.exceptions import RequestError
 from opensearchpy.helpers.index import Index
 from opensearchpy.helpers.query import Q
 from opensearchpy.helpers.search import Search
@@ -52,10 +53,15 @@ class CommunityBookmarkAPI(BookmarkAPI):
         @wraps(func)
         def wrapped(self, *args, **kwargs):
             if not Index(prefix_index(self.bookmark_index), using=self.client).exists():
-                self.client.indices.create(
-                    index=prefix_index(self.bookmark_index),
-                    body=CommunityBookmarkAPI.MAPPINGS,
-                )
+                try:
+                    self.client.indices.create(
+                        index=prefix_index(self.bookmark_index),
+                        body=CommunityBookmarkAPI.MAPPINGS,
+                    )
+                except RequestError as e:
+                    # Another community worker may have just created it
+                    if e.error != "resource_already_exists_exception":
+                        raise
             return func(self, *args, **kwargs)
 
         return wrapped
@@ -0,0 +1,203 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Checkpoint API for the exhaustive subcount state of snapshot aggregators."""
+
+import base64
+import hashlib
+import json
+import zlib
+from functools import wraps
+from typing import Any
+
+import arrow
+from flask import current_app
+from invenio_search.utils import prefix_index
+from opensearchpy.exceptions import NotFoundError, RequestError
+from opensearchpy.helpers.index import Index
+
+
+class SnapshotCheckpointAPI:
+    """Store the exhaustive "top" subcount state of snapshot aggregators.
+
+    Snapshot aggregators select the top N items for "top" subcounts from an
+    exhaustive cache holding the cumulative totals of every item ever seen. This
+    cache can't be rebuilt from the previous snapshot, so without a checkpoint it
+    is rebuilt on every run by reading all of the community's delta documents.
+
+    Each checkpoint holds the cache as it stood after the snapshot for its date
+    was created, compressed into a single binary field. There is one checkpoint
+    per aggregation type and community, overwritten on each run. A hash of the
+    relevant subcount configuration is stored with it, so that a checkpoint built
+    with a different configuration is never used.
+    """
+
+    CHECKPOINT_VERSION = 1
+
+    MAPPINGS = {
+        "mappings": {
+            "dynamic": "strict",
+            "properties": {
+                "date": {"type": "date", "format": "date_optional_time"},
+                "aggregation_type": {"type": "keyword"},
+                "community_id": {"type": "keyword"},
+                "config_hash": {"type": "keyword"},
+                "timestamp": {"type": "date", "format": "date_optional_time"},
+                "state": {"type": "binary"},
+            },
+        }
+    }
+
+    def __init__(self, client, agg_type: str):
+        """Initialize the SnapshotCheckpointAPI.
+
+        Args:
+            client: The OpenSearch client.
+            agg_type (str): The aggregation type (aggregator name).
+        """
+        self.client = client
+        self.agg_type = agg_type
+        self.checkpoint_index = "stats-community-snapshot-checkpoints"
+
+    @staticmethod
+    def _ensure_index_exists(func):
+        """Decorator for ensuring the checkpoints index exists.
+
+        Returns:
+            function: The wrapped function that ensures index exists before execution.
+        """
+
+        @wraps(func)
+        def wrapped(self, *args, **kwargs):
+            if not Index(
+                prefix_index(self.checkpoint_index), using=self.client
+            ).exists():
+                try:
+                    self.client.indices.create(
+                        index=prefix_index(self.checkpoint_index),
+                        body=SnapshotCheckpointAPI.MAPPINGS,
+                    )
+                except RequestError as e:
+                    # Another community worker may have just created it
+                    if e.error != "resource_already_exists_exception":
+                        raise
+            return func(self, *args, **kwargs)
+
+        return wrapped
+
+    @classmethod
+    def make_config_hash(cls, subcount_configs: dict) -> str:
+        """Make a hash identifying the configuration a checkpoint was built with.
+
+        Args:
+            subcount_configs (dict): The configurations of the subcounts held in
+                the checkpoint.
+
+        Returns:
+            str: The configuration hash.
+        """
+        serialized = json.dumps(
+            {"version": cls.CHECKPOINT_VERSION, "subcounts": subcount_configs},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+    def _get_doc_id(self, community_id: str) -> str:
+        """Get the checkpoint document ID for a community.
+
+        Returns:
+            str: The document ID.
+        """
+        return f"{self.agg_type}_{community_id}"
+
+    @_ensure_index_exists
+    def set_checkpoint(
+        self,
+        community_id: str,
+        date: arrow.Arrow,
+        config_hash: str,
+        state: dict[str, Any],
+    ) -> None:
+        """Store the exhaustive cache state for a community and snapshot date.
+
+        Args:
+            community_id (str): The community ID.
+            date (arrow.Arrow): The date of the last snapshot the state includes.
+            config_hash (str): The hash of the subcount configuration.
+            state (dict[str, Any]): The exhaustive cache to store.
+        """
+        encoded_state = base64.b64encode(
+            zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+        ).decode("ascii")
+        self.client.index(
+            index=prefix_index(self.checkpoint_index),
+            id=self._get_doc_id(community_id),
+            body={
+                "date": date.floor("day").format("YYYY-MM-DDTHH:mm:ss"),
+                "aggregation_type": self.agg_type,
+                "community_id": community_id,
+                "config_hash": config_hash,
+                "timestamp": arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss"),
+                "state": encoded_state,
+            },
+        )
+
+    @_ensure_index_exists
+    def get_checkpoint(
+        self, community_id: str, config_hash: str
+    ) -> tuple[arrow.Arrow, dict[str, Any]] | None:
+        """Get the stored exhaustive cache state for a community.
+
+        Args:
+            community_id (str): The community ID.
+            config_hash (str): The hash of the current subcount configuration.
+
+        Returns:
+            tuple[arrow.Arrow, dict[str, Any]] | None: The date of the checkpoint
+                and the exhaustive cache, or None if there is no usable checkpoint.
+        """
+        try:
+            response = self.client.get(
+                index=prefix_index(self.checkpoint_index),
+                id=self._get_doc_id(community_id),
+            )
+        except NotFoundError:
+            return None
+
+        source = response.get("_source", {})
+        if source.get("config_hash") != config_hash:
+            current_app.logger.info(
+                f"Ignoring {self.agg_type} checkpoint for {community_id}: "
+                "subcount configuration has changed"
+            )
+            return None
+
+        try:
+            state = json.loads(zlib.decompress(base64.b64decode(source["state"])))
+            return arrow.get(source["date"]), state
+        except (KeyError, ValueError, zlib.error) as e:
+            current_app.logger.warning(
+                f"Ignoring unreadable {self.agg_type} checkpoint for "
+                f"{community_id}: {e}"
+            )
+            return None
+
+    @_ensure_index_exists
+    def clear_checkpoint(self, community_id: str) -> int:
+        """Clear the checkpoint for a community.
+
+        Returns:
+            int: Number of checkpoints deleted (0 or 1).
+        """
+        try:
+            result = self.client.delete(
+                index=prefix_index(self.checkpoint_index),
+                id=self._get_doc_id(community_id),
+            )
+            return 1 if result.get("result") == "deleted" else 0
+        except NotFoundError:
+            return 0
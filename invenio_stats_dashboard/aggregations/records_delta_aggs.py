@@ -13,11 +13,17 @@ from typing import Any, cast
 import arrow
 from flask import current_app
 from invenio_search.utils import prefix_index
+from opensearchpy.exceptions import ConnectionTimeout, TransportError
 from opensearchpy.helpers.query import Q
 from opensearchpy.helpers.search import Search
 
 from ..queries import CommunityRecordDeltaQuery
-from ..utils.utils import get_subcount_combine_subfields, get_subcount_field
+from ..resources.label_cache import SubcountLabelCache, label_cache_enabled
+from ..utils.utils import (
+    get_subcount_combine_subfields,
+    get_subcount_field,
+    get_subcount_label_includes,
+)
 from .base import CommunityAggregatorBase
 from .types import (
     RecordDeltaDocument,
@@ -49,12 +55,20 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
         self.subcount_configs = (
             subcount_configs or current_app.config["COMMUNITY_STATS_SUBCOUNTS"]
         )
+        self.label_cache = SubcountLabelCache(client=self.client)
         # Default to using record creation dates
         self.first_event_date_field = "record_created_date"
         self.event_date_field = "record_created_date"
         self.event_community_query_term = lambda community_id: Q(
             "term", community_id=community_id
         )
+        # Batched mode: fetch a window of daily deltas with a single query
+        self.batched = current_app.config.get(
+            "COMMUNITY_STATS_RECORDS_DELTA_BATCHED", False
+        )
+        self.batch_days = max(
+            1, current_app.config.get("COMMUNITY_STATS_RECORDS_DELTA_BATCH_DAYS", 366)
+        )
 
     def _check_usage_events_migrated(self) -> None:
         """Override abstract method - checking done in usage delta aggregator."""
@@ -381,7 +395,7 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
             removed_items = aggs_removed.get(subcount_name, {}).get("buckets", [])
 
         return self._process_single_field_results(
-            added_items, removed_items, config, field_index
+            added_items, removed_items, config, field_index, subcount_key=subcount_name
         )
 
     def _process_multi_field_subcount(
@@ -419,9 +433,13 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
         removed_items: list[dict],
         config: dict,
         field_index: int,
+        subcount_key: str | None = None,
     ) -> list[RecordDeltaSubcountItem]:
         """Process results for a single field.
 
+        Labels come from the buckets' "label" top_hits where the query
+        included them, and otherwise from the label cache.
+
         Returns:
             list[RecordDeltaSubcountItem]: List of processed subcount items.
         """
@@ -435,6 +453,35 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
         if not combined_keys:
             return subcount_list
 
+        field = get_subcount_field(config, "field", field_index)
+        label_field = get_subcount_field(config, "label_field", field_index)
+        path_strings: list[str] = []
+        if field:
+            path_strings.append(field)
+            if label_field:
+                path_strings.append(label_field)
+
+        cached_labels: dict[str, Any] = {}
+        if field and label_field and subcount_key and label_cache_enabled():
+            labeled_keys = {
+                b["key"] for b in [*added_items, *removed_items] if "label" in b
+            }
+            unlabeled = [k for k in combined_keys if k and k not in labeled_keys]
+            if unlabeled:
+                cached_labels = self.label_cache.resolve(
+                    subcount_key,
+                    label_field,
+                    unlabeled,
+                    fallback_index=prefix_index(self.record_index),
+                    fallback_field=field,
+                    label_includes=get_subcount_label_includes(config, field_index),
+                    extract_label=lambda bucket, key: (
+                        CommunityRecordsDeltaAggregatorBase._find_item_label(
+                            bucket, {}, path_strings, key
+                        )
+                    ),
+                )
+
         for key in combined_keys:
             # Skip None or empty keys
             if not key:
@@ -445,16 +492,10 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
             removed_filtered = list(filter(lambda x: x["key"] == key, removed_items))
             removed = removed_filtered[0] if removed_filtered else {}
 
-            path_strings: list[str] = []
-            field = get_subcount_field(config, "field", field_index)
-            label_field = get_subcount_field(config, "label_field", field_index)
-            if field:
-                path_strings.append(field)
-                if label_field:
-                    path_strings.append(label_field)
-
             label: str | dict[str, str] = (
-                CommunityRecordsDeltaAggregatorBase._find_item_label(
+                cached_labels[str(key)]
+                if str(key) in cached_labels
+                else CommunityRecordsDeltaAggregatorBase._find_item_label(
                     added, removed, path_strings, key
                 )
             )
@@ -682,6 +723,13 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
             record_index=self.record_index,
         )
 
+        add_idx = "stats-community-records-delta-added"
+        publish_idx = "stats-community-records-delta-published"
+        query_kwargs = {
+            "use_included_dates": (self.aggregation_index == add_idx),
+            "use_published_dates": (self.aggregation_index == publish_idx),
+        }
+
         total_days_processed = 0
         for year in range(start_date.year, end_date.year + 1):
             year_start_date = max(arrow.get(f"{year}-01-01"), start_date.floor("day"))
@@ -690,6 +738,30 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
 
             index_name = prefix_index(f"{self.aggregation_index}-{year}")
 
+            daily_aggs_added: dict[str, dict] = {}
+            daily_aggs_removed: dict[str, dict] = {}
+            batch_seconds_per_day = 0.0
+            if self.batched and not should_skip:
+                batch_start_time = time.time()
+                daily_aggs_added = self._fetch_daily_aggregations(
+                    query_builder,
+                    community_id,
+                    year_start_date,
+                    year_end_date,
+                    **query_kwargs,
+                )
+                daily_aggs_removed = self._fetch_daily_aggregations(
+                    query_builder,
+                    community_id,
+                    year_start_date,
+                    year_end_date,
+                    find_deleted=True,
+                )
+                # Spread the batch query time over the days it produced
+                batch_seconds_per_day = (time.time() - batch_start_time) / max(
+                    (year_end_date - year_start_date).days + 1, 1
+                )
+
             days_in_year = 0
             for day in arrow.Arrow.range("day", year_start_date, year_end_date):
                 day_iteration_start_time = time.time()
@@ -701,17 +773,22 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
                     source_content = self._create_zero_document(
                         community_id, day_start_date
                     )
+                elif self.batched:
+                    day_key = day_start_date.format("YYYY-MM-DD")
+                    source_content = self.create_agg_dict(
+                        community_id,
+                        day_start_date,
+                        daily_aggs_added.get(day_key, {}),
+                        daily_aggs_removed.get(day_key, {}),
+                    )
                 else:
                     day_end_date = day.ceil("day")
 
-                    add_idx = "stats-community-records-delta-added"
-                    publish_idx = "stats-community-records-delta-published"
                     day_search_added = query_builder.build_query(
                         day_start_date.format("YYYY-MM-DDTHH:mm:ss"),
                         day_end_date.format("YYYY-MM-DDTHH:mm:ss"),
                         community_id=community_id,
-                        use_included_dates=(self.aggregation_index == add_idx),
-                        use_published_dates=(self.aggregation_index == publish_idx),
+                        **query_kwargs,
                     )
                     day_results_added = day_search_added.execute()
                     aggs_added = day_results_added.aggregations.to_dict()
@@ -739,11 +816,121 @@ class CommunityRecordsDeltaAggregatorBase(CommunityAggregatorBase):
                 # Log timing for this day iteration
                 day_iteration_end_time = time.time()
                 day_iteration_duration = (
-                    day_iteration_end_time - day_iteration_start_time
+                    day_iteration_end_time
+                    - day_iteration_start_time
+                    + batch_seconds_per_day
                 )
 
                 yield (document, day_iteration_duration)
 
+    def _fetch_daily_aggregations(
+        self,
+        query_builder: CommunityRecordDeltaQuery,
+        community_id: str,
+        start_date: arrow.Arrow,
+        end_date: arrow.Arrow,
+        find_deleted: bool = False,
+        use_included_dates: bool = False,
+        use_published_dates: bool = False,
+    ) -> dict[str, dict]:
+        """Fetch the daily delta aggregations for a period in batched queries.
+
+        The period is split into windows of at most `self.batch_days` days, each
+        of which is fetched with a single `build_daily_query` search. If a
+        window's search fails (e.g. because it exceeds the cluster's
+        `search.max_buckets` limit or times out) the window is halved and
+        retried, down to single days.
+
+        Args:
+            query_builder: The query builder to use.
+            community_id: The community ID (or "global").
+            start_date: The first day of the period.
+            end_date: The last day of the period.
+            find_deleted: Whether to find deleted records.
+            use_included_dates: Whether to use community addition dates.
+            use_published_dates: Whether to use metadata publication dates.
+
+        Returns:
+            dict[str, dict]: A mapping of "YYYY-MM-DD" day strings to the
+                aggregations for that day. Days without records are omitted.
+        """
+        daily_aggs: dict[str, dict] = {}
+        window_start = start_date.floor("day")
+        last_day = end_date.floor("day")
+        while window_start <= last_day:
+            window_end = min(window_start.shift(days=self.batch_days - 1), last_day)
+            daily_aggs.update(
+                self._fetch_daily_aggregations_window(
+                    query_builder,
+                    community_id,
+                    window_start,
+                    window_end,
+                    find_deleted=find_deleted,
+                    use_included_dates=use_included_dates,
+                    use_published_dates=use_published_dates,
+                )
+            )
+            window_start = window_end.shift(days=1)
+        return daily_aggs
+
+    def _fetch_daily_aggregations_window(
+        self,
+        query_builder: CommunityRecordDeltaQuery,
+        community_id: str,
+        window_start: arrow.Arrow,
+        window_end: arrow.Arrow,
+        **query_kwargs: bool,
+    ) -> dict[str, dict]:
+        """Fetch the daily delta aggregations for one window of days.
+
+        Args:
+            query_builder: The query builder to use.
+            community_id: The community ID (or "global").
+            window_start: The first day of the window.
+            window_end: The last day of the window.
+            **query_kwargs: Date basis flags passed on to `build_daily_query`.
+
+        Returns:
+            dict[str, dict]: A mapping of "YYYY-MM-DD" day strings to the
+                aggregations for that day.
+
+        Raises:
+            TransportError: If the search fails even for a single day.
+            ConnectionTimeout: If the search times out even for a single day.
+        """
+        try:
+            search = query_builder.build_daily_query(
+                window_start.floor("day").format("YYYY-MM-DDTHH:mm:ss"),
+                window_end.ceil("day").format("YYYY-MM-DDTHH:mm:ss"),
+                community_id=community_id,
+                **query_kwargs,
+            )
+            if search is None:
+                return {}
+            results = search.extra(timeout=f"{self.query_timeout_seconds}s").execute()
+            return query_builder.get_daily_aggregations(results.aggregations.to_dict())
+        except (TransportError, ConnectionTimeout) as e:
+            window_days = (window_end - window_start).days + 1
+            if window_days <= 1:
+                raise
+            half = window_start.shift(days=window_days // 2 - 1)
+            current_app.logger.warning(
+                f"Batched delta query for {community_id} failed for "
+                f"{window_days} days ({e}), splitting the window and retrying"
+            )
+            return {
+                **self._fetch_daily_aggregations_window(
+                    query_builder, community_id, window_start, half, **query_kwargs
+                ),
+                **self._fetch_daily_aggregations_window(
+                    query_builder,
+                    community_id,
+                    half.shift(days=1),
+                    window_end,
+                    **query_kwargs,
+                ),
+            }
+
 
 class CommunityRecordsDeltaCreatedAggregator(CommunityRecordsDeltaAggregatorBase):
     """Aggregator for community record deltas.
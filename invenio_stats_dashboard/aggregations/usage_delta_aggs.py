@@ -6,8 +6,11 @@
 
 """Community usage delta aggregators for tracking daily usage statistics."""
 
+import threading
 import time
+from collections import OrderedDict
 from collections.abc import Generator
+from functools import partial
 from itertools import chain
 from typing import Any
 
@@ -15,11 +18,13 @@ import arrow
 from flask import current_app
 from invenio_search.utils import prefix_index
 from opensearchpy import AttrDict, AttrList
+from opensearchpy.exceptions import ConnectionTimeout, TransportError
 from opensearchpy.helpers.query import Q
 from opensearchpy.helpers.search import Search
 
 from ..exceptions import UsageEventsNotMigratedError
 from ..queries import CommunityUsageDeltaQuery
+from ..resources.label_cache import SubcountLabelCache, label_cache_enabled
 from ..utils.utils import (
     get_subcount_combine_subfields,
     get_subcount_field,
@@ -32,6 +37,25 @@ from .types import (
 )
 
 
+class FanInCommunityResults:
+    """One community's bucket from a fan-in usage query, shaped like a response.
+
+    `create_agg_dict` reads `aggregations` and `hits.total.value` from the
+    response of a single-community query. The "by_community" bucket of a fan-in
+    query holds the same aggregations, so this thin wrapper lets the bucket be
+    passed in unchanged.
+    """
+
+    def __init__(self, bucket: AttrDict):
+        """Initialize the wrapper.
+
+        Args:
+            bucket (AttrDict): The community bucket from the fan-in response.
+        """
+        self.aggregations = bucket
+        self.hits = AttrDict({"total": {"value": bucket.doc_count}})
+
+
 class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
     """Community usage delta aggregator for tracking daily usage statistics.
 
@@ -64,6 +88,37 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
         self.event_date_field = "timestamp"
         self.event_community_query_term = lambda community_id: Q("match_all")
         self.query_builder = CommunityUsageDeltaQuery(client=self.client)
+        self.label_cache = SubcountLabelCache(client=self.client)
+        self.fan_in = current_app.config.get(
+            "COMMUNITY_STATS_USAGE_DELTA_FAN_IN", False
+        )
+        self.fan_in_max_days = max(
+            1, current_app.config.get("COMMUNITY_STATS_USAGE_DELTA_FAN_IN_MAX_DAYS", 7)
+        )
+        self.fan_in_batch_size = max(
+            1,
+            current_app.config.get(
+                "COMMUNITY_STATS_USAGE_DELTA_FAN_IN_BATCH_SIZE", 500
+            ),
+        )
+        # day -> event type -> community id -> results, shared by all
+        # communities processed in one run (including parallel workers)
+        self._fan_in_cache: OrderedDict[str, dict[str, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._fan_in_lock = threading.Lock()
+
+    def run(self, *args, **kwargs):
+        """Run the aggregation, discarding fan-in results afterwards.
+
+        Returns:
+            list: The results of the parent class run.
+        """
+        self._fan_in_cache.clear()
+        try:
+            return super().run(*args, **kwargs)
+        finally:
+            self._fan_in_cache.clear()
 
     def _check_usage_events_migrated(self) -> None:
         """Check if usage events have been migrated to include community_ids.
@@ -595,9 +650,15 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
         usage_config: dict,
         subcount_name: str,
         index: int = 0,
+        subcount_key: str | None = None,
     ) -> list[UsageSubcountItem]:
         """Assemble subcount items from view and download results.
 
+        The view and download buckets are joined on their keys in a single
+        pass over each list, so assembly stays linear in the number of
+        buckets. Labels come from the buckets' "label" top_hits where the
+        query included them, and otherwise from the label cache.
+
         Returns:
             list[UsageSubcountItem]: List of assembled subcount items.
         """
@@ -613,30 +674,47 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
             download_agg = getattr(download_results.aggregations, subcount_name)
             download_buckets = download_agg.buckets
 
-        all_keys = set()
-        for view_bucket in view_buckets:
-            all_keys.add(view_bucket.key)
-        for download_bucket in download_buckets:
-            all_keys.add(download_bucket.key)
-
-        for key in all_keys:
-            view_bucket = None
-            for bucket in view_buckets:
-                if bucket.key == key:
-                    view_bucket = bucket
-                    break
-
-            download_bucket = None
-            for bucket in download_buckets:
-                if bucket.key == key:
-                    download_bucket = bucket
-                    break
+        # key -> [view bucket, download bucket]
+        joined_buckets: dict[Any, list[AttrDict | None]] = {}
+        for bucket in view_buckets:
+            joined_buckets.setdefault(bucket.key, [None, None])[0] = bucket
+        for bucket in download_buckets:
+            joined_buckets.setdefault(bucket.key, [None, None])[1] = bucket
+
+        label_field = get_subcount_field(usage_config, "label_field", index)
+
+        cached_labels: dict[str, Any] = {}
+        if label_field and label_cache_enabled():
+            unlabeled = [
+                key
+                for key, buckets in joined_buckets.items()
+                if not any(
+                    bucket and hasattr(bucket, "label") for bucket in buckets
+                )
+            ]
+            if unlabeled:
+                field = get_subcount_field(usage_config, "field", index)
+                cached_labels = self.label_cache.resolve(
+                    subcount_key or subcount_name,
+                    label_field,
+                    unlabeled,
+                    fallback_index=",".join(
+                        prefix_index(event_index) for _, event_index in self.event_index
+                    ),
+                    fallback_field=field or label_field,
+                    label_includes=get_subcount_label_includes(usage_config, index),
+                    extract_label=partial(
+                        self._extract_label_from_label_bucket, label_field=label_field
+                    ),
+                )
 
+        for key, (view_bucket, download_bucket) in joined_buckets.items():
             # Initialize label as string; will be converted to object if needed
             label: str | dict[str, str] = str(key)
-            label_field = get_subcount_field(usage_config, "label_field", index)
 
-            if label_field:
+            if str(key) in cached_labels:
+                label = cached_labels[str(key)]
+            elif label_field:
                 for bucket in [view_bucket, download_bucket]:
                     if (
                         bucket
@@ -716,32 +794,38 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
     def _merge_field_results(
         self, item_sets: list[list[dict[str, Any]]]
     ) -> list[dict[str, Any]]:
-        """Merge results from multiple fields.
+        """Merge results from multiple fields by id.
+
+        Items with the same id are combined in a single pass, keyed by id:
+        their view and download metrics are summed, and the first non-empty
+        label is kept.
 
         Returns:
             list[dict[str, Any]]: Merged list of results from all fields.
         """
-        all_result_items = [item for item_set in item_sets for item in item_set]
-
-        if not all_result_items:
-            return []
-
-        merged_results: dict[str, Any] = {}
-        for item in all_result_items:
-            for key, value in item.items():
-                if key not in merged_results:
-                    merged_results[key] = value
-                elif isinstance(value, dict):
-                    if isinstance(merged_results[key], dict) and not merged_results[
-                        key
-                    ].get("label"):
-                        merged_results[key]["label"] = value.get("label")
-                    merged_results[key] = self._merge_field_results([
-                        [merged_results[key]],
-                        [value],
-                    ])
-                elif isinstance(value, int | float):
-                    merged_results[key] += value
+        merged_results: dict[str, dict[str, Any]] = {}
+        for item_set in item_sets:
+            for item in item_set:
+                item_id = item.get("id")
+                merged = merged_results.get(item_id)  # type: ignore[arg-type]
+                if merged is None:
+                    merged_results[item_id] = {  # type: ignore[index]
+                        key: dict(value) if isinstance(value, dict) else value
+                        for key, value in item.items()
+                    }
+                    continue
+                if not merged.get("label"):
+                    merged["label"] = item.get("label")
+                for metric_type in ("view", "download"):
+                    metrics = item.get(metric_type)
+                    if not metrics:
+                        continue
+                    merged_metrics = merged.setdefault(metric_type, {})
+                    for metric, value in metrics.items():
+                        if isinstance(value, int | float):
+                            merged_metrics[metric] = (
+                                merged_metrics.get(metric, 0) + value
+                            )
 
         return list(merged_results.values())
 
@@ -805,6 +889,7 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
                             usage_config,
                             subcount_name,
                             index,
+                            subcount_key=subcount_key,
                         )
                     )
             if len(item_sets) > 1:
@@ -831,10 +916,17 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
                 - [0]: A dictionary representing an aggregation document for indexing
                 - [1]: The time taken to generate this document (in seconds)
         """
+        use_fan_in = self._use_fan_in(start_date, end_date)
+
         # Check if we should skip aggregation due to no events after start_date
-        should_skip = self._should_skip_aggregation(
-            start_date, last_event_date, community_id, end_date=end_date
-        )
+        if use_fan_in:
+            should_skip = self._should_skip_fan_in(
+                start_date, end_date, last_event_date, community_id
+            )
+        else:
+            should_skip = self._should_skip_aggregation(
+                start_date, last_event_date, community_id, end_date=end_date
+            )
         if should_skip:
             current_app.logger.info(
                 f"Skipping usage delta aggregation for {community_id} - "
@@ -858,6 +950,13 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
                 source_content = self._create_zero_document(
                     community_id, current_iteration_date
                 )
+            elif use_fan_in:
+                view_results, download_results = self._get_fan_in_results(
+                    community_id, current_iteration_date
+                )
+                source_content = self.create_agg_dict(
+                    view_results, download_results, community_id, current_iteration_date
+                )
             else:
                 # Execute separate queries for each event type
                 view_index = None
@@ -910,6 +1009,198 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
 
             current_iteration_date = current_iteration_date.shift(days=1)
 
+    def _use_fan_in(self, start_date: arrow.Arrow, end_date: arrow.Arrow) -> bool:
+        """Check whether the fan-in query should serve this date range.
+
+        Fan-in results are held in memory for every community until the run
+        ends, so long catch-up ranges use the per-community queries instead.
+
+        Args:
+            start_date: The start date for aggregation.
+            end_date: The end date for aggregation.
+
+        Returns:
+            True if the fan-in query should be used, False otherwise.
+        """
+        if not self.fan_in:
+            return False
+        start_day = arrow.get(start_date).floor("day")
+        end_day = arrow.get(end_date).floor("day")
+        return (end_day - start_day).days < self.fan_in_max_days
+
+    def _iter_days(
+        self, start_date: arrow.Arrow, end_date: arrow.Arrow
+    ) -> Generator[arrow.Arrow, None, None]:
+        """Yield each day in the range, stepping the same way as `agg_iter`.
+
+        Yields:
+            arrow.Arrow: The date for each day in the range.
+        """
+        current_date = arrow.get(start_date)
+        end_date = arrow.get(end_date)
+        while current_date <= end_date:
+            yield current_date
+            current_date = current_date.shift(days=1)
+
+    def _should_skip_fan_in(
+        self,
+        start_date: arrow.Arrow,
+        end_date: arrow.Arrow,
+        last_event_date: arrow.Arrow | None,
+        community_id: str,
+    ) -> bool:
+        """Check whether to skip aggregation using the fan-in results.
+
+        This is the fan-in counterpart of `_should_skip_aggregation`. Instead of
+        running count queries for the community, it checks whether the community
+        has a bucket in the fan-in results for any day of the range.
+
+        Args:
+            start_date: The start date for aggregation.
+            end_date: The end date for aggregation.
+            last_event_date: The last event date, or None if no events exist.
+            community_id: The community ID to check.
+
+        Returns:
+            True if aggregation should be skipped, False otherwise.
+        """
+        if last_event_date is None or last_event_date < start_date:
+            return True
+        for day in self._iter_days(start_date, end_date):
+            if any(self._get_fan_in_results(community_id, day)):
+                return False
+        return True
+
+    def _get_fan_in_results(
+        self, community_id: str, day: arrow.Arrow
+    ) -> tuple[Any, Any]:
+        """Get the view and download results for one community and day.
+
+        The fan-in queries for the day are run on first use and cover every
+        community in the current run. Parallel workers wait for a day that is
+        already being fetched rather than fetching it again.
+
+        Args:
+            community_id: The community ID (or "global").
+            day: The day to get results for.
+
+        Returns:
+            tuple[Any, Any]: The view and download results. Either is None
+                if the community had no events of that type on the day.
+        """
+        day_key = day.format("YYYY-MM-DD")
+        with self._fan_in_lock:
+            if day_key in self._fan_in_cache:
+                self._fan_in_cache.move_to_end(day_key)
+            else:
+                run_community_ids = getattr(self, "communities_to_aggregate", None)
+                if not run_community_ids:
+                    run_community_ids = [community_id]
+                community_ids = [c for c in run_community_ids if c != "global"]
+                self._fan_in_cache[day_key] = {
+                    event_type: self._fetch_fan_in_results(
+                        event_type,
+                        community_ids,
+                        day,
+                        include_global="global" in run_community_ids,
+                    )
+                    for event_type, _index in self.event_index
+                }
+                while len(self._fan_in_cache) > self.fan_in_max_days:
+                    self._fan_in_cache.popitem(last=False)
+
+            day_results = self._fan_in_cache[day_key]
+        return (
+            day_results.get("view", {}).get(community_id),
+            day_results.get("download", {}).get(community_id),
+        )
+
+    def _fetch_fan_in_results(
+        self,
+        event_type: str,
+        community_ids: list[str],
+        day: arrow.Arrow,
+        include_global: bool = True,
+    ) -> dict[str, Any]:
+        """Run the fan-in queries for one event type and day.
+
+        Communities are queried in batches of `fan_in_batch_size`. If a batch
+        fails (e.g. by exceeding the search.max_buckets limit), it is halved and
+        retried. Only the first search includes the top-level aggregations for
+        the global results.
+
+        Args:
+            event_type: The type of event (view or download).
+            community_ids: The community IDs to split the results by.
+            day: The day to query.
+            include_global: Whether the global results are needed.
+
+        Returns:
+            dict[str, Any]: Results keyed by community ID, with the unsplit
+                response under "global" if it was requested. Communities
+                without events are absent.
+        """
+        results: dict[str, Any] = {}
+        batches = [
+            community_ids[i : i + self.fan_in_batch_size]
+            for i in range(0, len(community_ids), self.fan_in_batch_size)
+        ] or [[]]
+        for batch in batches:
+            self._fetch_fan_in_batch(
+                event_type, batch, day, results, include_global=include_global
+            )
+        return results
+
+    def _fetch_fan_in_batch(
+        self,
+        event_type: str,
+        community_ids: list[str],
+        day: arrow.Arrow,
+        results: dict[str, Any],
+        include_global: bool = True,
+    ) -> None:
+        """Run one fan-in query and add its split results to `results`.
+
+        The global results are only requested while `results` doesn't hold
+        them yet.
+
+        Raises:
+            TransportError: If the query fails for a single community.
+            ConnectionTimeout: If the query times out for a single community.
+        """
+        include_global = include_global and "global" not in results
+        if not community_ids and not include_global:
+            return
+        if event_type == "view":
+            search = self.query_builder.build_fan_in_view_query(
+                community_ids, day, day, include_global=include_global
+            )
+        else:
+            search = self.query_builder.build_fan_in_download_query(
+                community_ids, day, day, include_global=include_global
+            )
+        try:
+            response = search.execute()
+        except (TransportError, ConnectionTimeout) as e:
+            if len(community_ids) <= 1:
+                raise
+            middle = len(community_ids) // 2
+            current_app.logger.warning(
+                f"Fan-in {event_type} query for {len(community_ids)} communities "
+                f"failed ({e}), splitting into batches of {middle}"
+            )
+            for half in (community_ids[:middle], community_ids[middle:]):
+                self._fetch_fan_in_batch(
+                    event_type, half, day, results, include_global=include_global
+                )
+            return
+
+        if include_global and response:
+            results["global"] = response
+        if hasattr(response.aggregations, "by_community"):
+            for bucket in response.aggregations.by_community.buckets:
+                results[bucket.key] = FanInCommunityResults(bucket)
+
     def _combine_split_aggregations(
         self, view_results, download_results, config, subcount_name, field_index=0
     ):
@@ -1171,6 +1462,8 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
             return None
 
         matching_items = []
+        match_by_name = match_path == name_field_path
+        bucket_key_lower = bucket_key.lower() if match_by_name else bucket_key
 
         for item in field_data:
             field_value = None
@@ -1179,8 +1472,8 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
                     item, match_path, None
                 )
                 if field_value:
-                    if match_path == name_field_path:
-                        matches = field_value.lower() == bucket_key.lower()
+                    if match_by_name:
+                        matches = field_value.lower() == bucket_key_lower
                     else:
                         matches = field_value == bucket_key
 
@@ -1347,6 +1640,32 @@ class CommunityUsageDeltaAggregator(CommunityAggregatorBase):
             bucket_key, title_field
         )
 
+    @staticmethod
+    def _extract_label_from_label_bucket(
+        bucket: dict, key: str, label_field: str
+    ) -> str | dict[str, str] | None:
+        """Extract the label from a terms bucket with a "label" top_hits.
+
+        Used by the label cache for ids it has to look up from a sample
+        document.
+
+        Returns:
+            str | dict[str, str] | None: The label, or None if the sample
+                document doesn't have one for the key.
+        """
+        hits = bucket.get("label", {}).get("hits", {}).get("hits", [])
+        source = hits[0].get("_source") if hits else None
+        if not source:
+            return None
+        label = CommunityUsageDeltaAggregator._extract_label_from_source(
+            source, label_field, key
+        )
+        if label == CommunityUsageDeltaAggregator._create_fallback_label(
+            key, label_field
+        ):
+            return None
+        return label
+
     @staticmethod
     def _create_fallback_label(
         bucket_key: str, title_field: str
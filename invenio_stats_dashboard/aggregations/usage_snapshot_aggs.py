@@ -7,7 +7,6 @@
 """Community usage snapshot aggregators for tracking cumulative usage statistics."""
 
 import copy
-import gc
 import heapq
 import numbers
 import time
@@ -25,6 +24,7 @@ from opensearchpy.helpers.search import Search
 from ..queries import (
     CommunityUsageSnapshotQuery,
 )
+from ..utils.memory import memory_governor
 from .base import CommunitySnapshotAggregatorBase
 from .types import (
     UsageCategories,
@@ -532,6 +532,23 @@ class UsageSnapshotMemoryEstimator:
         )
         return new_page_size
 
+    @staticmethod
+    def under_pressure(mem_estimate: dict, rss_bytes: int, budget_bytes: int) -> bool:
+        """Check whether the predicted peak memory would exceed the budget.
+
+        Args:
+            mem_estimate: Output dict from `estimate()`.
+            rss_bytes: Current process RSS in bytes.
+            budget_bytes: Effective memory budget in bytes.
+
+        Returns:
+            bool: True if the current RSS plus the predicted peak is over budget.
+        """
+        if budget_bytes <= 0:
+            return False
+        predicted_peak = int(mem_estimate.get("predicted_peak_bytes", 0))
+        return rss_bytes + predicted_peak > budget_bytes
+
 
 class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
     """Aggregator for creating cumulative usage snapshots from daily delta documents."""
@@ -552,6 +569,7 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
         self.first_event_index = "stats-community-usage-delta"
         self.aggregation_index = "stats-community-usage-snapshot"
         self.event_date_field = "period_start"
+        self.subcount_config_section = "usage_events"
         self.query_builder = CommunityUsageSnapshotQuery(client=self.client)
 
         # Planned sizing defaults (used for preflight estimation and loop)
@@ -583,11 +601,7 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
         self.query_timeout_seconds = int(
             cfg.get("COMMUNITY_STATS_BULK_INDEX_TIMEOUT", 300)
         )
-        # Cache process handle and total memory once
-        try:
-            self.proc = psutil.Process()
-        except Exception:
-            self.proc = None  # type: ignore[assignment]
+        # Cache total memory once
         try:
             self.total_mem = psutil.virtual_memory().total
         except Exception:
@@ -1046,12 +1060,19 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
         )
 
         try:
-            # Build top-cache from historical deltas BEFORE current period
+            # Build top-cache from historical deltas BEFORE current period,
+            # resuming from a checkpoint if possible so that only the deltas
+            # after the checkpoint need to be scanned
             top_cache: dict[str, Any] = {}
+            scan_start_date = first_event_date
+            checkpoint = self._load_checkpoint(community_id, current_iteration_date)
+            if checkpoint:
+                checkpoint_date, top_cache = checkpoint
+                scan_start_date = checkpoint_date.shift(days=1).floor("day")
             self._build_exhaustive_cache_from_scan(
                 top_cache,
                 community_id,
-                first_event_date,
+                scan_start_date,
                 current_iteration_date,
                 page_size=adjusted_scan_page_size,
             )
@@ -1084,6 +1105,8 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
         )
 
         iteration_count = 0
+        last_completed_date = None
+        had_errors = False
         while current_iteration_date <= end_date:
             iteration_start_time = time.time()
             iteration_count += 1
@@ -1134,6 +1157,7 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
                 yield (document, iteration_duration)
 
                 previous_snapshot_date = current_iteration_date
+                last_completed_date = current_iteration_date
                 current_iteration_date = current_iteration_date.shift(days=1)
 
             except Exception as e:
@@ -1141,9 +1165,17 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
                     "Error processing date "
                     f"{current_iteration_date.format('YYYY-MM-DD')}: {e}"
                 )
+                had_errors = True
                 current_iteration_date = current_iteration_date.shift(days=1)
                 continue
 
+        # A failed day may have left the cache partly updated, so only
+        # checkpoint runs that completed cleanly
+        if last_completed_date is not None and not had_errors:
+            for subcount_key in self._get_top_subcount_keys():
+                top_cache.setdefault(subcount_key, {})
+            self._save_checkpoint(community_id, last_completed_date, top_cache)
+
     def _init_working_state_from_snapshot(
         self, previous_snapshot: UsageSnapshotDocument
     ) -> tuple[UsageCategories, dict[str, dict[str, dict]]]:
@@ -1329,10 +1361,7 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
         # Cache for adaptive runtime checks during historical scan
         self._last_mem_estimate = mem_estimate
 
-        try:
-            rss = self.proc.memory_info().rss if self.proc else 0  # type: ignore[union-attr]
-        except Exception:
-            rss = 0
+        rss = memory_governor.get_rss()
         budget = self.mem_budget_effective
 
         return UsageSnapshotMemoryEstimator.adjust_scan_page_size(
@@ -1412,20 +1441,13 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
             except Exception:
                 search_after_date = None
 
-            # Clear large response objects before memory check to allow GC
+            # Clear large response objects before the memory check
             del hits
             del resp
-            # Collect after every page to ensure timely release
-            gc.collect()
 
-            # Memory guard – shrink page size when necessary
-            try:
-                rss = self.proc.memory_info().rss if self.proc else 0  # type: ignore[union-attr]
-            except Exception as e:
-                rss = 0
-                current_app.logger.error(
-                    f"Error getting RSS memory usage during delta scan: {e}"
-                )
+            # Memory guard – collect only under pressure, then shrink page size
+            # when necessary
+            rss = self._relieve_memory_pressure("usage_snapshot_delta_scan")
             budget = self.mem_budget_effective
             mem_estimate = getattr(self, "_last_mem_estimate", None) or {
                 "predicted_peak_bytes": 0,
@@ -1509,7 +1531,7 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
         finally:
             del hits
             del results
-            gc.collect()
+            self._relieve_memory_pressure("usage_snapshot_delta_pages")
 
     def _get_delta_from_buffer(
         self,
@@ -1639,7 +1661,26 @@ class CommunityUsageSnapshotAggregator(CommunitySnapshotAggregatorBase):
             )
             raise
         finally:
-            gc.collect()
+            self._relieve_memory_pressure("usage_snapshot_exhaustive_cache")
+
+    def _relieve_memory_pressure(self, site: str) -> int:
+        """Collect garbage if the last memory estimate is close to the budget.
+
+        Args:
+            site: Name of the calling loop, used to group the governor's metrics.
+
+        Returns:
+            int: The RSS in bytes after any collection.
+        """
+        mem_estimate = getattr(self, "_last_mem_estimate", None) or {
+            "predicted_peak_bytes": 0
+        }
+        return memory_governor.relieve(
+            site,
+            lambda rss_bytes: UsageSnapshotMemoryEstimator.under_pressure(
+                mem_estimate, rss_bytes, self.mem_budget_effective
+            ),
+        )
 
     def _update_exhaustive_cache_all_subcounts(
         self, exhaustive_cache: dict, delta_doc: dict | AttrDict
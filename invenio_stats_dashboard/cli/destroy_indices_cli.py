@@ -107,6 +107,7 @@ STATS_DASHBOARD_INDICES = [
     "*events-stats-file-download-*-v2.0.0",
     "*stats-bookmarks-community*",
     "*stats-bookmarks-reindexing*",
+    "*stats-community-snapshot-checkpoints*",
 ]
 
 
@@ -507,6 +507,14 @@ def _report_migration_results(results):
     for event_type_name, event_results in results["event_types"].items():
         click.echo(f"  {event_type_name} events: {event_results['processed']:,}")
     click.echo(f"  Total errors: {results['total_errors']:,}")
+    if results.get("lookup_cache"):
+        lookup_cache = results["lookup_cache"]
+        click.echo(
+            f"  Record lookup cache: {lookup_cache['hits']:,} hits, "
+            f"{lookup_cache['misses']:,} misses "
+            f"({lookup_cache['hit_rate_percent']}% hit rate), "
+            f"{lookup_cache['evictions']:,} evictions"
+        )
     click.echo(f"\n  Completed: {completed_count:,} monthly indices")
     click.echo(f"  Interrupted: {interrupted_count:,} monthly indices")
     click.echo(f"  Failed: {failed_count:,} monthly indices")
@@ -113,6 +113,135 @@ COMMUNITY_STATS_AGGREGATIONS = register_aggregations()
 
 COMMUNITY_STATS_CATCHUP_INTERVAL = 365
 
+COMMUNITY_STATS_RECORDS_DELTA_BATCHED = False
+"""Use batched queries in the record delta aggregators.
+
+When True, the record delta aggregators fetch a whole window of daily deltas
+with one search per window (a daily bucket aggregation with the usual subcount
+sub-aggregations nested under it) instead of two searches per day. The
+documents produced are the same as in the default per-day mode.
+"""
+COMMUNITY_STATS_RECORDS_DELTA_BATCH_DAYS = 366
+"""Maximum number of days fetched by one batched record delta search.
+
+Windows never cross a calendar year boundary. If a window's search fails (for
+example by exceeding the cluster's `search.max_buckets` limit) it is split in
+half and retried automatically.
+"""
+
+COMMUNITY_STATS_RECORDS_DELTA_ID_PAGE_SIZE = 10000
+"""Number of record IDs read per request when resolving record delta IDs.
+
+Record delta aggregators find the records relevant for a community and period in
+the community events index. The IDs are read in pages of this size, so that no
+records are dropped however many are relevant.
+"""
+
+COMMUNITY_STATS_RECORDS_DELTA_FILTER_STRATEGY = "events"
+"""How community record delta queries select records in the records index.
+
+With "events" (the default) the relevant record IDs are looked up in the
+community events index and matched by ID. With "community", queries for records
+created in the period match the records by their parent community instead, so
+the query doesn't grow with the number of new records. Records removed from the
+community since the start of the period are matched by ID as well. Deletion
+queries and queries based on the community addition date or the publication
+date always use "events".
+"""
+
+COMMUNITY_STATS_AGGREGATION_WORKERS = 1
+"""Number of communities each aggregator processes concurrently.
+
+Aggregation time is dominated by search latency rather than CPU, so running
+several communities at once in worker threads can shorten a run considerably.
+Each community keeps its own bookmark and registry keys, and the results are
+reported in the same order as in a serial run. With the default of 1,
+communities are processed one after another.
+"""
+
+COMMUNITY_STATS_AGGREGATION_DAG = False
+"""Run the aggregators of each aggregation task concurrently.
+
+By default the aggregators run one after another in the configured order. When
+this is enabled, independent aggregators (e.g. the record and usage aggregators)
+run at the same time, and each snapshot aggregator aggregates a community as soon
+as its delta aggregator has finished that community. The dependencies are worked
+out from the configured aggregators' indices. The task still produces a single
+report.
+"""
+
+COMMUNITY_STATS_SNAPSHOT_CHECKPOINTS = True
+"""Resume the snapshot aggregators' "top" subcount state from checkpoints.
+
+The "top" subcounts of a snapshot are selected from the cumulative totals of
+every item ever seen, which can't be recovered from the previous snapshot. When
+True, the snapshot aggregators store these totals as a compressed checkpoint in
+the `stats-community-snapshot-checkpoints` index after each run, and the next
+run folds only the newer delta documents into it. Without a usable checkpoint
+(missing, newer than the dates being aggregated, or built with a different
+subcount configuration) they are rebuilt from all of the community's deltas.
+"""
+
+COMMUNITY_STATS_USAGE_DELTA_FAN_IN = False
+"""Use cross-community fan-in queries in the usage delta aggregator.
+
+When True, the usage delta aggregator sends one search per event type and day
+for all communities in the run. A terms aggregation on the events'
+`community_ids` field splits the results into one bucket per community, with
+the usual metric and subcount aggregations nested under it. Without fan-in,
+each community needs its own two searches per day.
+"""
+
+COMMUNITY_STATS_USAGE_DELTA_FAN_IN_MAX_DAYS = 7
+"""Longest date range (in days) served by the fan-in usage delta queries.
+
+Fan-in results are kept in memory for all communities until the run ends.
+Communities with a longer range to catch up on use the per-community queries.
+"""
+
+COMMUNITY_STATS_USAGE_DELTA_FAN_IN_BATCH_SIZE = 500
+"""Maximum number of communities split out by one fan-in usage delta search.
+
+If a search fails (for example by exceeding the cluster's `search.max_buckets`
+limit) its batch of communities is split in half and retried automatically.
+"""
+
+COMMUNITY_STATS_LABEL_CACHE_ENABLED = True
+"""Resolve subcount item labels through the label cache.
+
+When True, labeled subcount aggregations return plain terms buckets instead of
+nesting a top_hits "label" aggregation under every bucket. The aggregators then
+look the labels up by id in an in-process LRU, a shared Redis hash and the
+indices configured in COMMUNITY_STATS_LABEL_VOCABULARIES, and only fall back to
+a top_hits search for ids none of these know.
+"""
+
+COMMUNITY_STATS_LABEL_CACHE_SIZE = 50000  # labels kept in each process's LRU
+
+COMMUNITY_STATS_LABEL_CACHE_TTL = 604800  # seconds labels are kept in Redis
+
+COMMUNITY_STATS_LABEL_CACHE_MISS_TTL = 86400  # seconds ids without labels are kept
+
+COMMUNITY_STATS_LABEL_CACHE_PREFIX = "stats_labels"  # Redis key prefix
+
+COMMUNITY_STATS_LABEL_VOCABULARIES = {
+    "resource_types": {
+        "index": "vocabularies",
+        "type": "resourcetypes",
+        "label": "title",
+    },
+    "languages": {"index": "vocabularies", "type": "languages", "label": "title"},
+    "rights": {"index": "vocabularies", "type": "licenses", "label": "title"},
+    "subjects": {"index": "subjects", "label": "subject"},
+    "funders": {"index": "funders", "label": "name"},
+    "affiliations": {"index": "affiliations", "label": "name"},
+}
+"""Indices the label cache looks up subcount item labels in, by subcount key.
+
+Each entry gives the `index` to search by item id, the source field holding the
+`label`, and optionally the vocabulary `type` to restrict the search to.
+"""
+
 COMMUNITY_STATS_FILTER_AGGREGATION_SIZE = 10000
 """Maximum number of buckets to return from Terms aggregation.
 
@@ -1176,6 +1305,47 @@ STATS_DASHBOARD_REINDEXING_MAX_BATCHES = 1000
 STATS_DASHBOARD_REINDEXING_BATCH_SIZE = 5000
 STATS_DASHBOARD_REINDEXING_MAX_MEMORY_PERCENT = 85
 
+STATS_DASHBOARD_REINDEXING_PIPELINED = False
+"""Migrate each monthly event index with parallel, pipelined slice workers.
+
+When True, each month is split into STATS_DASHBOARD_REINDEXING_SLICES slices
+of a point in time, each migrated by its own worker with its own bookmark. A
+worker fetches its next batch while the current one is enriched and indexed,
+and the enriched index is refreshed once at the end instead of after every
+batch. STATS_DASHBOARD_REINDEXING_MAX_BATCHES then limits the batches of all
+slices of a month together.
+"""
+
+STATS_DASHBOARD_REINDEXING_SLICES = 4  # slice workers per month when pipelined
+
+STATS_DASHBOARD_REINDEXING_CONCURRENT_MONTHS = 1  # months migrated at once
+
+# Record metadata and community membership lookups cached during one reindexing
+# run (maximum number of entries and their maximum total size in bytes)
+STATS_DASHBOARD_REINDEXING_LOOKUP_CACHE_SIZE = 50000
+STATS_DASHBOARD_REINDEXING_LOOKUP_CACHE_BYTES = 256 * 1024 * 1024
+
+# Community events generation (records read, looked up and written per page)
+COMMUNITY_STATS_EVENTS_GENERATION_PAGE_SIZE = 500
+
+COMMUNITY_STATS_EVENTS_ASYNC_WRITES = False
+"""Write record community events from a Celery task.
+
+Community membership changes made by a service call (publishing, adding records
+to a community, etc.) are queued and written together with one bulk request
+after the call's unit of work is committed. When this is enabled, the queued
+changes are handed to a Celery task instead of being written in the request.
+Each change keeps the timestamp of the service call.
+"""
+
+COMMUNITY_STATS_EVENTS_ASYNC_LOCK_TIMEOUT = 300
+"""Seconds before the lock on a record's community event writes expires.
+
+With COMMUNITY_STATS_EVENTS_ASYNC_WRITES, each task locks its records while it
+writes their events, so that the writes for one record happen one at a time.
+The timeout only matters if a worker dies while holding the lock.
+"""
+
 # Adaptive chunking for aggregation (base aggregator)
 # These variables are part of the adaptive protection against
 # out-of-memory errors and bulk indexing errors.
@@ -1608,6 +1778,13 @@ STATS_CACHE_REDIS_DB = 7
 STATS_CACHE_PREFIX = "stats_dashboard"
 STATS_CACHE_DEFAULT_TTL = 365  # 1 year in days (allows age measurement)
 STATS_CACHE_COMPRESSION_METHOD = "gzip"
+STATS_CACHE_COMPRESS_PAYLOADS = False  # store compressed response bodies
+STATS_CACHE_GENERATION_LOCK_TTL = 300  # seconds a cache miss generation is locked
+STATS_CACHE_GENERATION_WAIT = 30  # seconds of waiting before a timeout is logged
+STATS_CACHE_PENDING_TTL = 60  # seconds an incomplete response is shared
+STATS_CACHE_STALE_TTL = 3600  # seconds a deleted response is served as stale
+STATS_CACHE_GENERATION_WORKERS = 1  # responses the cache task generates concurrently
+STATS_CACHE_COMMUNITY_BATCH_SIZE = 100  # communities generated from one index scan
 
 STATS_AGG_REGISTRY_PREFIX = "stats_agg_registry"
 STATS_AGG_REGISTRY_REDIS_DB = 8
@@ -26,11 +26,13 @@ class RegistryOperation(StrEnum):
     These values represent the types of operations tracked in the
     StatsAggregationRegistry. The "cache" and "agg_updated" operations include
     placeholders for the year (e.g., "cache_{year}"). Use .format() or .replace()
-    to substitute the year value.
+    to substitute the year value. "agg_updated_{year}_{index}" also names the
+    aggregation index that was updated.
     """
 
     AGG = "agg"
     AGG_UPDATED = "agg_updated_{year}"
+    AGG_UPDATED_INDEX = "agg_updated_{year}_{index}"
     CACHE = "cache_{year}"
     FIRST_RUN = "first_run"
 
@@ -53,3 +53,9 @@ class UsageEventsNotMigratedError(Exception):
     """Exception raised when usage events lack community_ids after migration."""
 
     pass
+
+
+class AggregationDependencyError(Exception):
+    """Exception raised when an upstream aggregator fails during a scheduled run."""
+
+    pass
@@ -9,6 +9,7 @@
 
 import hashlib
 import json
+import time
 from typing import Any, cast
 
 import arrow
@@ -19,6 +20,15 @@ from invenio_communities.communities.services.results import CommunityListResult
 from invenio_communities.proxies import current_communities
 
 from ..resources.cache_utils import StatsCache
+from ..resources.serializers.data_series_serializers import (
+    CompressedStatsJSONSerializer,
+)
+
+# Cached values starting with this marker hold a compressed response body,
+# stored as marker + compression method + b"\x00" + compressed bytes. The
+# body is the JSON the API returns for the response's query on its own:
+# {"<category>":<data>}. Raw JSON values can never start with a null byte.
+ENCODED_PAYLOAD_MARKER = b"\x00encoded:"
 
 
 class CachedResponse:
@@ -60,6 +70,8 @@ class CachedResponse:
         self._cache_key: str | None = None
         self._bytes_data: bytes | None = None
         self._object_data: dict | list | None = None
+        self._encoded_body: bytes | None = None
+        self._encoding: str | None = None
         self._created_at: arrow.Arrow | None = None
         self._expires_at: arrow.Arrow | None = None
 
@@ -179,8 +191,39 @@ class CachedResponse:
             )
             return self._bytes_data
 
+        if self._encoded_body is not None and self._encoding is not None:
+            body = CompressedStatsJSONSerializer(self._encoding).decompress(
+                self._encoded_body
+            )
+            self._bytes_data = body[len(self.body_prefix):-1]
+            return self._bytes_data
+
         raise ValueError("No data available")
 
+    @property
+    def body_prefix(self) -> bytes:
+        """Opening bytes of the API response body for this response alone."""
+        return f'{{"{self.category}":'.encode()
+
+    def encoded_body(self, compression_method: str) -> bytes | None:
+        """Get the stored compressed API response body, if there is one.
+
+        The body is the complete response to a request for this response's
+        query alone, so it can be sent as-is with a matching
+        Content-Encoding.
+
+        Args:
+            compression_method: The compression method the client accepts
+                ("gzip" or "brotli").
+
+        Returns:
+            The compressed body, or None if the response wasn't stored
+            compressed with that method.
+        """
+        if self._encoding == compression_method:
+            return self._encoded_body
+        return None
+
     @property
     def object_data(self) -> dict | list:
         """Get data as Python object (lazily loaded from bytes if needed).
@@ -194,10 +237,10 @@ class CachedResponse:
         if self._object_data is not None:
             return self._object_data
 
-        if self._bytes_data is not None:
+        if self._bytes_data is not None or self._encoded_body is not None:
             # orjson.loads accepts bytes directly
             # Cast to preserve type information (orjson.loads returns Any)
-            self._object_data = cast(dict | list, orjson.loads(self._bytes_data))
+            self._object_data = cast(dict | list, orjson.loads(self.bytes_data))
             return self._object_data
 
         raise ValueError("No data available")
@@ -211,6 +254,37 @@ class CachedResponse:
             )
         return self._cache_key
 
+    @property
+    def stale_cache_key(self) -> str:
+        """Key of the stale copy kept while the response is rebuilt.
+
+        It sits outside the "{cache_prefix}:*" pattern, so it isn't listed,
+        counted or cleared with the cached responses.
+        """
+        cache_prefix, _, key_hash = self.cache_key.rpartition(":")
+        return f"{cache_prefix}_stale:{key_hash}"
+
+    @property
+    def lock_key(self) -> str:
+        """Key of the lock held while the response is generated.
+
+        Like the stale copy, it sits outside the "{cache_prefix}:*" pattern.
+        """
+        cache_prefix, _, key_hash = self.cache_key.rpartition(":")
+        return f"{cache_prefix}_lock:{key_hash}"
+
+    @property
+    def pending_cache_key(self) -> str:
+        """Key of a briefly shared copy of an incomplete response.
+
+        Responses generated while aggregations are still catching up aren't
+        cached, so this copy lets requests waiting on the generation use the
+        result. Like the stale copy, it sits outside the "{cache_prefix}:*"
+        pattern.
+        """
+        cache_prefix, _, key_hash = self.cache_key.rpartition(":")
+        return f"{cache_prefix}_pending:{key_hash}"
+
     @property
     def created_at(self) -> arrow.Arrow | None:
         """Get the creation timestamp."""
@@ -240,6 +314,28 @@ class CachedResponse:
         """Set the aggregation completeness flag."""
         self._aggregation_complete = value
 
+    @property
+    def aggregation_index(self) -> str | None:
+        """Name of the aggregation index this response's query reads from.
+
+        Returns:
+            The unprefixed index name (e.g. "stats-community-records-delta-added"),
+            or None if the query is not configured.
+        """
+        query_config = current_app.config.get("STATS_QUERIES", {}).get(
+            self.request_data["stat"]
+        )
+        if not query_config:
+            return None
+        query_index = query_config["params"]["index"]
+        query_instance = query_config["cls"](name=self.category, index=query_index)
+        if not hasattr(query_instance, "_get_index_for_date_basis"):
+            return str(query_index)
+        params = cast(dict[str, Any], self.request_data["params"])
+        return str(
+            query_instance._get_index_for_date_basis(params.get("date_basis", "added"))
+        )
+
     @staticmethod
     def generate_cache_key(
         content_type: str,
@@ -331,6 +427,28 @@ class CachedResponse:
 
         Returns:
             Self (for method chaining)
+        """
+        query_instance, run_params = self.make_query()
+
+        if hasattr(query_instance, "run_json"):
+            # Category queries can serialize their data series block by block,
+            # so the full dictionary never has to be held alongside the JSON
+            self.set_generated_data(
+                query_instance,
+                bytes_data=b"".join(query_instance.run_json(**run_params)),
+            )
+        else:
+            self.set_generated_data(
+                query_instance, object_data=query_instance.run(**run_params)
+            )
+        return self
+
+    def make_query(self) -> tuple[Any, dict[str, Any]]:
+        """Instantiate the configured query for this response.
+
+        Returns:
+            tuple[Any, dict[str, Any]]: The query instance and the keyword
+                arguments to run it with.
 
         Raises:
             ValueError: If query type is not configured or parameters are invalid.
@@ -370,14 +488,33 @@ class CachedResponse:
         ):
             run_params["component_names"] = set(run_params["component_names"])
 
-        query_result = query_instance.run(**run_params)
+        return query_instance, run_params
+
+    def set_generated_data(
+        self,
+        query_instance: Any,
+        bytes_data: bytes | None = None,
+        object_data: dict | list | None = None,
+    ) -> None:
+        """Store freshly generated data for this response.
 
-        self._object_data = query_result
-        self._bytes_data = None  # Clear bytes cache
+        Also checks whether the aggregations the data comes from are complete,
+        and sets the response's creation and expiry times.
+
+        Args:
+            query_instance: The query that generated the data.
+            bytes_data: The data as serialized JSON.
+            object_data: The data as Python objects, if not serialized.
+        """
+        self._bytes_data = bytes_data
+        self._object_data = object_data
+        self._encoded_body = None
+        self._encoding = None
         self._created_at = arrow.utcnow()
 
         # Check aggregation completeness for all data series queries
         if hasattr(query_instance, "_check_aggregation_completeness"):
+            query_params = cast(dict[str, Any], self.request_data["params"])
             community_id = query_params.get("community_id", "global")
             end_date = query_params.get("end_date")
             if not end_date:
@@ -397,9 +534,7 @@ class CachedResponse:
         else:
             self._expires_at = None
 
-        return self
-
-    def load_from_cache(self) -> bool:
+    def load_from_cache(self, cache: StatsCache | None = None) -> bool:
         """Try to load data from cache.
 
         Stores as bytes_data to avoid unnecessary deserialization.
@@ -407,42 +542,77 @@ class CachedResponse:
 
         Sets created_at to now and expires_at based on actual Redis TTL.
 
+        Args:
+            cache: Optional StatsCache to read from. A new one (sharing the
+                process-wide connection pool) is used if not provided.
+
         Returns:
             True if data was loaded from cache, False otherwise
         """
-        cache = StatsCache()
-        cached_data = cache.get(self.cache_key)
+        cache = cache or StatsCache()
+        cached_data, ttl_seconds = cache.get_with_ttl(self.cache_key)
+        return self.load_cached_value(cached_data, ttl_seconds)
+
+    def load_cached_value(
+        self, cached_data: bytes | None, ttl_seconds: int | None
+    ) -> bool:
+        """Hydrate the response from a value already read from the cache.
+
+        Used directly when several cache keys are read at once with
+        StatsCache.get_many_with_ttl().
+
+        Args:
+            cached_data: The cached bytes, or None on a cache miss.
+            ttl_seconds: The remaining TTL of the cached value in seconds.
+
+        Returns:
+            True if data was loaded, False if there was nothing to load
+        """
+        if not cached_data:
+            return False
 
-        if cached_data:
+        if cached_data.startswith(ENCODED_PAYLOAD_MARKER):
+            # Keep the compressed body; the JSON is only decompressed if needed
+            header_end = cached_data.index(b"\x00", len(ENCODED_PAYLOAD_MARKER))
+            self._encoding = cached_data[
+                len(ENCODED_PAYLOAD_MARKER):header_end
+            ].decode()
+            self._encoded_body = cached_data[header_end + 1:]
+            self._bytes_data = None
+        else:
+            self._encoding = None
+            self._encoded_body = None
             self._bytes_data = cached_data
-            self._object_data = None
+        self._object_data = None
 
-            # We don't know when the data was originally created
-            self._created_at = None
+        # We don't know when the data was originally created
+        self._created_at = None
 
-            ttl_seconds = cache.get_ttl(self.cache_key)
-            if ttl_seconds and ttl_seconds > 0:
-                self._expires_at = arrow.utcnow().shift(seconds=ttl_seconds)
-            else:
-                self._expires_at = None
+        if ttl_seconds and ttl_seconds > 0:
+            self._expires_at = arrow.utcnow().shift(seconds=ttl_seconds)
+        else:
+            self._expires_at = None
 
-            return True
-        return False
+        return True
 
-    def save_to_cache(self) -> bool:
+    def save_to_cache(self, cache: StatsCache | None = None) -> bool:
         """Save data to cache.
 
+        If STATS_CACHE_COMPRESS_PAYLOADS is True, the response is stored as
+        the compressed API response body, using the
+        STATS_CACHE_COMPRESSION_METHOD compression method. Otherwise the raw
+        JSON data is stored.
+
+        Args:
+            cache: Optional StatsCache to write to. A new one (sharing the
+                process-wide connection pool) is used if not provided.
+
         Returns:
             True if successful, False otherwise
         """
-        cache = StatsCache()
-        default_ttl = current_app.config.get("STATS_CACHE_DEFAULT_TTL", None)
-        ttl = None
-        if default_ttl:
-            ttl = default_ttl * 86400  # Convert days to seconds
-
+        cache = cache or StatsCache()
         try:
-            cache.set(self.cache_key, self.bytes_data, ttl=ttl)
+            cache.set(self.cache_key, self.cache_value(), ttl=self.cache_ttl())
             return True
         except Exception as e:
             current_app.logger.error(
@@ -451,22 +621,184 @@ class CachedResponse:
             )
             return False
 
+    def cache_value(self) -> bytes:
+        """Build the value stored in the cache for this response.
+
+        Returns:
+            The compressed API response body if STATS_CACHE_COMPRESS_PAYLOADS
+            is True, otherwise the raw JSON data.
+        """
+        if current_app.config.get("STATS_CACHE_COMPRESS_PAYLOADS", False):
+            return self._encode_payload()
+        return self.bytes_data
+
+    @staticmethod
+    def cache_ttl() -> int | None:
+        """Get the TTL in seconds for cached responses.
+
+        Returns:
+            STATS_CACHE_DEFAULT_TTL converted to seconds, or None for no
+            expiration.
+        """
+        default_ttl = current_app.config.get("STATS_CACHE_DEFAULT_TTL", None)
+        if default_ttl:
+            return int(default_ttl * 86400)  # Convert days to seconds
+        return None
+
+    def _encode_payload(self) -> bytes:
+        """Build the compressed cache value for this response.
+
+        Returns:
+            The tagged, compressed API response body.
+        """
+        compression_method = current_app.config.get(
+            "STATS_CACHE_COMPRESSION_METHOD", "gzip"
+        ).lower()
+        if self._encoding != compression_method or self._encoded_body is None:
+            serializer = CompressedStatsJSONSerializer(compression_method)
+            self._encoded_body = b"".join(
+                serializer.iter_compressed([self.body_prefix, self.bytes_data, b"}"])
+            )
+            self._encoding = compression_method
+        return (
+            ENCODED_PAYLOAD_MARKER
+            + compression_method.encode()
+            + b"\x00"
+            + self._encoded_body
+        )
+
     def clear_data(self) -> None:
         """Release in-memory copies of the cached payload."""
         self._object_data = None
         self._bytes_data = None
+        self._encoded_body = None
+        self._encoding = None
 
-    def get_or_generate(self) -> "CachedResponse":
+    def get_or_generate(self, cache: StatsCache | None = None) -> "CachedResponse":
         """Load from cache or generate new data.
 
         Only saves to cache if aggregations are complete.
         This prevents caching incomplete data during catch-up aggregations.
 
+        Args:
+            cache: Optional StatsCache to use for the cache read and write.
+
         Returns:
             Self with data loaded (for method chaining)
         """
-        if not self.load_from_cache():
+        cache = cache or StatsCache()
+        if not self.load_from_cache(cache):
+            self.generate_single_flight(cache)
+        return self
+
+    def generate_single_flight(self, cache: StatsCache) -> "CachedResponse":
+        """Generate the response after a cache miss, once across workers.
+
+        The first worker to miss the cache takes a short-lived Redis lock and
+        generates the response. It caches the response if the aggregations
+        are complete, and otherwise shares it for STATS_CACHE_PENDING_TTL
+        seconds under a separate key. Workers that miss the cache while the
+        lock is held get the stale copy of the response if one exists, and
+        otherwise wait for the lock holder's result. If the lock is freed
+        without a result, the waiting workers take turns at the lock, so
+        only one of them generates the response again.
+
+        Args:
+            cache: The StatsCache to use for locking, reading and writing.
+
+        Returns:
+            Self with data loaded (for method chaining)
+        """
+        if self._load_pending(cache):
+            cache.increment_counter("coalesced")
+            return self
+
+        lock_ttl = current_app.config.get("STATS_CACHE_GENERATION_LOCK_TTL", 300)
+        token = cache.acquire_lock(self.lock_key, lock_ttl)
+
+        if token is None:
+            stale_data, stale_ttl = cache.get_with_ttl(self.stale_cache_key)
+            if self.load_cached_value(stale_data, stale_ttl):
+                cache.increment_counter("stale_served")
+                return self
+            token = self._wait_for_generation(cache, lock_ttl)
+            if token is None:
+                cache.increment_counter("coalesced")
+                return self
+
+        try:
             self.generate()
+            cache.increment_counter("generated")
             if self.aggregation_complete:
-                self.save_to_cache()
+                self.save_to_cache(cache)
+            else:
+                self._save_pending(cache)
+        finally:
+            cache.release_lock(self.lock_key, token)
         return self
+
+    def _load_pending(self, cache: StatsCache) -> bool:
+        """Load the cached response or the shared copy of an incomplete one.
+
+        Args:
+            cache: The StatsCache to read from.
+
+        Returns:
+            True if either was loaded, False otherwise
+        """
+        if self.load_from_cache(cache):
+            return True
+        pending_data, pending_ttl = cache.get_with_ttl(self.pending_cache_key)
+        return self.load_cached_value(pending_data, pending_ttl)
+
+    def _save_pending(self, cache: StatsCache) -> None:
+        """Share an incomplete response with the workers waiting for it.
+
+        Args:
+            cache: The StatsCache to write to.
+        """
+        pending_ttl = current_app.config.get("STATS_CACHE_PENDING_TTL", 60)
+        if pending_ttl:
+            cache.set(self.pending_cache_key, self.cache_value(), ttl=pending_ttl)
+
+    def _wait_for_generation(self, cache: StatsCache, lock_ttl: int) -> str | None:
+        """Wait for another worker to generate this response.
+
+        The wait ends when the other worker's result can be loaded, or when
+        this worker takes the generation lock itself. That happens if the
+        other worker released the lock without a result, or its lock
+        expired. A wait longer than STATS_CACHE_GENERATION_WAIT seconds is
+        logged and counted as a timeout.
+
+        Args:
+            cache: The StatsCache to poll.
+            lock_ttl: Seconds after which the lock expires if it is taken.
+
+        Returns:
+            None if the response was loaded, otherwise the token of the
+            generation lock, which is now held by this worker.
+        """
+        wait = current_app.config.get("STATS_CACHE_GENERATION_WAIT", 30)
+        poll_interval = 0.25
+        deadline = time.monotonic() + wait
+        timed_out = False
+
+        while True:
+            time.sleep(poll_interval)
+            if self._load_pending(cache):
+                return None
+            token = cache.acquire_lock(self.lock_key, lock_ttl)
+            if token is not None:
+                # The result may have been saved just before the lock was freed
+                if self._load_pending(cache):
+                    cache.release_lock(self.lock_key, token)
+                    return None
+                return token
+            if not timed_out and time.monotonic() >= deadline:
+                timed_out = True
+                current_app.logger.warning(
+                    f"Still waiting for cached response "
+                    f"{self.community_id}/{self.year}/{self.category} after "
+                    f"{wait} seconds"
+                )
+                cache.increment_counter("wait_timeouts")
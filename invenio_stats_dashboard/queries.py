@@ -6,6 +6,8 @@
 
 """Queries for the stats dashboard."""
 
+import copy
+from collections.abc import Generator
 from typing import Any
 
 import arrow
@@ -16,6 +18,7 @@ from opensearchpy import OpenSearch
 from opensearchpy.helpers.query import Q
 from opensearchpy.helpers.search import Search
 
+from .resources.label_cache import label_cache_enabled
 from .utils.utils import (
     get_subcount_combine_subfields,
     get_subcount_field,
@@ -23,20 +26,31 @@ from .utils.utils import (
 )
 
 
-def get_relevant_record_ids_from_events(
+def _get_record_events_date_field(
+    use_included_dates: bool = False,
+    use_published_dates: bool = False,
+) -> str:
+    """Get the events index date field that marks a record's "start".
+
+    Returns:
+        str: The name of the date field in the stats-community-events index.
+    """
+    if use_published_dates:
+        return "record_published_date"
+    elif use_included_dates:
+        return "event_date"
+    return "record_created_date"
+
+
+def _build_record_events_query(
     start_date: str,
     end_date: str,
     community_id: str,
     find_deleted: bool = False,
     use_included_dates: bool = False,
     use_published_dates: bool = False,
-    event_index: str = "stats-community-events",
-    client=None,
-):
-    """Get relevant record IDs from the events index.
-
-    This function queries the stats-community-events index to find record IDs
-    that match the given criteria.
+) -> dict:
+    """Build the bool query used to find relevant events in the events index.
 
     Args:
         start_date (str): The start date to query.
@@ -48,21 +62,13 @@ def get_relevant_record_ids_from_events(
             was added to the community instead of the created date.
         use_published_dates (bool, optional): Whether to use the metadata publication
             date instead of the created date.
-        event_index (str, optional): The events index to query. Defaults to
-            "stats-community-events".
-        client: The OpenSearch client to use.
 
     Returns:
-        set: A set of record IDs that match the criteria.
+        dict: The bool query for the stats-community-events index.
 
     Raises:
         ValueError: If community_id is "global" and use_published_dates=False.
     """
-    if client is None:
-        from invenio_search.proxies import current_search_client
-
-        client = current_search_client
-
     # Validate that community_id is not "global" unless use_published_dates=True
     # Global queries are only supported for published dates since we now have
     # global events
@@ -74,12 +80,7 @@ def get_relevant_record_ids_from_events(
         )
 
     # Determine which date field to use based on the parameters
-    if use_published_dates:
-        date_field = "record_published_date"
-    elif use_included_dates:
-        date_field = "event_date"
-    else:
-        date_field = "record_created_date"
+    date_field = _get_record_events_date_field(use_included_dates, use_published_dates)
 
     # Build the query for the events index
     should_clauses: list[Any] = []
@@ -139,29 +140,363 @@ def get_relevant_record_ids_from_events(
             }
         })
 
-    # Execute the query
+    return {
+        "bool": {
+            "should": should_clauses,
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def iter_relevant_record_ids_from_events(
+    start_date: str,
+    end_date: str,
+    community_id: str,
+    find_deleted: bool = False,
+    use_included_dates: bool = False,
+    use_published_dates: bool = False,
+    event_index: str = "stats-community-events",
+    client=None,
+    page_size: int = 10000,
+) -> Generator[list[str], None, None]:
+    """Page through the relevant record IDs in the events index.
+
+    The distinct record IDs are read with a composite aggregation, one page at a
+    time, so that any number of records can be resolved without loading every
+    matching event at once. Each record ID is yielded only once.
+
+    Args:
+        start_date (str): The start date to query.
+        end_date (str): The end date to query.
+        community_id (str): The community ID. Must not be "global" unless
+            use_published_dates=True.
+        find_deleted (bool, optional): Whether to find deleted records.
+        use_included_dates (bool, optional): Whether to use the dates when the record
+            was added to the community instead of the created date.
+        use_published_dates (bool, optional): Whether to use the metadata publication
+            date instead of the created date.
+        event_index (str, optional): The events index to query. Defaults to
+            "stats-community-events".
+        client: The OpenSearch client to use.
+        page_size (int, optional): The number of record IDs per page.
+
+    Yields:
+        list[str]: Each page of record IDs, in ascending order.
+    """
+    if client is None:
+        from invenio_search.proxies import current_search_client
+
+        client = current_search_client
+
+    query = _build_record_events_query(
+        start_date,
+        end_date,
+        community_id,
+        find_deleted=find_deleted,
+        use_included_dates=use_included_dates,
+        use_published_dates=use_published_dates,
+    )
+    yield from _iter_record_id_pages(query, event_index, client, page_size)
+
+
+def iter_removed_record_ids_from_events(
+    start_date: str,
+    community_id: str,
+    event_index: str = "stats-community-events",
+    client=None,
+    page_size: int = 10000,
+) -> Generator[list[str], None, None]:
+    """Page through the records removed from a community since a date.
+
+    Args:
+        start_date (str): The earliest removal date to include.
+        community_id (str): The community ID.
+        event_index (str, optional): The events index to query. Defaults to
+            "stats-community-events".
+        client: The OpenSearch client to use.
+        page_size (int, optional): The number of record IDs per page.
+
+    Yields:
+        list[str]: Each page of record IDs, in ascending order.
+    """
+    if client is None:
+        from invenio_search.proxies import current_search_client
+
+        client = current_search_client
+
     query = {
-        "query": {
-            "bool": {
-                "should": should_clauses,
-                "minimum_should_match": 1,
-            }
-        },
-        "size": 10000,  # Adjust as needed
-        "_source": ["record_id"],
+        "bool": {
+            "must": [
+                {"term": {"event_type": "removed"}},
+                {"term": {"community_id": community_id}},
+                {"range": {"event_date": {"gte": start_date}}},
+            ]
+        }
     }
+    yield from _iter_record_id_pages(query, event_index, client, page_size)
+
+
+def _iter_record_id_pages(
+    query: dict, event_index: str, client, page_size: int
+) -> Generator[list[str], None, None]:
+    """Page through the distinct record IDs of the events matching a query.
+
+    Args:
+        query (dict): The query for the events index.
+        event_index (str): The events index to query.
+        client: The OpenSearch client to use.
+        page_size (int): The number of record IDs per page.
+
+    Yields:
+        list[str]: Each page of record IDs, in ascending order.
+    """
+    after_key = None
+    while True:
+        composite: dict = {
+            "size": page_size,
+            "sources": [{"record_id": {"terms": {"field": "record_id"}}}],
+        }
+        if after_key:
+            composite["after"] = after_key
+        result = client.search(
+            index=prefix_index(event_index),
+            body={
+                "size": 0,
+                "query": query,
+                "aggs": {"record_ids": {"composite": composite}},
+            },
+        )
+        record_ids_agg = result["aggregations"]["record_ids"]
+        buckets = record_ids_agg.get("buckets", [])
+        if buckets:
+            yield [bucket["key"]["record_id"] for bucket in buckets]
+        after_key = record_ids_agg.get("after_key")
+        if not after_key or len(buckets) < page_size:
+            return
+
+
+def get_relevant_record_ids_from_events(
+    start_date: str,
+    end_date: str,
+    community_id: str,
+    find_deleted: bool = False,
+    use_included_dates: bool = False,
+    use_published_dates: bool = False,
+    event_index: str = "stats-community-events",
+    client=None,
+    page_size: int = 10000,
+):
+    """Get relevant record IDs from the events index.
 
-    result = client.search(index=prefix_index(event_index), body=query)
+    This function queries the stats-community-events index to find record IDs
+    that match the given criteria. The IDs are read in pages (see
+    `iter_relevant_record_ids_from_events`), so the result is never truncated.
+
+    Args:
+        start_date (str): The start date to query.
+        end_date (str): The end date to query.
+        community_id (str): The community ID. Must not be "global" unless
+            use_published_dates=True.
+        find_deleted (bool, optional): Whether to find deleted records.
+        use_included_dates (bool, optional): Whether to use the dates when the record
+            was added to the community instead of the created date.
+        use_published_dates (bool, optional): Whether to use the metadata publication
+            date instead of the created date.
+        event_index (str, optional): The events index to query. Defaults to
+            "stats-community-events".
+        client: The OpenSearch client to use.
+        page_size (int, optional): The number of record IDs to read per request.
 
-    # Extract record IDs from the results
+    Returns:
+        set: A set of record IDs that match the criteria.
+    """
     record_ids = set()
-    for hit in result["hits"]["hits"]:
-        record_id = hit["_source"]["record_id"]
-        record_ids.add(record_id)
+    for page in iter_relevant_record_ids_from_events(
+        start_date,
+        end_date,
+        community_id,
+        find_deleted=find_deleted,
+        use_included_dates=use_included_dates,
+        use_published_dates=use_published_dates,
+        event_index=event_index,
+        client=client,
+        page_size=page_size,
+    ):
+        record_ids.update(page)
 
     return record_ids
 
 
+def _build_record_ids_clause(record_ids, max_terms: int = 65536) -> dict:
+    """Build a records index clause matching a list of record IDs.
+
+    A single `terms` clause can't hold more than the index's `max_terms_count`
+    values (65536 by default), so longer lists are split into several `terms`
+    clauses of which any may match.
+
+    Args:
+        record_ids: The record IDs to match.
+        max_terms (int, optional): The maximum number of IDs per `terms` clause.
+
+    Returns:
+        dict: The query clause.
+    """
+    ids = sorted(record_ids)
+    if len(ids) <= max_terms:
+        return {"terms": {"id": ids}}
+    return {
+        "bool": {
+            "should": [
+                {"terms": {"id": ids[i : i + max_terms]}}
+                for i in range(0, len(ids), max_terms)
+            ],
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def _build_record_ids_clause_from_pages(
+    pages, max_terms: int = 65536
+) -> dict | None:
+    """Build a records index clause matching pages of record IDs.
+
+    The pages are consumed one at a time and packed straight into `terms`
+    clauses, so no separate set or sorted copy of the IDs is built. Each ID
+    must only appear once across the pages, as with
+    `iter_relevant_record_ids_from_events`.
+
+    Args:
+        pages: An iterable of record ID lists.
+        max_terms (int, optional): The maximum number of IDs per `terms` clause.
+
+    Returns:
+        dict | None: The query clause, or None if there were no IDs.
+    """
+    chunks: list[list[str]] = []
+    for page in pages:
+        for record_id in page:
+            if not chunks or len(chunks[-1]) >= max_terms:
+                chunks.append([])
+            chunks[-1].append(record_id)
+    if not chunks:
+        return None
+    if len(chunks) == 1:
+        return {"terms": {"id": chunks[0]}}
+    return {
+        "bool": {
+            "should": [{"terms": {"id": chunk}} for chunk in chunks],
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def get_relevant_record_ids_by_day_from_events(
+    start_date: str,
+    end_date: str,
+    community_id: str,
+    find_deleted: bool = False,
+    use_included_dates: bool = False,
+    use_published_dates: bool = False,
+    event_index: str = "stats-community-events",
+    client=None,
+) -> dict[str, set[str]]:
+    """Get relevant record IDs from the events index grouped by day.
+
+    This is the multi-day counterpart of `get_relevant_record_ids_from_events`.
+    A single scan of the events index covers the whole period, and each event
+    is then assigned to the day(s) for which the single-day query would have
+    returned it. The result for each day is therefore identical to calling
+    `get_relevant_record_ids_from_events` with that day's start and end dates.
+
+    Args:
+        start_date (str): The start date to query.
+        end_date (str): The end date to query.
+        community_id (str): The community ID. Must not be "global" unless
+            use_published_dates=True.
+        find_deleted (bool, optional): Whether to find deleted records.
+        use_included_dates (bool, optional): Whether to use the dates when the record
+            was added to the community instead of the created date.
+        use_published_dates (bool, optional): Whether to use the metadata publication
+            date instead of the created date.
+        event_index (str, optional): The events index to query. Defaults to
+            "stats-community-events".
+        client: The OpenSearch client to use.
+
+    Returns:
+        dict[str, set[str]]: A mapping of "YYYY-MM-DD" day strings to the set of
+            record IDs relevant for that day. Days without any relevant records
+            are omitted.
+    """
+    if client is None:
+        from invenio_search.proxies import current_search_client
+
+        client = current_search_client
+
+    date_field = _get_record_events_date_field(use_included_dates, use_published_dates)
+    period_start = arrow.get(start_date)
+    period_end = arrow.get(end_date)
+
+    search = (
+        Search(using=client, index=prefix_index(event_index))
+        .update_from_dict({
+            "query": _build_record_events_query(
+                start_date,
+                end_date,
+                community_id,
+                find_deleted=find_deleted,
+                use_included_dates=use_included_dates,
+                use_published_dates=use_published_dates,
+            )
+        })
+        .source([
+            "record_id",
+            "event_type",
+            "event_date",
+            "is_deleted",
+            "deleted_date",
+            date_field,
+        ])
+    )
+
+    def in_period(date: arrow.Arrow) -> bool:
+        return period_start <= date <= period_end
+
+    record_ids_by_day: dict[str, set[str]] = {}
+    for hit in search.scan():
+        event = hit.to_dict()
+        deleted_date = (
+            arrow.get(event["deleted_date"]) if event.get("deleted_date") else None
+        )
+        if find_deleted:
+            days = []
+            if event.get("event_type") == "removed" and event.get("event_date"):
+                event_date = arrow.get(event["event_date"])
+                if in_period(event_date):
+                    days.append(event_date)
+            if event.get("is_deleted") and deleted_date and in_period(deleted_date):
+                days.append(deleted_date)
+        else:
+            if not event.get(date_field):
+                continue
+            event_date = arrow.get(event[date_field])
+            # Records deleted before the start of the event's own day are
+            # excluded, matching the single-day query's must_not clause
+            if (
+                event.get("is_deleted")
+                and deleted_date
+                and deleted_date < event_date.floor("day")
+            ):
+                continue
+            days = [event_date]
+
+        for day in days:
+            record_ids_by_day.setdefault(day.format("YYYY-MM-DD"), set()).add(
+                event["record_id"]
+            )
+
+    return record_ids_by_day
+
+
 class CommunityUsageDeltaQuery:
     """Query builder for community usage delta aggregation.
 
@@ -248,6 +583,111 @@ class CommunityUsageDeltaQuery:
         )
         return download_search
 
+    def build_fan_in_view_query(
+        self,
+        community_ids: list[str],
+        start_date: arrow.Arrow | str,
+        end_date: arrow.Arrow | str,
+        include_global: bool = True,
+    ) -> Search:
+        """Build a view query covering the whole instance and many communities.
+
+        Args:
+            community_ids (list[str]): The community IDs to split the results by.
+            start_date (arrow.Arrow | str): The start date to aggregate for.
+            end_date (arrow.Arrow | str): The end date to aggregate for.
+            include_global (bool, optional): Whether to include the top-level
+                aggregations for the whole instance. Defaults to True.
+
+        Returns:
+            Search: The search object for view events.
+        """
+        return self._build_fan_in_search(
+            community_ids, start_date, end_date, "view", self.view_index, include_global
+        )
+
+    def build_fan_in_download_query(
+        self,
+        community_ids: list[str],
+        start_date: arrow.Arrow | str,
+        end_date: arrow.Arrow | str,
+        include_global: bool = True,
+    ) -> Search:
+        """Build a download query covering the whole instance and many communities.
+
+        Args:
+            community_ids (list[str]): The community IDs to split the results by.
+            start_date (arrow.Arrow | str): The start date to aggregate for.
+            end_date (arrow.Arrow | str): The end date to aggregate for.
+            include_global (bool, optional): Whether to include the top-level
+                aggregations for the whole instance. Defaults to True.
+
+        Returns:
+            Search: The search object for download events.
+        """
+        return self._build_fan_in_search(
+            community_ids,
+            start_date,
+            end_date,
+            "download",
+            self.download_index,
+            include_global,
+        )
+
+    def _build_fan_in_search(
+        self,
+        community_ids: list[str],
+        start_date: arrow.Arrow | str,
+        end_date: arrow.Arrow | str,
+        event_type: str,
+        index: str,
+        include_global: bool = True,
+    ) -> Search:
+        """Build a fan-in search for view or download events.
+
+        The top-level aggregations are the same as those of the global query.
+        The same metric and subcount aggregations are also nested under a
+        "by_community" terms aggregation on the enriched `community_ids` field,
+        with one bucket per requested community. Each bucket therefore holds the
+        aggregations the single-community query would return for it. Searches
+        for further batches of communities can leave out the top-level
+        aggregations, since they would only repeat the first batch's.
+
+        Args:
+            community_ids (list[str]): The community IDs to split the results by.
+            start_date (arrow.Arrow | str): The start date to aggregate for.
+            end_date (arrow.Arrow | str): The end date to aggregate for.
+            event_type (str): The type of event (view or download).
+            index (str): The events index to search.
+            include_global (bool, optional): Whether to include the top-level
+                aggregations. Defaults to True.
+
+        Returns:
+            Search: The search object for the fan-in query.
+        """
+        if isinstance(start_date, str):
+            start_date = arrow.get(start_date)
+        if isinstance(end_date, str):
+            end_date = arrow.get(end_date)
+        query_dict = self._build_query_dict("global", start_date, end_date, event_type)
+        if community_ids:
+            by_community = {
+                "terms": {
+                    "field": "community_ids",
+                    "size": len(community_ids),
+                    "include": list(community_ids),
+                },
+                "aggs": copy.deepcopy(query_dict["aggs"]),
+            }
+            if not include_global:
+                query_dict["aggs"] = {}
+            query_dict["aggs"]["by_community"] = by_community
+        return (
+            Search(using=self.client, index=prefix_index(index))
+            .update_from_dict(query_dict)
+            .extra(size=1)
+        )
+
     def _build_query_dict(
         self,
         community_id: str,
@@ -395,7 +835,9 @@ class CommunityUsageDeltaQuery:
                             get_subcount_label_includes(usage_config, field_index),
                             event_type,
                         )
-                elif get_subcount_field(usage_config, "label_field", field_index):
+                elif get_subcount_field(
+                    usage_config, "label_field", field_index
+                ) and not label_cache_enabled():
                     # Handle single field with label
                     field = get_subcount_field(usage_config, "field", field_index)
                     if field:
@@ -409,7 +851,8 @@ class CommunityUsageDeltaQuery:
                             event_type,
                         )
                 else:
-                    # Handle simple field without label
+                    # Handle simple field without label, or with a label that
+                    # is filled in from the label cache
                     field = get_subcount_field(usage_config, "field", field_index)
                     if field:
                         if len(source_fields) > 1:
@@ -581,6 +1024,101 @@ class CommunityRecordDeltaQuery:
         self.subcount_configs = (
             subcount_configs or current_app.config["COMMUNITY_STATS_SUBCOUNTS"]
         )
+        self.filter_strategy = current_app.config.get(
+            "COMMUNITY_STATS_RECORDS_DELTA_FILTER_STRATEGY", "events"
+        )
+        self.id_page_size = current_app.config.get(
+            "COMMUNITY_STATS_RECORDS_DELTA_ID_PAGE_SIZE", 10000
+        )
+
+    def _use_community_filter(
+        self,
+        community_id: str,
+        find_deleted: bool,
+        use_included_dates: bool,
+        use_published_dates: bool,
+    ) -> bool:
+        """Check whether to filter the records index by parent community.
+
+        With the "community" filter strategy, community queries for records
+        created in the period match the community's records directly in the
+        records index instead of via a list of IDs from the events index. The
+        community addition date, the parsed publication date and the date a
+        record was removed from a community only exist in the events index, so
+        those queries (and all deletion queries) always use the events index.
+
+        Args:
+            community_id (str): The community ID (or "global").
+            find_deleted (bool): Whether to find deleted records.
+            use_included_dates (bool): Whether to use the community addition date.
+            use_published_dates (bool): Whether to use the publication date.
+
+        Returns:
+            bool: True if the records index should be filtered by community.
+        """
+        return (
+            self.filter_strategy == "community"
+            and community_id != "global"
+            and not find_deleted
+            and not use_included_dates
+            and not use_published_dates
+        )
+
+    def _get_community_clause(self, start_date: str, community_id: str) -> dict:
+        """Get the clause matching a community's records in the records index.
+
+        Besides the records that currently belong to the community, this
+        matches the records removed from it since the start of the period,
+        which the events index still counts for the community until their
+        removal.
+
+        Args:
+            start_date (str): The start date of the period.
+            community_id (str): The community ID.
+
+        Returns:
+            dict: The query clause.
+        """
+        member_clause = {"term": {"parent.communities.ids": community_id}}
+        removed_clause = _build_record_ids_clause_from_pages(
+            iter_removed_record_ids_from_events(
+                start_date,
+                community_id,
+                event_index=self.event_index,
+                client=self.client,
+                page_size=self.id_page_size,
+            )
+        )
+        if removed_clause is None:
+            return member_clause
+        return {
+            "bool": {
+                "should": [member_clause, removed_clause],
+                "minimum_should_match": 1,
+            }
+        }
+
+    def _get_date_filter_clauses(
+        self, start_date: str, end_date: str, find_deleted: bool
+    ) -> list[dict]:
+        """Get the must clauses for queries based on the record date fields.
+
+        Args:
+            start_date (str): The start date to query.
+            end_date (str): The end date to query.
+            find_deleted (bool): Whether to find deleted records.
+
+        Returns:
+            list[dict]: The must clauses for the records index.
+        """
+        date_series_field = "tombstone.removal_date" if find_deleted else "created"
+        must_clauses: list[dict] = [{"term": {"is_published": True}}]
+        if find_deleted:
+            must_clauses.append({"term": {"is_deleted": True}})
+        must_clauses.append({
+            "range": {date_series_field: {"gte": start_date, "lte": end_date}}
+        })
+        return must_clauses
 
     def _get_must_clauses(
         self,
@@ -593,6 +1131,10 @@ class CommunityRecordDeltaQuery:
     ) -> list[dict]:
         """Get the must clauses for the query.
 
+        Community queries match the relevant record IDs from the events index,
+        unless the "community" filter strategy applies (see
+        `_use_community_filter`).
+
         Args:
             start_date (str): The start date to query.
             end_date (str): The end date to query.
@@ -608,54 +1150,28 @@ class CommunityRecordDeltaQuery:
         Returns:
             list: The must clauses for the query.
         """
-        must_clauses: list[dict] = []
-
-        # For global queries with use_published_dates=True, use the events index
-        if community_id == "global" and use_published_dates:
-            # Get relevant record IDs from the events index
-            record_ids = get_relevant_record_ids_from_events(
-                start_date=start_date,
-                end_date=end_date,
-                community_id="global",
-                find_deleted=find_deleted,
-                use_included_dates=use_included_dates,
-                use_published_dates=use_published_dates,
-                event_index=self.event_index,
-                client=self.client,
-            )
-
-            # If no records found, return empty query
-            if not record_ids:
-                must_clauses = [{"term": {"_id": "no-matching-records"}}]
-            else:
-                # Build the query for the records index using the found record IDs
-                must_clauses = [
-                    {"terms": {"id": list(record_ids)}},
-                    {"term": {"is_published": True}},
-                ]
-        elif community_id == "global":
+        if community_id == "global" and not use_published_dates:
             # For global queries without use_published_dates, use record date
             # fields directly
-            date_series_field = "created"
-            if find_deleted:
-                date_series_field = "tombstone.removal_date"
-
-            must_clauses = [
-                {"term": {"is_published": True}},
+            return self._get_date_filter_clauses(start_date, end_date, find_deleted)
+
+        if self._use_community_filter(
+            community_id, find_deleted, use_included_dates, use_published_dates
+        ):
+            # Match the community's records in the records index directly, so
+            # that the query doesn't grow with the number of records
+            return [
+                *self._get_date_filter_clauses(start_date, end_date, find_deleted),
+                self._get_community_clause(start_date, community_id),
             ]
 
-            if find_deleted:
-                must_clauses.append({"term": {"is_deleted": True}})
-                must_clauses.append({
-                    "range": {date_series_field: {"gte": start_date, "lte": end_date}}
-                })
-            else:
-                must_clauses.append({
-                    "range": {date_series_field: {"gte": start_date, "lte": end_date}}
-                })
-        else:
-            # Get relevant record IDs from the events index
-            record_ids = get_relevant_record_ids_from_events(
+        # Get relevant record IDs from the events index. For global queries this
+        # is only reached with use_published_dates=True.
+        event_index_kwargs = (
+            {"event_index": self.event_index} if community_id == "global" else {}
+        )
+        record_ids_clause = _build_record_ids_clause_from_pages(
+            iter_relevant_record_ids_from_events(
                 start_date=start_date,
                 end_date=end_date,
                 community_id=community_id,
@@ -663,17 +1179,21 @@ class CommunityRecordDeltaQuery:
                 use_included_dates=use_included_dates,
                 use_published_dates=use_published_dates,
                 client=self.client,
+                page_size=self.id_page_size,
+                **event_index_kwargs,
             )
+        )
 
-            # If no records found, return empty query
-            if not record_ids:
-                must_clauses = [{"term": {"_id": "no-matching-records"}}]
-            else:
-                # Build the query for the records index using the found record IDs
-                must_clauses = [
-                    {"terms": {"id": list(record_ids)}},
-                    {"term": {"is_published": True}},
-                ]
+        # If no records found, return empty query
+        must_clauses: list[dict]
+        if record_ids_clause is None:
+            must_clauses = [{"term": {"_id": "no-matching-records"}}]
+        else:
+            # Build the query for the records index using the found record IDs
+            must_clauses = [
+                record_ids_clause,
+                {"term": {"is_published": True}},
+            ]
 
         return must_clauses
 
@@ -764,9 +1284,10 @@ class CommunityRecordDeltaQuery:
                     field, label_field, label_includes
                 )
         else:
-            # Standard single field aggregation
+            # Standard single field aggregation. With the label cache, labels
+            # are filled in afterwards instead of from a top_hits sample.
             sub_aggs[agg_name] = self._make_subcount_agg_dict(
-                field, label_field, label_includes
+                field, None if label_cache_enabled() else label_field, label_includes
             )
 
         return sub_aggs
@@ -822,8 +1343,6 @@ class CommunityRecordDeltaQuery:
             use_published_dates,
         )
 
-        sub_aggregations = self._get_sub_aggregations()
-
         query = {
             "size": 0,
             "query": {
@@ -831,28 +1350,154 @@ class CommunityRecordDeltaQuery:
                     "must": must_clauses,
                 }
             },
-            "aggs": {
-                "total_records": {"value_count": {"field": "_id"}},
-                "with_files": {
-                    "filter": {"term": {"files.enabled": True}},
-                    "aggs": {"unique_parents": {"cardinality": {"field": "parent.id"}}},
-                },
-                "without_files": {
-                    "filter": {"term": {"files.enabled": False}},
-                    "aggs": {"unique_parents": {"cardinality": {"field": "parent.id"}}},
-                },
-                "uploaders": {
-                    "cardinality": {"field": "parent.access.owned_by.user"},
+            "aggs": self._get_aggregations(),
+        }
+
+        search = Search(using=self.client, index=prefix_index(self.record_index))
+        search.update_from_dict(query)
+
+        return search
+
+    def _get_aggregations(self) -> dict:
+        """Get the full set of aggregations for one delta period.
+
+        Returns:
+            dict: The metric aggregations plus the subcount sub-aggregations.
+        """
+        return {
+            "total_records": {"value_count": {"field": "_id"}},
+            "with_files": {
+                "filter": {"term": {"files.enabled": True}},
+                "aggs": {"unique_parents": {"cardinality": {"field": "parent.id"}}},
+            },
+            "without_files": {
+                "filter": {"term": {"files.enabled": False}},
+                "aggs": {"unique_parents": {"cardinality": {"field": "parent.id"}}},
+            },
+            "uploaders": {
+                "cardinality": {"field": "parent.access.owned_by.user"},
+            },
+            "file_count": {
+                "value_count": {"field": "files.entries.key"},
+            },
+            "total_bytes": {"sum": {"field": "files.entries.size"}},
+            **self._get_sub_aggregations(),
+        }
+
+    def build_daily_query(
+        self,
+        start_date: str,
+        end_date: str,
+        community_id: str | None = None,
+        find_deleted: bool = False,
+        use_included_dates: bool = False,
+        use_published_dates: bool = False,
+    ) -> Search | None:
+        """Build one query returning daily delta aggregations for a whole period.
+
+        The aggregations returned by `build_query` for a single day are nested
+        under a "days" bucket aggregation with one bucket per day. For global
+        queries that don't depend on the events index, this is a
+        `date_histogram` on the record date field. Otherwise the relevant
+        record IDs for every day are resolved with a single scan of the events
+        index and the buckets are keyed `filters` on those IDs (since the
+        community addition date only exists in the events index).
+
+        Use `get_daily_aggregations` to unpack the response.
+
+        Args:
+            start_date (str): The start date of the period.
+            end_date (str): The end date of the period.
+            community_id (str, optional): The community ID (or "global").
+            find_deleted (bool, optional): Whether to find deleted records.
+            use_included_dates (bool, optional): Whether to use the dates when
+                the record was included to the community instead of the created date.
+            use_published_dates (bool, optional): Whether to use the metadata
+                publication date instead of the created date.
+
+        Returns:
+            Search | None: The search for the daily delta aggregations, or None if
+                no records are relevant for any day in the period.
+
+        Raises:
+            ValueError: If community_id is None.
+        """
+        if community_id is None:
+            raise ValueError("community_id must not be None")
+
+        use_community_filter = self._use_community_filter(
+            community_id, find_deleted, use_included_dates, use_published_dates
+        )
+        if use_community_filter or (
+            community_id == "global" and not use_published_dates
+        ):
+            date_series_field = "tombstone.removal_date" if find_deleted else "created"
+            must_clauses = self._get_date_filter_clauses(
+                start_date, end_date, find_deleted
+            )
+            if use_community_filter:
+                must_clauses.append(
+                    self._get_community_clause(start_date, community_id)
+                )
+            days_agg: dict = {
+                "date_histogram": {
+                    "field": date_series_field,
+                    "calendar_interval": "day",
+                    "format": "yyyy-MM-dd",
+                    "min_doc_count": 1,
                 },
-                "file_count": {
-                    "value_count": {"field": "files.entries.key"},
+            }
+        else:
+            record_ids_by_day = get_relevant_record_ids_by_day_from_events(
+                start_date=start_date,
+                end_date=end_date,
+                community_id=community_id,
+                find_deleted=find_deleted,
+                use_included_dates=use_included_dates,
+                use_published_dates=use_published_dates,
+                event_index=self.event_index,
+                client=self.client,
+            )
+            if not record_ids_by_day:
+                return None
+            must_clauses = [{"term": {"is_published": True}}]
+            days_agg = {
+                "filters": {
+                    "filters": {
+                        day: _build_record_ids_clause(record_ids)
+                        for day, record_ids in sorted(record_ids_by_day.items())
+                    },
                 },
-                "total_bytes": {"sum": {"field": "files.entries.size"}},
-                **sub_aggregations,
-            },
+            }
+
+        query = {
+            "size": 0,
+            "query": {"bool": {"must": must_clauses}},
+            "aggs": {"days": {**days_agg, "aggs": self._get_aggregations()}},
         }
 
         search = Search(using=self.client, index=prefix_index(self.record_index))
         search.update_from_dict(query)
 
         return search
+
+    @staticmethod
+    def get_daily_aggregations(aggregations: dict) -> dict[str, dict]:
+        """Unpack the response aggregations of a `build_daily_query` search.
+
+        Args:
+            aggregations (dict): The response aggregations as a dictionary.
+
+        Returns:
+            dict[str, dict]: A mapping of "YYYY-MM-DD" day strings to that day's
+                aggregations, in the same shape `build_query` returns for a
+                single day. Days without matching records are omitted.
+        """
+        buckets = aggregations.get("days", {}).get("buckets", {})
+        if isinstance(buckets, dict):  # keyed filters buckets
+            return {
+                day: bucket
+                for day, bucket in buckets.items()
+                if bucket.get("doc_count", 0)
+            }
+        return {bucket["key_as_string"]: bucket for bucket in buckets}
@@ -7,6 +7,12 @@
 
 """Cache utilities for invenio-stats-dashboard."""
 
+import os
+import threading
+import uuid
+from collections.abc import Iterator
+from fnmatch import fnmatchcase
+from itertools import batched
 from typing import Any
 
 import arrow
@@ -15,6 +21,69 @@ from flask import current_app
 
 from ..utils.utils import format_bytes
 
+_connection_pools: dict[tuple[str, bool], redis.ConnectionPool] = {}
+_connection_pools_pid: int | None = None
+_connection_pools_lock = threading.Lock()
+
+# Number of keys requested per SCAN call and sent per MGET/pipeline batch
+_SCAN_BATCH_SIZE = 1000
+
+# Delete a lock key only if it still holds the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Move a cached value to its stale key, keeping it for ARGV[1] seconds
+_RETIRE_KEY_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    redis.call("rename", KEYS[1], KEYS[2])
+    redis.call("expire", KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+def get_connection_pool(
+    redis_url: str, decode_responses: bool = False
+) -> redis.ConnectionPool:
+    """Get the process-wide Redis connection pool for a URL.
+
+    Pools are shared by every StatsCache (and StatsAggregationRegistry)
+    pointing at the same URL, so requests and tasks reuse open connections
+    instead of opening a new one per cache object. The registry is reset
+    when the process id changes, so forked workers never share sockets
+    with their parent.
+
+    Args:
+        redis_url: The Redis URL, including the database number.
+        decode_responses: Whether clients using the pool decode responses
+            to strings.
+
+    Returns:
+        redis.ConnectionPool: The shared connection pool.
+    """
+    global _connection_pools_pid
+
+    with _connection_pools_lock:
+        pid = os.getpid()
+        if _connection_pools_pid != pid:
+            # Don't disconnect the parent's pools: the sockets belong to it.
+            _connection_pools.clear()
+            _connection_pools_pid = pid
+
+        pool_key = (redis_url, decode_responses)
+        pool = _connection_pools.get(pool_key)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                redis_url, decode_responses=decode_responses
+            )
+            _connection_pools[pool_key] = pool
+        return pool
+
 
 class StatsCache:
     """Low-level Redis cache manager for statistics data.
@@ -30,7 +99,7 @@ class StatsCache:
         stats_db_number: int | None = None,
         decode_responses: bool = False,
     ):
-        """Initialize the cache manager with direct Redis connection.
+        """Initialize the cache manager with a shared Redis connection pool.
 
         Args:
             cache_prefix: Optional prefix for cache keys
@@ -48,8 +117,8 @@ class StatsCache:
             "STATS_CACHE_PREFIX", "stats_dashboard"
         )
 
-        self.redis_client: redis.Redis = redis.from_url(
-            redis_url, decode_responses=decode_responses
+        self.redis_client: redis.Redis = redis.Redis(
+            connection_pool=get_connection_pool(redis_url, decode_responses)
         )
 
     def _get_redis_url(self) -> str:
@@ -98,6 +167,62 @@ class StatsCache:
             current_app.logger.warning(f"Cache get error for key {key}: {e}")
             return None
 
+    def get_with_ttl(self, key: str) -> tuple[bytes | None, int | None]:
+        """Get cached data and its TTL in a single round trip.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (cached data bytes or None, TTL in seconds or None).
+            The TTL is -1 if the key exists with no expiration and None if
+            the key doesn't exist.
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.ttl(key)
+            cached_data, ttl = pipe.execute()
+            if cached_data is None or ttl == -2:
+                return None, None
+            return cached_data, int(ttl)
+        except Exception as e:
+            current_app.logger.warning(f"Cache get error for key {key}: {e}")
+            return None, None
+
+    def get_many_with_ttl(
+        self, keys: list[str]
+    ) -> dict[str, tuple[bytes | None, int | None]]:
+        """Get cached data and TTLs for multiple keys in a single round trip.
+
+        Args:
+            keys: List of cache keys
+
+        Returns:
+            Dictionary mapping each key to a (data, ttl) tuple, with the
+            same meaning as the return value of get_with_ttl().
+        """
+        if not keys:
+            return {}
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.mget(keys)
+            for key in keys:
+                pipe.ttl(key)
+            values, *ttls = pipe.execute()
+        except Exception as e:
+            current_app.logger.warning(f"Cache get many error: {e}")
+            return {key: (None, None) for key in keys}
+
+        results: dict[str, tuple[bytes | None, int | None]] = {}
+        for key, cached_data, ttl in zip(keys, values, ttls, strict=True):
+            if cached_data is None or ttl == -2:
+                results[key] = (None, None)
+            else:
+                results[key] = (cached_data, int(ttl))
+        return results
+
     def set(
         self,
         key: str,
@@ -167,6 +292,159 @@ class StatsCache:
             current_app.logger.warning(f"Cache delete error for key {key}: {e}")
             return False
 
+    def retire(self, key: str, stale_key: str, stale_ttl: int) -> bool:
+        """Move a cache entry to a stale key instead of deleting it.
+
+        The stale copy can be served while the entry is regenerated.
+
+        Args:
+            key: Cache key
+            stale_key: Key to keep the stale copy under
+            stale_ttl: Seconds to keep the stale copy
+
+        Returns:
+            True if the entry was moved, False if not found or error
+        """
+        try:
+            retired = self.redis_client.eval(
+                _RETIRE_KEY_SCRIPT, 2, key, stale_key, stale_ttl
+            )
+            return bool(retired)
+        except Exception as e:
+            current_app.logger.warning(f"Cache retire error for key {key}: {e}")
+            return False
+
+    def acquire_lock(self, key: str, ttl: int) -> str | None:
+        """Try to acquire a short-lived lock.
+
+        Args:
+            key: Lock key
+            ttl: Seconds after which the lock expires if it is never released
+
+        Returns:
+            A token to pass to release_lock(), or None if the lock is held
+            elsewhere (or Redis is unavailable)
+        """
+        token = str(uuid.uuid4())
+        try:
+            if self.redis_client.set(key, token, nx=True, ex=ttl):
+                return token
+        except Exception as e:
+            current_app.logger.warning(f"Cache lock error for key {key}: {e}")
+        return None
+
+    def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock acquired with acquire_lock().
+
+        The lock is only deleted if it still holds the token, so a lock that
+        expired and was taken by another worker is left alone.
+
+        Args:
+            key: Lock key
+            token: Token returned by acquire_lock()
+
+        Returns:
+            True if the lock was released, False otherwise
+        """
+        try:
+            return bool(self.redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token))
+        except Exception as e:
+            current_app.logger.warning(f"Cache unlock error for key {key}: {e}")
+            return False
+
+    def is_locked(self, key: str) -> bool:
+        """Check whether a lock is currently held.
+
+        Args:
+            key: Lock key
+
+        Returns:
+            True if the lock is held, False otherwise
+        """
+        try:
+            return bool(self.redis_client.exists(key))
+        except Exception:
+            return False
+
+    @property
+    def counters_key(self) -> str:
+        """Key of the hash holding the cache's counters.
+
+        It sits outside the "{cache_prefix}:*" pattern, so it isn't listed
+        or cleared with the cached responses.
+        """
+        return f"{self.cache_prefix}_counters"
+
+    def is_internal_key(self, key: str) -> bool:
+        """Check whether a key holds the cache's own bookkeeping.
+
+        These are the counters hash and the stale copies, pending copies and
+        generation locks of cached responses, which all sit outside the
+        "{cache_prefix}:*" pattern.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            True if the key isn't a cached response
+        """
+        return key == self.counters_key or key.startswith((
+            f"{self.cache_prefix}_stale:",
+            f"{self.cache_prefix}_lock:",
+            f"{self.cache_prefix}_pending:",
+        ))
+
+    def increment_counter(self, name: str, amount: int = 1) -> None:
+        """Increment one of the cache's counters.
+
+        Args:
+            name: Counter name
+            amount: Amount to add
+        """
+        try:
+            self.redis_client.hincrby(self.counters_key, name, amount)
+        except Exception as e:
+            current_app.logger.warning(f"Cache counter error for {name}: {e}")
+
+    def get_counters(self) -> dict[str, int]:
+        """Get the current values of the cache's counters.
+
+        Returns:
+            Dictionary mapping counter names to their values
+        """
+        try:
+            counters: dict = self.redis_client.hgetall(  # type: ignore
+                self.counters_key
+            )
+        except Exception as e:
+            current_app.logger.warning(f"Cache counters error: {e}")
+            return {}
+        return {
+            (k.decode("utf-8") if isinstance(k, bytes) else str(k)): int(v)
+            for k, v in counters.items()
+        }
+
+    def iter_keys(
+        self, pattern: str | None = None, count: int = _SCAN_BATCH_SIZE
+    ) -> Iterator[str]:
+        """Iterate over cache keys matching pattern.
+
+        Uses cursor-based SCAN rather than KEYS so that Redis is never
+        blocked while a large keyspace is walked. As with SCAN, a key
+        may be yielded more than once if the keyspace changes meanwhile.
+
+        Args:
+            pattern: Redis key pattern (defaults to all keys with cache prefix)
+            count: Number of keys to ask Redis for per SCAN call
+
+        Yields:
+            Matching cache keys
+        """
+        if pattern is None:
+            pattern = f"{self.cache_prefix}:*"
+        for key in self.redis_client.scan_iter(match=pattern, count=count):
+            yield key.decode("utf-8") if isinstance(key, bytes) else str(key)
+
     def keys(self, pattern: str | None = None) -> list[str]:
         """List cache keys matching pattern.
 
@@ -176,44 +454,48 @@ class StatsCache:
         Returns:
             List of matching cache keys
         """
-        if pattern is None:
-            pattern = f"{self.cache_prefix}:*"
         try:
-            keys: list[bytes] | list[str] | None = self.redis_client.keys(pattern)  # type: ignore
-            if keys is None:
-                return []
-            return [
-                key.decode("utf-8") if isinstance(key, bytes) else str(key)
-                for key in keys
-            ]
+            return list(dict.fromkeys(self.iter_keys(pattern)))
         except Exception as e:
             current_app.logger.warning(f"Cache keys error: {e}")
             return []
 
+    def get_many(self, keys: list[str]) -> list[Any]:
+        """Get the values of multiple keys with batched MGET calls.
+
+        Args:
+            keys: List of cache keys
+
+        Returns:
+            List of values in the same order as keys, with None for keys
+            that do not exist or do not hold a string value
+        """
+        values: list[Any] = []
+        for batch in batched(keys, _SCAN_BATCH_SIZE):
+            values.extend(self.redis_client.mget(batch))  # type: ignore
+        return values
+
     def clear_all(self, pattern: str | None = None) -> tuple[bool, int]:
         """Clear all cache entries matching pattern.
 
+        Keys are deleted in batches as they are scanned, so memory use and
+        the length of each Redis command stay bounded.
+
         Args:
             pattern: Redis key pattern (defaults to all keys with cache prefix)
 
         Returns:
             Tuple of (success, number_of_deleted_keys)
         """
-        if pattern is None:
-            pattern = f"{self.cache_prefix}:*"
         try:
-            keys: list[bytes] | list[str] | None = self.redis_client.keys(pattern)  # type: ignore
-            if keys is None:
-                current_app.logger.warning(
-                    "Redis keys() returned None - possible connection issue"
-                )
-                return False, 0
+            deleted_count = 0
+            for batch in batched(self.iter_keys(pattern), _SCAN_BATCH_SIZE):
+                deleted_count += self.redis_client.delete(*batch)  # type: ignore
 
-            if not keys:
+            if not deleted_count:
                 current_app.logger.info("No cache entries found to clear")
                 return True, 0
 
-            deleted_count: int = self.redis_client.delete(*keys)
             current_app.logger.info(f"Cleared {deleted_count} cache entries")
             return True, deleted_count
 
@@ -228,14 +510,17 @@ class StatsCache:
             Dictionary with cache size information
         """
         try:
-            # Get all keys in the database (since it's dedicated to
-            # stats cache)
-            all_keys = self.keys("*")
-            key_count = len(all_keys)
-
+            # Walk all keys in the database (since it's dedicated to
+            # stats cache), sizing one batch at a time. The cache's own
+            # bookkeeping keys aren't cached responses, so they're skipped.
+            key_count = 0
             total_memory = 0
-            if all_keys:
-                sizes = self.get_key_sizes_batch(all_keys)
+            cached_keys = (
+                k for k in self.iter_keys("*") if not self.is_internal_key(k)
+            )
+            for batch in batched(cached_keys, _SCAN_BATCH_SIZE):
+                key_count += len(batch)
+                sizes = self.get_key_sizes_batch(list(batch))
                 for size in sizes.values():
                     if size is not None:
                         total_memory += size
@@ -282,7 +567,7 @@ class StatsCache:
         """Get sizes in bytes for multiple cache keys using pipelining.
 
         This is more efficient than calling get_key_size() multiple times
-        as it batches the requests into a single round trip.
+        as it batches the requests into one round trip per 1000 keys.
 
         Args:
             keys: List of cache keys
@@ -295,10 +580,12 @@ class StatsCache:
 
         results: dict[str, int | None] = {}
         try:
-            pipe = self.redis_client.pipeline()
-            for key in keys:
-                pipe.memory_usage(key)  # type: ignore
-            responses = pipe.execute()
+            responses: list[Any] = []
+            for batch in batched(keys, _SCAN_BATCH_SIZE):
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.memory_usage(key)  # type: ignore
+                responses.extend(pipe.execute())
 
             for key, memory_usage in zip(keys, responses, strict=True):
                 if memory_usage is not None:
@@ -317,7 +604,7 @@ class StatsCache:
         """Get TTLs (time to live) for multiple cache keys using pipelining.
 
         This is more efficient than calling get_ttl() multiple times
-        as it batches the requests into a single round trip.
+        as it batches the requests into one round trip per 1000 keys.
 
         Args:
             keys: List of cache keys
@@ -333,11 +620,13 @@ class StatsCache:
 
         results: dict[str, int | None] = {}
         try:
-            # Use pipeline to batch all TTL commands
-            pipe = self.redis_client.pipeline()
-            for key in keys:
-                pipe.ttl(key)
-            responses = pipe.execute()
+            # Use pipelines to batch the TTL commands
+            responses: list[Any] = []
+            for batch in batched(keys, _SCAN_BATCH_SIZE):
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.ttl(key)
+                responses.extend(pipe.execute())
 
             for key, ttl in zip(keys, responses, strict=True):
                 if ttl == -2:  # Key doesn't exist
@@ -367,6 +656,7 @@ class StatsCache:
                     "redis_version": redis_info.get("redis_version", "unknown"),
                     "used_memory_human": redis_info.get("used_memory_human", "unknown"),
                     "connected_clients": redis_info.get("connected_clients", "unknown"),
+                    "counters": self.get_counters(),
                     "timestamp": arrow.utcnow().isoformat(),
                 }
             else:
@@ -386,6 +676,12 @@ class StatsAggregationRegistry(StatsCache):
     This allows us to give users accurate feedback about a
     community's dashboard state when no results return from the
     server.
+
+    Alongside the registry keys themselves, the registry keeps a set
+    per community holding the keys registered for it. Looking up a
+    community's operations then reads that set instead of scanning
+    the whole registry. Entries whose keys have expired are pruned
+    from the set when they are next read.
     """
 
     def __init__(self, cache_prefix: str | None = None):
@@ -414,9 +710,143 @@ class StatsAggregationRegistry(StatsCache):
         """
         return f"{community_id}_{operation}"
 
+    def make_index_key(self, community_id: str) -> str:
+        """Build the key of the set indexing a community's registry keys.
+
+        Args:
+            community_id: Community UUID (or "global")
+
+        Returns:
+            str: Key of the community's index set
+        """
+        return f"{self.cache_prefix}:index:{community_id}"
+
+    @property
+    def index_ready_key(self) -> str:
+        """Key flagging that the community index sets have been built."""
+        return f"{self.cache_prefix}:index_ready"
+
+    def set(
+        self,
+        key: str,
+        value: bytes | str,
+        ttl: int | None = None,
+    ) -> bool:
+        """Set a registry entry and add it to its community's index.
+
+        Args:
+            key: Registry key, as built by make_registry_key()
+            value: Value to store
+            ttl: Time to live in seconds (None = no expiration)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        community_id = key.split("_", 1)[0]
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            if ttl is None:
+                pipe.set(key, value)
+            else:
+                pipe.setex(key, ttl, value)
+            pipe.sadd(self.make_index_key(community_id), key)
+            pipe.execute()
+            return True
+        except Exception as e:
+            current_app.logger.warning(f"Cache set error for key {key}: {e}")
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Delete a registry entry and remove it from its community's index.
+
+        Args:
+            key: Registry key
+
+        Returns:
+            True if deleted, False if not found or error
+        """
+        deleted = super().delete(key)
+        try:
+            self.redis_client.srem(self.make_index_key(key.split("_", 1)[0]), key)
+        except Exception as e:
+            current_app.logger.warning(f"Registry index error for key {key}: {e}")
+        return deleted
+
+    def rebuild_index(self) -> int:
+        """Rebuild the community index sets from the registry keys.
+
+        This is run automatically the first time a community lookup finds
+        no index, so entries registered before the index existed (such as
+        persistent first-run records) are not missed.
+
+        Returns:
+            int: Number of registry keys indexed
+        """
+        indexed = 0
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in self.iter_keys("*"):
+            if key.startswith(f"{self.cache_prefix}:"):
+                continue
+            pipe.sadd(self.make_index_key(key.split("_", 1)[0]), key)
+            indexed += 1
+        pipe.set(self.index_ready_key, arrow.utcnow().isoformat())
+        pipe.execute()
+        current_app.logger.info(f"Indexed {indexed} aggregation registry keys")
+        return indexed
+
+    def get_community_entries(
+        self, community_id: str, pattern: str | None = None
+    ) -> list[tuple[str, str]]:
+        """Get the registry entries of one community from its index.
+
+        This costs two round trips however large the registry is: one to
+        read the community's index set and one MGET for the values.
+
+        Args:
+            community_id: Community UUID (or "global")
+            pattern: Optional glob pattern the full registry keys must
+                match (e.g., "community_id_cache_*")
+
+        Returns:
+            list[tuple[str, str]]: Matching (key, value) tuples.
+        """
+        index_key = self.make_index_key(community_id)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.exists(self.index_ready_key)
+            pipe.smembers(index_key)
+            index_ready, members = pipe.execute()
+            if not index_ready:
+                self.rebuild_index()
+                members = self.redis_client.smembers(index_key)
+
+            keys = sorted(
+                k for k in members if pattern is None or fnmatchcase(k, pattern)
+            )
+            if not keys:
+                return []
+            values = self.get_many(keys)
+
+            expired = [k for k, v in zip(keys, values, strict=True) if v is None]
+            if expired:
+                self.redis_client.srem(index_key, *expired)
+            return [
+                (k, str(v))
+                for k, v in zip(keys, values, strict=True)
+                if v is not None
+            ]
+
+        except Exception as e:
+            current_app.logger.warning(f"Cache read all error: {e}")
+            return []
+
     def get_all(self, pattern: str | None = None) -> list[tuple[str, str]]:
         """Get all items whose keys match the pattern.
 
+        Patterns scoped to a single community (e.g., "community_id_agg*")
+        are answered from that community's index. Any other pattern walks
+        the registry with SCAN and reads the values with batched MGETs.
+
         Args:
             pattern: Redis key pattern (e.g., "community_id_agg*").
                 Defaults to "*" to match all keys.
@@ -426,13 +856,26 @@ class StatsAggregationRegistry(StatsCache):
         """
         if pattern is None:
             pattern = "*"
+        community_id, separator, _ = pattern.partition("_")
+        if separator and not any(c in community_id for c in "*?[\\"):
+            return self.get_community_entries(community_id, pattern)
+
         try:
-            keys: list[str] | None = self.redis_client.keys(pattern)  # type: ignore
-            if keys is None or keys == []:
+            keys = [
+                k
+                for k in dict.fromkeys(self.iter_keys(pattern))
+                if not k.startswith(f"{self.cache_prefix}:")
+            ]
+            if not keys:
                 return []
 
             # With decode_responses=True, values are already strings
-            return [(str(k), str(self.redis_client.get(k))) for k in keys]
+            values = self.get_many(keys)
+            return [
+                (k, str(v))
+                for k, v in zip(keys, values, strict=True)
+                if v is not None
+            ]
 
         except Exception as e:
             current_app.logger.warning(f"Cache read all error: {e}")
@@ -6,7 +6,9 @@
 
 """Data series API query classes for invenio-stats-dashboard."""
 
-import gc
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any, cast
 
 import arrow
 import orjson
@@ -27,6 +29,11 @@ from ..transformers.record_snapshots import RecordSnapshotDataSeriesSet
 from ..transformers.types import DataSeriesDict
 from ..transformers.usage_deltas import UsageDeltaDataSeriesSet
 from ..transformers.usage_snapshots import UsageSnapshotDataSeriesSet
+from ..utils.memory import memory_governor
+
+# Share of the memory headroom available to a query run in this context.
+# Set below 1.0 by callers that run several data series queries at once.
+memory_budget_share: ContextVar[float] = ContextVar("memory_budget_share", default=1.0)
 
 
 class DataSeriesMemoryEstimator:
@@ -86,8 +93,6 @@ class DataSeriesMemoryEstimator:
             cfg.get("STATS_DATA_SERIES_MEM_HIGH_WATER_PERCENT", 0.75)
         )
 
-        self.proc = psutil.Process()
-
         try:
             total_mem = psutil.virtual_memory().total
         except Exception:
@@ -122,6 +127,13 @@ class DataSeriesMemoryEstimator:
         # Set on first iteration, cleared after re-estimation
         self.rss_with_page: int | None = None
 
+        # Queries running concurrently each get an equal share of the headroom
+        # that was left when they started
+        share = memory_budget_share.get()
+        if self.budget_bytes > 0 and share < 1.0:
+            headroom = max(0, self.budget_bytes - self.initial_rss)
+            self.budget_bytes = self.initial_rss + int(headroom * share)
+
         # ===== SECTION 6: Initialize runtime state =====
         # Initial estimates for page memory (re-estimated after first page)
         self.current_page_size = initial_page_size
@@ -227,12 +239,43 @@ class DataSeriesMemoryEstimator:
         Returns:
             int: Current RSS in bytes, or 0 if unavailable.
         """
-        try:
-            if self.proc:
-                return self.proc.memory_info().rss  # type: ignore[union-attr, no-any-return] # noqa: E501
-            return 0
-        except Exception:
-            return 0
+        return memory_governor.get_rss()
+
+    def _additional_memory_needed(self) -> int:
+        """Estimate the additional memory needed to process the next page.
+
+        This covers the next page of documents (temporary, cleared after
+        processing) and all of the remaining series growth from the next page
+        onwards. days_processed already includes the current page, so the
+        remaining documents exclude it.
+
+        Returns:
+            int: The additional memory needed, in bytes.
+        """
+        if self.total_count is not None:
+            remaining_docs = max(0, self.total_count - self.days_processed)
+            remaining_series_growth = self.series_bytes_per_day * remaining_docs
+        else:
+            remaining_series_growth = self.series_bytes_per_day * (
+                self.days_processed + self.current_page_size
+            )
+        return int(self.per_page_bytes + remaining_series_growth)
+
+    def under_pressure(self, current_used_bytes: int | None = None) -> bool:
+        """Check whether processing the next page would exceed the budget.
+
+        Args:
+            current_used_bytes: Current process memory usage in bytes.
+                If None, fetches from proc.
+
+        Returns:
+            bool: True if the predicted peak memory is over budget.
+        """
+        if self.budget_bytes <= 0:
+            return False
+        if current_used_bytes is None:
+            current_used_bytes = self.get_current_rss()
+        return current_used_bytes + self._additional_memory_needed() > self.budget_bytes
 
     def get_current_page_size(self) -> int:
         """Get the current page size.
@@ -262,20 +305,7 @@ class DataSeriesMemoryEstimator:
         if current_used_bytes is None:
             current_used_bytes = self.get_current_rss()
 
-        # Calculate additional memory needed for the NEXT page:
-        # 1. Next page of documents (temporary, will be cleared after processing)
-        # 2. All remaining series growth (from next page onwards)
-        # Note: days_processed already includes the current page, so remaining_docs
-        # excludes the current page, which is already processed.
-        if self.total_count is not None:
-            remaining_docs = max(0, self.total_count - self.days_processed)
-            remaining_series_growth = self.series_bytes_per_day * remaining_docs
-        else:
-            remaining_series_growth = self.series_bytes_per_day * (
-                self.days_processed + self.current_page_size
-            )
-
-        additional_memory_needed = self.per_page_bytes + remaining_series_growth
+        additional_memory_needed = self._additional_memory_needed()
 
         peak_memory = current_used_bytes + additional_memory_needed
 
@@ -555,8 +585,9 @@ class DataSeriesQueryBase(Query):
         search_index: str,
         must_clauses: list[dict],
         date_field: str,
-        series_set: DataSeriesSet,
+        series_set: DataSeriesSet | list[DataSeriesSet],
         total_count: int | None = None,
+        sample_doc_bytes: int | None = None,
     ) -> None:
         """Fetch documents using pagination and add them incrementally.
 
@@ -568,16 +599,21 @@ class DataSeriesQueryBase(Query):
             search_index: The index to search
             must_clauses: Query clauses for the search
             date_field: Field to sort by (also used for search_after)
-            series_set: DataSeriesSet instance to add documents to
+            series_set: DataSeriesSet instance to add documents to, or a list
+                of instances that are each fed every page
             total_count: Total number of documents in the query (for memory estimation)
+            sample_doc_bytes: Serialized size of a sample document, if already
+                known. Otherwise a sample document is fetched to measure it.
         """
+        series_sets = series_set if isinstance(series_set, list) else [series_set]
         initial_page_size = self._get_page_size()
-        series_count = self._calculate_series_count(series_set)
+        series_count = sum(self._calculate_series_count(s) for s in series_sets)
 
         # Fetch a sample document to get accurate initial size estimate
-        sample_doc_bytes = self._measure_sample_document_bytes(
-            search_index, must_clauses
-        )
+        if sample_doc_bytes is None:
+            sample_doc_bytes = self._measure_sample_document_bytes(
+                search_index, must_clauses
+            )
 
         estimator = DataSeriesMemoryEstimator(
             series_count=series_count,
@@ -626,7 +662,8 @@ class DataSeriesQueryBase(Query):
                 page_documents = [h["_source"] for h in hits]
 
                 # Process this page
-                series_set.add(page_documents)
+                for page_series_set in series_sets:
+                    page_series_set.add(page_documents)
                 page_count = len(page_documents)
                 days_processed += page_count
 
@@ -639,7 +676,7 @@ class DataSeriesQueryBase(Query):
                 del hits
                 del page_documents
                 del response
-                gc.collect()
+                memory_governor.relieve("data_series_pages", estimator.under_pressure)
 
                 # Update page size (re-estimates if first page, then adjusts)
                 current_page_size = estimator.update_page_size(days_processed)
@@ -945,54 +982,340 @@ class CategoryDataSeriesQueryBase(DataSeriesQueryBase):
                             If provided, only metrics used by these components will
                             be included.
 
-        Raises:
-            ValueError: if the community can't be found.
-            AssertionError: if the index doesn't exist.
-
         Returns:
             Dictionary of DataSeries objects or Response with serialized data
         """
-        if community_id != "global":
+        series_set = self._build_series_set(
+            community_id, start_date, end_date, date_basis, optimize, component_names
+        )
+
+        # Get the complete data series set with camelCase conversion
+        json_result = series_set.for_json()
+
+        # Return raw data only - content negotiation handled by view
+        return json_result
+
+    def run_json(
+        self,
+        community_id: str = "global",
+        start_date: str | None = None,
+        end_date: str | None = None,
+        date_basis: str = "added",
+        optimize: bool = False,
+        component_names: set[str] | None = None,
+    ) -> Iterator[bytes]:
+        """Run the query, serializing the data series straight to JSON.
+
+        Takes the same arguments as run(). The data series are serialized
+        one metric block at a time, so the dictionary returned by run() is
+        never built in full.
+
+        Returns:
+            Iterator[bytes]: Chunks of the JSON document that run() would
+                return the data for.
+        """
+        series_set = self._build_series_set(
+            community_id, start_date, end_date, date_basis, optimize, component_names
+        )
+        return series_set.iter_json()
+
+    @staticmethod
+    def iter_series_sets(
+        queries: list[tuple["CategoryDataSeriesQueryBase", dict[str, Any]]],
+    ) -> Iterator[tuple[int, DataSeriesSet]]:
+        """Build the data series sets for several category queries together.
+
+        Each community is resolved once. Queries that read the same documents
+        (the same index and query clauses) share a single paginated scan,
+        which feeds every one of their data series sets. The document count
+        and a sample document for every scan are fetched in one msearch
+        request, instead of a count and a sample query per category.
+
+        Each data series set is yielded as soon as its scan has finished, and
+        no reference to it is kept afterwards, so callers can write out and
+        drop each set before the next scan runs.
+
+        Args:
+            queries: (query, parameters) pairs, where the parameters are the
+                keyword arguments run() would be called with.
+
+        Yields:
+            tuple[int, DataSeriesSet]: The position of each query with its
+                data series set. Every query gets exactly one set.
+        """
+        communities: dict[str, str] = {}
+        series_sets: list[DataSeriesSet | None] = []
+        scans: dict[tuple[str, str, bytes], list[int]] = {}
+        scan_clauses: dict[tuple[str, str, bytes], list[dict]] = {}
+
+        for position, (query, params) in enumerate(queries):
+            community_id = params.get("community_id", "global")
+            if community_id not in communities:
+                communities[community_id] = query._resolve_community(community_id)
+            series_sets.append(
+                query._new_series_set(
+                    params.get("optimize", False), params.get("component_names")
+                )
+            )
             try:
-                community = current_communities.service.read(
-                    system_identity, community_id
+                search_index, must_clauses = query._prepare_search(
+                    communities[community_id],
+                    params.get("start_date"),
+                    params.get("end_date"),
+                    params.get("date_basis", "added"),
                 )
-                community_id = community.id
-            except Exception as e:
-                raise ValueError(f"Community {community_id} not found: {str(e)}") from e
+            except AssertionError as e:
+                current_app.logger.error(f"Index does not exist: {query.index} {e}")
+                yield position, cast(DataSeriesSet, series_sets[position])
+                series_sets[position] = None
+                continue
+            scan_key = (search_index, query.date_field, orjson.dumps(must_clauses))
+            scans.setdefault(scan_key, []).append(position)
+            scan_clauses[scan_key] = must_clauses
+
+        if not scans:
+            return
 
-        search_index = self._get_index_for_date_basis(date_basis)
+        # One round trip for the count and a sample document of every scan
+        msearch_body: list[dict] = []
+        for scan_key in scans:
+            msearch_body.append({"index": scan_key[0]})
+            msearch_body.append(
+                {
+                    "query": {"bool": {"must": scan_clauses[scan_key]}},
+                    "size": 1,
+                    "track_total_hits": True,
+                }
+            )
+        client = queries[0][0].client
+        try:
+            probes = client.msearch(body=msearch_body)["responses"]
+        except Exception as e:
+            current_app.logger.warning(f"Document count msearch failed: {e}")
+            probes = [{} for _ in scans]
+
+        for (scan_key, positions), probe in zip(scans.items(), probes, strict=True):
+            search_index, date_field, _ = scan_key
+            total_count: int | None = None
+            sample_doc_bytes: int | None = None
+            if probe.get("hits"):
+                total_count = int(probe["hits"]["total"]["value"])
+                hits = probe["hits"]["hits"]
+                if hits:
+                    sample_doc_bytes = len(
+                        orjson.dumps(hits[0]["_source"], option=orjson.OPT_NAIVE_UTC)
+                    )
 
-        # Build search query
-        must_clauses: list[dict] = [
-            {"term": {"community_id": community_id}},
-        ]
-        range_clauses: dict[str, dict[str, str]] = {self.date_field: {}}
-        if start_date:
-            range_clauses[self.date_field]["gte"] = (
-                arrow.get(start_date).floor("day").format("YYYY-MM-DDTHH:mm:ss")
+            if total_count == 0:
+                current_app.logger.info(
+                    f"No results found in {search_index} for "
+                    f"{scan_clauses[scan_key]} - returning empty data series"
+                )
+            else:
+                queries[positions[0]][0]._fetch_documents_paginated_and_add(
+                    search_index,
+                    scan_clauses[scan_key],
+                    date_field,
+                    [
+                        cast(DataSeriesSet, series_sets[position])
+                        for position in positions
+                    ],
+                    total_count,
+                    sample_doc_bytes,
+                )
+
+            for position in positions:
+                series_set = cast(DataSeriesSet, series_sets[position])
+                series_sets[position] = None
+                yield position, series_set
+            del series_set
+
+    def iter_community_series_sets(
+        self,
+        community_params: dict[str, dict[str, Any]],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        date_basis: str = "added",
+    ) -> Iterator[tuple[str, DataSeriesSet]]:
+        """Build data series sets for many communities in a single scan.
+
+        The aggregation index is scanned once for all of the communities,
+        sorted by community and date, using a point in time (PIT) with
+        search_after so that the scan sees one consistent view of the index.
+        Each community's documents are streamed into its own data series set,
+        which is yielded as soon as that community's slice of the scan ends.
+        If the cluster doesn't support PIT, the same sorted search_after scan
+        is run without one.
+
+        Args:
+            community_params: Maps each resolved community ID (or "global") to
+                its "optimize" and "component_names" parameters.
+            start_date: The start date.
+            end_date: The end date.
+            date_basis: The date basis for the query.
+
+        Yields:
+            tuple[str, DataSeriesSet]: Each community ID with its data series
+                set. Communities without documents come last, with empty sets.
+        """
+        community_ids = sorted(community_params)
+        yielded: set[str] = set()
+
+        def new_set(community_id: str) -> DataSeriesSet:
+            params = community_params[community_id]
+            return self._new_series_set(
+                params.get("optimize", False), params.get("component_names")
             )
-        if end_date:
-            range_clauses[self.date_field]["lte"] = (
-                arrow.get(end_date).ceil("day").format("YYYY-MM-DDTHH:mm:ss")
+
+        try:
+            search_index, must_clauses = self._prepare_search(
+                community_ids, start_date, end_date, date_basis
             )
-        if range_clauses:
-            must_clauses.append({"range": range_clauses})
+        except AssertionError as e:
+            current_app.logger.error(f"Index does not exist: {self.index} {e}")
+            search_index = None
 
-        # Execute search (prefix-aware)
-        alias_name, index_pattern = self._prefixed_search_targets(str(search_index))
+        if search_index is not None:
+            keep_alive = "5m"
+            pit_id: str | None = None
+            try:
+                pit_id = self.client.create_pit(
+                    index=search_index, keep_alive=keep_alive
+                )["pit_id"]
+            except Exception as e:
+                current_app.logger.info(
+                    f"Could not open a point in time on {search_index}, "
+                    f"scanning without one: {e}"
+                )
 
-        try:
-            if self.client.indices.exists_alias(name=alias_name):
-                final_search_index = alias_name
-            else:
-                indices = self.client.indices.get(index_pattern)
-                if not indices:
-                    raise AssertionError(
-                        f"No indices found for alias '{alias_name}' or pattern "
-                        f"{index_pattern}'"
+            estimator = DataSeriesMemoryEstimator(
+                series_count=self._calculate_series_count(new_set(community_ids[0])),
+                initial_page_size=self._get_page_size(),
+            )
+            page_size = estimator.get_current_page_size()
+            search_after: list | None = None
+            current_id: str | None = None
+            current_set: DataSeriesSet | None = None
+            current_days = 0
+            first_page = True
+
+            try:
+                while True:
+                    body: dict[str, Any] = {
+                        "query": {"bool": {"must": must_clauses}},
+                        "size": page_size,
+                        "sort": [
+                            {"community_id": "asc"},
+                            {self.date_field: "asc"},
+                            {"_id": "asc"},
+                        ],
+                    }
+                    if search_after:
+                        body["search_after"] = search_after
+                    if pit_id:
+                        body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+                        response = self.client.search(body=body)
+                        pit_id = response.get("pit_id", pit_id)
+                    else:
+                        response = self.client.search(index=search_index, body=body)
+
+                    hits = response["hits"]["hits"]
+                    if not hits:
+                        break
+                    search_after = hits[-1].get("sort")
+
+                    # Split the page into runs of documents per community
+                    run_start = 0
+                    for position in range(len(hits) + 1):
+                        community_id = (
+                            hits[position]["_source"].get("community_id")
+                            if position < len(hits)
+                            else None
+                        )
+                        if position < len(hits) and community_id == current_id:
+                            continue
+                        if current_set is not None and position > run_start:
+                            current_set.add(
+                                [h["_source"] for h in hits[run_start:position]]
+                            )
+                            current_days += position - run_start
+                        if position == len(hits):
+                            break
+                        # A new community's slice starts, so the last one is done
+                        if current_set is not None and current_id is not None:
+                            yielded.add(current_id)
+                            yield current_id, current_set
+                        current_id = community_id
+                        current_set = (
+                            new_set(community_id)
+                            if community_id in community_params
+                            else None
+                        )
+                        current_days = 0
+                        run_start = position
+
+                    if first_page:
+                        estimator.capture_page_rss()
+                        first_page = False
+                    last_page = len(hits) < page_size or not search_after
+                    del hits
+                    del response
+                    if last_page:
+                        break
+                    memory_governor.relieve(
+                        "data_series_community_scan", estimator.under_pressure
                     )
-                final_search_index = index_pattern
+                    page_size = estimator.update_page_size(current_days)
+            finally:
+                if pit_id:
+                    try:
+                        self.client.delete_pit(body={"pit_id": [pit_id]})
+                    except Exception as e:
+                        current_app.logger.debug(f"Could not delete PIT: {e}")
+
+            if current_set is not None and current_id is not None:
+                yielded.add(current_id)
+                yield current_id, current_set
+
+        for community_id in community_ids:
+            if community_id not in yielded:
+                yield community_id, new_set(community_id)
+
+    def _build_series_set(
+        self,
+        community_id: str,
+        start_date: str | None,
+        end_date: str | None,
+        date_basis: str,
+        optimize: bool,
+        component_names: set[str] | None,
+    ) -> DataSeriesSet:
+        """Fetch the aggregation documents and add them to a data series set.
+
+        Args:
+            community_id: The community ID (UUID or slug). If "global", the
+                query will be run for the entire repository. Default is "global".
+            start_date: The start date. Can be a date string parseable by
+                arrow.get() or a datetime object.
+            end_date: The end date. Can be a date string parseable by
+                arrow.get() or a datetime object.
+            date_basis: The date basis for the query ("added", "created",
+                "published"). Default is "added".
+            optimize: If True, only include metrics used by UI components.
+            component_names: Optional set of component names to filter metrics by.
+                            If provided, only metrics used by these components will
+                            be included.
+
+        Returns:
+            DataSeriesSet: The data series set holding every document.
+        """
+        community_id = self._resolve_community(community_id)
+        series_set = self._new_series_set(optimize, component_names)
+
+        try:
+            final_search_index, must_clauses = self._prepare_search(
+                community_id, start_date, end_date, date_basis
+            )
 
             # Get total count for memory estimation
             count_search = Search(using=self.client, index=final_search_index).query(
@@ -1008,24 +1331,7 @@ class CategoryDataSeriesQueryBase(DataSeriesQueryBase):
                     f" for the period {start_date} to {end_date} - "
                     f"returning empty data series"
                 )
-                # Create empty data series set
-                series_set = self.transformer_class(
-                    documents=[],
-                    series_keys=None,  # None means use all available
-                    optimize=optimize,
-                    category=getattr(self, "category", None),
-                    component_names=component_names,
-                )
             else:
-                # Create data series set with empty initial list
-                series_set = self.transformer_class(
-                    documents=[],
-                    series_keys=None,  # None means use all available
-                    optimize=optimize,
-                    category=getattr(self, "category", None),
-                    component_names=component_names,
-                )
-
                 # Fetch and add documents incrementally using pagination
                 self._fetch_documents_paginated_and_add(
                     final_search_index,
@@ -1037,20 +1343,97 @@ class CategoryDataSeriesQueryBase(DataSeriesQueryBase):
 
         except AssertionError as e:
             current_app.logger.error(f"Index does not exist: {self.index} {e}")
-            # Create empty data series set
-            series_set = self.transformer_class(
-                documents=[],
-                series_keys=None,  # None means use all available
-                optimize=optimize,
-                category=getattr(self, "category", None),
-                component_names=component_names,
-            )
 
-        # Get the complete data series set with camelCase conversion
-        json_result = series_set.for_json()
+        return series_set
 
-        # Return raw data only - content negotiation handled by view
-        return json_result
+    def _resolve_community(self, community_id: str) -> str:
+        """Resolve a community slug or ID to the community's ID.
+
+        Returns:
+            str: The community ID, or "global".
+
+        Raises:
+            ValueError: if the community can't be found.
+        """
+        if community_id == "global":
+            return community_id
+        try:
+            community = current_communities.service.read(system_identity, community_id)
+        except Exception as e:
+            raise ValueError(f"Community {community_id} not found: {str(e)}") from e
+        return str(community.id)
+
+    def _new_series_set(
+        self, optimize: bool, component_names: set[str] | None
+    ) -> DataSeriesSet:
+        """Create an empty data series set for this category.
+
+        Returns:
+            DataSeriesSet: The empty data series set.
+        """
+        return self.transformer_class(
+            documents=[],
+            series_keys=None,  # None means use all available
+            optimize=optimize,
+            category=getattr(self, "category", None),
+            component_names=component_names,
+        )
+
+    def _prepare_search(
+        self,
+        community_id: str | list[str],
+        start_date: str | None,
+        end_date: str | None,
+        date_basis: str,
+    ) -> tuple[str, list[dict]]:
+        """Find the index to search and build the query clauses.
+
+        Args:
+            community_id: The resolved community ID, or "global". A list of
+                IDs matches the documents of any of those communities.
+            start_date: The start date.
+            end_date: The end date.
+            date_basis: The date basis for the query.
+
+        Returns:
+            tuple[str, list[dict]]: The alias or index pattern to search and
+                the bool query's must clauses.
+
+        Raises:
+            AssertionError: if the index doesn't exist.
+        """
+        search_index = self._get_index_for_date_basis(date_basis)
+
+        # Build search query
+        must_clauses: list[dict] = [
+            (
+                {"terms": {"community_id": community_id}}
+                if isinstance(community_id, list)
+                else {"term": {"community_id": community_id}}
+            ),
+        ]
+        range_clauses: dict[str, dict[str, str]] = {self.date_field: {}}
+        if start_date:
+            range_clauses[self.date_field]["gte"] = (
+                arrow.get(start_date).floor("day").format("YYYY-MM-DDTHH:mm:ss")
+            )
+        if end_date:
+            range_clauses[self.date_field]["lte"] = (
+                arrow.get(end_date).ceil("day").format("YYYY-MM-DDTHH:mm:ss")
+            )
+        if range_clauses:
+            must_clauses.append({"range": range_clauses})
+
+        # Resolve the search target (prefix-aware)
+        alias_name, index_pattern = self._prefixed_search_targets(str(search_index))
+        if self.client.indices.exists_alias(name=alias_name):
+            return alias_name, must_clauses
+        indices = self.client.indices.get(index_pattern)
+        if not indices:
+            raise AssertionError(
+                f"No indices found for alias '{alias_name}' or pattern {index_pattern}'"
+            )
+        return index_pattern, must_clauses
 
 
 class UsageSnapshotCategoryQuery(CategoryDataSeriesQueryBase):
@@ -0,0 +1,371 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Label resolution for subcount items."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from itertools import batched
+from typing import Any
+
+import orjson
+from flask import current_app
+from invenio_search.proxies import current_search_client
+from invenio_search.utils import prefix_index
+
+from .cache_utils import StatsCache
+
+# Number of ids looked up per vocabulary search or top_hits fallback search
+_LOOKUP_BATCH_SIZE = 1000
+
+_lru: OrderedDict[tuple[str, str], Any] = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+def label_cache_enabled() -> bool:
+    """Check whether subcount labels are resolved through the label cache.
+
+    Returns:
+        bool: True if labeled subcount aggregations can omit their top_hits
+            "label" sub-aggregation.
+    """
+    return bool(current_app.config.get("COMMUNITY_STATS_LABEL_CACHE_ENABLED", True))
+
+
+class SubcountLabelCache:
+    """Resolve subcount item ids to their display labels.
+
+    Labeled subcount aggregations used to attach a top_hits "label"
+    sub-aggregation to every terms bucket, only to recover each item's label
+    from a sample document. With the label cache they return bare terms
+    buckets, and the labels are filled in afterwards from three tiers:
+
+    - an in-process LRU of COMMUNITY_STATS_LABEL_CACHE_SIZE labels,
+    - a Redis hash per subcount field, shared by all workers and kept for
+      COMMUNITY_STATS_LABEL_CACHE_TTL seconds,
+    - the vocabulary, subjects, affiliations and funders indices, as
+      configured in COMMUNITY_STATS_LABEL_VOCABULARIES.
+
+    Ids that none of these know are looked up with a single top_hits
+    aggregation restricted to those ids, and the labels found are cached too.
+    Ids the lookup finds no label for are remembered in a second Redis hash
+    for COMMUNITY_STATS_LABEL_CACHE_MISS_TTL seconds, so they aren't looked
+    up again by every aggregation run.
+    Labels are stored in the same shape the aggregators would extract from a
+    sample document (a string or a dict of translated titles).
+    """
+
+    def __init__(self, client=None) -> None:
+        """Initialize the label cache.
+
+        Args:
+            client: The OpenSearch client to use for lookups.
+        """
+        self.client = client or current_search_client
+        self.ttl = int(
+            current_app.config.get("COMMUNITY_STATS_LABEL_CACHE_TTL", 604800)
+        )
+        self.miss_ttl = int(
+            current_app.config.get("COMMUNITY_STATS_LABEL_CACHE_MISS_TTL", 86400)
+        )
+        self.vocabularies: dict[str, dict] = current_app.config.get(
+            "COMMUNITY_STATS_LABEL_VOCABULARIES", {}
+        )
+        self.prefix = current_app.config.get(
+            "COMMUNITY_STATS_LABEL_CACHE_PREFIX", "stats_labels"
+        )
+        self._cache: StatsCache | None = None
+
+    @property
+    def cache(self) -> StatsCache:
+        """The shared Redis tier, connected on first use.
+
+        Returns:
+            StatsCache: The cache holding the label hashes.
+        """
+        if self._cache is None:
+            self._cache = StatsCache(cache_prefix=self.prefix)
+        return self._cache
+
+    def make_hash_key(self, subcount_key: str, label_field: str) -> str:
+        """Make the Redis key of the hash holding a subcount field's labels.
+
+        Returns:
+            str: The hash key.
+        """
+        return f"{self.prefix}:{subcount_key}:{label_field}"
+
+    @staticmethod
+    def clear_local() -> None:
+        """Empty the in-process LRU shared by all label caches."""
+        with _lru_lock:
+            _lru.clear()
+
+    def resolve(
+        self,
+        subcount_key: str,
+        label_field: str,
+        ids: Iterable[Any],
+        fallback_index: str,
+        fallback_field: str,
+        label_includes: list[str],
+        extract_label: Callable[[dict, str], Any],
+    ) -> dict[str, Any]:
+        """Resolve the labels of a subcount's item ids.
+
+        Args:
+            subcount_key: The subcount's key in COMMUNITY_STATS_SUBCOUNTS.
+            label_field: The field the labels are read from.
+            ids: The item ids (the terms bucket keys).
+            fallback_index: The index to run the top_hits fallback on.
+            fallback_field: The field the terms buckets are built from.
+            label_includes: The source fields the top_hits fallback returns.
+            extract_label: Extracts the label from a fallback terms bucket
+                (with its "label" top_hits) and the bucket key. Returns a
+                falsy value if the bucket has no label.
+
+        Returns:
+            dict[str, Any]: The labels found, by id. Ids without a label are
+                left out.
+        """
+        hash_key = self.make_hash_key(subcount_key, label_field)
+        missing = sorted({str(i) for i in ids if i not in (None, "")})
+        labels = self._get_local(hash_key, missing)
+        missing = [i for i in missing if i not in labels]
+        if not missing:
+            return labels
+
+        shared = self._get_shared(hash_key, missing)
+        labels.update(shared)
+        missing = [i for i in missing if i not in shared]
+        if missing:
+            known_misses = self._get_misses(hash_key, missing)
+            missing = [i for i in missing if i not in known_misses]
+
+        found: dict[str, Any] = {}
+        if missing and subcount_key in self.vocabularies:
+            found.update(
+                self._lookup_vocabulary(self.vocabularies[subcount_key], missing)
+            )
+            missing = [i for i in missing if i not in found]
+        if missing:
+            found.update(
+                self._lookup_top_hits(
+                    fallback_index,
+                    fallback_field,
+                    label_includes,
+                    missing,
+                    extract_label,
+                )
+            )
+
+        if found:
+            self._set_shared(hash_key, found)
+        not_found = [i for i in missing if i not in found]
+        if not_found:
+            self._set_misses(hash_key, not_found)
+        labels.update(found)
+        self._set_local(hash_key, {**shared, **found})
+        return labels
+
+    def _get_local(self, hash_key: str, ids: list[str]) -> dict[str, Any]:
+        """Get labels from the in-process LRU.
+
+        Returns:
+            dict[str, Any]: The labels found, by id.
+        """
+        labels = {}
+        with _lru_lock:
+            for item_id in ids:
+                label = _lru.get((hash_key, item_id))
+                if label is not None:
+                    _lru.move_to_end((hash_key, item_id))
+                    labels[item_id] = label
+        return labels
+
+    def _set_local(self, hash_key: str, labels: dict[str, Any]) -> None:
+        """Add labels to the in-process LRU, evicting the oldest.
+
+        The LRU is shared by all label caches in the process, so its size is
+        always read from COMMUNITY_STATS_LABEL_CACHE_SIZE.
+        """
+        max_size = int(
+            current_app.config.get("COMMUNITY_STATS_LABEL_CACHE_SIZE", 50000)
+        )
+        with _lru_lock:
+            for item_id, label in labels.items():
+                _lru[(hash_key, item_id)] = label
+                _lru.move_to_end((hash_key, item_id))
+            while len(_lru) > max_size:
+                _lru.popitem(last=False)
+
+    def _get_shared(self, hash_key: str, ids: list[str]) -> dict[str, Any]:
+        """Get labels from the shared Redis hash.
+
+        Returns:
+            dict[str, Any]: The labels found, by id.
+        """
+        labels = {}
+        try:
+            for chunk in batched(ids, _LOOKUP_BATCH_SIZE):
+                values = self.cache.redis_client.hmget(hash_key, list(chunk))
+                for item_id, value in zip(chunk, values, strict=True):
+                    if value is not None:
+                        labels[item_id] = orjson.loads(value)
+        except Exception as e:
+            current_app.logger.warning(f"Label cache get error for {hash_key}: {e}")
+        return labels
+
+    def _set_shared(self, hash_key: str, labels: dict[str, Any]) -> None:
+        """Add labels to the shared Redis hash and refresh its expiry."""
+        try:
+            pipe = self.cache.redis_client.pipeline(transaction=False)
+            pipe.hset(
+                hash_key,
+                mapping={k: orjson.dumps(v) for k, v in labels.items()},
+            )
+            pipe.expire(hash_key, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            current_app.logger.warning(f"Label cache set error for {hash_key}: {e}")
+
+    def _get_misses(self, hash_key: str, ids: list[str]) -> set[str]:
+        """Get the ids a recent lookup found no label for.
+
+        Each id is stored with the time its miss expires, so that adding
+        misses to the hash doesn't extend the older ones.
+
+        Returns:
+            set[str]: The ids with an unexpired miss.
+        """
+        misses = set()
+        now = time.time()
+        try:
+            for chunk in batched(ids, _LOOKUP_BATCH_SIZE):
+                values = self.cache.redis_client.hmget(
+                    f"{hash_key}:misses", list(chunk)
+                )
+                for item_id, value in zip(chunk, values, strict=True):
+                    if value is not None and float(value) > now:
+                        misses.add(item_id)
+        except Exception as e:
+            current_app.logger.warning(
+                f"Label cache get error for {hash_key}:misses: {e}"
+            )
+        return misses
+
+    def _set_misses(self, hash_key: str, ids: list[str]) -> None:
+        """Remember ids that no lookup found a label for."""
+        if self.miss_ttl <= 0:
+            return
+        expires = time.time() + self.miss_ttl
+        try:
+            pipe = self.cache.redis_client.pipeline(transaction=False)
+            pipe.hset(f"{hash_key}:misses", mapping=dict.fromkeys(ids, expires))
+            pipe.expire(f"{hash_key}:misses", self.miss_ttl)
+            pipe.execute()
+        except Exception as e:
+            current_app.logger.warning(
+                f"Label cache set error for {hash_key}:misses: {e}"
+            )
+
+    def _lookup_vocabulary(self, vocabulary: dict, ids: list[str]) -> dict[str, Any]:
+        """Look up labels in a vocabulary index.
+
+        Args:
+            vocabulary: The vocabulary config, with the "index" to search, the
+                source "label" field and optionally the vocabulary "type".
+            ids: The ids to look up.
+
+        Returns:
+            dict[str, Any]: The labels found, by id.
+        """
+        labels: dict[str, Any] = {}
+        label_path = vocabulary["label"].split(".")
+        for chunk in batched(ids, _LOOKUP_BATCH_SIZE):
+            filters: list[dict] = [{"terms": {"id": list(chunk)}}]
+            if vocabulary.get("type"):
+                filters.append({"term": {"type.id": vocabulary["type"]}})
+            try:
+                response = self.client.search(
+                    index=prefix_index(vocabulary["index"]),
+                    body={
+                        "query": {"bool": {"filter": filters}},
+                        "size": len(chunk),
+                        "_source": ["id", vocabulary["label"]],
+                    },
+                )
+            except Exception as e:
+                current_app.logger.warning(
+                    f"Label lookup in {vocabulary['index']} failed: {e}"
+                )
+                return labels
+            for hit in response["hits"]["hits"]:
+                label: Any = hit["_source"]
+                for part in label_path:
+                    label = label.get(part) if isinstance(label, dict) else None
+                if label and isinstance(label, str | dict):
+                    labels[str(hit["_source"]["id"])] = label
+        return labels
+
+    def _lookup_top_hits(
+        self,
+        index: str,
+        field: str,
+        label_includes: list[str],
+        ids: list[str],
+        extract_label: Callable[[dict, str], Any],
+    ) -> dict[str, Any]:
+        """Look up labels from a sample document for each id.
+
+        This runs the top_hits "label" sub-aggregation the subcount
+        aggregations used to include, restricted to the unknown ids and
+        without the aggregation's date or community filters, since an item's
+        label doesn't depend on them.
+
+        Returns:
+            dict[str, Any]: The labels found, by id.
+        """
+        labels: dict[str, Any] = {}
+        for chunk in batched(ids, _LOOKUP_BATCH_SIZE):
+            try:
+                response = self.client.search(
+                    index=index,
+                    body={
+                        "size": 0,
+                        "query": {"terms": {field: list(chunk)}},
+                        "aggs": {
+                            "items": {
+                                "terms": {
+                                    "field": field,
+                                    "size": len(chunk),
+                                    "include": list(chunk),
+                                },
+                                "aggs": {
+                                    "label": {
+                                        "top_hits": {
+                                            "size": 1,
+                                            "_source": {
+                                                "includes": label_includes or [field]
+                                            },
+                                        }
+                                    }
+                                },
+                            }
+                        },
+                    },
+                )
+            except Exception as e:
+                current_app.logger.warning(f"Label lookup in {index} failed: {e}")
+                return labels
+            for bucket in response["aggregations"]["items"]["buckets"]:
+                key = str(bucket["key"])
+                label = extract_label(bucket, key)
+                if label:
+                    labels[key] = label
+        return labels
@@ -13,6 +13,8 @@ import os
 import shutil
 import tempfile
 import xml.etree.ElementTree as ET
+import zlib
+from collections.abc import Iterable, Iterator
 
 import arrow
 import brotli
@@ -75,7 +77,77 @@ class CompressedStatsJSONSerializer:
 
         return compressed_data
 
-    def _create_gzip_response(self, compressed_data: bytes) -> Response:
+    def iter_compressed(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Compress a stream of JSON chunks incrementally.
+
+        Each chunk is fed to the compressor as it arrives, so neither the
+        whole uncompressed document nor the whole compressed one has to be
+        held in memory.
+
+        Args:
+            chunks: Consecutive chunks of a JSON document
+
+        Yields:
+            bytes: Consecutive chunks of the compressed document.
+        """
+        if self.compression_method == "brotli":
+            brotli_compressor = brotli.Compressor()
+            for chunk in chunks:
+                compressed_chunk = brotli_compressor.process(chunk)
+                if compressed_chunk:
+                    yield compressed_chunk
+            yield brotli_compressor.finish()
+        else:
+            # wbits=31 writes a gzip header and trailer around the deflate data
+            gzip_compressor = zlib.compressobj(wbits=31)
+            for chunk in chunks:
+                compressed_chunk = gzip_compressor.compress(chunk)
+                if compressed_chunk:
+                    yield compressed_chunk
+            yield gzip_compressor.flush()
+
+    def decompress(self, compressed_data: bytes) -> bytes:
+        """Decompress data compressed with this serializer's method.
+
+        Args:
+            compressed_data: The compressed bytes
+
+        Returns:
+            The decompressed bytes
+        """
+        if self.compression_method == "brotli":
+            return brotli.decompress(compressed_data)
+        return gzip.decompress(compressed_data)
+
+    def make_response(self, compressed_data: bytes | Iterable[bytes]) -> Response:
+        """Create a response for data already compressed with this method.
+
+        Args:
+            compressed_data: The compressed body, or an iterable of its chunks
+
+        Returns:
+            Response: The Flask response object with the matching
+                Content-Encoding.
+        """
+        if self.compression_method == "brotli":
+            return self._create_brotli_response(compressed_data)
+        return self._create_gzip_response(compressed_data)
+
+    def stream_response(self, chunks: Iterable[bytes]) -> Response:
+        """Create a response that compresses JSON chunks as it is sent.
+
+        Args:
+            chunks: Consecutive chunks of a JSON document
+
+        Returns:
+            Response: The Flask response object streaming the compressed
+                response body.
+        """
+        return self.make_response(self.iter_compressed(chunks))
+
+    def _create_gzip_response(
+        self, compressed_data: bytes | Iterable[bytes]
+    ) -> Response:
         """Create a gzip-compressed response.
 
         Returns:
@@ -92,7 +164,9 @@ class CompressedStatsJSONSerializer:
             },
         )
 
-    def _create_brotli_response(self, compressed_data: bytes) -> Response:
+    def _create_brotli_response(
+        self, compressed_data: bytes | Iterable[bytes]
+    ) -> Response:
         """Create a brotli-compressed response.
 
         Returns:
@@ -8,6 +8,7 @@
 """Service for managing cached stats responses."""
 
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, cast
 
 import arrow
@@ -20,6 +21,10 @@ from invenio_search.utils import prefix_index
 from ..constants import FirstRunStatus, RegistryOperation
 from ..models.cached_response import CachedResponse
 from ..resources.cache_utils import StatsAggregationRegistry, StatsCache
+from ..resources.data_series_queries import (
+    CategoryDataSeriesQueryBase,
+    memory_budget_share,
+)
 from .community_dashboards import CommunityDashboardsService
 
 
@@ -102,50 +107,56 @@ class CachedResponseService:
 
             # Check for community/year combinations that need cache updates
             # due to recent aggregations and merge them into years_per_community
-            updated_combinations, years_per_community = (
+            updated_indices, updated_entries, years_per_community = (
                 self._get_updated_aggregation_combinations(
                     registry, years_per_community, community_ids
                 )
             )
-            
+
             all_responses = self._generate_all_response_objects(
                 community_ids, years_per_community, optimize=optimize
             )
-            
+
             # Overwrite responses if:
             # 1. overwrite=True (explicit request)
-            # 2. Current year (always regenerate)
-            # 3. In updated_combinations (recent aggregation)
+            # 2. A recent aggregation updated the index the response reads from
+            # 3. Current year with no record of which indices were updated
             skipped_count = 0
             responses_to_process = []
-            registry_keys_to_cleanup: list[str] = []
-            
+            category_indices: dict[str, str | None] = {}
+
             for response in all_responses:
+                combination = (response.community_id, response.year)
+                index_updated = False
+                if combination in updated_indices:
+                    if response.category not in category_indices:
+                        category_indices[response.category] = (
+                            response.aggregation_index
+                        )
+                    changed = updated_indices[combination]
+                    index_updated = (
+                        changed is None
+                        or category_indices[response.category] in changed
+                    )
+
                 should_overwrite = (
                     overwrite
-                    or response.year == current_year
-                    or (response.community_id, response.year) in updated_combinations
+                    or index_updated
+                    or (
+                        response.year == current_year
+                        and combination not in updated_indices
+                    )
                 )
-                
+
                 if should_overwrite:
                     responses_to_process.append(response)
-                    
-                    # Track registry keys to clean up after processing
-                    if (response.community_id, response.year) in updated_combinations:
-                        operation = RegistryOperation.AGG_UPDATED.replace(
-                            "{year}", str(response.year)
-                        )
-                        registry_key = registry.make_registry_key(
-                            response.community_id, operation
-                        )
-                        registry_keys_to_cleanup.append(registry_key)
-                elif response.year != current_year and self.exists(
+                elif self.exists(
                     response.community_id, response.year, response.category
                 ):
                     skipped_count += 1
                 else:
                     responses_to_process.append(response)
-            
+
             results = self._create(responses_to_process, progress_callback)
             results["skipped"] = skipped_count
 
@@ -153,8 +164,10 @@ class CachedResponseService:
                 first_runs_completing, results, current_year, registry
             )
 
-            for registry_key in registry_keys_to_cleanup:
-                registry.delete(registry_key)
+            # Leave entries that an aggregation rewrote in the meantime
+            for registry_key, value in updated_entries:
+                if registry.get(registry_key) == value:
+                    registry.delete(registry_key)
 
             return results
         finally:
@@ -176,7 +189,7 @@ class CachedResponseService:
             CachedResponse if found in cache, None otherwise
         """
         response = CachedResponse(community_id, year, category)
-        if response.load_from_cache():
+        if response.load_from_cache(self.cache):
             return response
         return None
 
@@ -196,6 +209,10 @@ class CachedResponseService:
     def delete(self, community_id: str, year: int, category: str | None = None) -> bool:
         """Delete cached response(s).
 
+        If STATS_CACHE_STALE_TTL is set, each deleted response is kept for
+        that many seconds as a stale copy, which is served to requests that
+        arrive while the response is being regenerated.
+
         Args:
             community_id: Community ID
             year: Year
@@ -205,16 +222,28 @@ class CachedResponseService:
         Returns:
             True if successful, False otherwise
         """
-        if category:
-            response = CachedResponse(community_id, year, category)
-            success: bool = self.cache.delete(response.cache_key)
-            return success
-        else:
-            results = []
-            for cat in self.categories:
-                response = CachedResponse(community_id, year, cat)
-                results.append(self.cache.delete(response.cache_key))
-            return all(results)
+        categories = [category] if category else self.categories
+        results = [
+            self._delete_response(CachedResponse(community_id, year, cat))
+            for cat in categories
+        ]
+        return all(results)
+
+    def _delete_response(self, response: CachedResponse) -> bool:
+        """Delete one cached response, keeping a stale copy if configured.
+
+        Returns:
+            True if the response was deleted, False otherwise
+        """
+        stale_ttl = current_app.config.get("STATS_CACHE_STALE_TTL", 0)
+        if stale_ttl and self.cache.retire(
+            response.cache_key, response.stale_cache_key, stale_ttl
+        ):
+            current_app.logger.info(f"Deleted cache key: {response.cache_key}")
+            return True
+        # Without a stale copy (or nothing to retire) this is a plain delete
+        success: bool = self.cache.delete(response.cache_key)
+        return success
 
     def exists(self, community_id: str, year: int, category: str) -> bool:
         """Check if a cached response exists.
@@ -420,13 +449,18 @@ class CachedResponseService:
         registry: StatsAggregationRegistry,
         years_per_community: dict[str, list[int]],
         community_ids: list[str],
-    ) -> tuple[set[tuple[str, int]], dict[str, list[int]]]:
+    ) -> tuple[
+        dict[tuple[str, int], set[str] | None],
+        list[tuple[str, str]],
+        dict[str, list[int]],
+    ]:
         """Get community/year combinations that need cache updates and merge them.
 
-        Checks the registry for AGG_UPDATED entries that indicate recent
-        aggregations for historical years. Only includes combinations that are
-        in the current batch being processed. Merges these combinations into
-        years_per_community and adds communities to community_ids as needed.
+        Checks the registry for AGG_UPDATED entries that record recent
+        aggregations, along with the aggregation indices they updated. Only
+        includes combinations that are in the current batch being processed.
+        Merges these combinations into years_per_community and adds communities
+        to community_ids as needed.
 
         Args:
             registry: StatsAggregationRegistry instance
@@ -435,55 +469,65 @@ class CachedResponseService:
 
         Returns:
             Tuple of:
-            - Set of (community_id, year) tuples that need cache updates
+            - Dict mapping (community_id, year) tuples that need cache updates
+              to the set of updated aggregation indices, or to None if every
+              index should be treated as updated
+            - Registry (key, value) entries read, to be deleted once processed
             - Updated years_per_community dict with merged combinations
         """
-        combinations: set[tuple[str, int]] = set()
+        combinations: dict[tuple[str, int], set[str] | None] = {}
+        registry_entries: list[tuple[str, str]] = []
         updated_years_per_community = years_per_community.copy()
         updated_community_ids = community_ids.copy()
         communities_in_batch = set(community_ids)
-        
+
         try:
             pattern = "*_agg_updated_*"
             entries = registry.get_all(pattern)
-            
-            for key, _value in entries:
-                if "_agg_updated_" in key:
-                    parts = key.split("_agg_updated_")
-                    if len(parts) == 2:
-                        community_id = parts[0]
-                        
-                        if community_id not in communities_in_batch:
-                            continue
-                        
-                        try:
-                            year = int(parts[1])
-                            combinations.add((community_id, year))
-                            
-                            # Merge into years_per_community
-                            if community_id not in updated_years_per_community:
-                                updated_years_per_community[community_id] = []
-                            if year not in updated_years_per_community[community_id]:
-                                updated_years_per_community[community_id].append(year)
-                            
-                            # Add community to community_ids if not already present
-                            if community_id not in updated_community_ids:
-                                updated_community_ids.append(community_id)
-                                
-                        except ValueError:
-                            current_app.logger.warning(
-                                f"Could not parse year from registry key: {key}"
-                            )
+
+            for key, value in entries:
+                community_id, separator, suffix = key.partition("_agg_updated_")
+                if not separator or community_id not in communities_in_batch:
+                    continue
+
+                # Keys are "<community>_agg_updated_<year>", optionally
+                # followed by "_<index>" naming the updated index
+                year_str, _, index = suffix.partition("_")
+                try:
+                    year = int(year_str)
+                except ValueError:
+                    current_app.logger.warning(
+                        f"Could not parse year from registry key: {key}"
+                    )
+                    continue
+
+                registry_entries.append((key, value))
+                indices = combinations.setdefault((community_id, year), set())
+                if not index:
+                    combinations[(community_id, year)] = None
+                elif indices is not None:
+                    indices.add(index)
+
+                # Merge into years_per_community
+                if community_id not in updated_years_per_community:
+                    updated_years_per_community[community_id] = []
+                if year not in updated_years_per_community[community_id]:
+                    updated_years_per_community[community_id].append(year)
+
+                # Add community to community_ids if not already present
+                if community_id not in updated_community_ids:
+                    updated_community_ids.append(community_id)
+
         except Exception as e:
             current_app.logger.warning(
                 f"Error reading updated aggregation combinations: {e}"
             )
-        
+
         # Update community_ids in place (since it's a list reference)
         community_ids.clear()
         community_ids.extend(updated_community_ids)
-        
-        return combinations, updated_years_per_community
+
+        return combinations, registry_entries, updated_years_per_community
 
     def _get_community_creation_year(self, community_id: str) -> int | None:
         """Get the creation year for a community.
@@ -625,9 +669,72 @@ class CachedResponseService:
         """
         # Create CachedResponse and let it handle cache/generation
         response = CachedResponse.from_request_data(request_data)
-        response.get_or_generate()
+        response.get_or_generate(self.cache)
 
-        # Return in requested format
+        return self.format_response(response, as_json_bytes)
+
+    def get_or_create_many(
+        self, request_data: dict, as_json_bytes: bool = False
+    ) -> dict[str, bytes | dict | list]:
+        """Get cached responses for several queries, generating any misses.
+
+        All of the cache keys are read in a single Redis round trip. Only
+        the queries that miss the cache fall back to generation.
+
+        Args:
+            request_data: Raw request data from API, mapping each query name
+                to its query data.
+            as_json_bytes: If True, return JSON bytes. If False, return Python
+                dicts.
+
+        Returns:
+            dict mapping each query name to its result, in request order.
+        """
+        return {
+            query_name: self.format_response(response, as_json_bytes)
+            for query_name, response in self.get_or_create_responses(
+                request_data
+            ).items()
+        }
+
+    def get_or_create_responses(self, request_data: dict) -> dict[str, CachedResponse]:
+        """Get CachedResponse objects for several queries, generating any misses.
+
+        Like get_or_create_many(), but returns the loaded responses so that
+        callers can use their stored compressed bodies.
+
+        Args:
+            request_data: Raw request data from API, mapping each query name
+                to its query data.
+
+        Returns:
+            dict mapping each query name to its loaded CachedResponse.
+        """
+        responses = {
+            query_name: CachedResponse.from_request_data({query_name: query_data})
+            for query_name, query_data in request_data.items()
+        }
+        cached_values = self.cache.get_many_with_ttl(
+            [response.cache_key for response in responses.values()]
+        )
+
+        for response in responses.values():
+            cached_data, ttl_seconds = cached_values.get(
+                response.cache_key, (None, None)
+            )
+            if not response.load_cached_value(cached_data, ttl_seconds):
+                response.generate_single_flight(self.cache)
+        return responses
+
+    @staticmethod
+    def format_response(
+        response: CachedResponse, as_json_bytes: bool
+    ) -> bytes | dict | list:
+        """Return a response's data in the requested format.
+
+        Returns:
+            JSON bytes if as_json_bytes=True, otherwise Python dict
+        """
         if as_json_bytes:
             return cast(  # type: ignore[redundant-cast]
                 bytes, response.bytes_data
@@ -680,7 +787,19 @@ class CachedResponseService:
         responses: list[CachedResponse],
         progress_callback: Callable | None = None,
     ) -> dict[str, Any]:
-        """Create responses synchronously.
+        """Create responses, concurrently if so configured.
+
+        Category responses for the same year and category across many
+        communities are generated from one scan of the aggregation index, in
+        batches of STATS_CACHE_COMMUNITY_BATCH_SIZE communities (see
+        _generate_communities). The remaining responses are generated together
+        for each community and year, so that their category queries share
+        document fetches (see _generate_group).
+        With STATS_CACHE_GENERATION_WORKERS above 1, these units of work are
+        generated in a pool of that many threads. Each thread's data series
+        queries get an equal share of the memory budget. Outcomes and progress
+        updates are merged in the calling thread, so the results have the same
+        shape either way.
 
         Args:
             responses: List of CachedResponse objects to generate
@@ -698,72 +817,311 @@ class CachedResponseService:
             "responses": [],
         }
         total_responses = len(responses)
+        batch_size = int(
+            current_app.config.get("STATS_CACHE_COMMUNITY_BATCH_SIZE", 100)
+        )
+        batches: dict[tuple, list[CachedResponse]] = {}
+        groups: dict[tuple[str, int], list[CachedResponse]] = {}
+        for response in responses:
+            batch_key = self._community_batch_key(response) if batch_size > 1 else None
+            if batch_key is not None:
+                batches.setdefault(batch_key, []).append(response)
+            else:
+                groups.setdefault((response.community_id, response.year), []).append(
+                    response
+                )
 
-        for i, response in enumerate(responses):
-            try:
+        units: list[tuple[Callable, list[CachedResponse]]] = []
+        for batch in batches.values():
+            if len(batch) == 1:
+                groups.setdefault((batch[0].community_id, batch[0].year), []).append(
+                    batch[0]
+                )
+                continue
+            for start in range(0, len(batch), batch_size):
+                units.append(
+                    (self._generate_communities, batch[start : start + batch_size])
+                )
+        units.extend((self._generate_group, group) for group in groups.values())
+
+        max_workers = min(
+            int(current_app.config.get("STATS_CACHE_GENERATION_WORKERS", 1)),
+            len(units),
+        )
+        completed = 0
+
+        def merge_group(group: list[CachedResponse], outcomes: list[tuple]) -> None:
+            nonlocal completed
+            for response, outcome in zip(group, outcomes, strict=True):
+                self._merge_outcome(results, response, outcome)
+                completed += 1
                 if progress_callback:
-                    message = (
-                        f"Processing {response.community_id}/"
-                        f"{response.year}/{response.category}"
+                    progress_callback(
+                        completed, total_responses, self._describe(response)
                     )
-                    progress_callback(i, total_responses, message)
-
-                response.generate()
-
-                if response.aggregation_complete:
-                    # Redis SET operation atomically overwrites existing keys
-                    if response.save_to_cache():
-                        results["success"] += 1  # type:ignore
-                        results["responses"].append(  # type:ignore
-                            {
-                                "community_id": response.community_id,
-                                "year": response.year,
-                                "category": response.category,
-                                "cache_key": response.cache_key,
-                            }
-                        )
-                    else:
-                        results["failed"] += 1  # type:ignore
-                        results["errors"].append(  # type:ignore
-                            {
-                                "community_id": response.community_id,
-                                "year": response.year,
-                                "category": response.category,
-                                "cache_key": response.cache_key,
-                                "error": "Failed to save to cache",
-                            }
-                        )
-                        current_app.logger.error(
-                            f"Failed to save to cache for {response.community_id}/"
-                            f"{response.year}/{response.category}: key "
-                            f"{response.cache_key}"
-                        )
-                else:
-                    # Aggregation incomplete - skip caching but don't count as error
-                    current_app.logger.info(
-                        f"Skipping cache for {response.community_id}/"
-                        f"{response.year}/{response.category} - "
-                        "aggregation incomplete"
-                    )
-                    # Type: ignore needed because results dict is typed as Any
-                    current_skipped = results.get("skipped", 0)  # type: ignore
-                    results["skipped"] = current_skipped + 1  # type: ignore
-            except Exception as e:
-                results["failed"] += 1  # type:ignore
-                results["errors"].append({  # type:ignore
-                    "community_id": response.community_id,
-                    "year": response.year,
-                    "category": response.category,
-                    "error": str(e),
-                })
-            finally:
-                response.clear_data()
+
+        if max_workers <= 1:
+            for generate, group in units:
+                merge_group(group, generate(group))
+        else:
+            app = current_app._get_current_object()  # type: ignore[attr-defined]
+            budget_share = 1.0 / max_workers
+
+            def generate_in_app_context(
+                generate: Callable, group: list[CachedResponse]
+            ) -> list:
+                memory_budget_share.set(budget_share)
+                with app.app_context():
+                    return generate(group)
+
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="stats-cache-worker"
+            ) as executor:
+                futures = {
+                    executor.submit(generate_in_app_context, generate, group): group
+                    for generate, group in units
+                }
+                for future in as_completed(futures):
+                    merge_group(futures[future], future.result())
 
         if progress_callback:
             progress_callback(total_responses, total_responses, "Completed")
 
         return results
 
+    @staticmethod
+    def _community_batch_key(response: CachedResponse) -> tuple | None:
+        """Get the key of the community batch a response can be generated in.
+
+        Only category queries for a resolved community ID (or "global") can
+        be batched, since the batch scan matches documents by community ID.
+
+        Returns:
+            tuple | None: The query name and date parameters shared by the
+                responses of a batch, or None if the response can't be batched.
+        """
+        community_id = response.community_id
+        if community_id != "global" and not (
+            len(community_id) == 36 and community_id.count("-") == 4
+        ):
+            return None
+        query_name = response.request_data["stat"]
+        query_config = current_app.config.get("STATS_QUERIES", {}).get(query_name)
+        if not query_config or not issubclass(
+            query_config["cls"], CategoryDataSeriesQueryBase
+        ):
+            return None
+        params = cast(dict[str, Any], response.request_data["params"])
+        return (
+            query_name,
+            params.get("start_date"),
+            params.get("end_date"),
+            params.get("date_basis", "added"),
+        )
+
+    def _generate_communities(
+        self, responses: list[CachedResponse]
+    ) -> list[tuple[str, str | None]]:
+        """Generate the same category response for many communities together.
+
+        The responses share a query and date range, and differ only in their
+        community. CategoryDataSeriesQueryBase.iter_community_series_sets
+        scans the aggregation index once for all of them, and each response
+        is saved to the cache as soon as its community's slice of the scan is
+        complete, so that only one community's data series is held at a time.
+
+        Returns:
+            list[tuple[str, str | None]]: The outcome for each response, in
+                order, as returned by _generate_one().
+        """
+        outcomes: dict[int, tuple[str, str | None]] = {}
+        by_community: dict[str, tuple[int, CachedResponse]] = {}
+        community_params: dict[str, dict[str, Any]] = {}
+        query: Any = None
+        params: dict[str, Any] = {}
+        for position, response in enumerate(responses):
+            try:
+                query, params = response.make_query()
+            except Exception as e:
+                outcomes[position] = ("failed", str(e))
+                continue
+            by_community[response.community_id] = (position, response)
+            community_params[response.community_id] = params
+
+        try:
+            if community_params:
+                for community_id, series_set in query.iter_community_series_sets(
+                    community_params,
+                    params.get("start_date"),
+                    params.get("end_date"),
+                    params.get("date_basis", "added"),
+                ):
+                    position, response = by_community[community_id]
+                    try:
+                        response.set_generated_data(
+                            query, bytes_data=b"".join(series_set.iter_json())
+                        )
+                        del series_set
+                        if not response.aggregation_complete:
+                            current_app.logger.info(
+                                f"Skipping cache for {response.community_id}/"
+                                f"{response.year}/{response.category} - "
+                                "aggregation incomplete"
+                            )
+                            outcomes[position] = ("skipped", None)
+                        elif response.save_to_cache(self.cache):
+                            outcomes[position] = ("success", None)
+                        else:
+                            current_app.logger.error(
+                                f"Failed to save to cache for "
+                                f"{response.community_id}/{response.year}/"
+                                f"{response.category}: key {response.cache_key}"
+                            )
+                            outcomes[position] = ("failed", "Failed to save to cache")
+                    except Exception as e:
+                        outcomes[position] = ("failed", str(e))
+                    finally:
+                        response.clear_data()
+        except Exception as e:
+            for position, _ in by_community.values():
+                outcomes.setdefault(position, ("failed", str(e)))
+
+        return [outcomes[position] for position in range(len(responses))]
+
+    def _generate_group(
+        self, responses: list[CachedResponse]
+    ) -> list[tuple[str, str | None]]:
+        """Generate the responses for one community and year together.
+
+        The category queries among them are run through
+        CategoryDataSeriesQueryBase.iter_series_sets, which resolves the
+        community once, fetches every document count and sample in a single
+        msearch, and scans each aggregation index once for all the categories
+        that read it. Each response is written to the cache and dropped as
+        soon as its data series set is finished, so no more than one scan's
+        worth of series sets is held at a time. Any other queries are
+        generated one by one.
+
+        Returns:
+            list[tuple[str, str | None]]: The outcome for each response, in
+                order, as returned by _generate_one().
+        """
+        outcomes: dict[int, tuple[str, str | None]] = {}
+        shared: list[tuple[int, CachedResponse, Any, dict[str, Any]]] = []
+        for position, response in enumerate(responses):
+            try:
+                query, params = response.make_query()
+            except Exception as e:
+                outcomes[position] = ("failed", str(e))
+                continue
+            if isinstance(query, CategoryDataSeriesQueryBase):
+                shared.append((position, response, query, params))
+            else:
+                outcomes[position] = self._generate_one(response)
+
+        try:
+            if shared:
+                for index, series_set in CategoryDataSeriesQueryBase.iter_series_sets(
+                    [(query, params) for _, _, query, params in shared]
+                ):
+                    position, response, query, _ = shared[index]
+                    try:
+                        response.set_generated_data(
+                            query, bytes_data=b"".join(series_set.iter_json())
+                        )
+                        del series_set
+                        outcomes[position] = self._save_generated(response)
+                    except Exception as e:
+                        outcomes[position] = ("failed", str(e))
+                    finally:
+                        response.clear_data()
+        except Exception as e:
+            for position, _, _, _ in shared:
+                outcomes.setdefault(position, ("failed", str(e)))
+        finally:
+            for _, response, _, _ in shared:
+                response.clear_data()
+
+        return [outcomes[position] for position in range(len(responses))]
+
+    def _save_generated(self, response: CachedResponse) -> tuple[str, str | None]:
+        """Save a freshly generated response to the cache.
+
+        Returns:
+            tuple[str, str | None]: The outcome ("success", "failed" or
+                "skipped") and an error message for failures.
+        """
+        if not response.aggregation_complete:
+            # Aggregation incomplete - skip caching but don't count as error
+            current_app.logger.info(
+                f"Skipping cache for {response.community_id}/"
+                f"{response.year}/{response.category} - "
+                "aggregation incomplete"
+            )
+            return "skipped", None
+
+        # Redis SET operation atomically overwrites existing keys
+        if response.save_to_cache(self.cache):
+            return "success", None
+
+        current_app.logger.error(
+            f"Failed to save to cache for {response.community_id}/"
+            f"{response.year}/{response.category}: key "
+            f"{response.cache_key}"
+        )
+        return "failed", "Failed to save to cache"
+
+    @staticmethod
+    def _describe(response: CachedResponse) -> str:
+        """Describe a response in progress messages.
+
+        Returns:
+            str: Progress message for the response.
+        """
+        return f"Processing {response.community_id}/{response.year}/{response.category}"
+
+    def _generate_one(self, response: CachedResponse) -> tuple[str, str | None]:
+        """Generate one response and save it to the cache.
+
+        Returns:
+            tuple[str, str | None]: The outcome ("success", "failed" or
+                "skipped") and an error message for failures.
+        """
+        try:
+            response.generate()
+            return self._save_generated(response)
+        except Exception as e:
+            return "failed", str(e)
+        finally:
+            response.clear_data()
+
+    @staticmethod
+    def _merge_outcome(
+        results: dict[str, Any],
+        response: CachedResponse,
+        outcome: tuple[str, str | None],
+    ) -> None:
+        """Add the outcome of generating one response to the results summary."""
+        status, error = outcome
+        results[status] += 1
+        if status == "success":
+            results["responses"].append({
+                "community_id": response.community_id,
+                "year": response.year,
+                "category": response.category,
+                "cache_key": response.cache_key,
+            })
+        elif status == "failed":
+            error_entry = {
+                "community_id": response.community_id,
+                "year": response.year,
+                "category": response.category,
+                "error": error,
+            }
+            if error == "Failed to save to cache":
+                error_entry["cache_key"] = response.cache_key
+            results["errors"].append(error_entry)
+
     def invalidate_cache(self, pattern: str | None = None) -> bool:
         """Invalidate cache entries matching the given pattern.
 
@@ -9,8 +9,13 @@
 from .components import (
     CommunityAcceptedEventComponent,
     CommunityCustomFieldsDefaultsComponent,
+    CommunityEventsOp,
     RecordCommunityEventComponent,
     RecordCommunityEventTrackingComponent,
+    apply_community_event_changes,
+    make_community_event_change,
+    parse_publication_date_for_events,
+    queue_community_event_changes,
     update_community_events_created_date,
     update_community_events_index,
 )
@@ -18,8 +23,13 @@ from .components import (
 __all__ = [
     "CommunityAcceptedEventComponent",
     "CommunityCustomFieldsDefaultsComponent",
+    "CommunityEventsOp",
     "RecordCommunityEventComponent",
     "RecordCommunityEventTrackingComponent",
+    "apply_community_event_changes",
+    "make_community_event_change",
+    "parse_publication_date_for_events",
+    "queue_community_event_changes",
     "update_community_events_index",
     "update_community_events_created_date",
 ]
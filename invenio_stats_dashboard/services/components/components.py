@@ -6,7 +6,8 @@
 
 """Service components for community statistics and event management."""
 
-from typing import Any
+from typing import Any, cast
+from weakref import WeakKeyDictionary
 
 import arrow
 from flask import current_app
@@ -36,10 +37,15 @@ try:  # invenio-rdm-records changed this for InvenioRDM 13.0.0
 except ImportError:
     pass
 from invenio_records_resources.services.records.components.base import ServiceComponent
-from invenio_records_resources.services.uow import UnitOfWork, unit_of_work
+from invenio_records_resources.services.uow import (
+    Operation,
+    UnitOfWork,
+    unit_of_work,
+)
 from invenio_requests.records.api import RequestEvent
 from invenio_search import current_search_client
 from invenio_search.utils import prefix_index
+from opensearchpy.helpers import bulk
 
 
 def parse_publication_date_for_events(pub_date: str | None) -> str | None:
@@ -178,21 +184,36 @@ def update_community_events_deletion_fields(
     try:
         result = client.search(index=search_index, body=query)
 
-        if result["hits"]["total"]["value"] > 0:
-            updated_count = 0
-            for hit in result["hits"]["hits"]:
-                event_id = hit["_id"]
-                event_source = hit["_source"]
-                current_is_deleted = event_source.get("is_deleted", None)
-                current_deleted_date = event_source.get("deleted_date")
+        actions = []
+        for hit in result["hits"]["hits"]:
+            event_source = hit["_source"]
+            current_is_deleted = event_source.get("is_deleted", None)
+            current_deleted_date = event_source.get("deleted_date")
+
+            # Only update if the deletion status has changed
+            if current_is_deleted != is_deleted or current_deleted_date != deleted_date:
+                actions.append(
+                    {
+                        "_op_type": "update",
+                        "_index": hit["_index"],
+                        "_id": hit["_id"],
+                        "doc": {
+                            "is_deleted": is_deleted,
+                            "deleted_date": deleted_date,
+                            "updated_timestamp": (
+                                arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss.SSS")
+                            ),
+                        },
+                    }
+                )
 
-                # Only update if the deletion status has changed
-                if (
-                    current_is_deleted != is_deleted
-                    or current_deleted_date != deleted_date
-                ):
-                    update_event_deletion_fields(event_id, is_deleted, deleted_date)
-                    updated_count += 1
+        if actions:
+            _, errors = bulk(client, actions, raise_on_error=False, stats_only=False)
+            for error in cast(list, errors):
+                current_app.logger.error(
+                    f"Error updating deletion fields for record {record_id}: {error}"
+                )
+            client.indices.refresh(index=search_index)
 
     except Exception as e:
         current_app.logger.error(
@@ -299,6 +320,7 @@ def update_community_events_index(
 
     This function manages record community events in a separate search index.
     It also creates a "global" event for every record to enable global statistics.
+    The events are written straight away (see `apply_community_event_changes`).
 
     Args:
         record_id: The record ID
@@ -311,162 +333,388 @@ def update_community_events_index(
         deleted_date: When the record was deleted
         client: The search client to use for updating the index
     """
+    apply_community_event_changes(
+        [
+            make_community_event_change(
+                record_id,
+                community_ids_to_add=community_ids_to_add,
+                community_ids_to_remove=community_ids_to_remove,
+                timestamp=timestamp,
+                record_created_date=record_created_date,
+                record_published_date=record_published_date,
+                is_deleted=is_deleted,
+                deleted_date=deleted_date,
+            )
+        ],
+        client=client,
+    )
+
+
+def make_community_event_change(
+    record_id: str,
+    community_ids_to_add: list[str] | None = None,
+    community_ids_to_remove: list[str] | None = None,
+    timestamp=None,
+    record_created_date=None,
+    record_published_date: str | None = None,
+    is_deleted: bool = False,
+    deleted_date: str | None = None,
+) -> dict:
+    """Describe a change to a record's community membership.
+
+    The timestamp is fixed when the change is made, so that the events have the
+    right dates however long the change waits before being written. Dates are
+    stored as strings so that changes can be passed to a Celery task.
+
+    Args:
+        record_id: The record ID
+        community_ids_to_add: List of community IDs to mark as added
+        community_ids_to_remove: List of community IDs to mark as removed
+        timestamp: Timestamp of the change (defaults to current UTC time)
+        record_created_date: When the record was created
+        record_published_date: When the record was published
+        is_deleted: Whether the record is deleted
+        deleted_date: When the record was deleted
+
+    Returns:
+        dict: The change, as accepted by `apply_community_event_changes`.
+    """
     if timestamp is None:
         timestamp = arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss.SSS")
+    return {
+        "record_id": record_id,
+        "community_ids_to_add": list(community_ids_to_add or []),
+        "community_ids_to_remove": list(community_ids_to_remove or []),
+        "timestamp": (
+            timestamp if isinstance(timestamp, str) else timestamp.isoformat()
+        ),
+        "record_created_date": (
+            record_created_date
+            if record_created_date is None or isinstance(record_created_date, str)
+            else record_created_date.isoformat()
+        ),
+        "record_published_date": record_published_date,
+        "is_deleted": is_deleted,
+        "deleted_date": deleted_date,
+    }
 
-    if client is None:
-        client = current_search_client
-    search_index = prefix_index("stats-community-events")
 
-    event_year = arrow.get(timestamp).year
-    write_index = prefix_index(f"stats-community-events-{event_year}")
+def _get_newest_community_events(
+    client, pairs: set[tuple[str, str]], batch_size: int = 500
+) -> dict[tuple[str, str], dict]:
+    """Get the newest event for each record/community combination.
 
-    parsed_published_date = parse_publication_date_for_events(record_published_date)
+    The events are read with one search per batch of records, using a
+    `top_hits` aggregation under the record and community buckets.
 
-    def get_newest_event(record_id: str, community_id: str, is_removal: bool = False):
-        """Get the newest event for a record/community combination using the alias.
+    Args:
+        client: The search client
+        pairs: The (record ID, community ID) combinations to look up
+        batch_size: The number of records per search
 
-        Returns:
-            dict | None: The newest event document, or None if not found.
-        """
+    Returns:
+        dict: The newest event hit for each combination that has events.
+    """
+    search_index = prefix_index("stats-community-events")
+    record_ids = sorted({record_id for record_id, _ in pairs})
+    newest_events: dict[tuple[str, str], dict] = {}
+
+    for i in range(0, len(record_ids), batch_size):
+        batch = record_ids[i : i + batch_size]
+        batch_set = set(batch)
+        community_ids = sorted({c for r, c in pairs if r in batch_set})
         query = {
+            "size": 0,
             "query": {
                 "bool": {
                     "must": [
-                        {"term": {"record_id": record_id}},
-                        {"term": {"community_id": community_id}},
+                        {"terms": {"record_id": batch}},
+                        {"terms": {"community_id": community_ids}},
                     ]
                 }
             },
-            "sort": [{"event_date": {"order": "desc"}}],
-            "size": 1,
+            "aggs": {
+                "by_record": {
+                    "terms": {"field": "record_id", "size": len(batch)},
+                    "aggs": {
+                        "by_community": {
+                            "terms": {
+                                "field": "community_id",
+                                "size": len(community_ids),
+                            },
+                            "aggs": {
+                                "newest": {
+                                    "top_hits": {
+                                        "size": 1,
+                                        "sort": [{"event_date": {"order": "desc"}}],
+                                    }
+                                }
+                            },
+                        }
+                    },
+                }
+            },
         }
-
         try:
             result = client.search(index=search_index, body=query)
-            if result["hits"]["total"]["value"] > 0:
-                return result["hits"]["hits"][0]
-            elif is_removal:
-                # Only log error for removals with no prior events
-                current_app.logger.error(
-                    f"No prior events found for record {record_id}, "
-                    f"community {community_id} when attempting removal"
-                )
         except Exception as e:
             if "index_not_found_exception" in str(e) or "no such index" in str(e):
                 # This is normal for new records - the index will be created when
                 # first document is indexed
-                pass
-            else:
-                current_app.logger.error(
-                    f"Error querying community events index for record {record_id}, "
-                    f"community {community_id}: {e}"
-                )
-        return None
+                continue
+            current_app.logger.error(
+                f"Error querying community events index for records {batch}: {e}"
+            )
+            continue
+
+        for record_bucket in result["aggregations"]["by_record"]["buckets"]:
+            for community_bucket in record_bucket["by_community"]["buckets"]:
+                hits = community_bucket["newest"]["hits"]["hits"]
+                if hits:
+                    newest_events[(record_bucket["key"], community_bucket["key"])] = (
+                        hits[0]
+                    )
+    return newest_events
+
+
+def apply_community_event_changes(changes: list[dict], client=None) -> None:
+    """Write a batch of record community membership changes.
+
+    The changes are applied in order, following the same rules as one call to
+    `update_community_events_index` per change:
+
+    - an event is only created if the newest event for the record and community
+      is of a different type; otherwise the deletion fields of the newest event
+      are brought up to date;
+    - a removal without a prior addition gets an "added" event one second
+      before the removal.
+
+    Consecutive identical changes for a record and community are coalesced. The
+    newest existing events are looked up with one search per batch of records,
+    all writes go in one bulk request and the indices are refreshed once.
+
+    Args:
+        changes: The changes, as made by `make_community_event_change`
+        client: The search client to use for updating the index
+    """
+    if not changes:
+        return
+    if client is None:
+        client = current_search_client
+    search_index = prefix_index("stats-community-events")
+
+    operations: list[tuple[str, str, str, dict]] = []
+    for change in changes:
+        for community_id in change.get("community_ids_to_add") or []:
+            operations.append((change["record_id"], community_id, "added", change))
+        for community_id in change.get("community_ids_to_remove") or []:
+            operations.append((change["record_id"], community_id, "removed", change))
+
+    # Coalesce repeated changes that would leave the newest event untouched
+    coalesced: list[tuple[str, str, str, dict]] = []
+    last_operation: dict[tuple[str, str], tuple[str, bool, str | None]] = {}
+    for record_id, community_id, event_type, change in operations:
+        signature = (event_type, change["is_deleted"], change["deleted_date"])
+        if last_operation.get((record_id, community_id)) == signature:
+            continue
+        last_operation[(record_id, community_id)] = signature
+        coalesced.append((record_id, community_id, event_type, change))
+
+    newest_events = _get_newest_community_events(
+        client, {(operation[0], operation[1]) for operation in coalesced}
+    )
+    actions: list[dict] = []
+    write_indices: set[str] = set()
 
     def create_new_event(
-        record_id: str,
-        community_id: str,
-        event_type: str,
-        event_date: str,
-        is_deleted: bool,
-    ):
-        """Create a new community event in the appropriate annual index."""
+        change: dict, community_id: str, event_type: str, event_date: str
+    ) -> dict:
+        """Queue a new community event in the appropriate annual index.
+
+        Returns:
+            dict: The queued event, in the shape of a search hit.
+        """
+        now = arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss.SSS")
         event_doc = {
-            "record_id": record_id,
+            "record_id": change["record_id"],
             "community_id": community_id,
             "event_type": event_type,
             "event_date": event_date,
-            "record_created_date": record_created_date,
-            "record_published_date": parsed_published_date,
-            "is_deleted": is_deleted,
-            "timestamp": arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss.SSS"),
+            "record_created_date": change["record_created_date"],
+            "record_published_date": parse_publication_date_for_events(
+                change["record_published_date"]
+            ),
+            "is_deleted": change["is_deleted"],
+            "timestamp": now,
+            "updated_timestamp": now,
+        }
+        if change["deleted_date"]:
+            event_doc["deleted_date"] = change["deleted_date"]
+        write_index = prefix_index(
+            f"stats-community-events-{arrow.get(change['timestamp']).year}"
+        )
+        write_indices.add(write_index)
+        action = {"_op_type": "index", "_index": write_index, "_source": event_doc}
+        actions.append(action)
+        return {"_source": event_doc, "action": action}
+
+    def update_deletion_fields(newest_event: dict, change: dict) -> None:
+        """Bring the deletion fields of the newest event up to date."""
+        fields = {
+            "is_deleted": change["is_deleted"],
+            "deleted_date": change["deleted_date"],
             "updated_timestamp": arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss.SSS"),
         }
-        if deleted_date:
-            event_doc["deleted_date"] = deleted_date
-
-        try:
-            client.index(index=write_index, body=event_doc)
-        except Exception as e:
-            current_app.logger.error(
-                f"Error creating new community event for record {record_id}, "
-                f"community {community_id}: {e}"
+        newest_event["_source"].update(fields)
+        if "action" not in newest_event:
+            actions.append(
+                {
+                    "_op_type": "update",
+                    "_index": newest_event["_index"],
+                    "_id": newest_event["_id"],
+                    "doc": fields,
+                }
             )
 
-    def process_community_events(
-        record_id: str, community_ids: list[str], event_type: str, timestamp: str
-    ):
-        """Process community events (additions or removals) with common logic."""
-        for community_id in community_ids:
-            newest_event = get_newest_event(
-                record_id, community_id, event_type == "removed"
+    for record_id, community_id, event_type, change in coalesced:
+        pair = (record_id, community_id)
+        timestamp = change["timestamp"]
+        newest_event = newest_events.get(pair)
+        created_event = None
+
+        if newest_event is None and event_type == "removed":
+            current_app.logger.error(
+                f"No prior events found for record {record_id}, "
+                f"community {community_id} when attempting removal"
             )
 
-            if newest_event:
-                newest_event_source = newest_event["_source"]
-                newest_event_type = newest_event_source["event_type"]
-
-                if newest_event_type != "added" and event_type == "removed":
-                    # No addition event found, create one with timestamp
-                    # 1 second before removal
-                    removal_timestamp = arrow.get(timestamp)
-                    addition_timestamp = removal_timestamp.shift(seconds=-1)
-                    create_new_event(
-                        record_id,
-                        community_id,
-                        "added",
-                        addition_timestamp.format("YYYY-MM-DDTHH:mm:ss.SSS"),
-                        is_deleted,
-                    )
-                if newest_event_type == event_type:
-                    current_is_deleted = newest_event_source.get("is_deleted", False)
-                    current_deleted_date = newest_event_source.get("deleted_date")
-
-                    if (
-                        current_is_deleted != is_deleted
-                        or current_deleted_date != deleted_date
-                    ):
-                        update_event_deletion_fields(
-                            newest_event["_id"], is_deleted, deleted_date
-                        )
-                else:
-                    create_new_event(
-                        record_id, community_id, event_type, timestamp, is_deleted
-                    )
+        if newest_event:
+            newest_event_source = newest_event["_source"]
+            newest_event_type = newest_event_source["event_type"]
+
+            if newest_event_type != "added" and event_type == "removed":
+                # No addition event found, create one with timestamp
+                # 1 second before removal
+                created_event = create_new_event(
+                    change,
+                    community_id,
+                    "added",
+                    arrow.get(timestamp)
+                    .shift(seconds=-1)
+                    .format("YYYY-MM-DDTHH:mm:ss.SSS"),
+                )
+            if newest_event_type == event_type:
+                if (
+                    newest_event_source.get("is_deleted", False) != change["is_deleted"]
+                    or newest_event_source.get("deleted_date") != change["deleted_date"]
+                ):
+                    update_deletion_fields(newest_event, change)
             else:
-                if event_type == "removed":
-                    # No prior events found, create an addition event first
-                    # 1 second before the removal
-                    removal_timestamp = arrow.get(timestamp)
-                    addition_timestamp = removal_timestamp.shift(seconds=-1)
-                    create_new_event(
-                        record_id,
-                        community_id,
-                        "added",
-                        addition_timestamp.format("YYYY-MM-DDTHH:mm:ss.SSS"),
-                        is_deleted,
-                    )
+                created_event = create_new_event(
+                    change, community_id, event_type, timestamp
+                )
+        else:
+            if event_type == "removed":
+                # No prior events found, create an addition event first
+                # 1 second before the removal
                 create_new_event(
-                    record_id, community_id, event_type, timestamp, is_deleted
+                    change,
+                    community_id,
+                    "added",
+                    arrow.get(timestamp)
+                    .shift(seconds=-1)
+                    .format("YYYY-MM-DDTHH:mm:ss.SSS"),
                 )
+            created_event = create_new_event(
+                change, community_id, event_type, timestamp
+            )
 
-    if community_ids_to_add:
-        process_community_events(record_id, community_ids_to_add, "added", timestamp)
-    if community_ids_to_remove:
-        process_community_events(
-            record_id, community_ids_to_remove, "removed", timestamp
-        )
+        if created_event:
+            newest_events[pair] = created_event
+
+    if actions:
+        try:
+            _, errors = bulk(client, actions, raise_on_error=False, stats_only=False)
+            for error in cast(list, errors):
+                current_app.logger.error(
+                    f"Error writing community event for record change: {error}"
+                )
+        except Exception as e:
+            current_app.logger.error(f"Error writing community events: {e}")
 
     try:
-        # Refresh both the alias and the specific write index to ensure
+        # Refresh both the alias and the specific write indices to ensure
         # all indices are searchable
-        client.indices.refresh(index=search_index)
-        client.indices.refresh(index=write_index)
+        client.indices.refresh(index=",".join([search_index, *sorted(write_indices)]))
     except Exception as e:
         current_app.logger.error(f"Error refreshing community events indices: {e}")
 
 
+class CommunityEventsOp(Operation):
+    """Unit of work operation writing queued community membership changes.
+
+    Changes queued during a unit of work are written together after it is
+    committed, with one bulk request (see `apply_community_event_changes`).
+    """
+
+    def __init__(self):
+        """Initialize the operation with an empty queue."""
+        self.changes: list[dict] = []
+
+    def on_post_commit(self, uow):
+        """Write the queued changes once the unit of work is committed."""
+        flush_community_event_changes(self.changes)
+
+
+# The CommunityEventsOp registered on each open unit of work, so that all the
+# changes of one service call end up in a single operation
+_community_events_ops: "WeakKeyDictionary[UnitOfWork, CommunityEventsOp]" = (
+    WeakKeyDictionary()
+)
+
+
+def queue_community_event_changes(
+    changes: list[dict], uow: UnitOfWork | None = None
+) -> None:
+    """Queue record community membership changes for writing.
+
+    Within a unit of work, all changes are collected in a single
+    `CommunityEventsOp` and written after the commit. Without one, they are
+    written straight away.
+
+    Args:
+        changes: The changes, as made by `make_community_event_change`
+        uow: The unit of work of the current service call, if any
+    """
+    if uow is None:
+        flush_community_event_changes(changes)
+        return
+
+    op = _community_events_ops.get(uow)
+    if op is None:
+        op = CommunityEventsOp()
+        uow.register(op)
+        _community_events_ops[uow] = op
+    op.changes.extend(changes)
+
+
+def flush_community_event_changes(changes: list[dict]) -> None:
+    """Write record community membership changes now or in a Celery task.
+
+    Args:
+        changes: The changes, as made by `make_community_event_change`
+    """
+    if not changes:
+        return
+    if current_app.config.get("COMMUNITY_STATS_EVENTS_ASYNC_WRITES", False):
+        # Import here to avoid circular imports
+        from ...tasks.community_events_tasks import write_community_events
+
+        write_community_events.delay(changes)
+    else:
+        apply_community_event_changes(changes)
+
+
 class CommunityAcceptedEventComponent(ServiceComponent):
     """Component to update the community record events on a record.
 
@@ -513,11 +761,16 @@ class CommunityAcceptedEventComponent(ServiceComponent):
 
             community_id = request_data["receiver"]["community"]
             record_published_date = record.metadata.get("publication_date")
-            update_community_events_index(
-                record_id=str(record.pid.pid_value),
-                community_ids_to_add=[community_id, "global"],
-                record_created_date=record.created,
-                record_published_date=record_published_date,
+            queue_community_event_changes(
+                [
+                    make_community_event_change(
+                        record_id=str(record.pid.pid_value),
+                        community_ids_to_add=[community_id, "global"],
+                        record_created_date=record.created,
+                        record_published_date=record_published_date,
+                    )
+                ],
+                uow=uow,
             )
 
 
@@ -569,12 +822,17 @@ class RecordCommunityEventComponent(ServiceComponent):
         communities_to_remove = list(current_community_ids - new_community_ids)
 
         record_published_date = record.metadata.get("publication_date")  # type: ignore
-        update_community_events_index(
-            record_id=str(record.pid.pid_value),  # type: ignore
-            community_ids_to_add=communities_to_add + ["global"],
-            community_ids_to_remove=communities_to_remove,
-            record_created_date=record.created,
-            record_published_date=record_published_date,
+        queue_community_event_changes(
+            [
+                make_community_event_change(
+                    record_id=str(record.pid.pid_value),  # type: ignore
+                    community_ids_to_add=communities_to_add + ["global"],
+                    community_ids_to_remove=communities_to_remove,
+                    record_created_date=record.created,
+                    record_published_date=record_published_date,
+                )
+            ],
+            uow=kwargs.get("uow"),
         )
 
     def delete_record(
@@ -630,11 +888,16 @@ class RecordCommunityEventTrackingComponent(ServiceComponent):
         community_ids = [community["id"] for community in communities]
 
         record_published_date = record.metadata.get("publication_date")  # type: ignore
-        update_community_events_index(
-            record_id=str(record.pid.pid_value),  # type: ignore
-            community_ids_to_add=community_ids + ["global"],
-            record_created_date=record.created,
-            record_published_date=record_published_date,
+        queue_community_event_changes(
+            [
+                make_community_event_change(
+                    record_id=str(record.pid.pid_value),  # type: ignore
+                    community_ids_to_add=community_ids + ["global"],
+                    record_created_date=record.created,
+                    record_published_date=record_published_date,
+                )
+            ],
+            uow=uow,
         )
 
     def bulk_add(
@@ -645,17 +908,25 @@ class RecordCommunityEventTrackingComponent(ServiceComponent):
         set_default: dict,
         uow: UnitOfWork,
     ) -> None:
-        """Record addition of each record in the community events index."""
+        """Record addition of each record in the community events index.
+
+        The changes for all records are written together once the unit of work
+        is committed.
+        """
+        changes = []
         for record_id in record_ids:
             record = current_rdm_records_service.record_cls.pid.resolve(record_id)
 
             record_published_date = record.metadata.get("publication_date")
-            update_community_events_index(
-                record_id=str(record.pid.pid_value),
-                community_ids_to_add=[community_id, "global"],
-                record_created_date=record.created,
-                record_published_date=record_published_date,
+            changes.append(
+                make_community_event_change(
+                    record_id=str(record.pid.pid_value),
+                    community_ids_to_add=[community_id, "global"],
+                    record_created_date=record.created,
+                    record_published_date=record_published_date,
+                )
             )
+        queue_community_event_changes(changes, uow=uow)
 
     def remove_community(
         self,
@@ -683,11 +954,16 @@ class RecordCommunityEventTrackingComponent(ServiceComponent):
 
         record_published_date = record.metadata.get("publication_date")  # type: ignore
 
-        update_community_events_index(
-            record_id=str(record.pid.pid_value),  # type: ignore
-            community_ids_to_remove=[community_id],
-            record_created_date=record.created,
-            record_published_date=record_published_date,
+        queue_community_event_changes(
+            [
+                make_community_event_change(
+                    record_id=str(record.pid.pid_value),  # type: ignore
+                    community_ids_to_remove=[community_id],
+                    record_created_date=record.created,
+                    record_published_date=record_published_date,
+                )
+            ],
+            uow=uow,
         )
         # Note: No need to register RecordCommitOp since we're not modifying the record
 
@@ -15,6 +15,7 @@ from invenio_cache import current_cache
 from invenio_communities.proxies import current_communities
 from invenio_search.proxies import current_search_client
 from invenio_search.utils import prefix_index
+from opensearchpy.helpers import bulk
 from opensearchpy.helpers.search import Search
 
 from ..aggregations import register_aggregations
@@ -26,7 +27,8 @@ from ..tasks.aggregation_tasks import (
     CommunityStatsAggregationTask,
     aggregate_community_record_stats,
 )
-from .components import update_community_events_index
+from .components import parse_publication_date_for_events
+from .usage_reindexing import EventReindexingBookmarkAPI
 
 
 class CommunityStatsService:
@@ -282,6 +284,7 @@ class CommunityStatsService:
         community_ids: list[str] | None = None,
         start_date: str | None = None,
         end_date: str | None = None,
+        resume: bool = True,
     ) -> tuple[int, int, int]:
         """Create `stats-community-events` index events for one or more records.
 
@@ -290,6 +293,14 @@ class CommunityStatsService:
         1. Create "added" events for all communities the record belongs to
         2. Ensure a "global" addition event exists for every record
 
+        Records are read in pages (sorted by creation date) of
+        COMMUNITY_STATS_EVENTS_GENERATION_PAGE_SIZE records. The existing events
+        for each page are looked up with a single search, the missing events are
+        written with one bulk request, and the events index is refreshed once at
+        the end. After each page a bookmark is stored, so that an interrupted run
+        over all records (i.e. without recids) resumes from the last finished
+        page. The bookmark is removed once the run completes.
+
         Args:
             recids: The record IDs to update. If not provided, all records will be
                 updated.
@@ -299,13 +310,18 @@ class CommunityStatsService:
                 will be the first record creation date in the instance.
             end_date: The end date for the events. If not provided, the end date will be
                 the current date.
+            resume: Whether to resume from the bookmark of an interrupted run.
 
         Returns:
-            The number of records processed.
+            The number of records processed, the number of new events created and
+            the number of existing events found.
         """
         records_processed = 0
         new_events_created = 0
         old_events_found = 0
+        page_size = current_app.config.get(
+            "COMMUNITY_STATS_EVENTS_GENERATION_PAGE_SIZE", 500
+        )
         start_date_str = (
             (arrow.get(start_date).floor("day").format("YYYY-MM-DDTHH:mm:ss"))
             if start_date
@@ -332,121 +348,213 @@ class CommunityStatsService:
             record_search = record_search.query({"bool": {"must": terms}})
         else:
             record_search = record_search.query({"match_all": {}})
+        record_search = (
+            record_search
+            .source([
+                "id",
+                "created",
+                "metadata.publication_date",
+                "parent.communities",
+            ])
+            .sort({"created": {"order": "asc"}}, {"id": {"order": "asc"}})
+            .extra(size=page_size)
+        )
 
         if not community_ids:
             # Use scan() to get all communities without size limits
             all_communities = list(current_communities.service.scan(system_identity))
             community_ids = [c["id"] for c in all_communities]
 
-        for result in record_search.scan():
-            record_id = result["id"]
-            record_data = result.to_dict()
-
-            try:
-                record_created_date = record_data.get("created")
-                record_published_date = record_data.get("metadata", {}).get(
-                    "publication_date", None
+        # Only runs over all records can be resumed, since a list of recids
+        # isn't a stable position in the records index
+        bookmark_task_id = (
+            None
+            if recids
+            else (
+                f"community-events-generation-{start_date_str or 'start'}"
+                f"-{end_date_str or 'end'}"
+            )
+        )
+        search_after = None
+        if bookmark_task_id and resume:
+            bookmark = self.events_bookmark_api.get_bookmark(bookmark_task_id)
+            if bookmark:
+                search_after = [
+                    int(bookmark["last_event_timestamp"].float_timestamp * 1000),
+                    bookmark["last_event_id"],
+                ]
+                current_app.logger.info(
+                    f"Resuming community events generation after record "
+                    f"{bookmark['last_event_id']}"
                 )
 
-                record_communities = (
-                    record_data.get("parent", {}).get("communities", {}).get("ids", [])
-                )
+        while True:
+            page_search = (
+                record_search.extra(search_after=search_after)
+                if search_after
+                else record_search
+            )
+            hits = list(page_search.execute())
+            if not hits:
+                break
 
-                current_app.logger.debug(f"Generating events for record: {record_id}")
-                current_app.logger.debug(
-                    f"Record {record_id} belongs to communities: {record_communities}"
+            page_processed, page_created, page_found = self._generate_events_for_page(
+                [hit.to_dict() for hit in hits]
+            )
+            records_processed += page_processed
+            new_events_created += page_created
+            old_events_found += page_found
+
+            search_after = list(hits[-1].meta.sort)
+            if bookmark_task_id:
+                self.events_bookmark_api.set_bookmark(
+                    bookmark_task_id, hits[-1]["id"], hits[-1]["created"]
                 )
+            current_app.logger.info(
+                f"Community events generation: {records_processed} records "
+                f"processed, {new_events_created} events created"
+            )
+            if len(hits) < page_size:
+                break
 
-                # Always process global community, plus communities the record
-                # actually belongs to
-                communities_to_process = ["global"] + record_communities
+        # Refresh the search index to ensure new events are searchable
+        try:
+            self.client.indices.refresh(index=prefix_index("stats-community-events"))
+        except Exception as e:
+            current_app.logger.error(f"Error refreshing community events index: {e}")
 
-                current_app.logger.debug(
-                    f"Processing communities for record {record_id}: "
-                    f"{communities_to_process}"
-                )
+        if bookmark_task_id:
+            self.events_bookmark_api.delete_bookmark(bookmark_task_id)
 
-                existing_events = []
-                try:
-                    existing_events_search = Search(
-                        using=self.client, index=prefix_index("stats-community-events")
-                    )
+        current_app.logger.info(f"Total records processed: {records_processed}")
+        return records_processed, new_events_created, old_events_found
+
+    @property
+    def events_bookmark_api(self) -> EventReindexingBookmarkAPI:
+        """Bookmark API for the progress of community events generation.
+
+        Returns:
+            EventReindexingBookmarkAPI: The bookmark API.
+        """
+        if getattr(self, "_events_bookmark_api", None) is None:
+            self._events_bookmark_api = EventReindexingBookmarkAPI(self.client)
+        return self._events_bookmark_api
+
+    def _generate_events_for_page(self, records: list[dict]) -> tuple[int, int, int]:
+        """Create the missing "added" community events for a page of records.
+
+        Args:
+            records: The source documents of the records in the page.
 
-                    # Use raw query dict instead of Q objects
-                    query_dict = {
+        Returns:
+            The number of records processed, the number of new events created and
+            the number of existing events found.
+        """
+        communities_by_record: dict[str, list[str]] = {}
+        for record_data in records:
+            # Always process global community, plus communities the record
+            # actually belongs to
+            communities_by_record[record_data["id"]] = ["global"] + (
+                record_data.get("parent", {}).get("communities", {}).get("ids", [])
+            )
+
+        all_communities = {c for ids in communities_by_record.values() for c in ids}
+        existing: dict[str, set[str]] = {}
+        old_events_found = 0
+        try:
+            response = self.client.search(
+                index=prefix_index("stats-community-events"),
+                body={
+                    "size": 0,
+                    "query": {
                         "bool": {
                             "must": [
-                                {"term": {"record_id": record_id}},
-                                {"terms": {"community_id": communities_to_process}},
+                                {"terms": {"record_id": list(communities_by_record)}},
+                                {"terms": {"community_id": sorted(all_communities)}},
                                 {"term": {"event_type": "added"}},
                             ]
                         }
-                    }
+                    },
+                    "aggs": {
+                        "by_record": {
+                            "terms": {
+                                "field": "record_id",
+                                "size": len(communities_by_record),
+                            },
+                            "aggs": {
+                                "communities": {
+                                    "terms": {
+                                        "field": "community_id",
+                                        "size": len(all_communities),
+                                    }
+                                }
+                            },
+                        }
+                    },
+                },
+            )
+            for record_bucket in response["aggregations"]["by_record"]["buckets"]:
+                record_communities = set(communities_by_record[record_bucket["key"]])
+                for community_bucket in record_bucket["communities"]["buckets"]:
+                    if community_bucket["key"] in record_communities:
+                        existing.setdefault(record_bucket["key"], set()).add(
+                            community_bucket["key"]
+                        )
+                        old_events_found += community_bucket["doc_count"]
+        except Exception as e:
+            current_app.logger.warning(
+                f"Could not search stats-community-events index: {e}. "
+                f"Treating as empty."
+            )
 
-                    existing_events_search = existing_events_search.query(query_dict)
-                    existing_events = list(existing_events_search.execute())
-                    old_events_found += len(existing_events)
-                except Exception as e:
-                    current_app.logger.warning(
-                        f"Could not search stats-community-events index: {e}. "
-                        f"Treating as empty."
-                    )
+        now = arrow.utcnow().format("YYYY-MM-DDTHH:mm:ss.SSS")
+        actions = []
+        for record_data in records:
+            record_id = record_data["id"]
+            record_created_date = record_data.get("created")
+            communities_to_add = [
+                community_id
+                for community_id in communities_by_record[record_id]
+                if community_id not in existing.get(record_id, set())
+            ]
+            if not communities_to_add:
+                current_app.logger.debug(f"No new events needed for record {record_id}")
+                continue
 
-                existing_community_ids = {
-                    event["community_id"] for event in existing_events
+            published_date = parse_publication_date_for_events(
+                record_data.get("metadata", {}).get("publication_date")
+            )
+            write_index = prefix_index(
+                f"stats-community-events-{arrow.get(record_created_date).year}"
+            )
+            actions.extend(
+                {
+                    "_op_type": "index",
+                    "_index": write_index,
+                    "_source": {
+                        "record_id": record_id,
+                        "community_id": community_id,
+                        "event_type": "added",
+                        "event_date": record_created_date,
+                        "record_created_date": record_created_date,
+                        "record_published_date": published_date,
+                        "is_deleted": False,
+                        "timestamp": now,
+                        "updated_timestamp": now,
+                    },
                 }
+                for community_id in communities_to_add
+            )
 
-                current_app.logger.debug(
-                    f"Found {len(existing_events)} existing events for "
-                    f"record {record_id}"
-                )
-
-                communities_to_add = [
-                    community_id
-                    for community_id in communities_to_process
-                    if community_id not in existing_community_ids
-                ]
-
-                current_app.logger.debug(
-                    f"Will create events for communities: {communities_to_add}"
-                )
-
-                if communities_to_add:
-                    new_events_created += len(communities_to_add)
-                    update_community_events_index(
-                        record_id=record_id,
-                        community_ids_to_add=communities_to_add,
-                        timestamp=record_created_date,
-                        record_created_date=record_created_date,
-                        record_published_date=record_published_date,
-                        client=self.client,
-                    )
-                    current_app.logger.debug(
-                        f"Created {len(communities_to_add)} events for "
-                        f"record {record_id}"
-                    )
-
-                    # Refresh the search index to ensure new events are searchable
-                    try:
-                        self.client.indices.refresh(
-                            index=prefix_index("stats-community-events")
-                        )
-                    except Exception as e:
-                        current_app.logger.error(
-                            f"Error refreshing community events index: {e}"
-                        )
-                else:
-                    current_app.logger.info(
-                        f"No new events needed for record {record_id}"
-                    )
-
-                records_processed += 1
-
-            except Exception as e:
-                current_app.logger.error(f"Error processing record {record_id}: {e}")
+        new_events_created = 0
+        if actions:
+            new_events_created, errors = bulk(
+                self.client, actions, raise_on_error=False, stats_only=False
+            )
+            for error in cast(list, errors):
+                current_app.logger.error(f"Error creating community event: {error}")
 
-        current_app.logger.info(f"Total records processed: {records_processed}")
-        return records_processed, new_events_created, old_events_found
+        return len(records), new_events_created, old_events_found
 
     def read_stats(
         self,
@@ -859,8 +967,10 @@ class CommunityStatsService:
             Dictionary with success status and list of all lock keys
         """
         try:
-            # Get all keys that start with 'lock:'
-            all_keys = current_cache.cache._read_client.keys("lock:*")
+            # Get all keys that start with 'lock:', without blocking Redis
+            all_keys = list(
+                current_cache.cache._read_client.scan_iter(match="lock:*", count=1000)
+            )
 
             if not all_keys:
                 return {
@@ -7,7 +7,7 @@
 """TypedDict types for the EventReindexingService return values."""
 
 import types
-from typing import Any, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 
 class HealthCheckResult(TypedDict):
@@ -57,6 +57,18 @@ class MonthlyIndexBatchResult(TypedDict):
     search_after_point: list[str] | None
 
 
+class SliceMigrationResult(TypedDict):
+    """Result of migrating the slices of a monthly index."""
+
+    processed: int
+    batches: int
+    finished: bool
+    errors: list[str]
+    sample_document_ids: list[str]
+    last_event_id: str | None
+    last_event_timestamp: str | None
+
+
 class MigrationResult(TypedDict):
     """Result of migrating a monthly index."""
 
@@ -85,6 +97,17 @@ class EventTypeResults(TypedDict):
     months: dict[str, MigrationResult]
 
 
+class LookupCacheStats(TypedDict):
+    """Statistics of the record lookup cache used during event enrichment."""
+
+    hits: int
+    misses: int
+    hit_rate_percent: float
+    evictions: int
+    entries: int
+    bytes: int
+
+
 class ReindexingResults(TypedDict):
     """Results of the complete reindexing operation."""
 
@@ -94,6 +117,7 @@ class ReindexingResults(TypedDict):
     health_issues: list[str]
     completed: bool
     error: str | None
+    lookup_cache: NotRequired[LookupCacheStats]
 
 
 class OldMonthCounts(TypedDict):
@@ -7,11 +7,17 @@
 """Service for reindexing events with enriched metadata."""
 
 import random
+import threading
 import time
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
+from itertools import batched
 from typing import Any
 
 import arrow
+import orjson
 import psutil
 from flask import Flask, current_app
 from glom import Spec, glom
@@ -34,6 +40,7 @@ from .types import (
     BatchProcessingResult,
     EventTypeResults,
     HealthCheckResult,
+    LookupCacheStats,
     MigratedMonthCounts,
     MigrationResult,
     MonthlyIndexBatchResult,
@@ -41,10 +48,15 @@ from .types import (
     ProgressCounts,
     ReindexingProgress,
     ReindexingResults,
+    SliceMigrationResult,
     SpotCheckResult,
     ValidationResult,
 )
 
+# Record IDs looked up per community membership search (the size of its
+# terms aggregation)
+_MEMBERSHIP_PAGE_SIZE = 1000
+
 
 class MetadataExtractor:
     """High-performance metadata field extractor using pre-compiled glom specs.
@@ -157,6 +169,164 @@ class MetadataExtractor:
         }
 
 
+class RecordEnrichmentTemplate:
+    """Precomputed enrichment for the events of one record.
+
+    Holds the fields extracted from the record's metadata and its community
+    memberships sorted by effective date. The communities a record belonged
+    to at an event's time are then found with a binary search over the
+    dates, and the resulting community_ids lists are built once for each
+    number of active communities and shared by the enriched events, like the
+    extracted fields. Neither may be modified.
+    """
+
+    __slots__ = ("fields", "_memberships", "_effective_dates", "_active_by_count")
+
+    def __init__(self, fields: dict, communities: list[tuple[str, str]]):
+        """Initialize the template.
+
+        Args:
+            fields: The fields extracted from the record's metadata.
+            communities: The record's (community_id, effective_date) tuples.
+        """
+        self.fields = fields
+        self._memberships = [(c, d) for c, d in communities if c != "global"]
+        self._effective_dates = sorted(d for _, d in self._memberships)
+        self._active_by_count: dict[int, list[str]] = {}
+
+    def get_community_ids(self, end_of_event_day: str) -> list[str]:
+        """Get the communities the record belonged to by the end of an event's day.
+
+        Args:
+            end_of_event_day: The end of the event's day, formatted like the
+                effective dates (see get_end_of_event_day).
+
+        Returns:
+            list[str]: The community IDs, in membership order.
+        """
+        count = bisect_right(self._effective_dates, end_of_event_day)
+        active = self._active_by_count.get(count)
+        if active is None:
+            active = [c for c, d in self._memberships if d <= end_of_event_day]
+            self._active_by_count[count] = active
+        return active
+
+    @staticmethod
+    def get_end_of_event_day(event_timestamp: Any) -> str:
+        """Get the end of an event's day, to include communities added that day.
+
+        ISO 8601 timestamps are handled by slicing off their date instead of
+        parsing them.
+
+        Returns:
+            str: The end of the day in YYYY-MM-DDTHH:mm:ss.SSS format.
+        """
+        if (
+            isinstance(event_timestamp, str)
+            and len(event_timestamp) >= 10
+            and event_timestamp[4] == "-"
+            and event_timestamp[7] == "-"
+        ):
+            return f"{event_timestamp[:10]}T23:59:59.999"
+        return arrow.get(event_timestamp).ceil("day").format("YYYY-MM-DDTHH:mm:ss.SSS")
+
+
+class RecordLookupCache:
+    """Bounded LRU cache for record lookups shared by enrichment batches.
+
+    Popular records appear in almost every batch of a month, so without a
+    cache their metadata and community membership are searched for again in
+    each batch. The cache keeps the raw lookup results by kind ("metadata" or
+    "membership") and record ID, and evicts the least recently used entries
+    once it holds more than max_items entries or more than max_bytes of
+    (JSON-serialized) values. It is thread-safe, so concurrent slices and
+    months can share it.
+    """
+
+    def __init__(self, max_items: int, max_bytes: int):
+        """Initialize the cache.
+
+        Args:
+            max_items: Maximum number of entries kept.
+            max_bytes: Maximum total estimated size of the kept values.
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_many(self, kind: str, record_ids: list[str]) -> dict[str, Any]:
+        """Get the cached values of a kind for several records.
+
+        Returns:
+            dict[str, Any]: The cached values by record ID. Records that aren't
+                cached are left out.
+        """
+        found = {}
+        with self._lock:
+            for record_id in record_ids:
+                entry = self._entries.get((kind, record_id))
+                if entry is None:
+                    continue
+                self._entries.move_to_end((kind, record_id))
+                found[record_id] = entry[0]
+            self._hits += len(found)
+            self._misses += len(record_ids) - len(found)
+        return found
+
+    def set_many(self, kind: str, values: dict[str, Any]) -> None:
+        """Cache the values of a kind for several records."""
+        sized = {
+            record_id: (value, len(orjson.dumps(value)))
+            for record_id, value in values.items()
+        }
+        with self._lock:
+            for record_id, entry in sized.items():
+                previous = self._entries.pop((kind, record_id), None)
+                if previous is not None:
+                    self._bytes -= previous[1]
+                self._entries[(kind, record_id)] = entry
+                self._bytes += entry[1]
+            while self._entries and (
+                len(self._entries) > self.max_items or self._bytes > self.max_bytes
+            ):
+                _, (_, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Empty the cache and reset its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get_stats(self) -> LookupCacheStats:
+        """Get cache performance statistics.
+
+        Returns:
+            LookupCacheStats: Hits, misses, evictions and current size.
+        """
+        with self._lock:
+            total_requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_percent": (
+                    round(self._hits / total_requests * 100, 2) if total_requests else 0
+                ),
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
 class EventReindexingBookmarkAPI(CommunityBookmarkAPI):
     """Bookmark API for event reindexing progress."""
 
@@ -194,10 +364,15 @@ class EventReindexingBookmarkAPI(CommunityBookmarkAPI):
         @wraps(func)
         def wrapped(self, *args, **kwargs):
             if not Index(prefix_index(self.bookmark_index), using=self.client).exists():
-                self.client.indices.create(
-                    index=prefix_index(self.bookmark_index),
-                    body=EventReindexingBookmarkAPI.MAPPINGS,
-                )
+                try:
+                    self.client.indices.create(
+                        index=prefix_index(self.bookmark_index),
+                        body=EventReindexingBookmarkAPI.MAPPINGS,
+                    )
+                except RequestError as e:
+                    # Another migration worker may have just created it
+                    if e.error != "resource_already_exists_exception":
+                        raise
             return func(self, *args, **kwargs)
 
         return wrapped
@@ -296,16 +471,44 @@ class EventReindexingBookmarkAPI(CommunityBookmarkAPI):
         except Exception as e:
             current_app.logger.warning(f"Failed to delete bookmark {task_id}: {e}")
 
+    @_ensure_index_exists
+    def delete_slice_bookmarks(self, task_id: str):
+        """Delete the bookmarks of a task's slices (see get_slice_task_id)."""
+        try:
+            self.client.delete_by_query(
+                index=prefix_index(self.bookmark_index),
+                body={"query": {"prefix": {"task_id": f"{task_id}-slice-"}}},
+                refresh=True,
+            )
+        except Exception as e:
+            current_app.logger.warning(
+                f"Failed to delete slice bookmarks for {task_id}: {e}"
+            )
+
+    @staticmethod
+    def get_slice_task_id(task_id: str, slice_id: int, slice_count: int) -> str:
+        """Get the task identifier of one slice of a sliced reindexing task.
+
+        The slice count is part of the identifier because a document's slice
+        depends on it, so a slice's bookmark is only valid for the same count.
+
+        Returns:
+            str: The slice's task identifier.
+        """
+        return f"{task_id}-slice-{slice_id}-of-{slice_count}"
+
     @_ensure_index_exists
     def reset_bookmark_to_beginning(self, task_id: str, source_index: str):
         """Reset a bookmark by deleting it, allowing migration to start fresh.
 
         This is used when a migration fails to preserve failure information
         while indicating that the enriched index data is unreliable.
-        Deleting the bookmark ensures we start from the very beginning.
+        Deleting the bookmark (and any slice bookmarks) ensures we start from
+        the very beginning.
         """
         try:
             self.delete_bookmark(task_id)
+            self.delete_slice_bookmarks(task_id)
             current_app.logger.info(
                 f"Reset bookmark for {task_id} by deletion - will start from beginning"
             )
@@ -355,7 +558,22 @@ class EventReindexingService:
         self.max_spot_check_sample_size = app.config.get(
             "STATS_DASHBOARD_REINDEXING_MAX_SPOT_CHECK_SAMPLE_SIZE", 100
         )
+        self.pipelined = app.config.get("STATS_DASHBOARD_REINDEXING_PIPELINED", False)
+        self.slices = max(
+            1, int(app.config.get("STATS_DASHBOARD_REINDEXING_SLICES", 4))
+        )
+        self.concurrent_months = max(
+            1, int(app.config.get("STATS_DASHBOARD_REINDEXING_CONCURRENT_MONTHS", 1))
+        )
         self.subcount_configs = app.config.get("COMMUNITY_STATS_SUBCOUNTS", {})
+        self.record_lookup_cache = RecordLookupCache(
+            max_items=app.config.get(
+                "STATS_DASHBOARD_REINDEXING_LOOKUP_CACHE_SIZE", 50000
+            ),
+            max_bytes=app.config.get(
+                "STATS_DASHBOARD_REINDEXING_LOOKUP_CACHE_BYTES", 256 * 1024 * 1024
+            ),
+        )
 
         # Lazy-load components that require application context
         self._reindexing_bookmark_api: EventReindexingBookmarkAPI | None = None
@@ -1404,47 +1622,58 @@ class EventReindexingService:
             current_app.logger.info(
                 f"Searching for community events using pattern: {search_pattern}"
             )
-            community_search = Search(using=self.client, index=search_pattern)
-            community_search = community_search.query({
-                "terms": {"record_id": record_ids}
-            })
+            membership: dict[str, list] = {}
+            # The terms aggregation returns at most one bucket per record ID in
+            # the query, so look the records up in pages of its bucket limit
+            for page_ids in batched(record_ids, _MEMBERSHIP_PAGE_SIZE):
+                community_search = Search(using=self.client, index=search_pattern)
+                community_search = community_search.query({
+                    "terms": {"record_id": list(page_ids)}
+                })
 
-            record_agg = community_search.aggs.bucket(
-                "by_record", "terms", field="record_id", size=1000
-            )
-            community_agg = record_agg.bucket(
-                "by_community", "terms", field="community_id", size=100
-            )
-            community_agg.bucket(
-                "top_hit", "top_hits", size=1, sort=[{"timestamp": {"order": "desc"}}]
-            )
+                record_agg = community_search.aggs.bucket(
+                    "by_record", "terms", field="record_id", size=len(page_ids)
+                )
+                community_agg = record_agg.bucket(
+                    "by_community", "terms", field="community_id", size=100
+                )
+                community_agg.bucket(
+                    "top_hit",
+                    "top_hits",
+                    size=1,
+                    sort=[{"timestamp": {"order": "desc"}}],
+                )
 
-            community_results = community_search.execute()
+                community_results = community_search.execute()
 
-            if hasattr(community_results, "aggregations") and hasattr(
-                community_results.aggregations, "by_record"
-            ):
-                current_app.logger.info(
-                    f"Found {len(community_results.aggregations.by_record.buckets)} "
-                    f"record buckets in aggregations"
-                )
-            else:
-                current_app.logger.warning("No aggregations found in search results")
+                if hasattr(community_results, "aggregations") and hasattr(
+                    community_results.aggregations, "by_record"
+                ):
+                    current_app.logger.info(
+                        f"Found "
+                        f"{len(community_results.aggregations.by_record.buckets)} "
+                        f"record buckets in aggregations"
+                    )
+                else:
+                    current_app.logger.warning(
+                        "No aggregations found in search results"
+                    )
 
-            membership: dict[str, list] = {}
-            for record_bucket in community_results.aggregations.by_record.buckets:
-                record_id = record_bucket.key
-                membership[record_id] = []
+                for record_bucket in community_results.aggregations.by_record.buckets:
+                    record_id = record_bucket.key
+                    membership[record_id] = []
 
-                for community_bucket in record_bucket.by_community.buckets:
-                    community_id = community_bucket.key
-                    if community_bucket.top_hit.hits.hits:
-                        top_hit = community_bucket.top_hit.hits.hits[0]
-                        event_type = top_hit["_source"]["event_type"]
-                        event_date = top_hit["_source"]["event_date"]
+                    for community_bucket in record_bucket.by_community.buckets:
+                        community_id = community_bucket.key
+                        if community_bucket.top_hit.hits.hits:
+                            top_hit = community_bucket.top_hit.hits.hits[0]
+                            event_type = top_hit["_source"]["event_type"]
+                            event_date = top_hit["_source"]["event_date"]
 
-                        if event_type == "added":
-                            membership[record_id].append((community_id, event_date))
+                            if event_type == "added":
+                                membership[record_id].append(
+                                    (community_id, event_date)
+                                )
 
             # Fallback for records without community event index records
             missing_records = [rid for rid in record_ids if rid not in membership]
@@ -1543,7 +1772,11 @@ class EventReindexingService:
             return {}
 
     def _process_and_index_events_batch(
-        self, hits: list[dict], target_index: str, context: str = "events"
+        self,
+        hits: list[dict],
+        target_index: str,
+        context: str = "events",
+        refresh: bool = True,
     ) -> BatchProcessingResult:
         """Process a batch of events and bulk index them with error handling.
 
@@ -1551,6 +1784,7 @@ class EventReindexingService:
             hits: List of search hits from OpenSearch
             target_index: Target index name for the enriched documents
             context: Context for logging (e.g., "new records", "events")
+            refresh: Whether to refresh the target index after indexing
 
         Returns:
             BatchProcessingResult, which is a dictionary with the following keys:
@@ -1587,7 +1821,7 @@ class EventReindexingService:
         )
 
         try:
-            bulk_result = bulk(self.client, enriched_docs, refresh=True)
+            bulk_result = bulk(self.client, enriched_docs, refresh=refresh)
             success, failed = bulk_result
 
             # Handle different return types from bulk function
@@ -1639,6 +1873,46 @@ class EventReindexingService:
                 "error_message": error_msg,
             }
 
+    def _get_cached_record_lookups(
+        self, record_ids: list[str]
+    ) -> tuple[dict[str, dict], dict[str, list[tuple[str, str]]]]:
+        """Get record metadata and community membership through the lookup cache.
+
+        Only the records missing from the cache are searched for, and the
+        results are added to the cache for later batches.
+
+        Args:
+            record_ids: The record IDs to look up.
+
+        Returns:
+            tuple: The metadata by record ID and the community membership by
+                record ID (see get_community_membership).
+        """
+        cache = self.record_lookup_cache
+
+        metadata_by_recid = cache.get_many("metadata", record_ids)
+        missing_ids = [r for r in record_ids if r not in metadata_by_recid]
+        if missing_ids:
+            fetched_metadata = self.get_metadata_for_records(missing_ids)
+            cache.set_many("metadata", fetched_metadata)
+            metadata_by_recid.update(fetched_metadata)
+
+        communities_by_recid = cache.get_many("membership", record_ids)
+        missing_ids = [r for r in record_ids if r not in communities_by_recid]
+        if missing_ids:
+            fetched_membership = self.get_community_membership(
+                missing_ids,
+                {
+                    r: metadata_by_recid[r]
+                    for r in missing_ids
+                    if r in metadata_by_recid
+                },
+            )
+            cache.set_many("membership", fetched_membership)
+            communities_by_recid.update(fetched_membership)
+
+        return metadata_by_recid, communities_by_recid
+
     def _bulk_enrich_events(
         self,
         hits: list[dict],
@@ -1646,10 +1920,11 @@ class EventReindexingService:
     ) -> list[dict]:
         """Bulk enrich events using pre-computed enrichment data.
 
+        The enrichment of each record in the batch is computed once as a
+        RecordEnrichmentTemplate, which its events share.
+
         Args:
             hits: List of event search hits from OpenSearch
-            enrichment_lookup: Pre-computed enrichment data by record ID
-            communities_by_recid: Community membership by record ID
             target_index: Target index name for the enriched documents
 
         Returns:
@@ -1658,42 +1933,39 @@ class EventReindexingService:
         enriched_docs = []
 
         record_ids = list(set(hit["_source"]["recid"] for hit in hits))
-        metadata_by_recid = self.get_metadata_for_records(record_ids)
-        communities_by_recid = self.get_community_membership(
-            record_ids, metadata_by_recid
+        metadata_by_recid, communities_by_recid = self._get_cached_record_lookups(
+            record_ids
         )
 
-        enrichment_lookup = {}
-        for record_id in record_ids:
-            metadata = metadata_by_recid.get(record_id, {})
-
-            enrichment_lookup[record_id] = self.metadata_extractor.extract_fields(
-                metadata, record_id
+        templates = {
+            record_id: RecordEnrichmentTemplate(
+                self.metadata_extractor.extract_fields(
+                    metadata_by_recid.get(record_id, {}), record_id
+                ),
+                communities_by_recid.get(record_id, []),
             )
+            for record_id in record_ids
+        }
+        get_end_of_event_day = RecordEnrichmentTemplate.get_end_of_event_day
 
         for hit in hits:
             event = hit["_source"]
-            record_id = event["recid"]
-
-            enrichment_data = enrichment_lookup.get(record_id, {}).copy()
-
-            # Calculate community_ids based on event timestamp
-            event_timestamp = event.get("timestamp")
-            # Get the end of the event day to include communities added on same day
-            event_date = arrow.get(event_timestamp)
-            end_of_event_day = event_date.ceil("day").format("YYYY-MM-DDTHH:mm:ss.SSS")
+            template = templates[event["recid"]]
 
-            effective_communities = [
-                c
-                for c, effective_date in communities_by_recid.get(record_id, [])
-                if effective_date <= end_of_event_day and c != "global"
-            ]
-            enrichment_data["community_ids"] = effective_communities
+            # Calculate community_ids based on the end of the event day, to
+            # include communities added on the same day
+            effective_communities = template.get_community_ids(
+                get_end_of_event_day(event.get("timestamp"))
+            )
             if not effective_communities:
                 self._month_count_without_communities += 1
 
             # Merge event with enrichment data (fast dictionary merge)
-            enriched_event = {**event, **enrichment_data}
+            enriched_event = {
+                **event,
+                **template.fields,
+                "community_ids": effective_communities,
+            }
 
             enriched_docs.append({
                 "_index": target_index,
@@ -1982,6 +2254,247 @@ class EventReindexingService:
                 "search_after_point": None,
             }
 
+    def _migrate_slices(
+        self,
+        event_type: str,
+        source_index: str,
+        target_index: str,
+        month: str,
+        max_batches: int | None,
+        source_count: int,
+    ) -> SliceMigrationResult:
+        """Migrate a monthly index with parallel, pipelined slice workers.
+
+        The index is split into STATS_DASHBOARD_REINDEXING_SLICES slices of a
+        point in time (PIT), and each slice is migrated by its own worker. A
+        worker fetches its next page while the current one is being enriched
+        and indexed, and stores its position in its own bookmark after every
+        page, so an interrupted migration resumes each slice where it stopped.
+        Pages are indexed without refreshing the target index, which is
+        refreshed once when all slices are done.
+
+        If the cluster can't open a PIT the index is migrated as one slice.
+
+        Args:
+            event_type: The type of event (view or download)
+            source_index: The source monthly index name
+            target_index: The target enriched index name
+            month: The month being migrated (YYYY-MM format)
+            max_batches: Maximum number of batches to process across all slices
+            source_count: The number of documents in the source index
+
+        Returns:
+            SliceMigrationResult: The combined results of the slices. The
+                migration is finished when every slice has reached its end.
+        """
+        task_id = f"{event_type}-{month}-reindexing"
+        keep_alive = "10m"
+        pit_id: str | None = None
+        try:
+            pit_id = self.client.create_pit(index=source_index, keep_alive=keep_alive)[
+                "pit_id"
+            ]
+        except Exception as e:
+            current_app.logger.info(
+                f"Could not open a point in time on {source_index}, "
+                f"migrating it as a single slice: {e}"
+            )
+        slice_count = self.slices if pit_id else 1
+
+        total_batches = max(1, -(-source_count // self.batch_size))
+        samples_per_batch = max(1, self.max_spot_check_sample_size // total_batches)
+        batch_budget = threading.BoundedSemaphore(max_batches) if max_batches else None
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def migrate_slice_in_app_context(slice_id: int) -> SliceMigrationResult:
+            with app.app_context():
+                return self._migrate_slice(
+                    task_id,
+                    source_index,
+                    target_index,
+                    pit_id,
+                    keep_alive,
+                    slice_id,
+                    slice_count,
+                    batch_budget,
+                    samples_per_batch,
+                )
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=slice_count,
+                thread_name_prefix=f"reindex-{event_type}-{month}",
+            ) as executor:
+                slice_results = list(
+                    executor.map(migrate_slice_in_app_context, range(slice_count))
+                )
+        finally:
+            if pit_id:
+                try:
+                    self.client.delete_pit(body={"pit_id": [pit_id]})
+                except Exception as e:
+                    current_app.logger.debug(f"Could not delete PIT: {e}")
+
+        self.client.indices.refresh(index=target_index)
+
+        results: SliceMigrationResult = {
+            "processed": sum(r["processed"] for r in slice_results),
+            "batches": sum(r["batches"] for r in slice_results),
+            "finished": all(r["finished"] for r in slice_results),
+            "errors": [e for r in slice_results for e in r["errors"]],
+            "sample_document_ids": [
+                i for r in slice_results for i in r["sample_document_ids"]
+            ],
+            "last_event_id": None,
+            "last_event_timestamp": None,
+        }
+        last_events = [
+            (arrow.get(r["last_event_timestamp"]), r["last_event_id"], r)
+            for r in slice_results
+            if r["last_event_id"] and r["last_event_timestamp"]
+        ]
+        if last_events:
+            _, _, last_slice = max(last_events, key=lambda e: (e[0], e[1]))
+            results["last_event_id"] = last_slice["last_event_id"]
+            results["last_event_timestamp"] = last_slice["last_event_timestamp"]
+        return results
+
+    def _migrate_slice(
+        self,
+        task_id: str,
+        source_index: str,
+        target_index: str,
+        pit_id: str | None,
+        keep_alive: str,
+        slice_id: int,
+        slice_count: int,
+        batch_budget: threading.BoundedSemaphore | None,
+        samples_per_batch: int,
+    ) -> SliceMigrationResult:
+        """Migrate one slice of a monthly index, prefetching its next page.
+
+        Args:
+            task_id: The reindexing task identifier of the month
+            source_index: The source monthly index name
+            target_index: The target enriched index name
+            pit_id: The point in time to search, or None to search the index
+            keep_alive: How long each search keeps the point in time open
+            slice_id: The slice to migrate
+            slice_count: The number of slices the month is split into
+            batch_budget: The batches left for all slices of the month, or None
+                if they are unlimited
+            samples_per_batch: Number of document IDs to sample from each batch
+                for spot-check validation
+
+        Returns:
+            SliceMigrationResult: The results of the slice.
+        """
+        results: SliceMigrationResult = {
+            "processed": 0,
+            "batches": 0,
+            "finished": False,
+            "errors": [],
+            "sample_document_ids": [],
+            "last_event_id": None,
+            "last_event_timestamp": None,
+        }
+        slice_task_id = self.reindexing_bookmark_api.get_slice_task_id(
+            task_id, slice_id, slice_count
+        )
+        search_after: list | None = None
+        bookmark = self.reindexing_bookmark_api.get_bookmark(slice_task_id)
+        if bookmark:
+            # Date sort values are epoch milliseconds
+            search_after = [
+                int(bookmark["last_event_timestamp"].float_timestamp * 1000),
+                bookmark["last_event_id"],
+            ]
+            current_app.logger.info(
+                f"Resuming {slice_task_id} after {bookmark['last_event_id']}"
+            )
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def fetch_page(after: list | None) -> list[dict]:
+            body: dict[str, Any] = {
+                "size": self.batch_size,
+                "sort": [{"timestamp": "asc"}, {"_id": "asc"}],
+            }
+            if after:
+                body["search_after"] = after
+            with app.app_context():
+                if pit_id:
+                    body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+                    if slice_count > 1:
+                        body["slice"] = {"id": slice_id, "max": slice_count}
+                    response = self.client.search(body=body)
+                else:
+                    response = self.client.search(index=source_index, body=body)
+            return response["hits"]["hits"]
+
+        def may_fetch() -> bool:
+            health_check = self.check_health_conditions()
+            if not health_check["is_healthy"]:
+                results["errors"].append(
+                    f"{slice_task_id}: health check failed: {health_check['reason']}"
+                )
+                return False
+            return batch_budget is None or batch_budget.acquire(blocking=False)
+
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{slice_task_id}-prefetch"
+        ) as prefetcher:
+            next_page: Future | None = None
+            if may_fetch():
+                next_page = prefetcher.submit(fetch_page, search_after)
+            while next_page is not None:
+                try:
+                    hits = next_page.result()
+                except Exception as e:
+                    results["errors"].append(f"{slice_task_id}: search failed: {e}")
+                    break
+                next_page = None
+
+                # Fetch the next page while this one is enriched and indexed
+                if len(hits) < self.batch_size:
+                    results["finished"] = True
+                elif may_fetch():
+                    next_page = prefetcher.submit(fetch_page, hits[-1]["sort"])
+                if not hits:
+                    break
+
+                batch_result = self._process_and_index_events_batch(
+                    hits, target_index, "events", refresh=False
+                )
+                if not batch_result["success"]:
+                    results["errors"].append(
+                        f"{slice_task_id}: {batch_result['error_message']}"
+                    )
+                    results["finished"] = False
+                    if next_page is not None:
+                        next_page.cancel()
+                    break
+
+                last_event_id = hits[-1]["_id"]
+                last_event_timestamp = hits[-1]["_source"]["timestamp"]
+                self.reindexing_bookmark_api.set_bookmark(
+                    slice_task_id, last_event_id, last_event_timestamp
+                )
+                results["last_event_id"] = last_event_id
+                results["last_event_timestamp"] = last_event_timestamp
+                results["processed"] += len(hits)
+                results["batches"] += 1
+                results["sample_document_ids"] += random.sample(
+                    [hit["_id"] for hit in hits], min(samples_per_batch, len(hits))
+                )
+
+        current_app.logger.info(
+            f"{slice_task_id} processed {results['processed']} events in "
+            f"{results['batches']} batches (finished: {results['finished']})"
+        )
+        return results
+
     @time_operation
     def migrate_monthly_index(
         self,
@@ -2048,6 +2561,7 @@ class EventReindexingService:
             # Delete existing bookmark
             try:
                 self.reindexing_bookmark_api.delete_bookmark(task_id)
+                self.reindexing_bookmark_api.delete_slice_bookmarks(task_id)
                 current_app.logger.info(
                     f"Fresh start enabled - deleted existing bookmark for "
                     f"{event_type}-{month}"
@@ -2102,97 +2616,124 @@ class EventReindexingService:
                         "No valid bookmark data found - starting from beginning"
                     )
 
-            batch_count = 0
-            should_continue = True
-            previous_batch_ids: set[str] = set()
-            search_after_point = None
-
-            while should_continue:
-                # Check max batches limit
-                if max_batches and batch_count >= max_batches:
-                    current_app.logger.info(
-                        f"Reached max batches limit for {event_type}-{month}"
-                    )
-                    break
-
-                current_app.logger.info(
-                    f"Processing batch {batch_count + 1} for {event_type}-{month}"
-                )
-
-                # Process batch
-                batch_result = self.process_monthly_index_batch(
+            if self.pipelined:
+                slice_results = self._migrate_slices(
                     event_type,
                     source_index,
                     target_index,
                     month,
-                    last_processed_id,
-                    last_processed_timestamp,
-                    previous_batch_ids,
-                    search_after_point,
-                )
-                processed_count = batch_result["processed_count"]
-                last_id = batch_result["last_event_id"]
-                last_timestamp = batch_result["last_event_timestamp"]
-                continue_processing = batch_result["should_continue"]
-                batch_document_ids = batch_result.get("batch_document_ids", [])
-                previous_batch_ids = (
-                    batch_result.get("previous_batch_ids", set()) or set()
-                )
-                search_after_point = batch_result.get("search_after_point", None)
-
-                current_app.logger.info(
-                    f"Batch {batch_count + 1} result: processed={processed_count}, "
-                    f"continue_processing={continue_processing}, last_id={last_id}"
-                )
-
-                # Log cumulative progress
-                current_app.logger.info(
-                    f"Total processed so far: {results['processed']} documents"
-                )
+                    max_batches,
+                    source_count,
+                )
+                for error in slice_results["errors"]:
+                    add_operational_error("batch_failure", error)
+                results["processed"] = slice_results["processed"]
+                results["batches_succeeded"] = slice_results["batches"]
+                results["all_sample_document_ids"] = slice_results[
+                    "sample_document_ids"
+                ]
+                batch_count = slice_results["batches"]
+                # The slices resume from their own bookmarks, so the month's
+                # bookmark only moves once every slice has finished
+                should_continue = not slice_results["finished"]
+                if slice_results["finished"] and slice_results["last_event_id"]:
+                    last_processed_id = slice_results["last_event_id"]
+                    last_processed_timestamp = slice_results["last_event_timestamp"]
+            else:
+                batch_count = 0
+                should_continue = True
+                previous_batch_ids: set[str] = set()
+                search_after_point = None
+
+                while should_continue:
+                    # Check max batches limit
+                    if max_batches and batch_count >= max_batches:
+                        current_app.logger.info(
+                            f"Reached max batches limit for {event_type}-{month}"
+                        )
+                        break
 
-                if processed_count > 0:
-                    results["processed"] += processed_count
-                    results["batches_succeeded"] += 1
-                    # Always use the actual last document from the batch for bookmarking
-                    # search_after_point is for pagination, not for bookmarking
-                    last_processed_id = last_id
-                    last_processed_timestamp = last_timestamp
+                    current_app.logger.info(
+                        f"Processing batch {batch_count + 1} for {event_type}-{month}"
+                    )
 
-                    # Collect a sample of document IDs from each batch for validation
-                    total_batches = (source_count // self.batch_size) + (
-                        1 if source_count % self.batch_size > 0 else 0
+                    # Process batch
+                    batch_result = self.process_monthly_index_batch(
+                        event_type,
+                        source_index,
+                        target_index,
+                        month,
+                        last_processed_id,
+                        last_processed_timestamp,
+                        previous_batch_ids,
+                        search_after_point,
                     )
-                    samples_per_batch = max(
-                        1, self.max_spot_check_sample_size // total_batches
+                    processed_count = batch_result["processed_count"]
+                    last_id = batch_result["last_event_id"]
+                    last_timestamp = batch_result["last_event_timestamp"]
+                    continue_processing = batch_result["should_continue"]
+                    batch_document_ids = batch_result.get("batch_document_ids", [])
+                    previous_batch_ids = (
+                        batch_result.get("previous_batch_ids", set()) or set()
+                    )
+                    search_after_point = batch_result.get("search_after_point", None)
+
+                    current_app.logger.info(
+                        f"Batch {batch_count + 1} result: processed={processed_count}, "
+                        f"continue_processing={continue_processing}, last_id={last_id}"
                     )
-                    # Ensure we don't try to sample more documents than are available
-                    # in this batch
-                    actual_samples = min(samples_per_batch, len(batch_document_ids))
-                    results["all_sample_document_ids"] += random.sample(
-                        batch_document_ids, actual_samples
+
+                    # Log cumulative progress
+                    current_app.logger.info(
+                        f"Total processed so far: {results['processed']} documents"
                     )
-                else:
-                    # Only treat as error if we're not at the end of the data
-                    if continue_processing:
-                        add_operational_error(
-                            "batch_failure",
-                            f"Batch {batch_count + 1} processed 0 events",
+
+                    if processed_count > 0:
+                        results["processed"] += processed_count
+                        results["batches_succeeded"] += 1
+                        # Always use the actual last document from the batch for
+                        # bookmarking. search_after_point is for pagination, not
+                        # for bookmarking
+                        last_processed_id = last_id
+                        last_processed_timestamp = last_timestamp
+
+                        # Collect a sample of document IDs from each batch for
+                        # validation
+                        total_batches = (source_count // self.batch_size) + (
+                            1 if source_count % self.batch_size > 0 else 0
                         )
-                    else:
-                        current_app.logger.info(
-                            f"Batch {batch_count + 1}: No more events to process "
-                            f"for {event_type}-{month}"
+                        samples_per_batch = max(
+                            1, self.max_spot_check_sample_size // total_batches
+                        )
+                        # Ensure we don't try to sample more documents than are
+                        # available in this batch
+                        actual_samples = min(samples_per_batch, len(batch_document_ids))
+                        results["all_sample_document_ids"] += random.sample(
+                            batch_document_ids, actual_samples
                         )
+                    else:
+                        # Only treat as error if we're not at the end of the data
+                        if continue_processing:
+                            add_operational_error(
+                                "batch_failure",
+                                f"Batch {batch_count + 1} processed 0 events",
+                            )
+                        else:
+                            current_app.logger.info(
+                                f"Batch {batch_count + 1}: No more events to process "
+                                f"for {event_type}-{month}"
+                            )
 
-                should_continue = continue_processing and processed_count > 0
+                    should_continue = continue_processing and processed_count > 0
 
-                # Only increment batch count if we actually processed documents
-                # This prevents counting "checking for more data" as an attempted batch
-                if processed_count > 0:
-                    batch_count += 1
+                    # Only increment batch count if we actually processed documents
+                    # This prevents counting "checking for more data" as an
+                    # attempted batch
+                    if processed_count > 0:
+                        batch_count += 1
 
-                # Small delay to prevent overwhelming the system
-                time.sleep(0.1)
+                    # Small delay to prevent overwhelming the system
+                    time.sleep(0.1)
 
             # Always set batches_attempted to the actual number of batches
             # processed
@@ -2262,14 +2803,15 @@ class EventReindexingService:
                     },
                 }
             else:
-                # Normal case: validate the migrated data
+                # Normal case: validate the migrated data. A finished pipelined
+                # migration has covered the whole source index.
                 validation_results = self.validate_enriched_data(
                     source_index,
                     target_index,
                     results.get("all_sample_document_ids", []),
                     last_processed_id,
                     last_processed_timestamp,
-                    max_batches=max_batches,
+                    max_batches=None if self.pipelined else max_batches,
                     fresh_start=fresh_start,
                     batches_attempted=results["batches_attempted"],
                     processed_count=results["processed"],
@@ -2527,6 +3069,61 @@ class EventReindexingService:
 
         return True
 
+    def _migrate_monthly_indices(
+        self,
+        event_type: str,
+        monthly_indices: list[str],
+        max_batches: int | None,
+        delete_old_indices: bool,
+        fresh_start: bool,
+    ) -> list[tuple[str, MigrationResult]]:
+        """Migrate monthly indices, several months at a time if configured.
+
+        Up to STATS_DASHBOARD_REINDEXING_CONCURRENT_MONTHS months are migrated
+        concurrently. Concurrent migrations still stop when memory use exceeds the
+        max_memory_percent limit, since every batch checks it.
+
+        Returns:
+            list[tuple[str, MigrationResult]]: The month (YYYY-MM) and the
+                migration results for each index, in the order given.
+        """
+        months = []
+        for source_index in monthly_indices:
+            year, month = source_index.split("-")[-2:]
+            months.append((source_index, f"{year}-{month}"))
+
+        def migrate(source_index: str, month: str) -> MigrationResult:
+            current_app.logger.info(f"Processing {event_type} events for {month}")
+            return self.migrate_monthly_index(
+                event_type,
+                source_index,
+                month,
+                max_batches,
+                delete_old_indices,
+                fresh_start,
+            )
+
+        if self.concurrent_months == 1 or len(months) < 2:
+            return [
+                (month, migrate(source_index, month)) for source_index, month in months
+            ]
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def migrate_in_app_context(source_index: str, month: str) -> MigrationResult:
+            with app.app_context():
+                return migrate(source_index, month)
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrent_months,
+            thread_name_prefix=f"reindex-{event_type}",
+        ) as executor:
+            futures = [
+                (month, executor.submit(migrate_in_app_context, source_index, month))
+                for source_index, month in months
+            ]
+            return [(month, future.result()) for month, future in futures]
+
     def reindex_events(
         self,
         event_types: list[str] | None = None,
@@ -2594,6 +3191,9 @@ class EventReindexingService:
         if event_types is None:
             event_types = ["view", "download"]
 
+        # Record lookups are shared by all batches and months of this run
+        self.record_lookup_cache.clear()
+
         current_app.logger.info(f"Starting reindexing for event types: {event_types}")
 
         for event_type in event_types:
@@ -2613,22 +3213,14 @@ class EventReindexingService:
                 "months": {},
             }
 
-            for source_index in monthly_indices:
-                year, month = source_index.split("-")[-2:]
-                current_app.logger.info(
-                    f"Processing {event_type} events for {year}-{month}"
-                )
-
-                month_results = self.migrate_monthly_index(
-                    event_type,
-                    source_index,
-                    f"{year}-{month}",
-                    max_batches,
-                    delete_old_indices,
-                    fresh_start,
-                )
-
-                event_results["months"][f"{year}-{month}"] = month_results
+            for month, month_results in self._migrate_monthly_indices(
+                event_type,
+                monthly_indices,
+                max_batches,
+                delete_old_indices,
+                fresh_start,
+            ):
+                event_results["months"][month] = month_results
                 event_results["processed"] += month_results.get("processed", 0)
                 # Count operational and validation errors
                 op_error_count = len(month_results.get("operational_errors", []))
@@ -2689,6 +3281,8 @@ class EventReindexingService:
                 total_errors += op_error_count + val_error_count
 
         results["total_errors"] = total_errors
+        results["lookup_cache"] = self.record_lookup_cache.get_stats()
+        current_app.logger.info(f"Record lookup cache: {results['lookup_cache']}")
 
         return results
 
@@ -6,10 +6,14 @@
 
 """Celery tasks for community statistics aggregation and event reindexing."""
 
+import json
+import queue
+import threading
 import time
 import uuid
+from collections.abc import Generator
 from datetime import timedelta
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 import arrow
 from celery import shared_task
@@ -22,11 +26,13 @@ from invenio_stats.proxies import current_stats
 
 from ..constants import RegistryOperation
 from ..exceptions import (
+    AggregationDependencyError,
     CommunityEventsNotInitializedError,
     TaskLockAcquisitionError,
     UsageEventsNotMigratedError,
 )
 from ..resources.cache_utils import StatsAggregationRegistry
+from ..utils.memory import memory_governor
 
 
 # TypedDict definitions for aggregation response objects
@@ -80,6 +86,8 @@ class AggregationResponse(TypedDict):
     total_duration: str
     formatted_report: str
     formatted_report_verbose: str
+    # Garbage collections run by the memory governor, per call site
+    memory_metrics: NotRequired[dict[str, dict[str, float]]]
 
 
 def format_agg_startup_message(
@@ -263,6 +271,19 @@ def _format_aggregation_report(
         lines.append(f"{'Total':<35} {total_duration:>15}")
         lines.append("=" * 60)
 
+        memory_metrics = result.get("memory_metrics") or {}
+        if memory_metrics:
+            lines.append("\nGarbage collections under memory pressure:")
+            lines.append("-" * 50)
+            for site, site_metrics in memory_metrics.items():
+                lines.append(
+                    f"  {site}: {int(site_metrics['collections'])} collections in "
+                    f"{int(site_metrics['checks'])} checks, "
+                    f"{int(site_metrics['bytes_reclaimed']):,} bytes reclaimed "
+                    f"in {site_metrics['collection_seconds']:.3f}s"
+                )
+            lines.append("=" * 60)
+
     return "\n".join(lines)
 
 
@@ -651,82 +672,90 @@ def _assemble_aggregation_results(
     }
 
 
-def _run_aggregation(
-    aggregations: list[str],
-    start_date: str | None = None,
-    end_date: str | None = None,
-    update_bookmark: bool = True,
-    community_ids: list[str] | None = None,
-    ignore_bookmark: bool = False,
-    verbose: bool = False,
-    eager: bool = False,
-) -> AggregationResponse:
-    """Run the actual aggregation logic.
+def _build_aggregator(aggr_name: str, community_ids: list[str] | None = None):
+    """Instantiate a configured aggregator.
+
+    Args:
+        aggr_name: Name of the aggregator in the invenio-stats configuration
+        community_ids: Optional list of community IDs to limit the aggregation to
 
     Returns:
-        AggregationResponse
+        The aggregator instance
     """
-    parsed_start_date = dateutil_parse(start_date) if start_date else None
-    parsed_end_date = dateutil_parse(end_date) if end_date else None
-    results: list[AggregatorResult] = []
+    aggr_cfg = current_stats.aggregations[aggr_name]
+    params = aggr_cfg.params.copy()
+    if community_ids:
+        params["community_ids"] = community_ids
+    return aggr_cfg.cls(name=aggr_cfg.name, **params)
 
-    startup_config = format_agg_startup_message(
-        community_ids=community_ids,
-        start_date=str(start_date) if start_date else None,
-        end_date=str(end_date) if end_date else None,
-        eager=eager,
-        update_bookmark=update_bookmark,
-        ignore_bookmark=ignore_bookmark,
-        verbose=verbose,
+
+def _complete_aggregator_run(
+    aggregator, aggr_name: str, raw_result: list, aggr_duration: str, run_kwargs: dict
+) -> AggregatorResult:
+    """Refresh an aggregator's index and assemble its results.
+
+    Args:
+        aggregator: The aggregator instance that has been run
+        aggr_name: Name of the aggregator
+        raw_result: Raw result from aggregator.run()
+        aggr_duration: Formatted duration string
+        run_kwargs: The keyword arguments the aggregator was run with
+
+    Returns:
+        Assembled AggregatorResult dictionary
+    """
+    # Get the actual communities that were processed by the aggregator
+    processed_communities = getattr(aggregator, "communities_to_aggregate", [])
+
+    if hasattr(aggregator, "aggregation_index") and aggregator.aggregation_index:
+        current_search_client.indices.refresh(index=f"*{aggregator.aggregation_index}*")
+
+    return _assemble_aggregation_results(
+        raw_result,
+        aggr_name,
+        aggr_duration,
+        processed_communities,
+        run_kwargs["start_date"],
+        run_kwargs["end_date"],
+        "completed",
     )
-    current_app.logger.info(f"Aggregation startup configuration:\n{startup_config}")
 
-    # Refresh community events index before running aggregators
-    current_search_client.indices.refresh(index="*stats-community-events*")
 
-    total_start_time = time.time()
+def _run_aggregators_in_sequence(
+    aggregations: list[str], community_ids: list[str] | None, run_kwargs: dict
+) -> list[AggregatorResult]:
+    """Run the aggregators one after another in the configured order.
+
+    Args:
+        aggregations: Names of the aggregators to run
+        community_ids: Optional list of community IDs to limit the aggregation to
+        run_kwargs: Keyword arguments for each aggregator's run method
+
+    Returns:
+        The assembled result for each aggregator that was run
+    """
+    results: list[AggregatorResult] = []
+    parsed_start_date = run_kwargs["start_date"]
+    parsed_end_date = run_kwargs["end_date"]
 
     for aggr_name in aggregations:
         aggr_start_time = time.time()
         current_app.logger.info(f"Starting aggregator: {aggr_name}")
 
-        aggr_cfg = current_stats.aggregations[aggr_name]
-        params = aggr_cfg.params.copy()
-        if community_ids:
-            params["community_ids"] = community_ids
-        aggregator = aggr_cfg.cls(name=aggr_cfg.name, **params)
+        aggregator = _build_aggregator(aggr_name, community_ids)
 
         try:
-            raw_result = aggregator.run(
-                parsed_start_date, parsed_end_date, update_bookmark, ignore_bookmark
-            )
-
-            # Get the actual communities that were processed by the aggregator
-            processed_communities = getattr(aggregator, "communities_to_aggregate", [])
-
-            if (
-                hasattr(aggregator, "aggregation_index")
-                and aggregator.aggregation_index
-            ):
-                current_search_client.indices.refresh(
-                    index=f"*{aggregator.aggregation_index}*"
-                )
+            raw_result = aggregator.run(**run_kwargs)
 
             # Calculate duration after successful run
             aggr_end_time = time.time()
             aggr_duration = str(timedelta(seconds=aggr_end_time - aggr_start_time))
 
-            # Assemble successful result
-            result = _assemble_aggregation_results(
-                raw_result,
-                aggr_name,
-                aggr_duration,
-                processed_communities,
-                parsed_start_date,
-                parsed_end_date,
-                "completed",
+            results.append(
+                _complete_aggregator_run(
+                    aggregator, aggr_name, raw_result, aggr_duration, run_kwargs
+                )
             )
-            results.append(result)
 
         except CommunityEventsNotInitializedError:
             # Calculate duration after error occurs
@@ -760,6 +789,281 @@ def _run_aggregation(
 
         current_app.logger.info(f"Completed aggregator: {aggr_name} in {aggr_duration}")
 
+    return results
+
+
+class _CommunityFeed:
+    """Hand communities finished by an upstream aggregator to a downstream one.
+
+    The upstream aggregator puts each community ID once it is done with it. The
+    downstream aggregator iterates over the feed, blocking until a community is
+    ready. Before yielding a batch of communities the upstream index is refreshed
+    once, so that the downstream aggregator can see the new documents.
+    """
+
+    _CLOSED = object()
+    _ABORTED = object()
+
+    def __init__(self, refresh_index: str | None = None):
+        """Initialize the feed.
+
+        Args:
+            refresh_index: The upstream index pattern to refresh before the
+                downstream aggregator reads a batch of communities.
+        """
+        self.refresh_index = refresh_index
+        self._queue: queue.Queue = queue.Queue()
+
+    def put(self, community_id: str) -> None:
+        """Mark a community as finished upstream."""
+        self._queue.put(community_id)
+
+    def close(self) -> None:
+        """Mark the upstream aggregator as finished."""
+        self._queue.put(self._CLOSED)
+
+    def abort(self) -> None:
+        """Mark the upstream aggregator as failed."""
+        self._queue.put(self._ABORTED)
+
+    def __iter__(self) -> Generator[str, None, None]:
+        """Yield community IDs as they are finished upstream.
+
+        Yields:
+            str: Each community ID finished by the upstream aggregator.
+
+        Raises:
+            AggregationDependencyError: If the upstream aggregator failed.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            community_ids = [item for item in batch if isinstance(item, str)]
+            if community_ids and self.refresh_index:
+                current_search_client.indices.refresh(index=self.refresh_index)
+            yield from community_ids
+
+            if self._ABORTED in batch:
+                raise AggregationDependencyError(
+                    "Upstream aggregator failed before finishing all communities"
+                )
+            if self._CLOSED in batch:
+                return
+
+
+def _get_aggregator_dependencies(aggregators: dict) -> dict[str, str]:
+    """Work out which of the aggregators to run depend on another one.
+
+    A snapshot aggregator reads the documents written by the delta aggregator
+    whose aggregation index is the snapshot aggregator's delta index.
+
+    Args:
+        aggregators: Mapping of aggregator names to aggregator instances
+
+    Returns:
+        Mapping of each dependent aggregator's name to its upstream aggregator's name
+    """
+    names_by_index = {
+        aggregator.aggregation_index: aggr_name
+        for aggr_name, aggregator in aggregators.items()
+        if getattr(aggregator, "aggregation_index", None)
+    }
+    dependencies = {}
+    for aggr_name, aggregator in aggregators.items():
+        upstream = names_by_index.get(getattr(aggregator, "delta_index", None))
+        if upstream and upstream != aggr_name:
+            dependencies[aggr_name] = upstream
+    return dependencies
+
+
+def _run_aggregators_as_dag(
+    aggregations: list[str], community_ids: list[str] | None, run_kwargs: dict
+) -> list[AggregatorResult]:
+    """Run the aggregators concurrently, following their dependencies.
+
+    Each aggregator runs in its own thread. Aggregators without an upstream
+    aggregator start straight away. A snapshot aggregator whose delta aggregator
+    is part of the run starts with it, and aggregates each community as soon as
+    the delta aggregator has finished that community.
+
+    Args:
+        aggregations: Names of the aggregators to run
+        community_ids: Optional list of community IDs to limit the aggregation to
+        run_kwargs: Keyword arguments for each aggregator's run method
+
+    Unexpected errors are re-raised once every aggregator has stopped.
+
+    Returns:
+        The assembled result for each aggregator, in the configured order
+    """
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    aggregators = {
+        aggr_name: _build_aggregator(aggr_name, community_ids)
+        for aggr_name in aggregations
+    }
+    dependencies = _get_aggregator_dependencies(aggregators)
+    feeds: dict[str, _CommunityFeed] = {
+        aggr_name: _CommunityFeed(
+            refresh_index=f"*{aggregators[upstream].aggregation_index}*"
+        )
+        for aggr_name, upstream in dependencies.items()
+    }
+    downstream: dict[str, list[_CommunityFeed]] = {name: [] for name in aggregators}
+    for aggr_name, upstream in dependencies.items():
+        downstream[upstream].append(feeds[aggr_name])
+        current_app.logger.info(
+            f"Aggregator {aggr_name} will follow {upstream} community by community"
+        )
+
+    outcomes: dict[str, dict] = {}
+
+    def run_node(aggr_name: str) -> None:
+        aggregator = aggregators[aggr_name]
+        node_feeds = downstream[aggr_name]
+
+        def community_done(community_id: str) -> None:
+            for feed in node_feeds:
+                feed.put(community_id)
+
+        aggr_start_time = time.time()
+        finished = False
+        with app.app_context():
+            current_app.logger.info(f"Starting aggregator: {aggr_name}")
+            try:
+                raw_result = aggregator.run(
+                    **run_kwargs,
+                    community_order=feeds.get(aggr_name),
+                    on_community_done=community_done,
+                )
+                finished = True
+            except Exception as e:
+                outcomes[aggr_name] = {
+                    "error": e,
+                    "duration": str(timedelta(seconds=time.time() - aggr_start_time)),
+                }
+                return
+            finally:
+                # Even a BaseException must not leave downstream threads waiting
+                if not finished:
+                    for feed in node_feeds:
+                        feed.abort()
+            for feed in node_feeds:
+                feed.close()
+            aggr_duration = str(timedelta(seconds=time.time() - aggr_start_time))
+            outcomes[aggr_name] = {"result": raw_result, "duration": aggr_duration}
+            current_app.logger.info(
+                f"Completed aggregator: {aggr_name} in {aggr_duration}"
+            )
+
+    threads = [
+        threading.Thread(target=run_node, args=(aggr_name,), name=aggr_name)
+        for aggr_name in aggregators
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results: list[AggregatorResult] = []
+    handled_setup_error = False
+    for aggr_name, aggregator in aggregators.items():
+        # A thread stopped by a BaseException leaves no outcome
+        outcome = outcomes.get(aggr_name) or {
+            "error": RuntimeError(f"Aggregator {aggr_name} stopped without a result")
+        }
+        error = outcome.get("error")
+        if error is None:
+            results.append(
+                _complete_aggregator_run(
+                    aggregator,
+                    aggr_name,
+                    outcome["result"],
+                    outcome["duration"],
+                    run_kwargs,
+                )
+            )
+        elif isinstance(error, AggregationDependencyError):
+            current_app.logger.error(
+                f"Aggregator {aggr_name} stopped because "
+                f"{dependencies[aggr_name]} failed"
+            )
+        elif isinstance(
+            error, CommunityEventsNotInitializedError | UsageEventsNotMigratedError
+        ):
+            # Only run the initialization or migration once per run
+            if handled_setup_error:
+                continue
+            handled_setup_error = True
+            handler = (
+                _handle_community_events_error
+                if isinstance(error, CommunityEventsNotInitializedError)
+                else _handle_usage_events_error
+            )
+            results.append(
+                handler(
+                    aggr_name,
+                    outcome["duration"],
+                    run_kwargs["start_date"],
+                    run_kwargs["end_date"],
+                )
+            )
+        else:
+            raise error
+
+    return results
+
+
+def _run_aggregation(
+    aggregations: list[str],
+    start_date: str | None = None,
+    end_date: str | None = None,
+    update_bookmark: bool = True,
+    community_ids: list[str] | None = None,
+    ignore_bookmark: bool = False,
+    verbose: bool = False,
+    eager: bool = False,
+) -> AggregationResponse:
+    """Run the actual aggregation logic.
+
+    Returns:
+        AggregationResponse
+    """
+    parsed_start_date = dateutil_parse(start_date) if start_date else None
+    parsed_end_date = dateutil_parse(end_date) if end_date else None
+
+    startup_config = format_agg_startup_message(
+        community_ids=community_ids,
+        start_date=str(start_date) if start_date else None,
+        end_date=str(end_date) if end_date else None,
+        eager=eager,
+        update_bookmark=update_bookmark,
+        ignore_bookmark=ignore_bookmark,
+        verbose=verbose,
+    )
+    current_app.logger.info(f"Aggregation startup configuration:\n{startup_config}")
+
+    # Refresh community events index before running aggregators
+    current_search_client.indices.refresh(index="*stats-community-events*")
+
+    total_start_time = time.time()
+    memory_governor.reset_metrics()
+
+    run_kwargs = {
+        "start_date": parsed_start_date,
+        "end_date": parsed_end_date,
+        "update_bookmark": update_bookmark,
+        "ignore_bookmark": ignore_bookmark,
+    }
+    if current_app.config.get("COMMUNITY_STATS_AGGREGATION_DAG", False):
+        results = _run_aggregators_as_dag(aggregations, community_ids, run_kwargs)
+    else:
+        results = _run_aggregators_in_sequence(aggregations, community_ids, run_kwargs)
+
     total_end_time = time.time()
     total_duration = str(timedelta(seconds=total_end_time - total_start_time))
 
@@ -774,6 +1078,7 @@ def _run_aggregation(
         "total_duration": total_duration,
         "formatted_report": "",
         "formatted_report_verbose": "",
+        "memory_metrics": memory_governor.metrics(),
     }
 
     # Generate formatted report for both logging and CLI display
@@ -793,15 +1098,19 @@ def _run_aggregation(
 
 
 def _record_aggregation_updates(results: list[AggregatorResult]) -> None:
-    """Record which community/year combinations were updated during aggregation.
+    """Record which aggregation indices were updated for each community and year.
 
     This creates registry entries that the cache task will check to determine
-    which historical cache entries need to be overwritten. We don't need to track
-    the current year because its cached responses are always overwritten by the 
-    cache task.
+    which cache entries need to be overwritten. Each entry names the
+    aggregation index that changed, so the cache task only rebuilds the
+    categories that read from it. The entry's value holds the range of dates
+    whose documents were written, merged with any earlier entry that the cache
+    task has not yet processed.
 
-    Extracts date ranges from the aggregation results to determine which years
-    were affected.
+    The dates are taken from the documents each aggregator indexed. If an
+    aggregator indexed documents without reporting them, we fall back to the
+    requested date range and record an entry (without an index name) for each
+    historical year in it, which causes every category to be rebuilt.
 
     Registry entries are created with a TTL of 7 days - the cache task should process
     these within that time.
@@ -812,31 +1121,51 @@ def _record_aggregation_updates(results: list[AggregatorResult]) -> None:
     """
     registry = StatsAggregationRegistry()
     current_year = arrow.utcnow().year
+    index_prefix = current_app.config.get("SEARCH_INDEX_PREFIX", "")
 
+    # (community_id, year, index) -> (earliest date, latest date) updated
+    updated_ranges: dict[tuple[str, int, str], tuple[str, str]] = {}
     updated_combinations: set[tuple[str, int]] = set()
 
     for result in results:
         community_details = result.get("community_details", [])
-        
+
         for detail in community_details:
             community_id = detail.get("community_id", "")
-            if not community_id:
+            if not community_id or not detail.get("docs_indexed"):
+                continue
+
+            documents = detail.get("documents", [])
+            index_name = detail.get("index_name", "").removeprefix(index_prefix)
+            base_index, _, year_suffix = index_name.rpartition("-")
+            if not year_suffix.isdigit():
+                base_index = index_name
+
+            if documents and base_index:
+                for document in documents:
+                    date_info = document.get("date_info", {})
+                    doc_date = date_info.get("period_start") or date_info.get(
+                        "snapshot_date"
+                    )
+                    if not doc_date:
+                        continue
+                    day = str(doc_date)[:10]
+                    key = (community_id, int(day[:4]), base_index)
+                    start, end = updated_ranges.get(key, (day, day))
+                    updated_ranges[key] = (min(start, day), max(end, day))
                 continue
-                
+
             date_range = detail.get("date_range_requested", {})
             start_date_str = date_range.get("start_date")
             end_date_str = date_range.get("end_date")
-            
+
             if not start_date_str or not end_date_str:
                 continue
-            
+
             try:
-                start_date = arrow.get(start_date_str)
-                end_date = arrow.get(end_date_str)
-                
-                start_year = start_date.year
-                end_year = end_date.year
-                
+                start_year = arrow.get(start_date_str).year
+                end_year = arrow.get(end_date_str).year
+
                 for year in range(start_year, end_year + 1):
                     if year < current_year:
                         updated_combinations.add((community_id, year))
@@ -849,13 +1178,36 @@ def _record_aggregation_updates(results: list[AggregatorResult]) -> None:
     ttl_seconds = 7 * 24 * 60 * 60  # 7 days
     timestamp = arrow.utcnow().isoformat()
 
+    for (community_id, year, index), (start, end) in updated_ranges.items():
+        operation = RegistryOperation.AGG_UPDATED_INDEX.replace(
+            "{year}", str(year)
+        ).replace("{index}", index)
+        registry_key = registry.make_registry_key(community_id, operation)
+
+        # Widen the range of an entry the cache task hasn't processed yet
+        existing = registry.get(registry_key)
+        if existing:
+            try:
+                previous = json.loads(existing)
+                start = min(start, previous["start_date"])
+                end = max(end, previous["end_date"])
+            except (ValueError, TypeError, KeyError):
+                pass
+
+        registry.set(
+            registry_key,
+            json.dumps({"start_date": start, "end_date": end, "updated": timestamp}),
+            ttl=ttl_seconds,
+        )
+
     for community_id, year in updated_combinations:
         operation = RegistryOperation.AGG_UPDATED.replace("{year}", str(year))
         registry_key = registry.make_registry_key(community_id, operation)
         registry.set(registry_key, timestamp, ttl=ttl_seconds)
 
-    if updated_combinations:
+    if updated_ranges or updated_combinations:
         current_app.logger.info(
-            f"Recorded {len(updated_combinations)} community/year combinations "
+            f"Recorded {len(updated_ranges)} index updates and "
+            f"{len(updated_combinations)} community/year combinations "
             "for cache update"
         )
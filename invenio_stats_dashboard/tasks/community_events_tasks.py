@@ -0,0 +1,49 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Celery tasks for writing record community events."""
+
+import time
+
+from celery import shared_task
+from flask import current_app
+
+from ..services.components.components import apply_community_event_changes
+from .aggregation_tasks import AggregationTaskLock
+
+
+@shared_task(ignore_result=True)
+def write_community_events(changes: list[dict]) -> None:
+    """Write queued record community membership changes as a Celery task.
+
+    Each change is applied relative to the newest stored event for its record
+    and community, so the writes for one record must not overlap. The task
+    holds a lock on each of its records while it writes, waiting for any
+    other task still writing one of them. The locks are taken in record ID
+    order, so two tasks can't wait on each other.
+
+    Args:
+        changes: The changes, as made by `make_community_event_change`.
+    """
+    lock_timeout = current_app.config.get(
+        "COMMUNITY_STATS_EVENTS_ASYNC_LOCK_TIMEOUT", 300
+    )
+    locks = []
+    try:
+        for record_id in sorted({change["record_id"] for change in changes}):
+            lock = AggregationTaskLock(
+                f"community_events:{record_id}", timeout=lock_timeout
+            )
+            # The lock expires after lock_timeout, so this always ends
+            while not lock.acquire():
+                time.sleep(0.1)
+            locks.append(lock)
+
+        current_app.logger.debug(f"Writing {len(changes)} community event changes")
+        apply_community_event_changes(changes)
+    finally:
+        for lock in reversed(locks):
+            lock.release()
@@ -8,9 +8,14 @@
 
 import json
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterator
+from datetime import date as date_type
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import orjson
 from babel.dates import format_date
 from flask import current_app
 
@@ -86,6 +91,153 @@ class DataPoint:
             return str(self.date)
 
 
+@lru_cache(maxsize=8192)
+def _format_ordinal(ordinal: int) -> tuple[str, str, int]:
+    """Format a date ordinal for serialization.
+
+    Returns:
+        tuple[str, str, int]: The YYYY-MM-DD string, the MM-DD string and
+            the year of the date.
+    """
+    day = date_type.fromordinal(ordinal)
+    return day.isoformat(), f"{day.month:02d}-{day.day:02d}", day.year
+
+
+class DataPointColumns:
+    """Columnar storage for the points of a data series.
+
+    Dates are packed as day ordinals and values as a typed array, instead
+    of one DataPoint object per point. The value column is typed by the
+    first value added ("q" for ints, "d" for floats), so serialized values
+    keep their Python type. Dates that aren't YYYY-MM-DD strings and series
+    with mixed value types fall back to plain lists.
+    """
+
+    __slots__ = ("_dates", "_values")
+
+    def __init__(self):
+        """Initialize an empty set of columns."""
+        self._dates: array | list[str] = array("l")
+        self._values: array | list[int | float] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of points."""
+        return len(self._dates)
+
+    def append(self, date: str | datetime, value: int | float) -> None:
+        """Add a point to the columns.
+
+        Args:
+            date: Date string (YYYY-MM-DD) or datetime object
+            value: Numeric value for this data point
+        """
+        if isinstance(date, datetime):
+            date = date.strftime("%Y-%m-%d")
+        self._append_date(date)
+        self._append_value(value)
+
+    def _append_date(self, date: str) -> None:
+        """Add a date, packing it as an ordinal when it round-trips exactly."""
+        if isinstance(self._dates, array):
+            try:
+                day = date_type.fromisoformat(date)
+                if day.isoformat() == date:
+                    self._dates.append(day.toordinal())
+                    return
+            except (TypeError, ValueError):
+                pass
+            self._dates = self.dates()
+        self._dates.append(date)
+
+    def _append_value(self, value: int | float) -> None:
+        """Add a value, keeping the typed column while the types agree."""
+        if self._values is None:
+            if type(value) is int:
+                self._values = array("q")
+            elif type(value) is float:
+                self._values = array("d")
+            else:
+                self._values = []
+        if isinstance(self._values, array):
+            expected_type = int if self._values.typecode == "q" else float
+            if type(value) is expected_type:
+                try:
+                    self._values.append(value)
+                    return
+                except OverflowError:
+                    pass
+            self._values = self._values.tolist()
+        self._values.append(value)
+
+    def dates(self) -> list[str]:
+        """Get the dates as YYYY-MM-DD strings.
+
+        Returns:
+            list[str]: The point dates, in insertion order.
+        """
+        if isinstance(self._dates, array):
+            return [_format_ordinal(ordinal)[0] for ordinal in self._dates]
+        return list(self._dates)
+
+    def values(self) -> list[int | float]:
+        """Get the values.
+
+        Returns:
+            list[int | float]: The point values, in insertion order.
+        """
+        if self._values is None:
+            return []
+        return list(self._values)
+
+    def single_year(self) -> int | None:
+        """Check if all points are in the same year.
+
+        Returns:
+            Year (int) if all dates are in the same year, None otherwise.
+        """
+        if not self._dates:
+            return None
+
+        if isinstance(self._dates, array):
+            first_year = _format_ordinal(min(self._dates))[2]
+            last_year = _format_ordinal(max(self._dates))[2]
+            return first_year if first_year == last_year else None
+
+        years = set()
+        for date in self._dates:
+            try:
+                years.add(datetime.strptime(date, "%Y-%m-%d").year)
+                if len(years) > 1:
+                    return None
+            except (ValueError, AttributeError):
+                return None
+        return years.pop() if len(years) == 1 else None
+
+    def to_arrays(self, year: int | None = None) -> list[DataPointArray]:
+        """Convert the points to [date, value] arrays.
+
+        Args:
+            year: If given, dates in this year are formatted as MM-DD.
+
+        Returns:
+            list[DataPointArray]: The points, in insertion order.
+        """
+        values = self.values()
+        if not isinstance(self._dates, array):
+            return [
+                DataPoint(date, value).to_dict(
+                    use_mmdd_format=year is not None, year=year
+                )
+                for date, value in zip(self._dates, values, strict=True)
+            ]
+
+        result: list[DataPointArray] = []
+        for ordinal, value in zip(self._dates, values, strict=True):
+            full_date, mmdd_date, date_year = _format_ordinal(ordinal)
+            result.append([mmdd_date if date_year == year else full_date, value])
+        return result
+
+
 class DataSeries(ABC):
     """Represents a complete data series for charting."""
 
@@ -113,7 +265,7 @@ class DataSeries(ABC):
         self.metric = metric
         self.chart_type = chart_type
         self.value_type = value_type
-        self.data: list[DataPoint] = []
+        self.points = DataPointColumns()
 
         # Additional attributes expected by serializers
         self.id = series_id
@@ -138,7 +290,21 @@ class DataSeries(ABC):
             date: Date string (YYYY-MM-DD)
             value: Numeric value for this data point
         """
-        self.data.append(DataPoint(date, value))
+        self.points.append(date, value)
+
+    @property
+    def data(self) -> list[DataPoint]:
+        """The series' points as DataPoint objects.
+
+        The points are stored in columns, so this builds new objects on
+        every access.
+        """
+        return [
+            DataPoint(date, value)
+            for date, value in zip(
+                self.points.dates(), self.points.values(), strict=True
+            )
+        ]
 
     def to_dict(self) -> DataSeriesDict:
         """Convert to dictionary format matching JavaScript output.
@@ -170,13 +336,10 @@ class DataSeries(ABC):
         # If all dates are in the same year, use optimized MM-DD format
         if series_year is not None:
             result["year"] = series_year
-            result["data"] = [
-                dp.to_dict(use_mmdd_format=True, year=series_year)
-                for dp in self.data
-            ]
+            result["data"] = self.points.to_arrays(year=series_year)
         else:
             # Fallback to full YYYY-MM-DD format for multi-year series
-            result["data"] = [dp.to_dict() for dp in self.data]
+            result["data"] = self.points.to_arrays()
 
         return result
 
@@ -186,20 +349,7 @@ class DataSeries(ABC):
         Returns:
             Year (int) if all dates are in the same year, None otherwise.
         """
-        if not self.data:
-            return None
-
-        years = set()
-        for dp in self.data:
-            try:
-                date_obj = datetime.strptime(dp.date, "%Y-%m-%d")
-                years.add(date_obj.year)
-                if len(years) > 1:
-                    return None
-            except (ValueError, AttributeError):
-                return None
-
-        return years.pop() if len(years) == 1 else None
+        return self.points.single_year()
 
     def for_json(self) -> DataSeriesDict:
         """Convert to dictionary format for JSON serialization.
@@ -244,6 +394,8 @@ class DataSeriesArray:
         self.value_type = value_type
         self.is_special = is_special
         self.series: DataSeries | list[DataSeries] | None = None
+        # Subcount series by item id, for series created from documents
+        self._series_index: dict[str, DataSeries] = {}
         self._initialized = False
 
     def add(self, doc: dict[str, Any]) -> None:
@@ -274,124 +426,97 @@ class DataSeriesArray:
                 # Create individual DataSeries as we encounter items
                 self._create_series_from_doc(doc)
 
-                # Add data to all existing series
-                if isinstance(self.series, list):
-                    for data_series in self.series:
-                        # Get the item data for this specific series
-                        item_data = self._get_item_data_for_series(doc, data_series)
-                        if item_data:
-                            data_series.add(item_data)
-
-    def _create_series_from_doc(self, doc: dict[str, Any]) -> None:
-        """Create individual DataSeries from document for subcount series."""
-        if self.is_global:
-            return
+                # Route each item straight to its series. Only the first item
+                # with a given id in a document is used.
+                subcount_series = self._get_subcount_items(doc)
+                if subcount_series is None:
+                    return
+                seen_ids = set()
+                for item in subcount_series:
+                    item_id = item.get("id")
+                    if item_id in seen_ids:
+                        continue
+                    seen_ids.add(item_id)
+                    data_series = self._series_index.get(item_id)
+                    if data_series is not None:
+                        data_series.add(self._make_item_data(doc, item))
+
+    def _get_subcount_items(self, doc: dict[str, Any]) -> list | None:
+        """Get the document's list of items for this array's subcount type.
 
+        Returns:
+            list | None: The subcount items, or None if the document has none.
+        """
         subcounts = doc.get("subcounts")
         if subcounts is None:
-            return
+            return None
 
-        # Process the specific subcount type
         if self.series_type.endswith("_by_view"):
             # For by_view series, look at subcounts[base_type]["by_view"]
             base_type = self.series_type.replace("_by_view", "")
             subcount_data = subcounts.get(base_type)
             if not isinstance(subcount_data, dict):
-                return
+                return None
             subcount_series = subcount_data.get("by_view", [])
         elif self.series_type.endswith("_by_download"):
             # For by_download series, look at subcounts[base_type]["by_download"]
             base_type = self.series_type.replace("_by_download", "")
             subcount_data = subcounts.get(base_type)
             if not isinstance(subcount_data, dict):
-                return
+                return None
             subcount_series = subcount_data.get("by_download", [])
         else:
             # For regular series, look at subcounts[series_type] (direct array)
             subcount_series = subcounts.get(self.series_type)
 
         if not isinstance(subcount_series, list):
-            return
-
-        for item in subcount_series:
-            item_id = item.get("id", "")
-            item_label = item.get("label", item_id)
-
-            # Preserve the full label object (string or multilingual dict)
-            if not isinstance(item_label, str | dict):
-                item_label = str(item_label)
-
-            # Create series for this item if it doesn't exist
-            if isinstance(self.series, list) and not any(
-                s.series_id == item_id for s in self.series
-            ):
-                # Preserve the original label object for proper multilingual handling
-                # The JavaScript side will handle localization
-                series_name = item_label
-                self.series.append(
-                    self.data_series_class(
-                        item_id,
-                        series_name,
-                        self.metric,
-                        self.chart_type,
-                        self.value_type,
-                    )
-                )
+            return None
+        return subcount_series
 
-    def _get_item_data_for_series(
-        self, doc: dict[str, Any], data_series: DataSeries
-    ) -> dict[str, Any] | None:
-        """Get the specific item data for a DataSeries from the document.
+    @staticmethod
+    def _make_item_data(doc: dict[str, Any], item: dict[str, Any]) -> dict[str, Any]:
+        """Copy a subcount item, adding the document's date fields.
 
         Returns:
-            dict[str, Any] | None: Item data dictionary, or None if not found.
+            dict[str, Any]: The item data to add to the item's series.
         """
-        if self.is_global:
-            # Return global document without subcounts
-            global_doc = dict(doc)
-            global_doc.pop("subcounts", None)
-            return global_doc
+        item_data = dict(item)
+        item_data["snapshot_date"] = doc.get("snapshot_date")
+        item_data["period_start"] = doc.get("period_start")
+        return item_data
 
-        # Get the item_id directly from series_id and subcount_type from series_type
-        item_id = data_series.series_id
-        subcount_type = self.series_type
+    def _create_series_from_doc(self, doc: dict[str, Any]) -> None:
+        """Create individual DataSeries from document for subcount series."""
+        if self.is_global:
+            return
 
-        subcounts = doc.get("subcounts")
-        if subcounts is None:
-            return None
+        subcount_series = self._get_subcount_items(doc)
+        if subcount_series is None:
+            return
 
-        # Handle different subcount types
-        if subcount_type.endswith("_by_view"):
-            # For by_view series, look at subcounts[base_type]["by_view"]
-            base_type = subcount_type.replace("_by_view", "")
-            subcount_data = subcounts.get(base_type)
-            if not isinstance(subcount_data, dict):
-                return None
-            subcount_series = subcount_data.get("by_view", [])
-        elif subcount_type.endswith("_by_download"):
-            # For by_download series, look at subcounts[base_type]["by_download"]
-            base_type = subcount_type.replace("_by_download", "")
-            subcount_data = subcounts.get(base_type)
-            if not isinstance(subcount_data, dict):
-                return None
-            subcount_series = subcount_data.get("by_download", [])
-        else:
-            # For regular series, look at subcounts[series_type] (direct array)
-            subcount_series = subcounts.get(subcount_type)
+        for item in subcount_series:
+            item_id = item.get("id", "")
 
-        if not isinstance(subcount_series, list):
-            return None
+            # Create series for this item if it doesn't exist
+            if isinstance(self.series, list) and item_id not in self._series_index:
+                item_label = item.get("label", item_id)
 
-        # Find the specific item
-        for item in subcount_series:
-            if item.get("id") == item_id:
-                # Return the full item data with the document date
-                item_data = dict(item)
-                item_data["snapshot_date"] = doc.get("snapshot_date")
-                item_data["period_start"] = doc.get("period_start")
-                return item_data
+                # Preserve the full label object (string or multilingual dict)
+                if not isinstance(item_label, str | dict):
+                    item_label = str(item_label)
 
-        return None
+                # Preserve the original label object for proper multilingual handling
+                # The JavaScript side will handle localization
+                series_name = item_label
+                data_series = self.data_series_class(
+                    item_id,
+                    series_name,
+                    self.metric,
+                    self.chart_type,
+                    self.value_type,
+                )
+                self.series.append(data_series)
+                self._series_index[item_id] = data_series
 
     def to_dict(self) -> list[DataSeriesDict]:
         """Convert to dictionary format.
@@ -586,6 +711,24 @@ class DataSeriesSet(ABC):
 
         self._initialized = True
 
+    def _iter_series_arrays_by_subcount(
+        self,
+    ) -> Iterator[tuple[str, list[tuple[str, DataSeriesArray]]]]:
+        """Group the current series arrays by subcount, in output order.
+
+        Yields:
+            tuple[str, list[tuple[str, DataSeriesArray]]]: Each subcount name
+                with its (metric, series array) pairs.
+        """
+        for subcount in dict.fromkeys(self.series_keys):
+            prefix = f"{subcount}_"
+            yield subcount, [
+                # Extract metric name (everything after "{subcount}_")
+                (series_key[len(prefix):], series_array)
+                for series_key, series_array in self.series_arrays.items()
+                if series_key.startswith(prefix)
+            ]
+
     def _build_result_dict(self) -> dict[str, dict[str, list[DataSeriesDict]]]:
         """Build the result dictionary from current series arrays.
 
@@ -595,19 +738,13 @@ class DataSeriesSet(ABC):
         Note: Only includes series arrays that were actually created (which may
             be filtered by optimization).
         """
-        result: dict[str, dict[str, list[DataSeriesDict]]] = {}
-        for subcount in self.series_keys:
-            if subcount not in result:
-                result[subcount] = {}
-
-            prefix = f"{subcount}_"
-            for series_key, series_array in self.series_arrays.items():
-                if series_key.startswith(prefix):
-                    # Extract metric name (everything after "{subcount}_")
-                    metric = series_key[len(prefix):]
-                    result[subcount][metric] = series_array.to_dict()
-
-        return result
+        return {
+            subcount: {
+                metric: series_array.to_dict()
+                for metric, series_array in metric_arrays
+            }
+            for subcount, metric_arrays in self._iter_series_arrays_by_subcount()
+        }
 
     def build(self) -> dict[str, dict[str, list[DataSeriesDict]]]:
         """Build all data series from the documents.
@@ -640,6 +777,36 @@ class DataSeriesSet(ABC):
         result = self.build()
         return self._convert_to_camelcase(result)
 
+    def iter_json(self) -> Iterator[bytes]:
+        """Serialize the data series set to JSON one metric block at a time.
+
+        The concatenated chunks are identical to orjson.dumps(for_json()),
+        but only one metric's series dictionaries exist at any time, so the
+        full object graph is never built.
+
+        Yields:
+            bytes: Consecutive chunks of the JSON document.
+        """
+        if not self._initialized:
+            self._initialize_series_arrays()
+
+        yield b"{"
+        for i, (subcount, metric_arrays) in enumerate(
+            self._iter_series_arrays_by_subcount()
+        ):
+            if i > 0:
+                yield b","
+            yield orjson.dumps(self._to_camelcase(subcount)) + b":{"
+            for j, (metric, series_array) in enumerate(metric_arrays):
+                yield b"".join([
+                    b"," if j > 0 else b"",
+                    orjson.dumps(self._to_camelcase(metric)),
+                    b":",
+                    orjson.dumps(series_array.to_dict(), option=orjson.OPT_NAIVE_UTC),
+                ])
+            yield b"}"
+        yield b"}"
+
     def add(self, documents: list[AggregationDocumentDict]) -> None:
         """Add additional documents to a data series set.
 
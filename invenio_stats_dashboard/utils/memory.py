@@ -0,0 +1,108 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Memory governor shared by the paginated queries and aggregators."""
+
+import gc
+import threading
+import time
+from collections.abc import Callable
+
+import psutil
+
+
+class MemoryGovernor:
+    """Decide when paginated loops collect garbage, and measure the results.
+
+    Pagination loops used to run a full garbage collection after every page.
+    On a heap holding a large data series set or exhaustive cache that costs
+    far more than processing a small page. Loops now ask the governor to
+    relieve memory pressure between pages instead. The governor reads the
+    process RSS, and only collects when the caller's memory estimator reports
+    that the RSS is too close to its budget. How often each call site
+    collects, how long that takes and how much memory it reclaims are kept as
+    metrics (see metrics()).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the governor."""
+        self._lock = threading.Lock()
+        self._metrics: dict[str, dict[str, float]] = {}
+
+    def get_rss(self) -> int:
+        """Get the current RSS memory usage of the process.
+
+        Returns:
+            int: Current RSS in bytes, or 0 if unavailable.
+        """
+        try:
+            return int(psutil.Process().memory_info().rss)
+        except Exception:
+            return 0
+
+    def relieve(self, site: str, under_pressure: Callable[[int], bool]) -> int:
+        """Collect garbage if the caller's estimator reports memory pressure.
+
+        Args:
+            site: Name of the calling loop, used to group the metrics.
+            under_pressure: Called with the current RSS. Returns whether the
+                caller is close enough to its memory budget to collect.
+
+        Returns:
+            int: The RSS in bytes after any collection.
+        """
+        rss = self.get_rss()
+        try:
+            collect = bool(under_pressure(rss))
+        except Exception:
+            collect = False
+
+        reclaimed = 0
+        seconds = 0.0
+        if collect:
+            started = time.perf_counter()
+            gc.collect()
+            seconds = time.perf_counter() - started
+            rss_after = self.get_rss()
+            reclaimed = max(0, rss - rss_after)
+            rss = rss_after
+
+        with self._lock:
+            site_metrics = self._metrics.setdefault(
+                site,
+                {
+                    "checks": 0,
+                    "collections": 0,
+                    "bytes_reclaimed": 0,
+                    "collection_seconds": 0.0,
+                },
+            )
+            site_metrics["checks"] += 1
+            if collect:
+                site_metrics["collections"] += 1
+                site_metrics["bytes_reclaimed"] += reclaimed
+                site_metrics["collection_seconds"] += seconds
+        return rss
+
+    def metrics(self) -> dict[str, dict[str, float]]:
+        """Get the governor's metrics for each call site.
+
+        Returns:
+            dict[str, dict[str, float]]: For each call site, the number of
+                pressure checks, the number of collections run, the total bytes
+                of RSS those collections reclaimed and the total seconds they
+                took.
+        """
+        with self._lock:
+            return {site: dict(values) for site, values in self._metrics.items()}
+
+    def reset_metrics(self) -> None:
+        """Reset the governor's metrics."""
+        with self._lock:
+            self._metrics.clear()
+
+
+memory_governor = MemoryGovernor()
@@ -9,6 +9,8 @@
 This module contains the views for the Invenio Stats Dashboard.
 """
 
+from collections.abc import Iterator
+from fnmatch import fnmatchcase
 from typing import Any
 
 from flask import (
@@ -31,6 +33,9 @@ from invenio_rest.views import ContentNegotiatedMethodView
 from ..config.component_metrics import extract_component_names_from_layout
 from ..constants import FirstRunStatus, RegistryOperation
 from ..resources.cache_utils import StatsAggregationRegistry
+from ..resources.serializers.data_series_serializers import (
+    CompressedStatsJSONSerializer,
+)
 from ..services.cached_response_service import CachedResponseService
 
 
@@ -146,14 +151,20 @@ def community_stats_dashboard(
     # Force CSRF cookie to be set for API requests made from client side
     request.csrf_cookie_needs_reset = True
 
-    registry = StatsAggregationRegistry()
-    active_cache_operations = registry.get_all(
-        f"{community.id}_{RegistryOperation.CACHE.replace('{year}', '*')}"
+    # One index lookup for all of the community's registry entries
+    registry_entries = StatsAggregationRegistry().get_community_entries(
+        str(community.id)
     )
-    active_agg_operations = registry.get_all(f"{community.id}_{RegistryOperation.AGG}*")
-    first_run_records = registry.get_all(
-        f"{community.id}_{RegistryOperation.FIRST_RUN}*"
+
+    def _matching_entries(operation_pattern: str) -> list[tuple[str, str]]:
+        pattern = f"{community.id}_{operation_pattern}"
+        return [entry for entry in registry_entries if fnmatchcase(entry[0], pattern)]
+
+    active_cache_operations = _matching_entries(
+        RegistryOperation.CACHE.replace("{year}", "*")
     )
+    active_agg_operations = _matching_entries(RegistryOperation.AGG)
+    first_run_records = _matching_entries(f"{RegistryOperation.FIRST_RUN}*")
     first_run_incomplete = len(first_run_records) == 0 or any(
         r[1] != FirstRunStatus.COMPLETED for r in first_run_records
     )
@@ -250,14 +261,24 @@ class StatsDashboardAPIResource(ContentNegotiatedMethodView):
         Returns:
             Complete JSON response bytes
         """
-        json_parts = []
+        return b"".join(self._iter_json_response(results))
+
+    def _iter_json_response(self, results: dict[str, bytes]) -> Iterator[bytes]:
+        """Yield the JSON response built from raw JSON bytes piece by piece.
+
+        Args:
+            results: Dictionary mapping query names to raw JSON bytes
+
+        Yields:
+            bytes: Consecutive chunks of the JSON response.
+        """
+        yield b"{"
         for i, (query_name, raw_json_bytes) in enumerate(results.items()):
             if i > 0:
-                json_parts.append(b",")
-            json_parts.append(f'"{query_name}":'.encode())
-            json_parts.append(raw_json_bytes)
-
-        return b"{" + b"".join(json_parts) + b"}"
+                yield b","
+            yield f'"{query_name}":'.encode()
+            yield raw_json_bytes
+        yield b"}"
 
     def post(self, **kwargs):
         """Handle stats dashboard API requests with cache checking.
@@ -331,7 +352,7 @@ class StatsDashboardAPIResource(ContentNegotiatedMethodView):
                 component_names = extract_component_names_from_layout(layout)
 
             cache_service = CachedResponseService()
-            results = {}
+            queries = {}
 
             for query_name, query_data in request_data.items():
                 if optimize_enabled and component_names:
@@ -342,17 +363,46 @@ class StatsDashboardAPIResource(ContentNegotiatedMethodView):
                             "component_names": list(component_names),
                         },
                     }
-
-                individual_request = {query_name: query_data}
-                result = cache_service.get_or_create(
-                    individual_request, as_json_bytes=is_json_request
+                queries[query_name] = query_data
+
+            # Look up every query's cached response in one round trip
+            responses = cache_service.get_or_create_responses(queries)
+
+            compression_method = None
+            if "application/json+gzip" in accept_header:
+                compression_method = "gzip"
+            elif "application/json+br" in accept_header:
+                compression_method = "brotli"
+
+            # A single response stored compressed with the accepted method
+            # is already the complete response body
+            if compression_method and len(responses) == 1:
+                (response,) = responses.values()
+                encoded_body = response.encoded_body(compression_method)
+                if encoded_body is not None:
+                    return CompressedStatsJSONSerializer(
+                        compression_method
+                    ).make_response(encoded_body)
+
+            results = {
+                query_name: cache_service.format_response(
+                    response, as_json_bytes=is_json_request
                 )
-                results[query_name] = result
+                for query_name, response in responses.items()
+            }
 
             # For JSON responses, handle raw bytes to avoid double serialization
             if is_json_request and all(isinstance(v, bytes) for v in results.values()):
                 # Cast to correct type since we've verified all values are bytes
                 bytes_results: dict[str, bytes] = results  # type: ignore
+
+                # Compress the raw bytes on the fly for compressed JSON requests
+                if compression_method:
+                    serializer = CompressedStatsJSONSerializer(compression_method)
+                    return serializer.stream_response(
+                        self._iter_json_response(bytes_results)
+                    )
+
                 final_json = self._build_json_response(bytes_results)
                 return Response(final_json, mimetype=accept_header)
 
@@ -0,0 +1,110 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the dependency-aware scheduling of aggregators."""
+
+import threading
+
+import pytest
+
+from invenio_stats_dashboard.aggregations.base import CommunityAggregatorBase
+from invenio_stats_dashboard.aggregations.usage_delta_aggs import (
+    CommunityUsageDeltaAggregator,
+)
+from invenio_stats_dashboard.aggregations.usage_snapshot_aggs import (
+    CommunityUsageSnapshotAggregator,
+)
+from invenio_stats_dashboard.exceptions import AggregationDependencyError
+from invenio_stats_dashboard.tasks.aggregation_tasks import (
+    _build_aggregator,
+    _CommunityFeed,
+    _get_aggregator_dependencies,
+    _run_aggregators_as_dag,
+)
+
+
+def test_aggregator_dependencies(running_app):
+    """Snapshot aggregators depend on the delta aggregator for their index."""
+    aggregations = [
+        "community-records-delta-added-agg",
+        "community-records-snapshot-added-agg",
+        "community-records-snapshot-created-agg",
+        "community-usage-delta-agg",
+        "community-usage-snapshot-agg",
+    ]
+    aggregators = {name: _build_aggregator(name) for name in aggregations}
+
+    assert _get_aggregator_dependencies(aggregators) == {
+        "community-records-snapshot-added-agg": "community-records-delta-added-agg",
+        "community-usage-snapshot-agg": "community-usage-delta-agg",
+    }
+
+
+def test_community_feed_order():
+    """Communities are yielded as they are finished upstream, in order."""
+    feed = _CommunityFeed()
+
+    def upstream():
+        for community_id in ["community-2", "global", "community-1"]:
+            feed.put(community_id)
+        feed.close()
+
+    thread = threading.Thread(target=upstream)
+    thread.start()
+    received = list(
+        CommunityAggregatorBase._iter_communities(
+            ["global", "community-1", "community-2", "community-3"], feed
+        )
+    )
+    thread.join()
+
+    # Communities the upstream aggregator never finished come last
+    assert received == ["community-2", "global", "community-1", "community-3"]
+
+
+def test_community_feed_abort():
+    """A failed upstream aggregator stops the downstream aggregator."""
+    feed = _CommunityFeed()
+    feed.put("community-1")
+    feed.abort()
+
+    received = []
+    with pytest.raises(AggregationDependencyError):
+        for community_id in feed:
+            received.append(community_id)
+    assert received == ["community-1"]
+
+
+class AggregatorStopped(BaseException):
+    """Stand-in for an interruption that isn't an Exception."""
+
+
+def test_dag_upstream_stopped_by_base_exception(running_app, monkeypatch):
+    """An upstream stopped by a BaseException still stops its downstream."""
+    downstream_errors = []
+
+    def stopped_run(self, **kwargs):
+        raise AggregatorStopped()
+
+    def following_run(self, community_order=None, **kwargs):
+        try:
+            list(community_order)
+        except AggregationDependencyError as e:
+            downstream_errors.append(e)
+            raise
+
+    monkeypatch.setattr(CommunityUsageDeltaAggregator, "run", stopped_run)
+    monkeypatch.setattr(CommunityUsageSnapshotAggregator, "run", following_run)
+    # The stopped thread's traceback would otherwise be printed
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+
+    with pytest.raises(RuntimeError, match="stopped without a result"):
+        _run_aggregators_as_dag(
+            ["community-usage-delta-agg", "community-usage-snapshot-agg"],
+            None,
+            {"start_date": None, "end_date": None},
+        )
+    assert len(downstream_errors) == 1
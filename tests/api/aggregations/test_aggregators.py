@@ -10,6 +10,7 @@ import re
 from collections.abc import Callable, Iterator
 from copy import deepcopy
 from pprint import pformat
+from unittest.mock import MagicMock
 
 import arrow
 import pytest
@@ -577,6 +578,51 @@ class TestCommunityRecordDeltaAddedAggregator(CommunityRecordDeltaAggregatorTest
                         assert f["records"]["removed"]["metadata_only"] == 0
 
 
+class TestCommunityRecordDeltaAddedAggregatorBatched(
+    TestCommunityRecordDeltaAddedAggregator
+):
+    """Test the CommunityRecordsDeltaAddedAggregator in batched query mode.
+
+    The batched mode must produce exactly the same daily documents as the
+    per-day mode, so we reuse all of the checks from the parent class. A small
+    batch size ensures that the test period is split across several windows.
+    """
+
+    @property
+    def aggregator_instance(self) -> CommunityRecordsDeltaAddedAggregator:
+        """Get the aggregator class with batched queries enabled.
+
+        Returns:
+            CommunityRecordsDeltaAddedAggregator: The aggregator instance.
+        """
+        aggregator = super().aggregator_instance
+        aggregator.batched = True
+        aggregator.batch_days = 3
+        return aggregator
+
+
+class TestCommunityRecordDeltaAddedAggregatorParallel(
+    TestCommunityRecordDeltaAddedAggregator
+):
+    """Test the CommunityRecordsDeltaAddedAggregator with parallel workers.
+
+    The community and the global stats are aggregated in separate worker
+    threads. Results, documents and bookmarks must be the same as in a serial
+    run, so we reuse all of the checks from the parent class.
+    """
+
+    @property
+    def aggregator_instance(self) -> CommunityRecordsDeltaAddedAggregator:
+        """Get the aggregator class with parallel workers enabled.
+
+        Returns:
+            CommunityRecordsDeltaAddedAggregator: The aggregator instance.
+        """
+        aggregator = super().aggregator_instance
+        aggregator.max_workers = 2
+        return aggregator
+
+
 class TestCommunityRecordAddedDeltaAggregatorOptIn(
     CommunityRecordDeltaAggregatorTestBase
 ):
@@ -1525,6 +1571,15 @@ class TestCommunityUsageAggregators:
         end_date = arrow.get("2025-06-16").ceil("day")
         return start_date, end_date
 
+    @property
+    def delta_aggregator_instance(self) -> CommunityUsageDeltaAggregator:
+        """Get the usage delta aggregator to test.
+
+        Returns:
+            CommunityUsageDeltaAggregator: The aggregator instance.
+        """
+        return CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+
     @property
     def run_args(self) -> dict[str, arrow.Arrow]:
         """Return the arguments for the aggregator run method.
@@ -2418,9 +2473,7 @@ class TestCommunityUsageAggregators:
         The delta results are prepared for earlier extra events
         so that the snapshot aggregator has access to them.
         """
-        earlier_results = CommunityUsageDeltaAggregator(
-            name="community-usage-delta-agg"
-        ).run(
+        earlier_results = self.delta_aggregator_instance.run(
             start_date=self.event_date_range[0].shift(days=-1).format("YYYY-MM-DD"),
             end_date=self.event_date_range[0].shift(days=-1).format("YYYY-MM-DD"),
             ignore_bookmark=True,
@@ -2528,7 +2581,7 @@ class TestCommunityUsageAggregators:
         self._setup_extra_events(test_records, extra_records, usage_event_factory)
 
         # Run the delta aggregator
-        aggregator = CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+        aggregator = self.delta_aggregator_instance
         self._set_bookmarks(aggregator, community_id)
 
         delta_response = aggregator.run(**self.run_args)
@@ -2560,6 +2613,58 @@ class TestCommunityUsageAggregators:
         )
 
 
+class TestCommunityUsageAggregatorsFanIn(TestCommunityUsageAggregators):
+    """Test community usage aggregators with fan-in usage delta queries.
+
+    The fan-in queries must produce the same daily delta documents as the
+    per-community queries, so we reuse all of the checks from the parent class.
+    The maximum range is raised to cover the whole test period, and a batch size
+    of one community makes each day's fan-in span several searches.
+    """
+
+    @property
+    def delta_aggregator_instance(self) -> CommunityUsageDeltaAggregator:
+        """Get the usage delta aggregator with fan-in queries enabled.
+
+        Returns:
+            CommunityUsageDeltaAggregator: The aggregator instance.
+        """
+        aggregator = super().delta_aggregator_instance
+        aggregator.fan_in = True
+        aggregator.fan_in_max_days = 31
+        aggregator.fan_in_batch_size = 1
+        return aggregator
+
+
+def test_fan_in_requests_global_aggregations_once(running_app):
+    """Only the first fan-in batch of a day includes the global aggregations."""
+    aggregator = CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+    aggregator.fan_in_batch_size = 1
+    aggregator.communities_to_aggregate = ["global", "c1", "c2", "c3"]
+    aggregator.query_builder = MagicMock()
+    response = AttrDict({"aggregations": {"by_community": {"buckets": []}}})
+    for build in (
+        aggregator.query_builder.build_fan_in_view_query,
+        aggregator.query_builder.build_fan_in_download_query,
+    ):
+        build.return_value.execute.return_value = response
+
+    day = arrow.get("2025-06-03")
+    assert aggregator._get_fan_in_results("c1", day) == (None, None)
+    assert aggregator._get_fan_in_results("global", day) == (response, response)
+
+    for build in (
+        aggregator.query_builder.build_fan_in_view_query,
+        aggregator.query_builder.build_fan_in_download_query,
+    ):
+        batches = [call.args[0] for call in build.call_args_list]
+        include_global = [
+            call.kwargs["include_global"] for call in build.call_args_list
+        ]
+        assert batches == [["c1"], ["c2"], ["c3"]]
+        assert include_global == [True, False, False]
+
+
 @pytest.mark.skip(reason="Skipping test until it can be refactored")
 @pytest.mark.usefixtures("reindex_languages")
 class TestCommunityUsageAggregatorsBookmarked(TestCommunityUsageAggregators):
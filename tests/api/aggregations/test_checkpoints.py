@@ -0,0 +1,87 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the snapshot aggregator exhaustive cache checkpoints."""
+
+import arrow
+from invenio_search.proxies import current_search_client
+
+from invenio_stats_dashboard.aggregations.checkpoints import SnapshotCheckpointAPI
+from invenio_stats_dashboard.aggregations.usage_snapshot_aggs import (
+    CommunityUsageSnapshotAggregator,
+)
+
+
+class TestSnapshotCheckpointAPI:
+    """Test storing and loading snapshot checkpoints."""
+
+    @property
+    def state(self) -> dict:
+        """Sample exhaustive cache state.
+
+        Returns:
+            dict: An exhaustive cache with one "top" subcount.
+        """
+        return {
+            "subjects": {
+                "subj-1": {
+                    "id": "subj-1",
+                    "label": {"en": "Subject One"},
+                    "view": {"total_events": 3, "unique_visitors": 2},
+                    "download": {"total_events": 1, "total_volume": 1024.0},
+                }
+            }
+        }
+
+    def test_checkpoint_round_trip(self, running_app, search_clear):
+        """Checkpoints are returned only for a matching configuration hash."""
+        api = SnapshotCheckpointAPI(
+            current_search_client, "community-usage-snapshot-agg"
+        )
+        config_hash = SnapshotCheckpointAPI.make_config_hash({"subjects": {"a": 1}})
+        assert config_hash != SnapshotCheckpointAPI.make_config_hash(
+            {"subjects": {"a": 2}}
+        )
+
+        assert api.get_checkpoint("community-1", config_hash) is None
+
+        api.set_checkpoint(
+            "community-1", arrow.get("2025-06-10T13:00:00"), config_hash, self.state
+        )
+        checkpoint = api.get_checkpoint("community-1", config_hash)
+        assert checkpoint is not None
+        checkpoint_date, state = checkpoint
+        assert checkpoint_date.format("YYYY-MM-DD") == "2025-06-10"
+        assert state == self.state
+
+        assert api.get_checkpoint("community-1", "other-hash") is None
+        assert api.get_checkpoint("community-2", config_hash) is None
+
+        assert api.clear_checkpoint("community-1") == 1
+        assert api.get_checkpoint("community-1", config_hash) is None
+
+    def test_load_checkpoint_requires_earlier_date(self, running_app, search_clear):
+        """Aggregators only resume from checkpoints before the first new date."""
+        aggregator = CommunityUsageSnapshotAggregator(
+            name="community-usage-snapshot-agg"
+        )
+        state = {key: {} for key in aggregator._get_top_subcount_keys()}
+        aggregator._save_checkpoint("community-1", arrow.get("2025-06-10"), state)
+
+        checkpoint = aggregator._load_checkpoint("community-1", arrow.get("2025-06-11"))
+        assert checkpoint is not None
+        assert checkpoint[0].format("YYYY-MM-DD") == "2025-06-10"
+        assert checkpoint[1] == state
+
+        # Reprocessing an earlier period can't reuse a later checkpoint
+        assert (
+            aggregator._load_checkpoint("community-1", arrow.get("2025-06-10")) is None
+        )
+
+        aggregator.use_checkpoints = False
+        assert (
+            aggregator._load_checkpoint("community-1", arrow.get("2025-06-11")) is None
+        )
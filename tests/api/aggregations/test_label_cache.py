@@ -0,0 +1,243 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the subcount label cache."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from opensearchpy.helpers.utils import AttrDict
+
+from invenio_stats_dashboard.aggregations.records_delta_aggs import (
+    CommunityRecordsDeltaCreatedAggregator,
+)
+from invenio_stats_dashboard.aggregations.usage_delta_aggs import (
+    CommunityUsageDeltaAggregator,
+)
+from invenio_stats_dashboard.queries import (
+    CommunityRecordDeltaQuery,
+    CommunityUsageDeltaQuery,
+)
+from invenio_stats_dashboard.resources.label_cache import SubcountLabelCache
+
+
+@pytest.fixture
+def clear_label_cache(running_app):
+    """Empty the in-process and Redis tiers of the label cache.
+
+    Yields:
+        None: The tiers are emptied before and after the test.
+    """
+
+    def clear():
+        SubcountLabelCache.clear_local()
+        cache = SubcountLabelCache(client=MagicMock()).cache
+        for key in cache.redis_client.scan_iter(match=f"{cache.cache_prefix}:*"):
+            cache.redis_client.delete(key)
+
+    clear()
+    yield
+    clear()
+
+
+def make_top_hits_response(key: str, source: dict) -> dict:
+    """Build a response to the label cache's top_hits fallback search.
+
+    Returns:
+        dict: A response with one "items" bucket and its sample document.
+    """
+    return {
+        "aggregations": {
+            "items": {
+                "buckets": [
+                    {
+                        "key": key,
+                        "doc_count": 1,
+                        "label": {"hits": {"hits": [{"_source": source}]}},
+                    }
+                ]
+            }
+        }
+    }
+
+
+def resolve_languages(label_cache: SubcountLabelCache) -> dict:
+    """Resolve two language ids.
+
+    Returns:
+        dict: The labels found, by id.
+    """
+    return label_cache.resolve(
+        "languages",
+        "languages.title",
+        ["eng", "fra"],
+        "events-stats-record-view",
+        "languages.id",
+        ["languages.id", "languages.title"],
+        lambda bucket, key: None,
+    )
+
+
+def test_label_cache_resolves_from_vocabulary_then_cache(clear_label_cache):
+    """Labels come from the vocabulary index once, then from the cache."""
+    client = MagicMock()
+    client.search.return_value = {
+        "hits": {
+            "hits": [
+                {"_source": {"id": "eng", "title": {"en": "English"}}},
+                {"_source": {"id": "fra", "title": {"en": "French"}}},
+            ]
+        }
+    }
+    label_cache = SubcountLabelCache(client=client)
+
+    assert resolve_languages(label_cache) == {
+        "eng": {"en": "English"},
+        "fra": {"en": "French"},
+    }
+    assert client.search.call_count == 1
+
+    # The shared Redis tier answers for a process without the labels
+    SubcountLabelCache.clear_local()
+    assert resolve_languages(label_cache) == {
+        "eng": {"en": "English"},
+        "fra": {"en": "French"},
+    }
+    assert client.search.call_count == 1
+
+    # And the in-process tier answers without Redis
+    label_cache.cache.redis_client.delete(
+        label_cache.make_hash_key("languages", "languages.title")
+    )
+    assert resolve_languages(label_cache) == {
+        "eng": {"en": "English"},
+        "fra": {"en": "French"},
+    }
+    assert client.search.call_count == 1
+
+
+def test_label_cache_remembers_misses(clear_label_cache):
+    """Ids no lookup can label aren't looked up again."""
+    client = MagicMock()
+    client.search.side_effect = [
+        {"hits": {"hits": []}},
+        {"aggregations": {"items": {"buckets": []}}},
+    ]
+    label_cache = SubcountLabelCache(client=client)
+
+    assert resolve_languages(label_cache) == {}
+    assert client.search.call_count == 2
+
+    assert resolve_languages(label_cache) == {}
+    assert client.search.call_count == 2
+
+
+def test_labeled_aggregations_omit_top_hits(running_app, monkeypatch):
+    """With the label cache, labeled subcounts don't nest a "label" top_hits."""
+    app = running_app.app
+    usage_query = CommunityUsageDeltaQuery(client=MagicMock())
+    records_query = CommunityRecordDeltaQuery(client=MagicMock())
+
+    monkeypatch.setitem(app.config, "COMMUNITY_STATS_LABEL_CACHE_ENABLED", True)
+    usage_aggs = usage_query._make_subcount_aggregations_dict("view")
+    records_aggs = records_query._get_sub_aggregations()
+    assert "label" not in usage_aggs["resource_types"]["aggs"]
+    assert "label" not in records_aggs["resource_types"]["aggs"]
+
+    monkeypatch.setitem(app.config, "COMMUNITY_STATS_LABEL_CACHE_ENABLED", False)
+    usage_aggs = usage_query._make_subcount_aggregations_dict("view")
+    records_aggs = records_query._get_sub_aggregations()
+    assert "top_hits" in usage_aggs["resource_types"]["aggs"]["label"]
+    assert "top_hits" in records_aggs["resource_types"]["aggs"]["label"]
+
+
+def test_assemble_subcount_items_labels_from_top_hits_fallback(
+    running_app, clear_label_cache, monkeypatch
+):
+    """Usage delta items get labels from the top_hits fallback search."""
+    app = running_app.app
+    monkeypatch.setitem(app.config, "COMMUNITY_STATS_LABEL_VOCABULARIES", {})
+    client = MagicMock()
+    client.search.return_value = make_top_hits_response(
+        "dataset",
+        {"resource_type": {"id": "dataset", "title": {"en": "Dataset"}}},
+    )
+    aggregator = CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+    aggregator.label_cache = SubcountLabelCache(client=client)
+    view_results = AttrDict(
+        {
+            "aggregations": {
+                "resource_types": {
+                    "buckets": [
+                        {
+                            "key": "dataset",
+                            "doc_count": 3,
+                            "unique_visitors": {"value": 2},
+                            "unique_records": {"value": 1},
+                            "unique_parents": {"value": 1},
+                        }
+                    ]
+                }
+            }
+        }
+    )
+    usage_config = app.config["COMMUNITY_STATS_SUBCOUNTS"]["resource_types"][
+        "usage_events"
+    ]
+
+    items = aggregator._assemble_subcount_items(
+        view_results, None, usage_config, "resource_types"
+    )
+
+    assert [item["label"] for item in items] == [{"en": "Dataset"}]
+    assert items[0]["view"]["total_events"] == 3
+    assert client.search.call_count == 1
+    body = client.search.call_args.kwargs["body"]
+    assert body["query"] == {"terms": {"resource_type.id": ["dataset"]}}
+    assert body["aggs"]["items"]["terms"]["include"] == ["dataset"]
+
+
+def test_process_single_field_results_labels_from_cache(
+    running_app, clear_label_cache, monkeypatch
+):
+    """Records delta items get labels from the label cache."""
+    app = running_app.app
+    monkeypatch.setitem(app.config, "COMMUNITY_STATS_LABEL_VOCABULARIES", {})
+    client = MagicMock()
+    client.search.return_value = make_top_hits_response(
+        "dataset",
+        {"metadata": {"resource_type": {"id": "dataset", "title": {"en": "Dataset"}}}},
+    )
+    aggregator = CommunityRecordsDeltaCreatedAggregator(
+        name="community-records-delta-created-agg"
+    )
+    aggregator.label_cache = SubcountLabelCache(client=client)
+    records_config = app.config["COMMUNITY_STATS_SUBCOUNTS"]["resource_types"][
+        "records"
+    ]
+
+    items = aggregator._process_single_field_results(
+        [{"key": "dataset", "with_files": {"doc_count": 2}}],
+        [],
+        records_config,
+        0,
+        "resource_types",
+    )
+
+    assert [item["label"] for item in items] == [{"en": "Dataset"}]
+    assert items[0]["records"]["added"]["with_files"] == 2
+    assert client.search.call_count == 1
+
+    # The label is cached for the next aggregation run
+    items = aggregator._process_single_field_results(
+        [{"key": "dataset", "with_files": {"doc_count": 1}}],
+        [],
+        records_config,
+        0,
+        "resource_types",
+    )
+    assert [item["label"] for item in items] == [{"en": "Dataset"}]
+    assert client.search.call_count == 1
@@ -21,6 +21,7 @@ from invenio_stats_dashboard.aggregations.usage_snapshot_aggs import (
     CommunityUsageSnapshotAggregator,
     UsageSnapshotMemoryEstimator,
 )
+from invenio_stats_dashboard.utils.memory import MemoryGovernor
 
 
 @pytest.fixture
@@ -710,3 +711,30 @@ class TestMemoryEstimator:
             scan_page_size_max=500,
         )
         assert 100 <= out2 <= 500
+
+    def test_memory_governor_collects_under_pressure(self, mocker):
+        """The governor only collects when the estimator reports pressure."""
+        collect = mocker.patch("invenio_stats_dashboard.utils.memory.gc.collect")
+        mem_est = {"predicted_peak_bytes": 200_000_000}
+        governor = MemoryGovernor()
+
+        governor.relieve(
+            "scan",
+            lambda rss: UsageSnapshotMemoryEstimator.under_pressure(
+                mem_est, rss, budget_bytes=0
+            ),
+        )
+        collect.assert_not_called()
+
+        governor.relieve(
+            "scan",
+            lambda rss: UsageSnapshotMemoryEstimator.under_pressure(
+                mem_est, rss, budget_bytes=1
+            ),
+        )
+        collect.assert_called_once()
+
+        metrics = governor.metrics()["scan"]
+        assert metrics["checks"] == 2
+        assert metrics["collections"] == 1
+        assert metrics["bytes_reclaimed"] >= 0
@@ -10,6 +10,7 @@ import json
 import re
 from copy import deepcopy
 from pprint import pformat
+from unittest.mock import MagicMock
 
 import arrow
 import pytest
@@ -28,6 +29,8 @@ from invenio_stats_dashboard.queries import (
     CommunityRecordDeltaQuery,
     CommunityUsageDeltaQuery,
     CommunityUsageSnapshotQuery,
+    _build_record_ids_clause,
+    _build_record_ids_clause_from_pages,
     get_relevant_record_ids_from_events,
 )
 from tests.helpers.sample_records import (
@@ -1228,6 +1231,208 @@ class TestCommunityRecordPublishedDeltaQuery(TestCommunityRecordCreatedDeltaQuer
                 self._check_empty_day(day, i)
 
 
+class TestCommunityRecordDeltaDailyAggregations:
+    """Test unpacking the responses of CommunityRecordDeltaQuery.build_daily_query."""
+
+    def test_get_daily_aggregations_filters_buckets(self):
+        """Keyed filters buckets are returned by day, skipping empty days."""
+        aggregations = {
+            "days": {
+                "buckets": {
+                    "2025-06-01": {
+                        "doc_count": 2,
+                        "with_files": {"doc_count": 1},
+                    },
+                    "2025-06-02": {"doc_count": 0},
+                }
+            }
+        }
+        daily = CommunityRecordDeltaQuery.get_daily_aggregations(aggregations)
+        assert list(daily.keys()) == ["2025-06-01"]
+        assert daily["2025-06-01"]["with_files"] == {"doc_count": 1}
+
+    def test_get_daily_aggregations_date_histogram_buckets(self):
+        """Date histogram buckets are keyed by their formatted date."""
+        aggregations = {
+            "days": {
+                "buckets": [
+                    {
+                        "key_as_string": "2025-06-01",
+                        "key": 1748736000000,
+                        "doc_count": 3,
+                    },
+                    {
+                        "key_as_string": "2025-06-03",
+                        "key": 1748908800000,
+                        "doc_count": 1,
+                    },
+                ]
+            }
+        }
+        daily = CommunityRecordDeltaQuery.get_daily_aggregations(aggregations)
+        assert sorted(daily.keys()) == ["2025-06-01", "2025-06-03"]
+        assert daily["2025-06-03"]["doc_count"] == 1
+
+    def test_get_daily_aggregations_empty(self):
+        """An empty response yields no days."""
+        assert CommunityRecordDeltaQuery.get_daily_aggregations({}) == {}
+
+
+class TestRecordIdsClause:
+    """Test matching lists of record IDs in the records index."""
+
+    def test_short_list_uses_single_terms_clause(self):
+        """Lists within the terms limit use one sorted terms clause."""
+        assert _build_record_ids_clause({"b", "a"}) == {"terms": {"id": ["a", "b"]}}
+
+    def test_long_list_is_split(self):
+        """Lists over the terms limit are split into alternative clauses."""
+        clause = _build_record_ids_clause(["e", "d", "c", "b", "a"], max_terms=2)
+        assert clause == {
+            "bool": {
+                "should": [
+                    {"terms": {"id": ["a", "b"]}},
+                    {"terms": {"id": ["c", "d"]}},
+                    {"terms": {"id": ["e"]}},
+                ],
+                "minimum_should_match": 1,
+            }
+        }
+
+    def test_pages_are_packed_into_terms_clauses(self):
+        """Pages of IDs are packed into terms clauses as they are consumed."""
+        pages = iter([["a", "b", "c"], ["d"], ["e"]])
+        clause = _build_record_ids_clause_from_pages(pages, max_terms=2)
+        assert clause == {
+            "bool": {
+                "should": [
+                    {"terms": {"id": ["a", "b"]}},
+                    {"terms": {"id": ["c", "d"]}},
+                    {"terms": {"id": ["e"]}},
+                ],
+                "minimum_should_match": 1,
+            }
+        }
+        assert _build_record_ids_clause_from_pages(iter([["a"], ["b"]])) == {
+            "terms": {"id": ["a", "b"]}
+        }
+        assert _build_record_ids_clause_from_pages(iter([])) is None
+
+
+def make_record_ids_page(record_ids: list[str], after_key: bool = True) -> dict:
+    """Build a composite aggregation response page of record IDs.
+
+    Returns:
+        dict: The search response.
+    """
+    buckets = [{"key": {"record_id": record_id}} for record_id in record_ids]
+    record_ids_agg: dict = {"buckets": buckets}
+    if after_key and buckets:
+        record_ids_agg["after_key"] = buckets[-1]["key"]
+    return {"aggregations": {"record_ids": record_ids_agg}}
+
+
+class TestCommunityFilterStrategy:
+    """Test the "community" filter strategy for record delta queries."""
+
+    @pytest.fixture
+    def community_strategy(self, running_app, monkeypatch):
+        """Enable the community filter strategy with small ID pages."""
+        monkeypatch.setitem(
+            running_app.app.config,
+            "COMMUNITY_STATS_RECORDS_DELTA_FILTER_STRATEGY",
+            "community",
+        )
+        monkeypatch.setitem(
+            running_app.app.config, "COMMUNITY_STATS_RECORDS_DELTA_ID_PAGE_SIZE", 2
+        )
+
+    def test_includes_records_removed_since_period_start(self, community_strategy):
+        """Records removed from the community are still matched for it."""
+        client = MagicMock()
+        client.search.side_effect = [
+            make_record_ids_page(["rec-1", "rec-2"]),
+            make_record_ids_page(["rec-3"]),
+        ]
+        query = CommunityRecordDeltaQuery(client=client)
+
+        search = query.build_query(
+            "2025-01-01T00:00:00", "2025-01-01T23:59:59", community_id="comm-1"
+        )
+
+        must = search.to_dict()["query"]["bool"]["must"]
+        assert {"term": {"is_published": True}} in must
+        assert {
+            "range": {
+                "created": {"gte": "2025-01-01T00:00:00", "lte": "2025-01-01T23:59:59"}
+            }
+        } in must
+        assert {
+            "bool": {
+                "should": [
+                    {"term": {"parent.communities.ids": "comm-1"}},
+                    {"terms": {"id": ["rec-1", "rec-2", "rec-3"]}},
+                ],
+                "minimum_should_match": 1,
+            }
+        } in must
+
+        # Removed records are paged from the events index since the period start
+        assert client.search.call_count == 2
+        first_body = client.search.call_args_list[0].kwargs["body"]
+        assert first_body["query"]["bool"]["must"] == [
+            {"term": {"event_type": "removed"}},
+            {"term": {"community_id": "comm-1"}},
+            {"range": {"event_date": {"gte": "2025-01-01T00:00:00"}}},
+        ]
+        assert "after" not in first_body["aggs"]["record_ids"]["composite"]
+        second_body = client.search.call_args_list[1].kwargs["body"]
+        assert second_body["aggs"]["record_ids"]["composite"]["after"] == {
+            "record_id": "rec-2"
+        }
+
+    def test_without_removed_records_matches_members(self, community_strategy):
+        """Without removals only the current members are matched."""
+        client = MagicMock()
+        client.search.return_value = make_record_ids_page([])
+        query = CommunityRecordDeltaQuery(client=client)
+
+        search = query.build_daily_query(
+            "2025-01-01T00:00:00", "2025-01-07T23:59:59", community_id="comm-1"
+        )
+
+        body = search.to_dict()
+        assert {"term": {"parent.communities.ids": "comm-1"}} in body["query"][
+            "bool"
+        ]["must"]
+        assert body["aggs"]["days"]["date_histogram"]["field"] == "created"
+
+    def test_deletion_queries_use_events_index(self, community_strategy):
+        """Deletions are resolved from the events index by record ID."""
+        client = MagicMock()
+        client.search.return_value = make_record_ids_page(
+            ["rec-1"], after_key=False
+        )
+        query = CommunityRecordDeltaQuery(client=client)
+
+        search = query.build_query(
+            "2025-01-01T00:00:00",
+            "2025-01-01T23:59:59",
+            community_id="comm-1",
+            find_deleted=True,
+        )
+
+        must = search.to_dict()["query"]["bool"]["must"]
+        assert must == [
+            {"terms": {"id": ["rec-1"]}},
+            {"term": {"is_published": True}},
+        ]
+        events_query = client.search.call_args.kwargs["body"]["query"]
+        assert {"term": {"event_type": "removed"}} in (
+            events_query["bool"]["should"][0]["bool"]["must"]
+        )
+
+
 class TestCommunityUsageDeltaQuery:
     """Test the community usage snapshot query."""
 
@@ -1680,6 +1885,23 @@ class TestCommunityUsageDeltaQuery:
         self._check_results(download_results, "download")
 
 
+def test_fan_in_query_without_global_aggregations(running_app):
+    """Later fan-in batches leave out the top-level aggregations."""
+    query = CommunityUsageDeltaQuery(client=MagicMock())
+
+    with_global = query.build_fan_in_view_query(
+        ["c1", "c2"], "2025-06-03", "2025-06-03"
+    ).to_dict()
+    without_global = query.build_fan_in_view_query(
+        ["c1", "c2"], "2025-06-03", "2025-06-03", include_global=False
+    ).to_dict()
+
+    assert set(with_global["aggs"]) > {"by_community"}
+    assert list(without_global["aggs"]) == ["by_community"]
+    assert without_global["aggs"]["by_community"] == with_global["aggs"]["by_community"]
+    assert without_global["query"] == with_global["query"]
+
+
 class TestCommunityUsageSnapshotQuery:
     """Test the CommunityUsageSnapshotQuery class.
 
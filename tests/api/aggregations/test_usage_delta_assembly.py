@@ -0,0 +1,157 @@
+# Part of the Invenio-Stats-Dashboard extension for InvenioRDM
+# Copyright (C) 2025 Mesh Research
+#
+# Invenio-Stats-Dashboard is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for usage delta subcount assembly."""
+
+import pytest
+from opensearchpy.helpers.utils import AttrDict
+
+from invenio_stats_dashboard.aggregations.usage_delta_aggs import (
+    CommunityUsageDeltaAggregator,
+)
+
+COUNTRIES_CONFIG = {
+    "source_fields": [
+        {"field": "country", "label_field": None, "label_source_includes": []}
+    ],
+}
+
+
+def make_results(keys: range, download: bool = False) -> AttrDict:
+    """Build synthetic search results with one bucket per key.
+
+    Returns:
+        AttrDict: Results with a "countries" terms aggregation.
+    """
+    buckets = []
+    for key in keys:
+        bucket = {
+            "key": f"key-{key}",
+            "doc_count": key + 1,
+            "unique_visitors": {"value": 1},
+            "unique_records": {"value": 1},
+            "unique_parents": {"value": 1},
+        }
+        if download:
+            bucket["unique_files"] = {"value": 1}
+            bucket["total_volume"] = {"value": 1024.0}
+        buckets.append(bucket)
+    return AttrDict({"aggregations": {"countries": {"buckets": buckets}}})
+
+
+def test_assemble_subcount_items_joins_buckets(running_app):
+    """View and download buckets are joined on their keys."""
+    aggregator = CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+
+    items = aggregator._assemble_subcount_items(
+        make_results(range(0, 3)),
+        make_results(range(2, 4), download=True),
+        COUNTRIES_CONFIG,
+        "countries",
+    )
+
+    by_id = {item["id"]: item for item in items}
+    assert sorted(by_id) == ["key-0", "key-1", "key-2", "key-3"]
+    assert by_id["key-0"]["view"]["total_events"] == 1
+    assert by_id["key-0"]["download"]["total_events"] == 0
+    assert by_id["key-2"]["view"]["total_events"] == 3
+    assert by_id["key-2"]["download"]["total_events"] == 3
+    assert by_id["key-2"]["download"]["total_volume"] == 1024.0
+    assert by_id["key-3"]["view"]["total_events"] == 0
+
+
+def test_merge_field_results_by_id(running_app):
+    """Items from several source fields are merged by id."""
+    aggregator = CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+    first = aggregator._assemble_subcount_items(
+        make_results(range(0, 2)), None, COUNTRIES_CONFIG, "countries"
+    )
+    second = aggregator._assemble_subcount_items(
+        make_results(range(1, 3)), None, COUNTRIES_CONFIG, "countries"
+    )
+
+    merged = {
+        item["id"]: item for item in aggregator._merge_field_results([first, second])
+    }
+
+    assert sorted(merged) == ["key-0", "key-1", "key-2"]
+    assert merged["key-1"]["view"]["total_events"] == 4
+    assert merged["key-1"]["view"]["unique_visitors"] == 2
+    # The inputs are left untouched
+    assert first[1]["view"]["total_events"] == 2
+
+
+class CountingBucket(AttrDict):
+    """A bucket that counts how often its key is read."""
+
+    reads = 0
+
+    def __getattr__(self, name):
+        """Count reads of the bucket key.
+
+        Returns:
+            Any: The attribute value.
+        """
+        if name == "key":
+            CountingBucket.reads += 1
+        return super().__getattr__(name)
+
+
+def make_counting_results(keys: range, download: bool = False) -> AttrDict:
+    """Build synthetic search results whose buckets count key reads.
+
+    Returns:
+        AttrDict: Results with a "countries" terms aggregation.
+    """
+    results = make_results(keys, download=download)
+    buckets = [
+        CountingBucket(bucket.to_dict())
+        for bucket in results.aggregations.countries.buckets
+    ]
+    return AttrDict({"aggregations": {"countries": {"buckets": buckets}}})
+
+
+@pytest.mark.parametrize("bucket_count", [1_000, 10_000])
+def test_assemble_subcount_items_reads_each_bucket_key_once(
+    running_app, monkeypatch, bucket_count
+):
+    """Assembly joins the view and download buckets in one pass over each.
+
+    The keys of the view and download buckets overlap by half. Searching
+    both bucket lists for every key read each bucket key once per key in
+    the other list, so the key reads also show the join stays linear in
+    the bucket count.
+    """
+    aggregator = CommunityUsageDeltaAggregator(name="community-usage-delta-agg")
+    view_results = make_counting_results(range(0, bucket_count))
+    download_results = make_counting_results(
+        range(bucket_count // 2, bucket_count + bucket_count // 2), download=True
+    )
+    monkeypatch.setattr(CountingBucket, "reads", 0)
+
+    items = aggregator._assemble_subcount_items(
+        view_results, download_results, COUNTRIES_CONFIG, "countries"
+    )
+
+    assert CountingBucket.reads == 2 * bucket_count
+    assert len(items) == bucket_count + bucket_count // 2
+    by_id = {item["id"]: item for item in items}
+    assert len(by_id) == len(items)
+
+    view_only = by_id["key-0"]
+    assert view_only["view"]["total_events"] == 1
+    assert view_only["download"]["total_events"] == 0
+
+    both = by_id[f"key-{bucket_count // 2}"]
+    assert both["view"]["total_events"] == bucket_count // 2 + 1
+    assert both["download"]["total_events"] == bucket_count // 2 + 1
+    assert both["download"]["total_volume"] == 1024.0
+
+    download_only = by_id[f"key-{bucket_count + bucket_count // 2 - 1}"]
+    assert download_only["view"]["total_events"] == 0
+    assert download_only["download"]["total_events"] == (
+        bucket_count + bucket_count // 2
+    )
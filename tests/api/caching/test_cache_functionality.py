@@ -6,12 +6,29 @@
 
 """Tests for cache functionality."""
 
+import gzip
 import json
+import threading
+import time
+from unittest.mock import MagicMock
 
 import pytest
 
-from invenio_stats_dashboard.models.cached_response import CachedResponse
-from invenio_stats_dashboard.resources.cache_utils import StatsCache
+from invenio_stats_dashboard.models.cached_response import (
+    ENCODED_PAYLOAD_MARKER,
+    CachedResponse,
+)
+from invenio_stats_dashboard.resources.cache_utils import (
+    StatsAggregationRegistry,
+    StatsCache,
+)
+from invenio_stats_dashboard.resources.data_series_queries import (
+    CategoryDataSeriesQueryBase,
+    UsageDeltaCategoryQuery,
+)
+from invenio_stats_dashboard.services.cached_response_service import (
+    CachedResponseService,
+)
 
 
 @pytest.fixture
@@ -124,6 +141,48 @@ def test_cache_set_with_timeout(running_app, db, stats_cache, sample_data):
     assert cached_data == data_bytes
 
 
+def test_cache_get_with_ttl(running_app, db, stats_cache, sample_data):
+    """Test reading cached data and its TTL together."""
+    data_bytes = json.dumps(sample_data).encode('utf-8')
+
+    assert stats_cache.get_with_ttl("test_key_missing") == (None, None)
+
+    stats_cache.set("test_key_ttl", data_bytes, ttl=3600)
+    stats_cache.set("test_key_no_ttl", data_bytes)
+
+    cached_data, ttl = stats_cache.get_with_ttl("test_key_ttl")
+    assert cached_data == data_bytes
+    assert 0 < ttl <= 3600
+    assert stats_cache.get_with_ttl("test_key_no_ttl") == (data_bytes, -1)
+
+    results = stats_cache.get_many_with_ttl(
+        ["test_key_ttl", "test_key_missing", "test_key_no_ttl"]
+    )
+    assert list(results.keys()) == [
+        "test_key_ttl",
+        "test_key_missing",
+        "test_key_no_ttl",
+    ]
+    assert results["test_key_ttl"][0] == data_bytes
+    assert results["test_key_missing"] == (None, None)
+    assert results["test_key_no_ttl"] == (data_bytes, -1)
+
+
+def test_cache_shares_connection_pool(running_app, db):
+    """Test that cache instances for the same db share a connection pool."""
+    cache_a = StatsCache()
+    cache_b = StatsCache()
+    registry = StatsAggregationRegistry()
+
+    assert (
+        cache_a.redis_client.connection_pool is cache_b.redis_client.connection_pool
+    )
+    assert (
+        registry.redis_client.connection_pool
+        is not cache_a.redis_client.connection_pool
+    )
+
+
 def test_cache_delete(running_app, db, stats_cache, sample_data):
     """Test cache deletion."""
     cache_key = "test_key_delete"
@@ -262,3 +321,365 @@ def test_cache_integration_with_cached_response(
 
     # Clean up
     stats_cache.delete(cache_key)
+
+
+def test_cache_lock(running_app, db, stats_cache):
+    """Test acquiring and releasing a cache lock."""
+    token = stats_cache.acquire_lock("test_lock", ttl=60)
+    assert token is not None
+    assert stats_cache.is_locked("test_lock")
+
+    # The lock can't be taken or released by another worker while it's held
+    assert stats_cache.acquire_lock("test_lock", ttl=60) is None
+    assert stats_cache.release_lock("test_lock", "not-the-token") is False
+
+    assert stats_cache.release_lock("test_lock", token) is True
+    assert not stats_cache.is_locked("test_lock")
+
+
+def test_single_flight_serves_stale_copy(running_app, db, stats_cache, sample_data):
+    """Test that a stale copy is served while another worker generates."""
+    response = CachedResponse("global", 2024, "record_delta")
+    response._object_data = sample_data
+    assert response.save_to_cache(stats_cache)
+    assert stats_cache.retire(
+        response.cache_key, response.stale_cache_key, stale_ttl=60
+    )
+
+    token = stats_cache.acquire_lock(response.lock_key, ttl=60)
+    assert token is not None
+
+    # "record_delta" isn't a configured query, so generating it would fail
+    waiting_response = CachedResponse("global", 2024, "record_delta")
+    waiting_response.get_or_generate(stats_cache)
+
+    assert waiting_response.object_data == sample_data
+    assert stats_cache.get_counters() == {"stale_served": 1}
+    stats_cache.release_lock(response.lock_key, token)
+
+
+def test_lock_and_stale_keys_are_not_cached_responses(
+    running_app, db, stats_cache, sample_data, monkeypatch
+):
+    """Test that locks and stale copies aren't listed as cached responses."""
+    monkeypatch.setitem(running_app.app.config, "STATS_CACHE_STALE_TTL", 60)
+    service = CachedResponseService()
+    response = CachedResponse("global", 2024, "record_delta")
+    response._object_data = sample_data
+    assert response.save_to_cache(stats_cache)
+
+    # Deleting keeps a stale copy and reports the deletion as before
+    assert service.delete("global", 2024, "record_delta") is True
+    assert stats_cache.get(response.stale_cache_key) is not None
+    assert service.delete("global", 2024, "record_delta") is False
+
+    token = stats_cache.acquire_lock(response.lock_key, ttl=60)
+    assert token is not None
+    stats_cache.increment_counter("generated")
+
+    assert stats_cache.keys() == []
+    assert stats_cache.get_cache_size_info()["key_count"] == 0
+    assert stats_cache.clear_all() == (True, 0)
+    assert stats_cache.is_locked(response.lock_key)
+    stats_cache.release_lock(response.lock_key, token)
+
+
+def test_single_flight_waits_for_result(running_app, db, stats_cache, sample_data):
+    """Test that a cache miss waits for the worker holding the lock."""
+    response = CachedResponse("global", 2024, "record_delta")
+    response._object_data = sample_data
+    token = stats_cache.acquire_lock(response.lock_key, ttl=60)
+    assert token is not None
+
+    def generating_worker():
+        time.sleep(0.5)
+        stats_cache.set(response.cache_key, response.bytes_data)
+        stats_cache.release_lock(response.lock_key, token)
+
+    thread = threading.Thread(target=generating_worker)
+    thread.start()
+    waiting_response = CachedResponse("global", 2024, "record_delta")
+    waiting_response.get_or_generate(stats_cache)
+    thread.join()
+
+    assert waiting_response.object_data == sample_data
+    assert stats_cache.get_counters() == {"coalesced": 1}
+
+
+def test_single_flight_shares_incomplete_response(
+    running_app, db, stats_cache, monkeypatch
+):
+    """Test that a response that can't be cached is still generated once."""
+    app = running_app.app
+    category = CachedResponseService().categories[0]
+    generated = []
+
+    def fake_run_json(self, **kwargs):
+        generated.append(kwargs)
+        time.sleep(0.5)
+        yield b'{"generated": true}'
+
+    monkeypatch.setattr(CategoryDataSeriesQueryBase, "run_json", fake_run_json)
+    monkeypatch.setattr(
+        CategoryDataSeriesQueryBase,
+        "_check_aggregation_completeness",
+        lambda self, *args: False,
+    )
+    responses = [CachedResponse("global", 2024, category) for _ in range(2)]
+
+    def request(response):
+        with app.app_context():
+            response.get_or_generate(stats_cache)
+
+    threads = [
+        threading.Thread(target=request, args=(response,)) for response in responses
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(generated) == 1
+    assert [response.object_data for response in responses] == [
+        {"generated": True}
+    ] * 2
+    assert stats_cache.get(responses[0].cache_key) is None
+    assert stats_cache.get_counters() == {"generated": 1, "coalesced": 1}
+
+
+def test_cached_response_compressed_payload(
+    running_app, db, stats_cache, sample_data, monkeypatch
+):
+    """Test storing a response as its compressed API response body."""
+    monkeypatch.setitem(running_app.app.config, "STATS_CACHE_COMPRESS_PAYLOADS", True)
+    response = CachedResponse("global", 2024, "record_delta")
+    response._object_data = sample_data
+    json_bytes = response.bytes_data
+    assert response.save_to_cache(stats_cache)
+
+    assert stats_cache.get(response.cache_key).startswith(ENCODED_PAYLOAD_MARKER)
+
+    loaded_response = CachedResponse("global", 2024, "record_delta")
+    assert loaded_response.load_from_cache(stats_cache)
+    assert loaded_response.encoded_body("brotli") is None
+    assert gzip.decompress(loaded_response.encoded_body("gzip")) == (
+        b'{"record_delta":' + json_bytes + b"}"
+    )
+    assert loaded_response.bytes_data == json_bytes
+    assert loaded_response.object_data == sample_data
+
+
+def test_create_in_worker_threads(running_app, db, stats_cache, monkeypatch):
+    """Test that concurrent generation merges outcomes into one summary."""
+    monkeypatch.setitem(running_app.app.config, "STATS_CACHE_GENERATION_WORKERS", 3)
+    service = CachedResponseService()
+    # "record_delta" isn't a configured query, so generating it fails
+    responses = [
+        CachedResponse("global", year, "record_delta") for year in range(2020, 2025)
+    ]
+    progress = []
+
+    results = service._create(
+        responses, lambda current, total, message: progress.append(current)
+    )
+
+    assert results["failed"] == 5
+    assert results["success"] == 0
+    assert sorted(error["year"] for error in results["errors"]) == list(
+        range(2020, 2025)
+    )
+    assert progress == [1, 2, 3, 4, 5, 5]
+
+
+def test_generate_group_without_aggregations(running_app, db, stats_cache):
+    """Test generating all categories of a community/year together."""
+    service = CachedResponseService()
+    responses = [
+        CachedResponse("global", 2024, category) for category in service.categories
+    ]
+
+    outcomes = service._generate_group(responses)
+
+    # Without aggregation bookmarks, nothing is complete enough to cache
+    assert outcomes == [("skipped", None)] * len(responses)
+    assert all(stats_cache.get(r.cache_key) is None for r in responses)
+    assert all(r._bytes_data is None for r in responses)
+
+
+class FakeSeriesSet:
+    """Stand-in for a finished data series set."""
+
+    def __init__(self, position: int):
+        """Initialize the set with its query's position."""
+        self.position = position
+
+    def iter_json(self):
+        """Yield the set's JSON in chunks."""
+        yield b'{"position":'
+        yield str(self.position).encode()
+        yield b"}"
+
+
+def test_generate_group_saves_each_response(running_app, db, stats_cache, monkeypatch):
+    """Test that each category's response is saved as soon as it is built."""
+    service = CachedResponseService()
+    responses = [
+        CachedResponse("global", 2024, category) for category in service.categories
+    ]
+    assert len(responses) > 1
+    saved_before_next: list[bool] = []
+
+    def fake_iter_series_sets(queries):
+        assert len(queries) == len(responses)
+        for position in range(len(queries)):
+            if position:
+                # The previous response is already in the cache
+                previous = responses[position - 1]
+                saved_before_next.append(
+                    stats_cache.get(previous.cache_key) is not None
+                )
+            yield position, FakeSeriesSet(position)
+
+    monkeypatch.setattr(
+        CategoryDataSeriesQueryBase,
+        "iter_series_sets",
+        staticmethod(fake_iter_series_sets),
+    )
+    monkeypatch.setattr(
+        CategoryDataSeriesQueryBase,
+        "_check_aggregation_completeness",
+        lambda self, *args: True,
+    )
+
+    outcomes = service._generate_group(responses)
+
+    assert outcomes == [("success", None)] * len(responses)
+    assert saved_before_next == [True] * (len(responses) - 1)
+    for position, response in enumerate(responses):
+        loaded = CachedResponse("global", 2024, response.category)
+        assert loaded.load_from_cache(stats_cache)
+        assert loaded.object_data == {"position": position}
+        assert response._bytes_data is None
+
+
+def test_generate_communities_without_aggregations(running_app, db, stats_cache):
+    """Test generating one category for several communities from one scan."""
+    service = CachedResponseService()
+    category = service.categories[0]
+    community_ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(3)]
+    responses = [
+        CachedResponse(community_id, 2024, category) for community_id in community_ids
+    ]
+
+    # All of the responses share one batch
+    assert len({service._community_batch_key(r) for r in responses}) == 1
+
+    outcomes = service._generate_communities(responses)
+
+    # Every community gets an outcome, even without any aggregation documents
+    assert outcomes == [("skipped", None)] * len(responses)
+    assert all(stats_cache.get(r.cache_key) is None for r in responses)
+    assert all(r._bytes_data is None for r in responses)
+
+
+class RecordingSeriesSet:
+    """Stand-in data series set recording the documents added to it."""
+
+    def __init__(self):
+        """Initialize the set without documents."""
+        self.docs: list[dict] = []
+
+    def add(self, docs: list[dict]) -> None:
+        """Record a run of documents."""
+        self.docs.extend(docs)
+
+
+def make_scan_client(docs: list[dict]) -> MagicMock:
+    """Build a client paging through sorted documents with search_after.
+
+    Returns:
+        MagicMock: The client, returning as many documents per search as the
+            requested page size.
+    """
+    hits = [
+        {
+            "_id": f"doc-{i}",
+            "_source": doc,
+            "sort": [doc["community_id"], doc["period_start"], f"doc-{i}"],
+        }
+        for i, doc in enumerate(docs)
+    ]
+
+    def search(body, index=None):
+        start = 0
+        if "search_after" in body:
+            start = next(
+                i + 1
+                for i, hit in enumerate(hits)
+                if hit["sort"] == body["search_after"]
+            )
+        return {
+            "pit_id": "test-pit",
+            "hits": {"hits": hits[start : start + body["size"]]},
+        }
+
+    client = MagicMock()
+    client.create_pit.return_value = {"pit_id": "test-pit"}
+    client.search.side_effect = search
+    return client
+
+
+def test_iter_community_series_sets_splits_pages(running_app, monkeypatch):
+    """Test that each community gets one complete set from a paged scan."""
+    config = running_app.app.config
+    monkeypatch.setitem(config, "STATS_DATA_SERIES_PAGE_SIZE", 2)
+    # Keep the memory estimator from resizing the pages
+    monkeypatch.setitem(config, "STATS_DATA_SERIES_MEM_BUDGET_BYTES", 1 << 60)
+    docs = [
+        {"community_id": community_id, "period_start": f"2024-01-0{day}"}
+        for community_id, days in [("comm-a", 3), ("comm-b", 1), ("comm-c", 4)]
+        for day in range(1, days + 1)
+    ]
+    client = make_scan_client(docs)
+    query = UsageDeltaCategoryQuery(
+        name="usage-delta-category", index="stats-community-usage-delta"
+    )
+    query.client = client
+    monkeypatch.setattr(
+        query, "_prepare_search", lambda *args: ("test-index", [{"match_all": {}}])
+    )
+    monkeypatch.setattr(
+        query, "_new_series_set", lambda *args: RecordingSeriesSet()
+    )
+    monkeypatch.setattr(query, "_calculate_series_count", lambda series_set: 1)
+
+    # comm-a crosses the first page boundary, the second page holds the end
+    # of comm-a and all of comm-b, and comm-d has no documents at all
+    community_params = {
+        community_id: {} for community_id in ["comm-d", "comm-c", "comm-b", "comm-a"]
+    }
+    results = list(
+        query.iter_community_series_sets(
+            community_params, "2024-01-01", "2024-12-31"
+        )
+    )
+
+    assert [community_id for community_id, _ in results] == [
+        "comm-a",
+        "comm-b",
+        "comm-c",
+        "comm-d",
+    ]
+    for community_id, series_set in results:
+        assert series_set.docs == [
+            doc for doc in docs if doc["community_id"] == community_id
+        ]
+
+    # Four full pages and an empty one, all sorted by community first
+    assert client.search.call_count == 5
+    for call in client.search.call_args_list:
+        body = call.kwargs["body"]
+        assert body["size"] == 2
+        assert body["sort"][0] == {"community_id": "asc"}
+        assert body["pit"]["id"] == "test-pit"
+    client.delete_pit.assert_called_once_with(body={"pit_id": ["test-pit"]})
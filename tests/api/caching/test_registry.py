@@ -6,10 +6,19 @@
 
 """Tests for StatsAggregationRegistry operations."""
 
+import json
+
 from invenio_stats_dashboard.constants import FirstRunStatus, RegistryOperation
+from invenio_stats_dashboard.models.cached_response import CachedResponse
 from invenio_stats_dashboard.resources.cache_utils import (
     StatsAggregationRegistry,
 )
+from invenio_stats_dashboard.services.cached_response_service import (
+    CachedResponseService,
+)
+from invenio_stats_dashboard.tasks.aggregation_tasks import (
+    _record_aggregation_updates,
+)
 
 
 def test_registry_basic_set_get(running_app, registry):
@@ -209,3 +218,120 @@ def test_registry_get_all_returns_strings(running_app, registry):
     assert isinstance(key, str)
     assert isinstance(value, str)
     assert value == FirstRunStatus.COMPLETED
+
+
+def test_registry_community_index(running_app, registry):
+    """Test that community lookups are answered from the community index."""
+    community_id = "test-community-123"
+    agg_key = StatsAggregationRegistry.make_registry_key(
+        community_id, RegistryOperation.AGG
+    )
+    other_key = StatsAggregationRegistry.make_registry_key(
+        "test-community-456", RegistryOperation.AGG
+    )
+    registry.set(agg_key, "2024-01-01T12:00:00.000", ttl=3600)
+    registry.set(other_key, "2024-01-01T12:00:00.000", ttl=3600)
+
+    index_key = registry.make_index_key(community_id)
+    assert registry.redis_client.smembers(index_key) == {agg_key}
+    assert registry.get_community_entries(community_id) == [
+        (agg_key, "2024-01-01T12:00:00.000")
+    ]
+
+    # Expired keys are pruned from the index when next read
+    registry.redis_client.delete(agg_key)
+    assert registry.get_community_entries(community_id) == []
+    assert registry.redis_client.smembers(index_key) == set()
+
+    # Deleted keys are removed from the index straight away
+    registry.delete(other_key)
+    assert (
+        registry.redis_client.smembers(registry.make_index_key("test-community-456"))
+        == set()
+    )
+
+
+def test_registry_index_rebuilt_for_existing_keys(running_app, registry):
+    """Test that keys registered before the index existed are still found."""
+    community_id = "test-community-123"
+    first_run_key = StatsAggregationRegistry.make_registry_key(
+        community_id, RegistryOperation.FIRST_RUN
+    )
+    # Write the key directly, as releases without the index did
+    registry.redis_client.set(first_run_key, FirstRunStatus.COMPLETED)
+    registry.redis_client.delete(registry.index_ready_key)
+
+    results = registry.get_all(f"{community_id}_{RegistryOperation.FIRST_RUN}*")
+
+    assert results == [(first_run_key, FirstRunStatus.COMPLETED)]
+    assert registry.redis_client.exists(registry.index_ready_key)
+
+
+def test_registry_get_all_across_communities(running_app, registry):
+    """Test that unscoped patterns scan the registry without index keys."""
+    keys = [
+        StatsAggregationRegistry.make_registry_key(
+            community_id, RegistryOperation.AGG_UPDATED.replace("{year}", "2023")
+        )
+        for community_id in ["test-community-123", "test-community-456"]
+    ]
+    for key in keys:
+        registry.set(key, "2024-01-01T12:00:00.000", ttl=3600)
+
+    results = registry.get_all("*_agg_updated_*")
+    assert sorted(key for key, _value in results) == sorted(keys)
+    assert not any(
+        key.startswith(f"{registry.cache_prefix}:")
+        for key, _value in registry.get_all("*")
+    )
+
+
+def test_aggregation_updates_recorded_per_index(running_app, registry):
+    """Test that aggregation updates are recorded per index and date range."""
+    community_id = "test-community-123"
+    detail = {
+        "community_id": community_id,
+        "index_name": "stats-community-usage-delta-2023",
+        "docs_indexed": 2,
+        "errors": 0,
+        "error_details": [],
+        "documents": [
+            {
+                "document_id": f"{community_id}-{day}",
+                "date_info": {"period_start": f"{day}T00:00:00", "date_type": "delta"},
+                "generation_time": 0.1,
+            }
+            for day in ["2023-03-01", "2023-03-02"]
+        ],
+        "date_range_requested": {"start_date": None, "end_date": None},
+    }
+    _record_aggregation_updates(
+        [{"aggregator": "community-usage-delta-agg", "community_details": [detail]}]
+    )
+
+    updated_key = StatsAggregationRegistry.make_registry_key(
+        community_id,
+        RegistryOperation.AGG_UPDATED_INDEX.replace("{year}", "2023").replace(
+            "{index}", "stats-community-usage-delta"
+        ),
+    )
+    value = json.loads(registry.get(updated_key))
+    assert value["start_date"] == "2023-03-01"
+    assert value["end_date"] == "2023-03-02"
+
+    service = CachedResponseService()
+    community_ids = [community_id]
+    updated, entries, years = service._get_updated_aggregation_combinations(
+        registry, {community_id: []}, community_ids
+    )
+    assert updated == {(community_id, 2023): {"stats-community-usage-delta"}}
+    assert [key for key, _value in entries] == [updated_key]
+    assert years == {community_id: [2023]}
+
+    # Only the usage delta category reads from the updated index
+    usage = CachedResponse("global", 2023, "usage-delta-category")
+    records = CachedResponse("global", 2023, "record-delta-category")
+    assert usage.aggregation_index in updated[(community_id, 2023)]
+    assert records.aggregation_index == "stats-community-records-delta-added"
+
+    registry.delete(updated_key)
@@ -6,7 +6,9 @@
 
 """Tests for community events functionality."""
 
+import threading
 from pprint import pformat
+from unittest.mock import MagicMock
 
 import arrow
 from invenio_access.permissions import system_identity
@@ -16,10 +18,18 @@ from invenio_search.utils import prefix_index
 
 from invenio_stats_dashboard.queries import get_relevant_record_ids_from_events
 from invenio_stats_dashboard.services.components.components import (
+    CommunityEventsOp,
+    apply_community_event_changes,
+    make_community_event_change,
+    queue_community_event_changes,
     update_community_events_deletion_fields,
     update_community_events_index,
     update_event_deletion_fields,
 )
+from invenio_stats_dashboard.tasks.aggregation_tasks import AggregationTaskLock
+from invenio_stats_dashboard.tasks.community_events_tasks import (
+    write_community_events,
+)
 
 
 def test_update_event_deletion_fields(
@@ -287,6 +297,127 @@ def test_update_community_events_index_duplicate_add(
     assert event["event_date"] == timestamp1
 
 
+def test_apply_community_event_changes_batch(
+    running_app, create_stats_indices, search_clear
+):
+    """Test writing several queued membership changes in one batch."""
+    client = current_search_client
+
+    changes = [
+        make_community_event_change(
+            "batch-record-1",
+            community_ids_to_add=["batch-community", "global"],
+            timestamp="2024-01-01T10:00:00",
+        ),
+        # A repeated addition is coalesced
+        make_community_event_change(
+            "batch-record-1",
+            community_ids_to_add=["batch-community"],
+            timestamp="2024-01-01T10:30:00",
+        ),
+        make_community_event_change(
+            "batch-record-1",
+            community_ids_to_remove=["batch-community"],
+            timestamp="2024-01-01T11:00:00",
+        ),
+        # Removal without a prior addition
+        make_community_event_change(
+            "batch-record-2",
+            community_ids_to_remove=["batch-community"],
+            timestamp="2024-01-01T12:00:00",
+        ),
+    ]
+    apply_community_event_changes(changes)
+
+    result = client.search(
+        index=prefix_index("stats-community-events"),
+        body={
+            "query": {"terms": {"record_id": ["batch-record-1", "batch-record-2"]}},
+            "size": 20,
+        },
+    )
+    events = sorted(
+        (
+            hit["_source"]["record_id"],
+            hit["_source"]["community_id"],
+            hit["_source"]["event_date"],
+            hit["_source"]["event_type"],
+        )
+        for hit in result["hits"]["hits"]
+    )
+    assert events == [
+        ("batch-record-1", "batch-community", "2024-01-01T10:00:00", "added"),
+        ("batch-record-1", "batch-community", "2024-01-01T11:00:00", "removed"),
+        ("batch-record-1", "global", "2024-01-01T10:00:00", "added"),
+        ("batch-record-2", "batch-community", "2024-01-01T11:59:59.000", "added"),
+        ("batch-record-2", "batch-community", "2024-01-01T12:00:00", "removed"),
+    ]
+
+
+def test_queue_community_event_changes_uses_one_op_per_uow(running_app):
+    """Changes queued in one unit of work are collected in a single op."""
+    uow = MagicMock()
+    first = make_community_event_change("queued-1", community_ids_to_add=["c"])
+    second = make_community_event_change("queued-2", community_ids_to_add=["c"])
+
+    queue_community_event_changes([first], uow=uow)
+    queue_community_event_changes([second], uow=uow)
+
+    uow.register.assert_called_once()
+    op = uow.register.call_args.args[0]
+    assert isinstance(op, CommunityEventsOp)
+    assert op.changes == [first, second]
+
+    # Another unit of work gets its own op
+    other_uow = MagicMock()
+    queue_community_event_changes([first], uow=other_uow)
+    assert other_uow.register.call_args.args[0] is not op
+
+
+def test_write_community_events_waits_for_record_lock(
+    running_app, create_stats_indices, search_clear
+):
+    """The task waits until no other task is writing the same record."""
+    client = current_search_client
+    changes = [
+        make_community_event_change(
+            "locked-record",
+            community_ids_to_add=["locked-community"],
+            timestamp="2024-01-01T10:00:00",
+        )
+    ]
+    other_task_lock = AggregationTaskLock("community_events:locked-record")
+    assert other_task_lock.acquire()
+    released = threading.Event()
+
+    app = running_app.app
+
+    def release_later():
+        with app.app_context():
+            other_task_lock.release()
+        released.set()
+
+    timer = threading.Timer(0.3, release_later)
+    timer.start()
+    try:
+        write_community_events(changes)
+    finally:
+        timer.cancel()
+
+    # The events were only written once the other lock was released
+    assert released.is_set()
+    result = client.search(
+        index=prefix_index("stats-community-events"),
+        body={"query": {"term": {"record_id": "locked-record"}}},
+    )
+    assert result["hits"]["total"]["value"] == 1
+
+    # The task's own lock was released after writing
+    lock = AggregationTaskLock("community_events:locked-record")
+    assert lock.acquire()
+    lock.release()
+
+
 def test_update_community_events_index_with_metadata(
     running_app, create_stats_indices, search_clear
 ):
@@ -446,3 +577,15 @@ def test_events_created_date_update(
     assert (
         record_id in record_ids_from_events
     ), f"Test record ID {record_id} not found in events search results"
+
+    # Reading the IDs one page at a time finds the same records
+    assert (
+        get_relevant_record_ids_from_events(
+            start_date=start,
+            end_date=end,
+            community_id=community_id,
+            client=client,
+            page_size=1,
+        )
+        == record_ids_from_events
+    )
@@ -267,6 +267,26 @@ def test_generate_record_community_events_all_records(
         )
         assert global_events["hits"]["total"]["value"] == 1
 
+    # Running again one record per page finds the existing events on every page
+    monkeypatch.setitem(app.config, "COMMUNITY_STATS_EVENTS_GENERATION_PAGE_SIZE", 1)
+    records_processed, new_events_created, old_events_found = (
+        service.generate_record_community_events(
+            community_ids=[community_id],
+        )
+    )
+    assert records_processed == 2
+    assert new_events_created == 0
+    assert old_events_found == 4
+
+    # Completed runs don't leave a bookmark behind
+    client.indices.refresh(index=prefix_index("stats-bookmarks-reindexing"))
+    assert (
+        service.events_bookmark_api.get_bookmark(
+            "community-events-generation-start-end"
+        )
+        is None
+    )
+
 
 def test_generate_record_community_events_with_dates(
     running_app,
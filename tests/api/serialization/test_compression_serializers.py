@@ -6,6 +6,7 @@
 
 """Tests for compression serializers."""
 
+import gzip
 import json
 
 import brotli
@@ -164,6 +165,24 @@ class TestCompressedStatsJSONSerializer:
         decompressed = brotli.decompress(compressed_data)
         assert orjson.loads(decompressed) == list_data
 
+    @pytest.mark.parametrize(
+        "compression_method,decompress",
+        [("gzip", gzip.decompress), ("brotli", brotli.decompress)],
+    )
+    def test_incremental_compression(
+        self, large_sample_data, compression_method, decompress
+    ):
+        """Test compressing JSON chunks as they are produced."""
+        json_bytes = orjson.dumps(large_sample_data)
+        chunks = [json_bytes[i : i + 100] for i in range(0, len(json_bytes), 100)]
+        serializer = CompressedStatsJSONSerializer(
+            compression_method=compression_method
+        )
+
+        compressed_data = b"".join(serializer.iter_compressed(iter(chunks)))
+
+        assert decompress(compressed_data) == json_bytes
+
 
 class TestConvenienceSerializers:
     """Test the convenience serializer classes."""
@@ -8,10 +8,18 @@
 
 from pprint import pformat
 
+import orjson
 import pytest
 from flask import current_app
 
-from invenio_stats_dashboard.transformers.record_deltas import RecordDeltaDataSeriesSet
+from invenio_stats_dashboard.transformers.base import (
+    DataPointColumns,
+    DataSeriesArray,
+)
+from invenio_stats_dashboard.transformers.record_deltas import (
+    RecordDeltaDataSeriesSet,
+    SubcountRecordDeltaDataSeries,
+)
 from invenio_stats_dashboard.transformers.record_snapshots import (
     RecordSnapshotDataSeriesSet,
 )
@@ -35,6 +43,107 @@ from tests.helpers.sample_stats_data.sample_usage_snapshot_docs import (
 )
 
 
+class TestDataPointColumns:
+    """Test the columnar storage of data series points."""
+
+    def test_columns_round_trip(self):
+        """Test that points serialize as they were added."""
+        columns = DataPointColumns()
+        columns.append("2024-01-01", 1)
+        columns.append("2024-12-31", 2)
+        assert len(columns) == 2
+        assert columns.single_year() == 2024
+        assert columns.to_arrays(year=2024) == [["01-01", 1], ["12-31", 2]]
+
+        columns.append("2025-01-01", 3)
+        assert columns.single_year() is None
+        assert columns.to_arrays() == [
+            ["2024-01-01", 1],
+            ["2024-12-31", 2],
+            ["2025-01-01", 3],
+        ]
+
+    def test_columns_fallbacks(self):
+        """Test that unusual dates and mixed values are kept unchanged."""
+        columns = DataPointColumns()
+        columns.append("2024-01-01", 1.5)
+        columns.append("2024-1-2", 2)
+        assert columns.single_year() == 2024
+        assert columns.to_arrays() == [["2024-01-01", 1.5], ["2024-1-2", 2]]
+        assert [type(v) for v in columns.values()] == [float, int]
+
+
+class TestDataSeriesArray:
+    """Test DataSeriesArray functionality."""
+
+    @staticmethod
+    def _item(item_id, label, added):
+        return {
+            "id": item_id,
+            "label": label,
+            "records": {"added": {"metadata_only": added}, "removed": {}},
+        }
+
+    def test_subcount_items_routed_to_series(self):
+        """Test that each document's items are added to their own series."""
+        documents = [
+            {
+                "period_start": "2024-01-01T00:00:00",
+                "subcounts": {
+                    "resource_types": [
+                        self._item("a", "A", 1),
+                        self._item("b", "B", 2),
+                    ]
+                },
+            },
+            {"period_start": "2024-01-02T00:00:00", "subcounts": {}},
+            {
+                "period_start": "2024-01-03T00:00:00",
+                "subcounts": {
+                    "resource_types": [
+                        self._item("b", "B (renamed)", 3),
+                        self._item("c", {"en": "C"}, 4),
+                        # Only the first item with an id is used
+                        self._item("b", "B", 99),
+                    ]
+                },
+            },
+        ]
+
+        series_array = DataSeriesArray(
+            "resource_types", SubcountRecordDeltaDataSeries, "records"
+        )
+        for doc in documents:
+            series_array.add(doc)
+
+        assert series_array.to_dict() == [
+            {
+                "id": "a",
+                "name": "A",
+                "data": [["01-01", 1]],
+                "type": "line",
+                "valueType": "number",
+                "year": 2024,
+            },
+            {
+                "id": "b",
+                "name": "B",
+                "data": [["01-01", 2], ["01-03", 3]],
+                "type": "line",
+                "valueType": "number",
+                "year": 2024,
+            },
+            {
+                "id": "c",
+                "name": {"en": "C"},
+                "data": [["01-03", 4]],
+                "type": "line",
+                "valueType": "number",
+                "year": 2024,
+            },
+        ]
+
+
 class TestRecordDeltaDataSeriesSet:
     """Test RecordDeltaDataSeriesSet functionality."""
 
@@ -151,6 +260,18 @@ class TestRecordDeltaDataSeriesSet:
         global_data_volume_series = result["subjects"]["data_volume"][0]
         assert global_data_volume_series["valueType"] == "filesize"
 
+    def test_record_delta_series_set_iter_json(self, running_app: RunningApp):
+        """Test that streamed JSON matches the serialized for_json() result."""
+        documents: list[AggregationDocumentDict] = MOCK_RECORD_DELTA_DOCS_2
+
+        streamed = b"".join(RecordDeltaDataSeriesSet(documents).iter_json())
+        expected = orjson.dumps(
+            RecordDeltaDataSeriesSet(documents).for_json(),
+            option=orjson.OPT_NAIVE_UTC,
+        )
+
+        assert streamed == expected
+
 
 class TestRecordSnapshotDataSeriesSet:
     """Test RecordSnapshotDataSeriesSet functionality."""
@@ -22,6 +22,8 @@ from opensearchpy.helpers.search import Search
 from invenio_stats_dashboard.proxies import current_event_reindexing_service
 from invenio_stats_dashboard.services.usage_reindexing import (
     EventReindexingService,
+    RecordEnrichmentTemplate,
+    RecordLookupCache,
 )
 from invenio_stats_dashboard.utils.usage_events import UsageEventFactory
 from tests.fixtures.records import enhance_metadata_with_funding_and_affiliations
@@ -303,6 +305,11 @@ class TestEventReindexingService:
         """Memory limit percentage for the service."""
         return 90
 
+    @property
+    def service_settings(self):
+        """Service attributes to set for the test run."""
+        return {"max_memory_percent": self.memory_limit_percent}
+
     @property
     def test_months(self):
         """Months to create test data for. Override for different date ranges."""
@@ -481,11 +488,20 @@ class TestEventReindexingService:
         # update service's memory limit since test setup has
         # limited resources and tests pass 85% memory usage
         extension = self.app.extensions.get("invenio-stats-dashboard")
-        if hasattr(extension, "event_reindexing_service"):
-            service = extension.event_reindexing_service
-            if service:
-                service.max_memory_percent = self.memory_limit_percent
+        service = getattr(extension, "event_reindexing_service", None)
+        original_settings = {}
+        if service:
+            for name, value in self.service_settings.items():
+                original_settings[name] = getattr(service, name)
+                setattr(service, name, value)
+        try:
+            self._run_reindexing_test(test_sample_files_folder)
+        finally:
+            for name, value in original_settings.items():
+                setattr(service, name, value)
 
+    def _run_reindexing_test(self, test_sample_files_folder):
+        """Run the reindexing test flow with the service configured."""
         self._verify_original_templates_lack_enriched_fields()
         self._setup_test_data(test_sample_files_folder)
         self._pre_migration_setup()
@@ -1088,6 +1104,21 @@ class TestEventReindexingServiceHighVolume(TestEventReindexingService):
         return 1500  # 3 records * 500 events
 
 
+class TestEventReindexingServicePipelined(TestEventReindexingService):
+    """Test the pipelined migration with several slices and concurrent months."""
+
+    @property
+    def service_settings(self):
+        """Override to migrate with small batches, two slices and two months."""
+        return {
+            **super().service_settings,
+            "pipelined": True,
+            "slices": 2,
+            "concurrent_months": 2,
+            "batch_size": 20,
+        }
+
+
 class TestEventReindexingServiceMixedCommunityMembership(TestEventReindexingService):
     """Test EventReindexingService with mixed community membership.
 
@@ -1300,3 +1331,80 @@ def test_usage_event_community_ids_with_same_day_community_added(
         f"{events_with_community_ids} events with community_ids out of "
         f"{len(view_results)} total events"
     )
+
+
+def test_record_lookup_cache_limits():
+    """The record lookup cache evicts the oldest entries past its limits."""
+    cache = RecordLookupCache(max_items=3, max_bytes=1000)
+    cache.set_many("metadata", {"a": {"id": "a"}, "b": {"id": "b"}})
+    cache.set_many("membership", {"a": [["c1", "2024-01-01"]]})
+    assert cache.get_many("metadata", ["a", "x"]) == {"a": {"id": "a"}}
+
+    # "b" is now the least recently used entry
+    cache.set_many("metadata", {"c": {"id": "c"}})
+    assert cache.get_many("metadata", ["a", "b", "c"]) == {
+        "a": {"id": "a"},
+        "c": {"id": "c"},
+    }
+
+    cache.set_many("metadata", {"big": {"text": "x" * 2000}})
+    stats = cache.get_stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+    assert stats["evictions"] == 5
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+
+
+def test_cached_record_lookups_fetch_missing_ids(running_app, monkeypatch):
+    """Cached record lookups only search for records missing from the cache."""
+    service = EventReindexingService(running_app.app)
+    metadata_requests = []
+    membership_requests = []
+
+    def get_metadata_for_records(record_ids):
+        metadata_requests.append(sorted(record_ids))
+        return {r: {"id": r} for r in record_ids}
+
+    def get_community_membership(record_ids, metadata_by_recid):
+        membership_requests.append(sorted(record_ids))
+        return {r: [("c1", "2024-01-01")] for r in record_ids}
+
+    monkeypatch.setattr(service, "get_metadata_for_records", get_metadata_for_records)
+    monkeypatch.setattr(service, "get_community_membership", get_community_membership)
+
+    service._get_cached_record_lookups(["r1", "r2"])
+    metadata, membership = service._get_cached_record_lookups(["r2", "r3"])
+
+    assert metadata_requests == [["r1", "r2"], ["r3"]]
+    assert membership_requests == [["r1", "r2"], ["r3"]]
+    assert metadata == {"r2": {"id": "r2"}, "r3": {"id": "r3"}}
+    assert membership["r2"] == [("c1", "2024-01-01")]
+    assert service.record_lookup_cache.get_stats()["hits"] == 2
+
+
+@pytest.mark.parametrize(
+    "event_timestamp",
+    ["2024-03-10T08:15:00", "2024-03-10T23:59:59.999999", "2024-03-10"],
+)
+def test_record_enrichment_template_matches_per_event_filtering(event_timestamp):
+    """Template community lookup matches filtering each event's memberships."""
+    communities = [
+        ("c3", "2024-03-11T00:00:00"),
+        ("global", "2020-01-01T00:00:00"),
+        ("c1", "2024-03-10T12:00:00"),
+        ("c2", "2023-01-01T00:00:00"),
+    ]
+    template = RecordEnrichmentTemplate({"resource_type": "x"}, communities)
+
+    end_of_event_day = RecordEnrichmentTemplate.get_end_of_event_day(event_timestamp)
+    expected_end = (
+        arrow.get(event_timestamp).ceil("day").format("YYYY-MM-DDTHH:mm:ss.SSS")
+    )
+    assert end_of_event_day == expected_end
+
+    expected = [c for c, d in communities if d <= expected_end and c != "global"]
+    community_ids = template.get_community_ids(end_of_event_day)
+    assert community_ids == expected == ["c1", "c2"]
+    # Events of the same record share the same list
+    assert template.get_community_ids(end_of_event_day) is community_ids
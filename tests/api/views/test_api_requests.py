@@ -7,6 +7,7 @@
 """Test the API requests for the stats dashboard."""
 
 import copy
+import gzip
 import json
 import time
 from pprint import pformat
@@ -33,7 +34,9 @@ from invenio_stats_dashboard.aggregations.usage_delta_aggs import (
 from invenio_stats_dashboard.aggregations.usage_snapshot_aggs import (
     CommunityUsageSnapshotAggregator,
 )
+from invenio_stats_dashboard.models.cached_response import CachedResponse
 from invenio_stats_dashboard.proxies import current_event_reindexing_service
+from invenio_stats_dashboard.resources.cache_utils import StatsCache
 from invenio_stats_dashboard.tasks.aggregation_tasks import (
     CommunityStatsAggregationTask,
     aggregate_community_record_stats,
@@ -2073,3 +2076,51 @@ class TestAPIRequestGlobalStats(TestAPIRequestCommunityStats):
         # Validate the response
         stats_data = self.validate_response_structure(response)
         self.validate_comprehensive_stats(stats_data, "global")
+
+
+def test_stats_api_passes_through_compressed_body(running_app, db, monkeypatch):
+    """A stored compressed body is sent as-is to clients accepting it."""
+    app = running_app.app
+    monkeypatch.setitem(app.config, "STATS_CACHE_COMPRESS_PAYLOADS", True)
+    monkeypatch.setitem(app.config, "STATS_CACHE_COMPRESSION_METHOD", "gzip")
+    query_name = "global-stats"
+    cache = StatsCache()
+    cached_response = CachedResponse("global", 2024, query_name)
+    cached_response._object_data = {"usage_deltas": []}
+    assert cached_response.save_to_cache(cache)
+
+    stored_response = CachedResponse("global", 2024, query_name)
+    assert stored_response.load_from_cache(cache)
+    stored_body = stored_response.encoded_body("gzip")
+    assert stored_body is not None
+
+    request_body = {
+        query_name: {
+            "stat": query_name,
+            "params": {
+                "community_id": "global",
+                "start_date": "2024-01-01",
+                "end_date": "2024-12-31",
+                "date_basis": "added",
+            },
+        }
+    }
+    try:
+        with app.test_client() as client:
+            response = client.post(
+                "/api/stats",
+                data=json.dumps(request_body),
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json+gzip",
+                },
+            )
+    finally:
+        cache.delete(cached_response.cache_key)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.get_data() == stored_body
+    assert json.loads(gzip.decompress(response.get_data())) == {
+        query_name: {"usage_deltas": []}
+    }